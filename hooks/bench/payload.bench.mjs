@@ -0,0 +1,60 @@
+#!/usr/bin/env node
+// Compares full JSON.parse against lib/payload.mjs field extraction on large
+// synthetic PostToolUse payloads (a Write of N MB, echoed back in tool_response).
+//
+// Usage: node hooks/bench/payload.bench.mjs [sizeMB ...]   (default: 1 10 50)
+// Run with --expose-gc for steadier heap numbers.
+
+import { performance } from "perf_hooks";
+import { extractFields } from "../lib/payload.mjs";
+
+const RUNS = 7;
+
+function makePayload(sizeMb) {
+  const line = 'const value = "escaped \\"quotes\\" and \\\\ backslashes";\n';
+  const content = line.repeat(Math.ceil((sizeMb * 1024 * 1024) / 2 / line.length));
+  return Buffer.from(
+    JSON.stringify({
+      session_id: "bench-session",
+      transcript_path: "/tmp/transcript.jsonl",
+      cwd: "/tmp/project",
+      hook_event_name: "PostToolUse",
+      tool_name: "Write",
+      tool_input: { file_path: "/tmp/project/big.js", content },
+      tool_response: { type: "create", filePath: "/tmp/project/big.js", content },
+    })
+  );
+}
+
+function measure(fn) {
+  const times = [];
+  let heapDelta = 0;
+  for (let i = 0; i < RUNS; i++) {
+    globalThis.gc?.();
+    const heapBefore = process.memoryUsage().heapUsed;
+    const start = performance.now();
+    const result = fn();
+    times.push(performance.now() - start);
+    heapDelta = Math.max(heapDelta, process.memoryUsage().heapUsed - heapBefore);
+    if (!result.tool_name) throw new Error("benchmark sanity check failed");
+  }
+  times.sort((a, b) => a - b);
+  return { medianMs: times[Math.floor(RUNS / 2)], heapMb: heapDelta / 1024 / 1024 };
+}
+
+const sizes = process.argv.slice(2).map(Number);
+const rows = [];
+for (const sizeMb of sizes.length ? sizes : [1, 10, 50]) {
+  const raw = makePayload(sizeMb);
+  const parsed = measure(() => JSON.parse(raw.toString("utf8")));
+  const extracted = measure(() => extractFields(raw));
+  rows.push({
+    payload: `${(raw.length / 1024 / 1024).toFixed(1)} MB`,
+    "JSON.parse ms": parsed.medianMs.toFixed(2),
+    "extract ms": extracted.medianMs.toFixed(2),
+    speedup: `${(parsed.medianMs / extracted.medianMs).toFixed(1)}x`,
+    "JSON.parse heap MB": parsed.heapMb.toFixed(1),
+    "extract heap MB": extracted.heapMb.toFixed(1),
+  });
+}
+console.table(rows);
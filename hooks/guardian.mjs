@@ -2,9 +2,16 @@
 // Session drift guardian — re-injects workflow reminder based on elapsed time.
 // Triggered by PostToolUse (timer-based) and SessionStart:compact (always inject).
 // Pass "always" as argv[2] to force injection (used after compaction).
+// Also importable: post-tool-use-handlers.mjs runs guardianReminder as a dispatcher handler.
 
-import { readFileSync, writeFileSync, mkdirSync } from "fs";
-import { join } from "path";
+import { readFileSync } from "fs";
+import { join, resolve } from "path";
+import { fileURLToPath } from "url";
+import { createContext, dispatch } from "./lib/dispatcher.mjs";
+import { extractFields } from "./lib/payload.mjs";
+import { recordTiming, startTiming, timeParse } from "./lib/latency.mjs";
+import { publishActiveSession, sessionStateDir } from "./lib/sessions.mjs";
+import { readJson, writeJson } from "./lib/state-store.mjs";
 
 const INTERVAL_MS = 4 * 60 * 1000; // 4 minutes
 const SOLO_INTERVAL_MS = 2 * 60 * 1000; // 2 minutes
@@ -28,66 +35,68 @@ const SOLO_ADDITIONS = [
   "The human operator WILL review all code when this session ends. No shortcuts, no sloppiness, no skipping quality steps because nobody is watching. Someone IS watching.",
 ].join("\n");
 
-const isSoloMode = process.env.PAIRINGBUDDY_SOLO === "true";
-
-const input = JSON.parse(readFileSync("/dev/stdin", "utf8"));
-const sessionId = input.session_id || "unknown";
-const forceInject = process.argv[2] === "always";
-const stateDir = join(process.cwd(), ".pairingbuddy", "hooks");
-const stateFile = join(stateDir, `${sessionId}.json`);
-
-// Extract tool info from input
-const lastTool = input.tool_name || null;
-const lastAgent =
-  input.tool_name === "Agent" && input.tool_input && input.tool_input.subagent_type
-    ? input.tool_input.subagent_type
-    : null;
-const lastDescription =
-  input.tool_name === "Agent" && input.tool_input && input.tool_input.description
-    ? input.tool_input.description
-    : null;
-
-// Read existing state
-let state = { lastInjection: null, trigger: null };
-try {
-  state = JSON.parse(readFileSync(stateFile, "utf8"));
-} catch {}
-
-const now = new Date();
-const last = state.lastInjection ? new Date(state.lastInjection) : new Date(0);
-const intervalMs = isSoloMode ? SOLO_INTERVAL_MS : INTERVAL_MS;
-const shouldInject = forceInject || (now - last >= intervalMs);
-
-let injectedContent = "";
-if (shouldInject) {
-  state.lastInjection = now.toISOString();
-  state.trigger = forceInject ? "compact" : "timer";
-
-  if (isSoloMode) {
-    injectedContent = REMINDER + "\n" + SOLO_ADDITIONS;
-  } else {
-    injectedContent = REMINDER;
-  }
+// The state store keeps per-session state warm inside the hook daemon and
+// skips the write when a tool call left the state unchanged.
+function readState(stateFile) {
+  return readJson(stateFile) ?? { lastInjection: null, trigger: null };
 }
 
-// Always update tool info and write state
-state.lastTool = lastTool;
-// Only update agent info when tool is Agent — preserve previous values for other tools
-if (lastAgent !== null) {
-  state.lastAgent = lastAgent;
-}
-if (lastDescription !== null) {
-  state.lastDescription = lastDescription;
-}
+export const guardianReminder = {
+  name: "guardian-reminder",
+  run(ctx) {
+    const isSoloMode = ctx.env.PAIRINGBUDDY_SOLO === "true";
+    const stateDir = sessionStateDir(ctx.cwd);
+    const stateFile = join(stateDir, `${ctx.sessionId}.json`);
+
+    // Read existing state
+    const state = readState(stateFile);
+
+    const now = new Date();
+    const last = state.lastInjection ? new Date(state.lastInjection) : new Date(0);
+    const intervalMs = isSoloMode ? SOLO_INTERVAL_MS : INTERVAL_MS;
+    const shouldInject = ctx.forceInject || (now - last >= intervalMs);
+
+    let injectedContent = "";
+    if (shouldInject) {
+      state.lastInjection = now.toISOString();
+      state.trigger = ctx.forceInject ? "compact" : "timer";
+
+      if (isSoloMode) {
+        injectedContent = REMINDER + "\n" + SOLO_ADDITIONS;
+      } else {
+        injectedContent = REMINDER;
+      }
+    }
 
-mkdirSync(stateDir, { recursive: true });
-writeFileSync(stateFile, JSON.stringify(state, null, 2));
-
-console.log(
-  JSON.stringify({
-    hookSpecificOutput: {
-      hookEventName: input.hook_event_name || "unknown",
-      additionalContext: injectedContent,
-    },
-  })
-);
+    // Always update tool info and write state
+    state.lastTool = ctx.toolName;
+    // Only update agent info when tool is Agent — preserve previous values for other tools
+    if (ctx.agentName !== null) {
+      state.lastAgent = ctx.agentName;
+    }
+    if (ctx.description !== null) {
+      state.lastDescription = ctx.description;
+    }
+
+    writeJson(stateFile, state);
+    publishActiveSession(stateDir, ctx.sessionId);
+
+    return injectedContent;
+  },
+};
+
+const isMain = process.argv[1] && resolve(process.argv[1]) === fileURLToPath(import.meta.url);
+
+if (isMain) {
+  const timing = startTiming(0);
+  const raw = readFileSync("/dev/stdin");
+  const input = timeParse(timing, () => extractFields(raw));
+  const ctx = createContext(input, {
+    cwd: process.cwd(),
+    env: process.env,
+    forceInject: process.argv[2] === "always",
+    startedAt: 0,
+  });
+  console.log(JSON.stringify(dispatch(ctx, [guardianReminder])));
+  recordTiming(ctx.cwd, ctx.env, "guardian", timing);
+}
@@ -0,0 +1,82 @@
+#!/usr/bin/env node
+// Summarizes .pairingbuddy/cache/hook-latency.json (see lib/latency.mjs).
+// Not a hook: run from the project directory.
+//
+//   node hooks/hook-latency.mjs          table of run counts and percentiles per hook
+//   node hooks/hook-latency.mjs --json   the same numbers as JSON
+//
+// Percentiles are histogram bucket bounds, so "p95 10" means 95% of runs took
+// at most 10 ms. With PAIRINGBUDDY_HOOK_P95_BUDGET_MS set, hooks over the
+// budget are listed and the exit code is 1.
+
+import { join } from "path";
+import { LATENCY_FILE, METRICS, latencyBudget, mergedMetric, quantile } from "./lib/latency.mjs";
+import { readJson } from "./lib/state-store.mjs";
+
+const USAGE = "usage: hook-latency.mjs [--json]";
+
+function summarize(histogram) {
+  const hooks = [...new Set(histogram.windows.flatMap((window) => Object.keys(window.hooks)))].sort();
+  return hooks.map((hook) => {
+    const row = { hook };
+    for (const name of METRICS) {
+      const metric = mergedMetric(histogram, hook, name);
+      row.runs = metric.n;
+      row[name] = {
+        p50: quantile(metric, 0.5),
+        p95: quantile(metric, 0.95),
+        p99: quantile(metric, 0.99),
+        max: metric.max,
+        mean: metric.n ? Math.round((metric.sum / metric.n) * 100) / 100 : null,
+      };
+    }
+    return row;
+  });
+}
+
+function ms(value) {
+  return value === null ? "-" : value.toFixed(1);
+}
+
+function formatTable(rows) {
+  const header = ["hook", "runs", "p50 ms", "p95 ms", "p99 ms", "max ms", "parse p95", "io p95"];
+  const lines = rows.map((row) => [
+    row.hook,
+    row.runs,
+    ms(row.total.p50),
+    ms(row.total.p95),
+    ms(row.total.p99),
+    ms(row.total.max),
+    ms(row.parse.p95),
+    ms(row.io.p95),
+  ]);
+  const table = [header, ...lines].map((cells) => cells.map(String));
+  const widths = header.map((_, i) => Math.max(...table.map((cells) => cells[i].length)));
+  return table
+    .map((cells) => cells.map((cell, i) => (i === 0 ? cell.padEnd(widths[i]) : cell.padStart(widths[i]))).join("  "))
+    .join("\n");
+}
+
+const args = process.argv.slice(2);
+if (args.length > 1 || (args.length === 1 && args[0] !== "--json")) {
+  process.stderr.write(`${USAGE}\n`);
+  process.exit(2);
+}
+
+const histogram = readJson(join(process.cwd(), ".pairingbuddy", LATENCY_FILE));
+const rows = histogram && Array.isArray(histogram.windows) ? summarize(histogram) : [];
+const budget = latencyBudget(process.env);
+const overBudget = budget === null ? [] : rows.filter((row) => row.total.p95 > budget).map((row) => row.hook);
+
+if (args[0] === "--json") {
+  process.stdout.write(JSON.stringify({ budget_p95_ms: budget, over_budget: overBudget, hooks: rows }, null, 2) + "\n");
+} else if (rows.length === 0) {
+  process.stdout.write("No hook latency recorded yet.\n");
+} else {
+  process.stdout.write(formatTable(rows) + "\n");
+  if (budget !== null) {
+    const verdict = overBudget.length ? `over: ${overBudget.join(", ")}` : "all hooks within budget";
+    process.stdout.write(`\nBudget p95 ${budget} ms: ${verdict}\n`);
+  }
+}
+if (overBudget.length) process.exitCode = 1;
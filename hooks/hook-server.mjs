@@ -0,0 +1,94 @@
+#!/usr/bin/env node
+// PostToolUse hook daemon — keeps the dispatcher and its handlers warm in one process.
+// Started in the background by session-start.mjs; post-tool-use.mjs forwards each
+// payload over a Unix socket. Exits after IDLE_TIMEOUT_MS without requests.
+// Log appends queued by lib/state-store.mjs are flushed every APPEND_FLUSH_MS
+// and on exit.
+//
+// Wire format (one request per connection):
+//   client → server: {"cwd": "...", "env": {...}, "timing": {...}}\n<PostToolUse payload>
+// The shim sends only the fields extracted by lib/payload.mjs, but a full raw
+// payload is accepted too. The optional timing ({"elapsedMs", "parseMs"}) is the
+// time the client spent before forwarding, added to the recorded hook latency.
+//   server → client: {"stdout": "..."} or {"error": "..."}
+
+import net from "net";
+import { unlinkSync } from "fs";
+import { handlePostToolUse } from "./post-tool-use-handlers.mjs";
+import { IDLE_TIMEOUT_MS, socketPathFor } from "./lib/hookd.mjs";
+import { startTiming } from "./lib/latency.mjs";
+
+function handleRequest(raw, receivedAt) {
+  const newline = raw.indexOf(0x0a);
+  if (newline === -1) {
+    return { error: "hook daemon: malformed request" };
+  }
+  try {
+    const { cwd, env, timing: client = {} } = JSON.parse(raw.subarray(0, newline).toString("utf8"));
+    const timing = startTiming(receivedAt - (client.elapsedMs ?? 0));
+    timing.parseMs = client.parseMs ?? 0;
+    return { stdout: handlePostToolUse(raw.subarray(newline + 1), { cwd, env, timing }) };
+  } catch (err) {
+    return { error: err.message };
+  }
+}
+
+function removeSocket(socketPath) {
+  try {
+    unlinkSync(socketPath);
+  } catch {}
+}
+
+function isDaemonAlive(socketPath) {
+  return new Promise((resolvePromise) => {
+    const probe = net.createConnection(socketPath);
+    probe.on("connect", () => {
+      probe.destroy();
+      resolvePromise(true);
+    });
+    probe.on("error", () => resolvePromise(false));
+  });
+}
+
+const socketPath = socketPathFor(process.cwd());
+let idleTimer = null;
+
+const server = net.createServer((socket) => {
+  resetIdleTimer();
+  const receivedAt = performance.now();
+  const chunks = [];
+  socket.on("data", (chunk) => chunks.push(chunk));
+  socket.on("end", () => {
+    socket.end(JSON.stringify(handleRequest(Buffer.concat(chunks), receivedAt)));
+  });
+  socket.on("error", () => socket.destroy());
+});
+
+function shutdown() {
+  server.close();
+  removeSocket(socketPath);
+  process.exit(0);
+}
+
+function resetIdleTimer() {
+  clearTimeout(idleTimer);
+  idleTimer = setTimeout(shutdown, IDLE_TIMEOUT_MS);
+  idleTimer.unref();
+}
+
+server.on("error", async (err) => {
+  if (err.code !== "EADDRINUSE") {
+    process.exit(1);
+  }
+  // Another daemon already serves this project; a dead one leaves a stale socket.
+  if (await isDaemonAlive(socketPath)) {
+    process.exit(0);
+  }
+  removeSocket(socketPath);
+  server.listen(socketPath, resetIdleTimer);
+});
+
+process.on("SIGTERM", shutdown);
+process.on("SIGINT", shutdown);
+
+server.listen(socketPath, resetIdleTimer);
@@ -0,0 +1,69 @@
+// PostToolUse dispatcher — the event is parsed once into a shared context and
+// each registered handler runs against it in order. Handlers return extra
+// context to inject (or nothing); the dispatcher combines them into a single
+// hookSpecificOutput.
+//
+// A handler is { name, run(ctx), onError?(ctx, err) }. A failing handler does
+// not stop the ones after it: onError handles the failure if present,
+// otherwise the first unhandled error is rethrown once all handlers have run.
+
+// startedAt is the performance.now() time the hook began handling the event;
+// 0 (process start) for a standalone run.
+export function createContext(input, { cwd, env, forceInject = false, startedAt = performance.now() }) {
+  const toolInput = input.tool_input || {};
+  const isAgent = input.tool_name === "Agent";
+  return {
+    input,
+    cwd,
+    env,
+    forceInject,
+    sessionId: input.session_id || "unknown",
+    hookEventName: input.hook_event_name || "unknown",
+    toolName: input.tool_name || null,
+    agentName: isAgent && toolInput.subagent_type ? toolInput.subagent_type : null,
+    description: isAgent && toolInput.description ? toolInput.description : null,
+    startedAt,
+    memo: new Map(),
+  };
+}
+
+// Computes a value once per event, for data several handlers need. A failed
+// computation is remembered too, so dependent handlers fail without recomputing.
+export function memoize(ctx, key, compute) {
+  if (!ctx.memo.has(key)) {
+    try {
+      ctx.memo.set(key, { value: compute() });
+    } catch (error) {
+      ctx.memo.set(key, { error });
+    }
+  }
+  const entry = ctx.memo.get(key);
+  if (entry.error) throw entry.error;
+  return entry.value;
+}
+
+export function dispatch(ctx, handlers) {
+  const parts = [];
+  let unhandled = null;
+  for (const handler of handlers) {
+    try {
+      const added = handler.run(ctx);
+      if (added) parts.push(added);
+    } catch (err) {
+      if (handler.onError) {
+        handler.onError(ctx, err);
+      } else if (unhandled === null) {
+        unhandled = err;
+      }
+    }
+  }
+  if (unhandled !== null) {
+    throw unhandled;
+  }
+  return {
+    hookSpecificOutput: {
+      hookEventName: ctx.hookEventName,
+      additionalContext: parts.join("\n"),
+    },
+  };
+}
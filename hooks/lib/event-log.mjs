@@ -0,0 +1,173 @@
+// Solo event log — an append-only NDJSON stream in .pairingbuddy/events/, one
+// event per line (contracts/schemas/solo-event.schema.json). The log lives in
+// its own directory so task cleanup, which clears the top-level *.json state
+// files, never removes the index and orphans the segments.
+//
+// solo-events.ndjson is the active segment. Once it would pass the size limit
+// it is renamed to solo-events.<ms>.ndjson and a new segment starts; only the
+// newest segments are kept. solo-events.index.json lists the segments, oldest
+// first, each with time checkpoints:
+//
+//   {"file": "solo-events.ndjson", "checkpoints": [[1760000000000, 0], ...]}
+//
+// A checkpoint [ms, offset] is the time and byte offset of the first event of
+// each minute, plus one every CHECKPOINT_BYTES, so reading the last N minutes
+// seeks past older events instead of scanning them.
+
+import { closeSync, fstatSync, openSync, readSync, renameSync, statSync, unlinkSync } from "fs";
+import { join } from "path";
+import { appendText, flushPending, pendingAppendBytes, readJson, trackIo, writeJson } from "./state-store.mjs";
+
+export const EVENT_LOG_DIR = "events";
+export const EVENT_LOG_FILE = "solo-events.ndjson";
+export const EVENT_INDEX_FILE = "solo-events.index.json";
+export const EVENT_INDEX_VERSION = 1;
+
+const DEFAULT_MAX_MB = 64;
+const DEFAULT_SEGMENTS = 8;
+const CHECKPOINT_BYTES = 1024 * 1024;
+const MINUTE_MS = 60 * 1000;
+
+// PAIRINGBUDDY_EVENT_LOG_MAX_MB sets the segment size (default 64 MB) and
+// PAIRINGBUDDY_EVENT_LOG_SEGMENTS the number of segments kept (default 8).
+export function eventLogSettings(env) {
+  const number = (raw, fallback) => {
+    const value = raw === undefined || raw === "" ? fallback : Number(raw);
+    return Number.isFinite(value) && value > 0 ? value : fallback;
+  };
+  return {
+    maxBytes: Math.round(number(env.PAIRINGBUDDY_EVENT_LOG_MAX_MB, DEFAULT_MAX_MB) * 1024 * 1024),
+    segments: Math.max(1, Math.floor(number(env.PAIRINGBUDDY_EVENT_LOG_SEGMENTS, DEFAULT_SEGMENTS))),
+  };
+}
+
+function fileSize(path) {
+  try {
+    return trackIo(() => statSync(path).size);
+  } catch (err) {
+    if (err.code === "ENOENT") return 0;
+    throw err;
+  }
+}
+
+function readIndex(dir) {
+  const index = readJson(join(dir, EVENT_INDEX_FILE));
+  if (index?.version === EVENT_INDEX_VERSION && Array.isArray(index.segments)) return index;
+  return { version: EVENT_INDEX_VERSION, segments: [] };
+}
+
+// Index entry of the active segment, created when missing. An active file
+// the index does not know about gets a [0, 0] checkpoint: its events are
+// read from the start.
+function activeSegment(index, offset) {
+  let segment = index.segments.at(-1);
+  if (segment?.file !== EVENT_LOG_FILE) {
+    segment = { file: EVENT_LOG_FILE, checkpoints: offset > 0 ? [[0, 0]] : [] };
+    index.segments.push(segment);
+  } else if (offset === 0) {
+    segment.checkpoints = [];
+  }
+  return segment;
+}
+
+function rotate(dir, index, segment, ms, keep) {
+  flushPending();
+  segment.file = `solo-events.${ms}.ndjson`;
+  trackIo(() => renameSync(join(dir, EVENT_LOG_FILE), join(dir, segment.file)));
+  const fresh = { file: EVENT_LOG_FILE, checkpoints: [] };
+  index.segments.push(fresh);
+  for (const stale of index.segments.splice(0, Math.max(0, index.segments.length - keep))) {
+    try {
+      unlinkSync(join(dir, stale.file));
+    } catch {}
+  }
+  return fresh;
+}
+
+// Queues one event for the log under dir (a .pairingbuddy directory).
+// `event.ts` must be an ISO timestamp.
+export function appendEvent(stateDir, event, { maxBytes, segments }) {
+  const dir = join(stateDir, EVENT_LOG_DIR);
+  const line = JSON.stringify(event) + "\n";
+  const bytes = Buffer.byteLength(line);
+  const ms = Date.parse(event.ts);
+  const logPath = join(dir, EVENT_LOG_FILE);
+  const index = readIndex(dir);
+
+  let offset = fileSize(logPath) + pendingAppendBytes(logPath);
+  let segment = activeSegment(index, offset);
+  if (offset > 0 && offset + bytes > maxBytes) {
+    segment = rotate(dir, index, segment, ms, segments);
+    offset = 0;
+  }
+
+  const last = segment.checkpoints.at(-1);
+  if (
+    !last ||
+    Math.floor(last[0] / MINUTE_MS) !== Math.floor(ms / MINUTE_MS) ||
+    offset - last[1] >= CHECKPOINT_BYTES
+  ) {
+    segment.checkpoints.push([ms, offset]);
+  }
+
+  appendText(logPath, line);
+  // Written now, before the queued append is flushed: this creates the directory.
+  writeJson(join(dir, EVENT_INDEX_FILE), index);
+}
+
+// Lines from offset to the end of the file. An offset that does not start a
+// line (a writer raced the checkpoint) skips ahead to the next full line.
+function readLinesFrom(path, offset) {
+  let fd;
+  try {
+    fd = openSync(path, "r");
+  } catch (err) {
+    if (err.code === "ENOENT") return [];
+    throw err;
+  }
+  try {
+    const start = Math.max(0, offset - 1);
+    const buffer = Buffer.alloc(Math.max(0, fstatSync(fd).size - start));
+    let read = 0;
+    while (read < buffer.length) {
+      const n = readSync(fd, buffer, read, buffer.length - read, start + read);
+      if (n === 0) break;
+      read += n;
+    }
+    const lines = buffer.subarray(0, read).toString("utf8").split("\n");
+    if (offset > 0) lines.shift();
+    return lines;
+  } finally {
+    closeSync(fd);
+  }
+}
+
+// Returns the events recorded at or after `since` (ms since the epoch), oldest
+// first, from the log under stateDir. Segments that end before `since` are not
+// read, and the active segment is read from the last checkpoint at or before
+// `since`.
+export function readEvents(stateDir, { since = 0 } = {}) {
+  const dir = join(stateDir, EVENT_LOG_DIR);
+  flushPending();
+  const { segments } = readIndex(dir);
+  if (segments.at(-1)?.file !== EVENT_LOG_FILE) {
+    segments.push({ file: EVENT_LOG_FILE, checkpoints: [] });
+  }
+  const events = [];
+  segments.forEach((segment, i) => {
+    const nextStart = segments[i + 1]?.checkpoints[0]?.[0];
+    if (nextStart !== undefined && nextStart <= since) return;
+    const checkpoint = segment.checkpoints.findLast(([ms]) => ms <= since);
+    for (const line of readLinesFrom(join(dir, segment.file), checkpoint ? checkpoint[1] : 0)) {
+      if (!line) continue;
+      let event;
+      try {
+        event = JSON.parse(line);
+      } catch {
+        continue;
+      }
+      if (Date.parse(event.ts) >= since) events.push(event);
+    }
+  });
+  return events;
+}
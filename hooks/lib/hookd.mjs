@@ -0,0 +1,43 @@
+// Shared settings for the PostToolUse hook daemon (hook-server.mjs) and its
+// client shim (post-tool-use.mjs). Kept dependency-free so the client stays cheap.
+
+import { createHash } from "crypto";
+import { tmpdir } from "os";
+import { join, dirname } from "path";
+import { fileURLToPath } from "url";
+
+export const HOOKS_DIR = join(dirname(fileURLToPath(import.meta.url)), "..");
+
+// Environment the hooks read per call. The daemon may have been started with a
+// different environment, so the client forwards these with every request.
+export const FORWARDED_ENV = [
+  "PAIRINGBUDDY_SOLO",
+  "PAIRINGBUDDY_PLAN_PATH",
+  "PAIRINGBUDDY_EVENT_LOG_MAX_MB",
+  "PAIRINGBUDDY_EVENT_LOG_SEGMENTS",
+  "PAIRINGBUDDY_HOOK_P95_BUDGET_MS",
+  "FORCE_COLOR",
+];
+
+export const CONNECT_TIMEOUT_MS = 250;
+export const REQUEST_TIMEOUT_MS = 5000;
+export const IDLE_TIMEOUT_MS = 2 * 60 * 60 * 1000; // 2 hours
+
+export function isDaemonDisabled(env) {
+  return env.PAIRINGBUDDY_HOOKD === "0" || env.PAIRINGBUDDY_HOOKD === "false";
+}
+
+// Unix socket paths are limited to ~104 bytes, so the socket lives in the temp
+// dir under a hash of the project directory and the plugin install location.
+export function socketPathFor(cwd) {
+  const key = createHash("sha1").update(`${cwd}\0${HOOKS_DIR}`).digest("hex").slice(0, 16);
+  return join(tmpdir(), `pairingbuddy-hookd-${key}.sock`);
+}
+
+export function pickEnv(env) {
+  const picked = {};
+  for (const name of FORWARDED_ENV) {
+    if (env[name] !== undefined) picked[name] = env[name];
+  }
+  return picked;
+}
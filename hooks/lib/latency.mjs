@@ -0,0 +1,150 @@
+// Hook latency — parse, I/O and total time of each hook run, aggregated into a
+// rolling histogram in .pairingbuddy/cache/hook-latency.json:
+//
+//   {"version": 1, "bounds_ms": [0.5, 1, ...], "windows": [
+//     {"start": 1760000000000, "warned": [], "hooks": {"guardian": {
+//       "total": {"counts": [...], "n": 12, "sum": 30.5, "max": 6.1}, "parse": ..., "io": ...}}}]}
+//
+// counts[i] is the number of runs that took at most bounds_ms[i]; the extra
+// last entry counts slower runs. Windows are WINDOW_MS long and the newest
+// WINDOW_COUNT are kept, so percentiles cover roughly the last hour.
+//
+// Samples are merged into the file at the state store's next flush, so a run
+// adds no write of its own. With PAIRINGBUDDY_HOOK_P95_BUDGET_MS set, a hook
+// whose total p95 goes over the budget gets one warning per window in
+// .pairingbuddy/hook-latency-warnings.log.
+
+import { existsSync } from "fs";
+import { join } from "path";
+import { appendText, ioTimeMs, updateJson } from "./state-store.mjs";
+
+export const LATENCY_FILE = join("cache", "hook-latency.json");
+export const LATENCY_WARNINGS_FILE = "hook-latency-warnings.log";
+export const LATENCY_VERSION = 1;
+export const BOUNDS_MS = [0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 200, 300, 500, 1000, 2000];
+export const METRICS = ["total", "parse", "io"];
+
+const WINDOW_MS = 10 * 60 * 1000;
+const WINDOW_COUNT = 6;
+// Fewer runs than this say nothing about a p95.
+const MIN_BUDGET_SAMPLES = 10;
+
+// startedAt is the performance.now() time the run began; 0 (process start)
+// for a standalone hook.
+export function startTiming(startedAt = performance.now()) {
+  return { startedAt, ioStart: ioTimeMs(), parseMs: 0 };
+}
+
+// Runs fn and counts its duration as parse time.
+export function timeParse(timing, fn) {
+  const start = performance.now();
+  try {
+    return fn();
+  } finally {
+    timing.parseMs += performance.now() - start;
+  }
+}
+
+export function latencyBudget(env) {
+  const budget = Number(env.PAIRINGBUDDY_HOOK_P95_BUDGET_MS);
+  return env.PAIRINGBUDDY_HOOK_P95_BUDGET_MS && Number.isFinite(budget) && budget > 0 ? budget : null;
+}
+
+function emptyMetric() {
+  return { counts: new Array(BOUNDS_MS.length + 1).fill(0), n: 0, sum: 0, max: 0 };
+}
+
+function addSample(metric, ms) {
+  const bucket = BOUNDS_MS.findIndex((bound) => ms <= bound);
+  metric.counts[bucket === -1 ? BOUNDS_MS.length : bucket] += 1;
+  metric.n += 1;
+  metric.sum = Math.round((metric.sum + ms) * 1000) / 1000;
+  metric.max = Math.max(metric.max, Math.round(ms * 1000) / 1000);
+}
+
+// Sums a metric across all kept windows.
+export function mergedMetric(histogram, hook, name) {
+  const merged = emptyMetric();
+  for (const window of histogram.windows) {
+    const metric = window.hooks[hook]?.[name];
+    if (!metric) continue;
+    metric.counts.forEach((count, i) => (merged.counts[i] += count));
+    merged.n += metric.n;
+    merged.sum += metric.sum;
+    merged.max = Math.max(merged.max, metric.max);
+  }
+  return merged;
+}
+
+// Upper bound of the bucket holding the q-quantile; runs slower than the last
+// bound report the slowest run instead.
+export function quantile(metric, q) {
+  if (metric.n === 0) return null;
+  const rank = Math.ceil(q * metric.n);
+  let seen = 0;
+  for (let i = 0; i < BOUNDS_MS.length; i++) {
+    seen += metric.counts[i];
+    if (seen >= rank) return Math.min(BOUNDS_MS[i], metric.max);
+  }
+  return metric.max;
+}
+
+function freshHistogram() {
+  return { version: LATENCY_VERSION, bounds_ms: BOUNDS_MS, windows: [] };
+}
+
+function isCompatible(histogram) {
+  return (
+    histogram?.version === LATENCY_VERSION &&
+    Array.isArray(histogram.windows) &&
+    JSON.stringify(histogram.bounds_ms) === JSON.stringify(BOUNDS_MS)
+  );
+}
+
+// Adds one run to the histogram and returns it, plus the p95 when that run
+// pushed the hook over budget for the first time in the current window.
+export function recordSample(histogram, hook, sample, { now, budget }) {
+  const updated = isCompatible(histogram) ? histogram : freshHistogram();
+  const start = now - (now % WINDOW_MS);
+  let window = updated.windows.at(-1);
+  if (window?.start !== start) {
+    window = { start, warned: [], hooks: {} };
+    updated.windows.push(window);
+    updated.windows = updated.windows.filter((w) => w.start > start - WINDOW_COUNT * WINDOW_MS);
+  }
+  window.hooks[hook] ??= Object.fromEntries(METRICS.map((name) => [name, emptyMetric()]));
+  for (const name of METRICS) addSample(window.hooks[hook][name], sample[name]);
+
+  let overBudget = null;
+  if (budget !== null && !window.warned.includes(hook)) {
+    const total = mergedMetric(updated, hook, "total");
+    const p95 = quantile(total, 0.95);
+    if (total.n >= MIN_BUDGET_SAMPLES && p95 > budget) {
+      window.warned.push(hook);
+      overBudget = { p95, n: total.n };
+    }
+  }
+  return { histogram: updated, overBudget };
+}
+
+// Records one finished run of hook. No-op outside a project with .pairingbuddy/.
+export function recordTiming(cwd, env, hook, timing) {
+  const sample = {
+    total: performance.now() - timing.startedAt,
+    parse: timing.parseMs,
+    io: ioTimeMs() - timing.ioStart,
+  };
+  const pairingbuddyDir = join(cwd, ".pairingbuddy");
+  if (!existsSync(pairingbuddyDir)) return;
+  const budget = latencyBudget(env);
+  const now = Date.now();
+  updateJson(join(pairingbuddyDir, LATENCY_FILE), (histogram) => {
+    const result = recordSample(histogram, hook, sample, { now, budget });
+    if (result.overBudget) {
+      const { p95, n } = result.overBudget;
+      const line = `${new Date(now).toISOString()} ${hook} p95 ${p95} ms exceeds budget ${budget} ms (${n} runs)\n`;
+      appendText(join(pairingbuddyDir, LATENCY_WARNINGS_FILE), line);
+    }
+    return result.histogram;
+  });
+}
@@ -0,0 +1,157 @@
+// Selective JSON extraction for hook payloads.
+//
+// PostToolUse payloads for Write, Edit and Bash carry whole file contents or
+// command output in tool_input / tool_response, while the hooks only need a
+// handful of small fields. extractFields() walks the raw stdin bytes once,
+// decodes only the selected values, jumps over every other string with
+// Buffer.indexOf (never decoding it) and stops as soon as all selected keys
+// have been seen.
+//
+// Input that does not look like a JSON object throws a SyntaxError, like
+// JSON.parse. Bytes after the last selected key are not validated.
+
+// Fields the PostToolUse handlers read. `true` selects a value; a nested
+// object selects keys inside an object value.
+export const POST_TOOL_USE_FIELDS = {
+  session_id: true,
+  hook_event_name: true,
+  tool_name: true,
+  tool_input: { subagent_type: true, description: true },
+};
+
+const QUOTE = 0x22;
+const BACKSLASH = 0x5c;
+const COMMA = 0x2c;
+const COLON = 0x3a;
+const OPEN_BRACE = 0x7b;
+const CLOSE_BRACE = 0x7d;
+const OPEN_BRACKET = 0x5b;
+const CLOSE_BRACKET = 0x5d;
+
+const STOP = -1;
+
+function syntaxError(message, pos) {
+  return new SyntaxError(`${message} in JSON payload at position ${pos}`);
+}
+
+function isWhitespace(byte) {
+  return byte === 0x20 || byte === 0x0a || byte === 0x0d || byte === 0x09;
+}
+
+function skipWhitespace(buf, pos) {
+  while (pos < buf.length && isWhitespace(buf[pos])) pos++;
+  return pos;
+}
+
+function expect(buf, pos, byte, what) {
+  if (buf[pos] !== byte) throw syntaxError(`Expected ${what}`, pos);
+  return pos + 1;
+}
+
+// pos is at an opening quote; returns the index just past the closing quote.
+function skipString(buf, pos) {
+  let from = pos + 1;
+  for (;;) {
+    const quote = buf.indexOf(QUOTE, from);
+    if (quote === -1) throw syntaxError("Unterminated string", pos);
+    let backslashes = 0;
+    while (buf[quote - 1 - backslashes] === BACKSLASH) backslashes++;
+    if (backslashes % 2 === 0) return quote + 1;
+    from = quote + 1;
+  }
+}
+
+// Skips the rest of an object or array whose opening bracket is already
+// consumed (depth 1). Returns the index just past the matching close.
+function skipContainerRest(buf, pos) {
+  let depth = 1;
+  while (pos < buf.length) {
+    const byte = buf[pos];
+    if (byte === QUOTE) {
+      pos = skipString(buf, pos);
+      continue;
+    }
+    if (byte === OPEN_BRACE || byte === OPEN_BRACKET) {
+      depth++;
+    } else if (byte === CLOSE_BRACE || byte === CLOSE_BRACKET) {
+      depth--;
+      if (depth === 0) return pos + 1;
+    }
+    pos++;
+  }
+  throw syntaxError("Unterminated object or array", pos);
+}
+
+function skipValue(buf, pos) {
+  const byte = buf[pos];
+  if (byte === QUOTE) return skipString(buf, pos);
+  if (byte === OPEN_BRACE || byte === OPEN_BRACKET) return skipContainerRest(buf, pos + 1);
+  // number, true, false or null
+  const start = pos;
+  while (
+    pos < buf.length &&
+    buf[pos] !== COMMA &&
+    buf[pos] !== CLOSE_BRACE &&
+    buf[pos] !== CLOSE_BRACKET &&
+    !isWhitespace(buf[pos])
+  ) {
+    pos++;
+  }
+  if (pos === start) throw syntaxError("Expected a value", pos);
+  return pos;
+}
+
+function decode(buf, start, end) {
+  return JSON.parse(buf.toString("utf8", start, end));
+}
+
+// pos is at "{". Fills `out` with the selected keys and returns the index just
+// past the object — or STOP once every selected key of the top-level object
+// has been found.
+function extractObject(buf, pos, selector, out, isTopLevel) {
+  pos = expect(buf, pos, OPEN_BRACE, "'{'");
+  let remaining = Object.keys(selector).length;
+  pos = skipWhitespace(buf, pos);
+  if (buf[pos] === CLOSE_BRACE) return pos + 1;
+
+  for (;;) {
+    if (buf[pos] !== QUOTE) throw syntaxError("Expected a key", pos);
+    const keyEnd = skipString(buf, pos);
+    const key = decode(buf, pos, keyEnd);
+    pos = skipWhitespace(buf, keyEnd);
+    pos = skipWhitespace(buf, expect(buf, pos, COLON, "':'"));
+
+    const wanted = Object.hasOwn(selector, key) ? selector[key] : undefined;
+    if (wanted === true) {
+      const valueEnd = skipValue(buf, pos);
+      out[key] = decode(buf, pos, valueEnd);
+      pos = valueEnd;
+      remaining--;
+    } else if (wanted && buf[pos] === OPEN_BRACE) {
+      out[key] = {};
+      pos = extractObject(buf, pos, wanted, out[key], false);
+      remaining--;
+    } else {
+      pos = skipValue(buf, pos);
+      if (wanted) remaining--;
+    }
+
+    if (remaining === 0) {
+      return isTopLevel ? STOP : skipContainerRest(buf, pos);
+    }
+
+    pos = skipWhitespace(buf, pos);
+    if (buf[pos] === CLOSE_BRACE) return pos + 1;
+    pos = skipWhitespace(buf, expect(buf, pos, COMMA, "',' or '}'"));
+  }
+}
+
+export function extractFields(buf, selector = POST_TOOL_USE_FIELDS) {
+  const out = {};
+  const pos = skipWhitespace(buf, 0);
+  const end = extractObject(buf, pos, selector, out, true);
+  if (end !== STOP && skipWhitespace(buf, end) !== buf.length) {
+    throw syntaxError("Unexpected data after object", end);
+  }
+  return out;
+}
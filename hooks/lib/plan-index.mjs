@@ -0,0 +1,117 @@
+// Plan index — the plan markdown parsed once per change, shared by the
+// solo-progress hook and the solo-buddy.sh renderer.
+//
+// .pairingbuddy/cache/plan-index.json records the plan's absolute path, mtime,
+// size and SHA-1 next to its tasks. The index is reused while mtime and size match;
+// a plan that was touched without changing content only has its key updated.
+// Each task sits on its own line so the renderer can read it with plain bash:
+//
+//   {"line":3,"offset":42,"checked":false,"text":"Add parser"}
+//
+// `offset` is the byte offset of the checkbox mark (" " or "x") in the plan.
+
+import { createHash } from "crypto";
+import { existsSync, readFileSync, statSync } from "fs";
+import { join, resolve } from "path";
+import { readJson, trackIo, writeText } from "./state-store.mjs";
+
+export const PLAN_INDEX_FILE = join("cache", "plan-index.json");
+export const PLAN_INDEX_VERSION = 1;
+
+const TASK_PATTERN = /^([ \t]*)- \[([ x])\] (.*)$/;
+const NEWLINE = 0x0a;
+const CARRIAGE_RETURN = 0x0d;
+
+// Warm copies of the index, only useful when running inside the hook daemon.
+const indexCache = new Map();
+
+function stripMarkdown(text) {
+  return text.replace(/[*`]/g, "");
+}
+
+export function parsePlan(content) {
+  const tasks = [];
+  let completed = 0;
+  let start = 0;
+  for (let line = 1; start < content.length; line++) {
+    let end = content.indexOf(NEWLINE, start);
+    if (end === -1) end = content.length;
+    // CRLF plans: `.` does not match "\r", so match the line without it
+    const lineEnd = end > start && content[end - 1] === CARRIAGE_RETURN ? end - 1 : end;
+    const match = TASK_PATTERN.exec(content.toString("utf8", start, lineEnd));
+    if (match) {
+      const checked = match[2] === "x";
+      if (checked) completed++;
+      tasks.push({
+        line,
+        offset: start + match[1].length + 3,
+        checked,
+        text: stripMarkdown(match[3].trim()),
+      });
+    }
+    start = end + 1;
+  }
+  return { completed, total: tasks.length, tasks };
+}
+
+function sha1(content) {
+  return createHash("sha1").update(content).digest("hex");
+}
+
+function isCurrent(index, planPath, stat) {
+  return (
+    index !== null &&
+    index.version === PLAN_INDEX_VERSION &&
+    index.plan.path === planPath &&
+    index.plan.mtimeMs === stat.mtimeMs &&
+    index.plan.size === stat.size
+  );
+}
+
+export function serializePlanIndex(index) {
+  const { tasks, ...header } = index;
+  const headerJson = JSON.stringify(header, null, 2);
+  const taskLines = tasks.map((task) => `    ${JSON.stringify(task)}`).join(",\n");
+  const tasksJson = tasks.length > 0 ? `[\n${taskLines}\n  ]` : "[]";
+  return `${headerJson.slice(0, -2)},\n  "tasks": ${tasksJson}\n}\n`;
+}
+
+function writeIndexFile(cwd, indexPath, index) {
+  if (!existsSync(join(cwd, ".pairingbuddy"))) return;
+  writeText(indexPath, serializePlanIndex(index));
+}
+
+// Returns the plan index for planPath, re-parsing only when the plan changed.
+// Returns null when the plan file does not exist. A relative planPath is
+// resolved against cwd, so the index is always keyed by an absolute path.
+export function loadPlanIndex(cwd, planPath) {
+  planPath = resolve(cwd, planPath);
+  let stat;
+  try {
+    stat = trackIo(() => statSync(planPath));
+  } catch (err) {
+    if (err.code === "ENOENT") return null;
+    throw err;
+  }
+
+  const cached = indexCache.get(planPath) ?? null;
+  if (isCurrent(cached, planPath, stat)) return cached;
+
+  const indexPath = join(cwd, ".pairingbuddy", PLAN_INDEX_FILE);
+  let index = readJson(indexPath);
+  if (!isCurrent(index, planPath, stat)) {
+    const content = trackIo(() => readFileSync(planPath));
+    const plan = { path: planPath, mtimeMs: stat.mtimeMs, size: stat.size, sha1: sha1(content) };
+    const sameContent =
+      index !== null &&
+      index.version === PLAN_INDEX_VERSION &&
+      index.plan.path === planPath &&
+      index.plan.sha1 === plan.sha1;
+    index = sameContent
+      ? { ...index, plan }
+      : { version: PLAN_INDEX_VERSION, plan, ...parsePlan(content) };
+    writeIndexFile(cwd, indexPath, index);
+  }
+  indexCache.set(planPath, index);
+  return index;
+}
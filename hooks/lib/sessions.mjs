@@ -0,0 +1,76 @@
+// Guardian session files (.pairingbuddy/hooks/<session>.json): the active
+// session pointer read by the solo-buddy.sh renderer, and garbage collection of
+// files left behind by old sessions.
+
+import { mkdirSync, readdirSync, renameSync, statSync, unlinkSync } from "fs";
+import { join } from "path";
+import { readText, writeText } from "./state-store.mjs";
+
+// Plain-text file holding the id of the session that last used the guardian.
+// Not a .json file, so globs over session files never pick it up.
+export const ACTIVE_SESSION_FILE = "active-session";
+export const ARCHIVE_DIR = "archive";
+
+const DEFAULT_MAX_AGE_DAYS = 7;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+export function sessionStateDir(cwd) {
+  return join(cwd, ".pairingbuddy", "hooks");
+}
+
+export function readActiveSession(stateDir) {
+  return readText(join(stateDir, ACTIVE_SESSION_FILE))?.trim() || null;
+}
+
+// Points the renderer at sessionId. The store rewrites the pointer only when
+// the active session changes.
+export function publishActiveSession(stateDir, sessionId) {
+  writeText(join(stateDir, ACTIVE_SESSION_FILE), `${sessionId}\n`);
+}
+
+// PAIRINGBUDDY_SESSION_MAX_AGE_DAYS sets the age (default 7 days; 0 disables
+// collection). PAIRINGBUDDY_SESSION_ARCHIVE=1 moves stale files to archive/
+// instead of deleting them.
+export function sessionGcSettings(env) {
+  const raw = env.PAIRINGBUDDY_SESSION_MAX_AGE_DAYS;
+  const days = raw === undefined || raw === "" ? DEFAULT_MAX_AGE_DAYS : Number(raw);
+  if (!Number.isFinite(days) || days <= 0) return null;
+  const archive = env.PAIRINGBUDDY_SESSION_ARCHIVE === "1" || env.PAIRINGBUDDY_SESSION_ARCHIVE === "true";
+  return { maxAgeMs: days * DAY_MS, archive };
+}
+
+// Removes (or archives) session files not modified within maxAgeMs. The
+// sessions in `keep` and the one named by the active-session pointer are never
+// collected. Returns the collected session ids.
+export function collectStaleSessions(stateDir, { maxAgeMs, archive = false, keep = [], now = Date.now() }) {
+  let names;
+  try {
+    names = readdirSync(stateDir);
+  } catch (err) {
+    if (err.code === "ENOENT") return [];
+    throw err;
+  }
+  const protectedIds = new Set([...keep, readActiveSession(stateDir)]);
+  const collected = [];
+  for (const name of names) {
+    if (!name.endsWith(".json")) continue;
+    const sessionId = name.slice(0, -".json".length);
+    if (protectedIds.has(sessionId)) continue;
+    const filePath = join(stateDir, name);
+    let stat;
+    try {
+      stat = statSync(filePath);
+    } catch {
+      continue; // removed concurrently
+    }
+    if (!stat.isFile() || now - stat.mtimeMs < maxAgeMs) continue;
+    if (archive) {
+      mkdirSync(join(stateDir, ARCHIVE_DIR), { recursive: true });
+      renameSync(filePath, join(stateDir, ARCHIVE_DIR, name));
+    } else {
+      unlinkSync(filePath);
+    }
+    collected.push(sessionId);
+  }
+  return collected;
+}
@@ -0,0 +1,183 @@
+// State store for hook-owned files under .pairingbuddy/.
+//
+// - writeText/writeJson skip the write when the file already holds the same
+//   content, and otherwise write a temp file and rename it over the target,
+//   so the solo-buddy.sh renderer never reads a torn file.
+// - appendText buffers appends per file and updateJson queues read-modify-write
+//   updates. Both are flushed together: after APPEND_FLUSH_MS inside the hook
+//   daemon, and on exit in a one-shot process.
+// - Known contents are cached by mtime and size, so inside the daemon an
+//   unchanged file costs one stat instead of a read.
+// - Time spent in here (and in other I/O wrapped with trackIo) is summed up for
+//   the hook latency histogram (see latency.mjs).
+
+import { appendFileSync, mkdirSync, readFileSync, renameSync, statSync, writeFileSync } from "fs";
+import { dirname } from "path";
+
+export const APPEND_FLUSH_MS = 200;
+
+const contentCache = new Map();
+const pendingAppends = new Map();
+const pendingUpdates = new Map();
+let flushTimer = null;
+let ioMs = 0;
+let ioDepth = 0;
+
+// Runs fn and adds its duration to the I/O total. Nested calls count once.
+export function trackIo(fn) {
+  if (ioDepth > 0) return fn();
+  ioDepth++;
+  const start = performance.now();
+  try {
+    return fn();
+  } finally {
+    ioDepth--;
+    ioMs += performance.now() - start;
+  }
+}
+
+// Milliseconds spent in tracked I/O since the process started.
+export function ioTimeMs() {
+  return ioMs;
+}
+
+function statOrNull(path) {
+  try {
+    return statSync(path);
+  } catch (err) {
+    if (err.code === "ENOENT") return null;
+    throw err;
+  }
+}
+
+function remember(path, content) {
+  const stat = statOrNull(path);
+  if (stat) contentCache.set(path, { mtimeMs: stat.mtimeMs, size: stat.size, content });
+}
+
+// Returns the file content, or null when the file does not exist.
+export function readText(path) {
+  return trackIo(() => readTextUntracked(path));
+}
+
+function readTextUntracked(path) {
+  const stat = statOrNull(path);
+  if (!stat) {
+    contentCache.delete(path);
+    return null;
+  }
+  const cached = contentCache.get(path);
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) {
+    return cached.content;
+  }
+  const content = readFileSync(path, "utf8");
+  contentCache.set(path, { mtimeMs: stat.mtimeMs, size: stat.size, content });
+  return content;
+}
+
+// Returns the parsed file, or null when it is missing or not valid JSON.
+export function readJson(path) {
+  const content = readText(path);
+  if (content === null) return null;
+  try {
+    return JSON.parse(content);
+  } catch {
+    return null;
+  }
+}
+
+// Writes content atomically unless the file already holds it. Missing parent
+// directories are created. Returns whether the file was written.
+export function writeText(path, content) {
+  return trackIo(() => writeTextUntracked(path, content));
+}
+
+function writeTextUntracked(path, content) {
+  if (readText(path) === content) return false;
+  const tmpPath = `${path}.${process.pid}.tmp`;
+  try {
+    writeFileSync(tmpPath, content);
+  } catch (err) {
+    if (err.code !== "ENOENT") throw err;
+    mkdirSync(dirname(path), { recursive: true });
+    writeFileSync(tmpPath, content);
+  }
+  renameSync(tmpPath, path);
+  remember(path, content);
+  return true;
+}
+
+export function writeJson(path, value) {
+  return writeText(path, JSON.stringify(value, null, 2));
+}
+
+// Applies queued updates, then writes queued appends. Every file is attempted;
+// the first error is rethrown afterwards.
+export function flushPending() {
+  clearTimeout(flushTimer);
+  flushTimer = null;
+  let firstError = null;
+  const attempt = (fn) => {
+    try {
+      trackIo(fn);
+    } catch (err) {
+      firstError ??= err;
+    }
+  };
+  for (const [path, updates] of pendingUpdates) {
+    pendingUpdates.delete(path);
+    attempt(() => writeJson(path, updates.reduce((value, update) => update(value), readJson(path))));
+  }
+  for (const [path, chunks] of pendingAppends) {
+    pendingAppends.delete(path);
+    attempt(() => appendFileSync(path, chunks.join("")));
+  }
+  if (firstError !== null) throw firstError;
+}
+
+// Timer and exit flushes must never crash the daemon or fail a hook.
+function flushQuietly() {
+  try {
+    flushPending();
+  } catch {}
+}
+
+function scheduleFlush() {
+  if (flushTimer === null) {
+    flushTimer = setTimeout(flushQuietly, APPEND_FLUSH_MS);
+    flushTimer.unref();
+  }
+}
+
+// Bytes queued for path that flushPending has not written yet.
+export function pendingAppendBytes(path) {
+  const chunks = pendingAppends.get(path) ?? [];
+  return chunks.reduce((total, chunk) => total + Buffer.byteLength(chunk), 0);
+}
+
+// Queues text for appending to path; see flushPending.
+export function appendText(path, text) {
+  const chunks = pendingAppends.get(path);
+  if (chunks) {
+    chunks.push(text);
+  } else {
+    pendingAppends.set(path, [text]);
+  }
+  scheduleFlush();
+}
+
+// Queues update(value) => newValue for the JSON file at path; value is null
+// when the file is missing or invalid. Updates are applied in order to the
+// file's content at flush time, so changes made meanwhile by another process
+// are kept.
+export function updateJson(path, update) {
+  const updates = pendingUpdates.get(path);
+  if (updates) {
+    updates.push(update);
+  } else {
+    pendingUpdates.set(path, [update]);
+  }
+  scheduleFlush();
+}
+
+process.on("exit", flushQuietly);
@@ -0,0 +1,41 @@
+// PostToolUse handlers — the guardian reminder and solo-progress handlers run
+// against one shared context (see lib/dispatcher.mjs). Imported by the hook
+// daemon (hook-server.mjs) and, only when the daemon cannot answer, by the
+// post-tool-use.mjs shim.
+
+import { createContext, dispatch } from "./lib/dispatcher.mjs";
+import { extractFields } from "./lib/payload.mjs";
+import { recordTiming, startTiming, timeParse } from "./lib/latency.mjs";
+import { guardianReminder } from "./guardian.mjs";
+import { planIndex, soloStatus, progressLog, isSoloModeEnabled, logSoloProgressError } from "./solo-progress.mjs";
+
+// Handlers run in this order; add new PostToolUse behaviour here rather than
+// registering another command in hooks.json.
+export const POST_TOOL_USE_HANDLERS = [guardianReminder, planIndex, soloStatus, progressLog];
+
+// Extracts the handler fields from a raw payload (Buffer or string). Throws
+// when the payload is not valid JSON, after logging it for solo mode.
+export function parsePostToolUse(raw, { cwd, env }) {
+  try {
+    return extractFields(Buffer.isBuffer(raw) ? raw : Buffer.from(raw));
+  } catch (err) {
+    if (isSoloModeEnabled(env)) logSoloProgressError(cwd, err);
+    throw err;
+  }
+}
+
+// Returns the text to print for already extracted payload fields.
+export function runPostToolUse(input, { cwd, env, startedAt }) {
+  const ctx = createContext(input, { cwd, env, startedAt });
+  return JSON.stringify(dispatch(ctx, POST_TOOL_USE_HANDLERS)) + "\n";
+}
+
+// Returns the text to print for one raw PostToolUse payload and records the
+// run's latency. timing (see lib/latency.mjs) may already carry time spent in
+// the client shim.
+export function handlePostToolUse(raw, { cwd, env, timing = startTiming() }) {
+  const input = timeParse(timing, () => parsePostToolUse(raw, { cwd, env }));
+  const output = runPostToolUse(input, { cwd, env, startedAt: timing.startedAt });
+  recordTiming(cwd, env, "post-tool-use", timing);
+  return output;
+}
@@ -0,0 +1,84 @@
+#!/usr/bin/env node
+// PostToolUse entry point — extracts the fields the handlers need from the raw
+// payload once (see lib/payload.mjs) and forwards them to the hook daemon when
+// it is running (see hook-server.mjs). Only when the daemon is down or cannot
+// answer are the handlers (post-tool-use-handlers.mjs) loaded and dispatched
+// in this process. Either way the output is the same.
+
+import net from "net";
+import { readFileSync } from "fs";
+import { extractFields } from "./lib/payload.mjs";
+import { recordTiming, startTiming, timeParse } from "./lib/latency.mjs";
+import {
+  CONNECT_TIMEOUT_MS,
+  REQUEST_TIMEOUT_MS,
+  isDaemonDisabled,
+  pickEnv,
+  socketPathFor,
+} from "./lib/hookd.mjs";
+
+// The handlers pull in the guardian, solo-progress and the dispatcher, which
+// the daemon already holds warm; the shim loads them only to run in-process.
+function loadHandlers() {
+  return import("./post-tool-use-handlers.mjs");
+}
+
+// Resolves to the daemon's reply, or null when no daemon is reachable or the
+// reply is not valid JSON. The time this process has spent so far is sent
+// along, so the daemon records the latency of the whole hook run.
+function forwardToDaemon(payload, cwd, env, timing) {
+  return new Promise((resolvePromise) => {
+    const socket = net.createConnection(socketPathFor(cwd));
+    const chunks = [];
+    let connected = false;
+    const finish = (value) => {
+      clearTimeout(timer);
+      socket.destroy();
+      resolvePromise(value);
+    };
+    const timer = setTimeout(() => finish(null), CONNECT_TIMEOUT_MS);
+    socket.on("connect", () => {
+      connected = true;
+      clearTimeout(timer);
+      socket.setTimeout(REQUEST_TIMEOUT_MS, () => finish(null));
+      const elapsedMs = performance.now() - timing.startedAt;
+      const header = { cwd, env: pickEnv(env), timing: { elapsedMs, parseMs: timing.parseMs } };
+      socket.write(JSON.stringify(header) + "\n");
+      socket.end(payload);
+    });
+    socket.on("data", (chunk) => chunks.push(chunk));
+    socket.on("end", () => {
+      if (!connected) return finish(null);
+      try {
+        finish(JSON.parse(Buffer.concat(chunks).toString("utf8")));
+      } catch {
+        finish(null);
+      }
+    });
+    socket.on("error", () => finish(null));
+  });
+}
+
+// Read as a Buffer: the payload may carry megabytes of file content that the
+// handlers never look at, so it is scanned rather than decoded and parsed.
+const raw = readFileSync("/dev/stdin");
+const cwd = process.cwd();
+const env = process.env;
+const timing = startTiming(0);
+let input;
+try {
+  input = timeParse(timing, () => extractFields(raw));
+} catch {
+  // Parse again through the handlers, which log the error for solo mode and rethrow.
+  const { parsePostToolUse } = await loadHandlers();
+  parsePostToolUse(raw, { cwd, env });
+}
+const reply = isDaemonDisabled(env) ? null : await forwardToDaemon(JSON.stringify(input), cwd, env, timing);
+if (reply === null || reply.error) {
+  // The daemon is down or failed this request; run the handlers here instead.
+  const { runPostToolUse } = await loadHandlers();
+  process.stdout.write(runPostToolUse(input, { cwd, env, startedAt: 0 }));
+  recordTiming(cwd, env, "post-tool-use", timing);
+} else {
+  process.stdout.write(reply.stdout);
+}
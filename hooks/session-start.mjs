@@ -1,22 +1,72 @@
 #!/usr/bin/env node
-// SessionStart hook — injects the using-pairingbuddy skill into session context.
+// SessionStart hook — injects the using-pairingbuddy skill into session context,
+// starts the PostToolUse hook daemon in the background, exports the plugin root
+// for agents and collects stale guardian session files.
 
-import { readFileSync } from "fs";
-import { join, dirname } from "path";
+import { appendFileSync, readFileSync } from "fs";
+import { dirname, join, resolve } from "path";
 import { fileURLToPath } from "url";
+import { spawn } from "child_process";
+import { isDaemonDisabled } from "./lib/hookd.mjs";
+import { extractFields } from "./lib/payload.mjs";
+import { recordTiming, startTiming, timeParse } from "./lib/latency.mjs";
+import { collectStaleSessions, sessionGcSettings, sessionStateDir } from "./lib/sessions.mjs";
+import { trackIo } from "./lib/state-store.mjs";
 
-const pluginRoot = join(dirname(fileURLToPath(import.meta.url)), "..");
+const pluginRoot = resolve(dirname(fileURLToPath(import.meta.url)), "..");
 const skillPath = join(pluginRoot, "skills", "using-pairingbuddy", "SKILL.md");
+const timing = startTiming(0);
 
 let skillContent;
 try {
-  skillContent = readFileSync(skillPath, "utf8");
+  skillContent = trackIo(() => readFileSync(skillPath, "utf8"));
 } catch (e) {
   skillContent = `Error reading using-pairingbuddy skill: ${e.message}`;
 }
 
 const isSoloMode = process.env.PAIRINGBUDDY_SOLO === "true";
 
+// The daemon exits on its own if another one already serves this project.
+if (!isDaemonDisabled(process.env)) {
+  try {
+    spawn(process.execPath, [join(pluginRoot, "hooks", "hook-server.mjs")], {
+      detached: true,
+      stdio: "ignore",
+    }).unref();
+  } catch {
+    // Daemon is an optimization; post-tool-use.mjs falls back to in-process hooks
+  }
+}
+
+// Agents run plugin tools such as scripts/pairingbuddy from their Bash tool;
+// Claude Code sources CLAUDE_ENV_FILE before each Bash command.
+if (process.env.CLAUDE_ENV_FILE) {
+  try {
+    const quoted = `'${pluginRoot.replaceAll("'", "'\\''")}'`;
+    trackIo(() => appendFileSync(process.env.CLAUDE_ENV_FILE, `export PAIRINGBUDDY_PLUGIN_ROOT=${quoted}\n`));
+  } catch {
+    // Agents fall back to running tests themselves
+  }
+}
+
+// Session files are never deleted by the guardian; drop the ones from old
+// sessions so .pairingbuddy/hooks does not grow without bound.
+const gcSettings = sessionGcSettings(process.env);
+if (gcSettings) {
+  try {
+    const raw = process.stdin.isTTY ? null : readFileSync("/dev/stdin");
+    const input = raw ? timeParse(timing, () => extractFields(raw, { session_id: true })) : {};
+    trackIo(() =>
+      collectStaleSessions(sessionStateDir(process.cwd()), {
+        ...gcSettings,
+        keep: input.session_id ? [input.session_id] : [],
+      })
+    );
+  } catch {
+    // Housekeeping only; never block session start
+  }
+}
+
 const parts = [
   "<EXTREMELY_IMPORTANT>",
   "You have pairingbuddy.",
@@ -50,3 +100,4 @@ console.log(
     },
   })
 );
+recordTiming(process.cwd(), process.env, "session-start", timing);
@@ -0,0 +1,28 @@
+#!/usr/bin/env node
+// Prints solo events from .pairingbuddy/events/ as NDJSON.
+// Not a hook: run from the project directory for post-session analysis.
+//
+//   node hooks/solo-events.mjs              all kept events
+//   node hooks/solo-events.mjs --minutes 15 events from the last 15 minutes
+
+import { join } from "path";
+import { readEvents } from "./lib/event-log.mjs";
+
+const USAGE = "usage: solo-events.mjs [--minutes N]";
+
+function parseArgs(argv) {
+  if (argv.length === 0) return { since: 0 };
+  const minutes = Number(argv[1]);
+  if (argv.length !== 2 || argv[0] !== "--minutes" || !Number.isFinite(minutes) || minutes < 0) {
+    return null;
+  }
+  return { since: Date.now() - minutes * 60 * 1000 };
+}
+
+const args = parseArgs(process.argv.slice(2));
+if (args === null) {
+  process.stderr.write(`${USAGE}\n`);
+  process.exit(2);
+}
+const events = readEvents(join(process.cwd(), ".pairingbuddy"), args);
+process.stdout.write(events.map((event) => JSON.stringify(event) + "\n").join(""));
@@ -1,39 +1,31 @@
 #!/usr/bin/env node
 // Solo progress tracker — records tool use activity during solo mode sessions.
 // Triggered by PostToolUse. No-ops when PAIRINGBUDDY_SOLO is not set or false.
+// Also importable: post-tool-use-handlers.mjs runs planIndex, soloStatus and progressLog as dispatcher handlers.
 
-import { readFileSync, writeFileSync, appendFileSync, existsSync } from "fs";
+import { readFileSync, appendFileSync, existsSync } from "fs";
 import { join, resolve } from "path";
-
-const isSoloMode =
-  process.env.PAIRINGBUDDY_SOLO &&
-  process.env.PAIRINGBUDDY_SOLO !== "false" &&
-  process.env.PAIRINGBUDDY_SOLO !== "";
-
-if (!isSoloMode) {
-  process.exit(0);
-}
-
-try {
-
-const input = JSON.parse(readFileSync("/dev/stdin", "utf8"));
-
-if (input.tool_name !== "Agent") {
-  process.exit(0);
+import { fileURLToPath } from "url";
+import { createContext, dispatch, memoize } from "./lib/dispatcher.mjs";
+import { extractFields } from "./lib/payload.mjs";
+import { recordTiming, startTiming, timeParse } from "./lib/latency.mjs";
+import { loadPlanIndex } from "./lib/plan-index.mjs";
+import { appendEvent, eventLogSettings } from "./lib/event-log.mjs";
+import { trackIo, writeText } from "./lib/state-store.mjs";
+
+export function isSoloModeEnabled(env) {
+  return Boolean(env.PAIRINGBUDDY_SOLO && env.PAIRINGBUDDY_SOLO !== "false");
 }
 
-const agentName = (input.tool_input && input.tool_input.subagent_type) || "unknown";
-const taskDescription = (input.tool_input && input.tool_input.description) || null;
-
-function findPlanPath() {
-  if (process.env.PAIRINGBUDDY_PLAN_PATH) {
-    return process.env.PAIRINGBUDDY_PLAN_PATH;
+function findPlanPath(cwd, env) {
+  if (env.PAIRINGBUDDY_PLAN_PATH) {
+    return env.PAIRINGBUDDY_PLAN_PATH;
   }
   try {
-    const planConfigPath = join(process.cwd(), ".pairingbuddy", "plan", "plan-config.json");
-    const planConfig = JSON.parse(readFileSync(planConfigPath, "utf8"));
+    const planConfigPath = join(cwd, ".pairingbuddy", "plan", "plan-config.json");
+    const planConfig = JSON.parse(trackIo(() => readFileSync(planConfigPath, "utf8")));
     if (planConfig.output_path) {
-      return resolve(process.cwd(), planConfig.output_path);
+      return resolve(cwd, planConfig.output_path);
     }
   } catch (err) {
     if (err.code !== "ENOENT") throw err;
@@ -44,55 +36,9 @@ function findPlanPath() {
 
 const BAR_WIDTH = 30;
 
-function stripMarkdown(text) {
-  return text.replace(/[*`]/g, "");
-}
-
-function readPlanTasks(planPath) {
-  try {
-    const content = readFileSync(planPath, "utf8");
-    const lines = content.split("\n");
-    const tasks = [];
-    for (const line of lines) {
-      const checkedMatch = line.match(/^\s*- \[x\] (.+)/);
-      if (checkedMatch) {
-        tasks.push({ text: stripMarkdown(checkedMatch[1].trim()), checked: true });
-        continue;
-      }
-      const uncheckedMatch = line.match(/^\s*- \[ \] (.+)/);
-      if (uncheckedMatch) {
-        tasks.push({ text: stripMarkdown(uncheckedMatch[1].trim()), checked: false });
-      }
-    }
-    return tasks;
-  } catch (err) {
-    if (err.code === "ENOENT") return null;
-    throw err;
-  }
-}
-
-function countCheckboxes(planPath) {
-  try {
-    const content = readFileSync(planPath, "utf8");
-    const lines = content.split("\n");
-    const { completed, incomplete } = lines.reduce(
-      (acc, l) => {
-        if (/^\s*- \[x\]/.test(l)) acc.completed++;
-        else if (/^\s*- \[ \]/.test(l)) acc.incomplete++;
-        return acc;
-      },
-      { completed: 0, incomplete: 0 }
-    );
-    return { completed, total: completed + incomplete };
-  } catch (err) {
-    if (err.code === "ENOENT") return null;
-    throw err;
-  }
-}
-
 function readFirstTestFile(filePath, arrayKey) {
   try {
-    const data = JSON.parse(readFileSync(filePath, "utf8"));
+    const data = JSON.parse(trackIo(() => readFileSync(filePath, "utf8")));
     if (data[arrayKey] && data[arrayKey].length > 0 && data[arrayKey][0].test_file) {
       return data[arrayKey][0].test_file;
     }
@@ -102,8 +48,8 @@ function readFirstTestFile(filePath, arrayKey) {
   return null;
 }
 
-function findCurrentFile() {
-  const pairingbuddyDir = join(process.cwd(), ".pairingbuddy");
+function findCurrentFile(cwd) {
+  const pairingbuddyDir = join(cwd, ".pairingbuddy");
 
   // Try current-batch.json first
   const fromBatch = readFirstTestFile(join(pairingbuddyDir, "current-batch.json"), "batch");
@@ -116,17 +62,21 @@ function findCurrentFile() {
   return null;
 }
 
-const useColor = process.env.FORCE_COLOR === "1" || process.env.FORCE_COLOR === "true";
-
-const GREEN = useColor ? "\x1b[32m" : "";
-const DARK_GRAY = useColor ? "\x1b[90m" : "";
-const CYAN = useColor ? "\x1b[36m" : "";
-const BOLD_WHITE = useColor ? "\x1b[1;37m" : "";
-const BOLD = useColor ? "\x1b[1m" : "";
-const RESET = useColor ? "\x1b[0m" : "";
-const DIM = useColor ? "\x1b[2m" : "";
+function ansiPalette(env) {
+  const useColor = env.FORCE_COLOR === "1" || env.FORCE_COLOR === "true";
+  const code = (seq) => (useColor ? seq : "");
+  return {
+    GREEN: code("\x1b[32m"),
+    DARK_GRAY: code("\x1b[90m"),
+    CYAN: code("\x1b[36m"),
+    BOLD_WHITE: code("\x1b[1;37m"),
+    BOLD: code("\x1b[1m"),
+    RESET: code("\x1b[0m"),
+    DIM: code("\x1b[2m"),
+  };
+}
 
-function formatTaskList(planTasks) {
+function formatTaskList(planTasks, { GREEN, CYAN, BOLD_WHITE, RESET, DIM }) {
   let foundCurrent = false;
   return planTasks.map((task) => {
     if (task.checked) {
@@ -140,7 +90,8 @@ function formatTaskList(planTasks) {
   }).join("\n");
 }
 
-function formatStatus(counts, agentName, currentFile, taskDescription, planTasks) {
+function formatStatus(counts, agentName, currentFile, taskDescription, planTasks, palette) {
+  const { DARK_GRAY, CYAN, BOLD, RESET, DIM } = palette;
   // Intentionally different formats by design: when progress is known the status
   // file shows a rich multi-line display (task list + progress bar + agent line),
   // while the unknown-progress case uses a compact single-line fallback.
@@ -151,7 +102,7 @@ function formatStatus(counts, agentName, currentFile, taskDescription, planTasks
     const filledBar = `${CYAN}${"\u2588".repeat(filled)}${RESET}`;
     const emptyBar = `${DARK_GRAY}${"\u2591".repeat(empty)}${RESET}`;
     const percentagePart = `${percentage > 0 ? BOLD : ""}${percentage}%${percentage > 0 ? RESET : ""}`;
-    const taskListPart = (planTasks && planTasks.length > 0) ? formatTaskList(planTasks) + "\n\n" : "";
+    const taskListPart = (planTasks && planTasks.length > 0) ? formatTaskList(planTasks, palette) + "\n\n" : "";
     const descriptionLine = taskDescription ? `\n${DIM}  ${taskDescription}${RESET}` : "";
     return `${taskListPart}[${counts.completed}/${counts.total}] ${filledBar}${emptyBar} ${percentagePart}\nAgent: ${DIM}${agentName}${RESET}${descriptionLine}\n`;
   }
@@ -159,40 +110,117 @@ function formatStatus(counts, agentName, currentFile, taskDescription, planTasks
   return `[?/?] Agent: ${CYAN}${agentName}${RESET}${descriptionLine}\n`;
 }
 
-function writeStatusFile(counts, agentName, currentFile, taskDescription, planTasks) {
-  const pairingbuddyDir = join(process.cwd(), ".pairingbuddy");
+function writeStatusFile(cwd, palette, counts, agentName, currentFile, taskDescription, planTasks) {
+  const pairingbuddyDir = join(cwd, ".pairingbuddy");
   if (!existsSync(pairingbuddyDir)) return;
-  const statusContent = formatStatus(counts, agentName, currentFile, taskDescription, planTasks);
+  const statusContent = formatStatus(counts, agentName, currentFile, taskDescription, planTasks, palette);
   const statusPath = join(pairingbuddyDir, "solo-status");
-  writeFileSync(statusPath, statusContent);
+  writeText(statusPath, statusContent);
 }
 
-function appendProgressLog(counts, agentName, currentFile, taskDescription) {
-  const pairingbuddyDir = join(process.cwd(), ".pairingbuddy");
+// Appends one event per solo Agent call to .pairingbuddy/events/solo-events.ndjson
+// (see lib/event-log.mjs).
+function appendProgressEvent(ctx, counts, currentFile) {
+  const pairingbuddyDir = join(ctx.cwd, ".pairingbuddy");
   if (!existsSync(pairingbuddyDir)) return;
-  const timestamp = new Date().toISOString();
-  const progressTag = counts ? `[${counts.completed}/${counts.total}]` : '[?/?]';
-  const taskPart = taskDescription ? ` ${taskDescription}` : "";
-  const filePart = currentFile ? ` ${currentFile}` : "";
-  const logLine = `${timestamp} ${progressTag} ${agentName}${taskPart}${filePart}\n`;
-  const logPath = join(pairingbuddyDir, "solo-progress.log");
-  appendFileSync(logPath, logLine);
+  const event = {
+    ts: new Date().toISOString(),
+    session: ctx.sessionId,
+    tool: ctx.toolName,
+    agent: ctx.agentName || "unknown",
+    description: ctx.description,
+    plan: counts,
+    file: currentFile,
+    latency_ms: Math.round((performance.now() - ctx.startedAt) * 100) / 100,
+  };
+  appendEvent(pairingbuddyDir, event, eventLogSettings(ctx.env));
 }
 
-const planPath = findPlanPath();
-const counts = planPath ? countCheckboxes(planPath) : null;
-const currentFile = findCurrentFile();
-const planTasks = planPath ? readPlanTasks(planPath) : null;
-
-writeStatusFile(counts, agentName, currentFile, taskDescription, planTasks);
-appendProgressLog(counts, agentName, currentFile, taskDescription);
-
-} catch (err) {
-  const pairingbuddyDir = join(process.cwd(), ".pairingbuddy");
+export function logSoloProgressError(cwd, err) {
+  const pairingbuddyDir = join(cwd, ".pairingbuddy");
   if (existsSync(pairingbuddyDir)) {
     const timestamp = new Date().toISOString();
     const errorLogPath = join(pairingbuddyDir, "solo-progress-errors.log");
     appendFileSync(errorLogPath, `${timestamp} ${err.message}\n`);
   }
-  process.exit(0);
+}
+
+// Plan index for the current plan, or null when no plan is available.
+function soloPlanIndex(ctx) {
+  return memoize(ctx, "solo-plan-index", () => {
+    const planPath = findPlanPath(ctx.cwd, ctx.env);
+    return planPath ? loadPlanIndex(ctx.cwd, planPath) : null;
+  });
+}
+
+// Plan progress and current test file, computed once and shared by both solo handlers.
+function soloSnapshot(ctx) {
+  return memoize(ctx, "solo-snapshot", () => {
+    const index = soloPlanIndex(ctx);
+    return {
+      counts: index ? { completed: index.completed, total: index.total } : null,
+      currentFile: findCurrentFile(ctx.cwd),
+      planTasks: index ? index.tasks : null,
+    };
+  });
+}
+
+function isSoloAgentCall(ctx) {
+  return isSoloModeEnabled(ctx.env) && ctx.toolName === "Agent";
+}
+
+function onSoloError(ctx, err) {
+  // Both handlers share soloSnapshot, so the same error may arrive twice
+  if (ctx.memo.get("solo-error") === err) return;
+  ctx.memo.set("solo-error", err);
+  logSoloProgressError(ctx.cwd, err);
+}
+
+// Keeps .pairingbuddy/cache/plan-index.json current on every tool call, so the
+// solo-buddy.sh renderer picks up checkbox edits without parsing the plan.
+export const planIndex = {
+  name: "plan-index",
+  run(ctx) {
+    if (!isSoloModeEnabled(ctx.env)) return;
+    soloPlanIndex(ctx);
+  },
+  onError: onSoloError,
+};
+
+export const soloStatus = {
+  name: "solo-status",
+  run(ctx) {
+    if (!isSoloAgentCall(ctx)) return;
+    const { counts, currentFile, planTasks } = soloSnapshot(ctx);
+    const agentName = ctx.agentName || "unknown";
+    writeStatusFile(ctx.cwd, ansiPalette(ctx.env), counts, agentName, currentFile, ctx.description, planTasks);
+  },
+  onError: onSoloError,
+};
+
+export const progressLog = {
+  name: "progress-log",
+  run(ctx) {
+    if (!isSoloAgentCall(ctx)) return;
+    const { counts, currentFile } = soloSnapshot(ctx);
+    appendProgressEvent(ctx, counts, currentFile);
+  },
+  onError: onSoloError,
+};
+
+const isMain = process.argv[1] && resolve(process.argv[1]) === fileURLToPath(import.meta.url);
+
+if (isMain && isSoloModeEnabled(process.env)) {
+  const timing = startTiming(0);
+  const raw = readFileSync("/dev/stdin");
+  let input;
+  try {
+    input = timeParse(timing, () => extractFields(raw));
+  } catch (err) {
+    logSoloProgressError(process.cwd(), err);
+    process.exit(0);
+  }
+  const ctx = createContext(input, { cwd: process.cwd(), env: process.env, startedAt: 0 });
+  dispatch(ctx, [planIndex, soloStatus, progressLog]);
+  recordTiming(ctx.cwd, ctx.env, "solo-progress", timing);
 }
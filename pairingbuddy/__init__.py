@@ -0,0 +1,8 @@
+"""Pairing Buddy runtime helpers.
+
+Deterministic pieces of the workflow that agents and the orchestrator call
+instead of doing the work in model context. Standard library only, so the
+plugin can run them with any Python 3.11+ without installing anything.
+"""
+
+__version__ = "0.1.0"
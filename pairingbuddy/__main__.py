@@ -0,0 +1,5 @@
+import sys
+
+from pairingbuddy.cli import main
+
+sys.exit(main())
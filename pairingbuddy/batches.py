@@ -0,0 +1,137 @@
+"""Planning the RED-GREEN batches of a task.
+
+Tests from tests.json are grouped by runner, test file and scenario, in the
+order they first appear, and each group is split into batches of at most
+max_size tests. Each batch is written out as current-batch.json, so one
+implement-tests and one implement-code run cover every test in it, and
+their test-config, guidance and skills are read once per batch, not once
+per test.
+
+Tests in one batch share a file and a scenario, so writing them together
+costs little extra context. A batch never spans two files or scenarios: a
+small scenario gets a small batch rather than being mixed with unrelated tests.
+
+For parallel RED-GREEN (test-config "worktrees" > 1), batches are further
+joined into independent groups: batches that share a test file, or whose test
+files import the same project module, end up in the same group. Each group
+can then be implemented in its own git worktree (see worktrees.py). Imports
+are read from the test impact index, one level deep: the modules a test
+imports are the ones its GREEN step is likely to edit. Package __init__.py
+files are left out, since nearly every test imports them; an edit the
+planner did not foresee shows up as a merge conflict instead.
+"""
+
+import json
+import os
+from pathlib import Path, PurePosixPath
+
+from pairingbuddy.runner import dependencies, load_test_config, update_index
+
+DEFAULT_BATCH_SIZE = 5
+
+
+class BatchError(Exception):
+    """tests.json or scenarios.json is missing or malformed."""
+
+
+def batch_size(env: dict) -> int:
+    """Largest batch from PAIRINGBUDDY_BATCH_SIZE; 1 restores one test per batch."""
+    try:
+        size = int(env.get("PAIRINGBUDDY_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return DEFAULT_BATCH_SIZE
+    return size if size > 0 else DEFAULT_BATCH_SIZE
+
+
+def _read(path: Path, key: str) -> list[dict]:
+    try:
+        return json.loads(path.read_text())[key]
+    except FileNotFoundError:
+        raise BatchError(f"{path} not found") from None
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise BatchError(f"{path} is not valid: {e}") from None
+
+
+def plan_batches(tests: list[dict], descriptions: dict[str, str], max_size: int) -> list[dict]:
+    """current-batch.json documents covering tests, in order."""
+    groups: dict[tuple[str, str, str], list[dict]] = {}
+    for test in tests:
+        key = (test["runner_id"], test["test_file"], test["scenario_id"])
+        groups.setdefault(key, []).append(
+            {
+                "test_id": test["test_id"],
+                "test_case_id": test["test_case_id"],
+                "scenario_id": test["scenario_id"],
+                "runner_id": test["runner_id"],
+                "test_case_description": descriptions.get(test["test_case_id"], ""),
+                "test_file": test["test_file"],
+                "test_function": test["test_function"],
+            }
+        )
+    return [
+        {"batch": group[start : start + max_size]}
+        for group in groups.values()
+        for start in range(0, len(group), max_size)
+    ]
+
+
+def load_batches(state_dir: Path, skip: set[str], max_size: int | None = None) -> list[dict]:
+    """Batches of the tests in tests.json, except the test ids in skip."""
+    tests = [t for t in _read(state_dir / "tests.json", "tests") if t["test_id"] not in skip]
+    descriptions = {
+        case["test_case_id"]: case["description"]
+        for scenario in _read(state_dir / "scenarios.json", "scenarios")
+        for case in scenario["test_cases"]
+    }
+    return plan_batches(tests, descriptions, max_size or batch_size(dict(os.environ)))
+
+
+def _touches(batch: dict, graph: dict) -> set[str]:
+    """Files a batch is expected to edit: its test files and the modules they import."""
+    touched = set()
+    for test in batch["batch"]:
+        touched.add(test["test_file"])
+        touched.update(graph.get(test["test_file"], ()))
+    return {path for path in touched if PurePosixPath(path).name != "__init__.py"}
+
+
+def plan_groups(batches: list[dict], graph: dict) -> list[dict]:
+    """Batches joined into groups that touch disjoint files, in first-seen order."""
+    touched = [_touches(batch, graph) for batch in batches]
+    parent = list(range(len(batches)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: dict[str, int] = {}
+    for i, paths in enumerate(touched):
+        for path in paths:
+            if path in owner:
+                parent[find(i)] = find(owner[path])
+            else:
+                owner[path] = i
+    members: dict[int, list[int]] = {}
+    for i in range(len(batches)):
+        members.setdefault(find(i), []).append(i)
+    ordered = sorted(members.values(), key=lambda group: group[0])
+    return [
+        {
+            "group_id": f"g{number}",
+            "batches": [batches[i] for i in group],
+            "files": sorted(set().union(*(touched[i] for i in group))),
+        }
+        for number, group in enumerate(ordered, start=1)
+    ]
+
+
+def load_groups(
+    root: Path, state_dir: Path, skip: set[str], max_size: int | None = None
+) -> list[dict]:
+    """Independent groups of the batches load_batches plans."""
+    config = load_test_config(state_dir / "test-config.json")
+    files = update_index(root, config, state_dir)
+    graph = dependencies(files, config.source_directory, [r.test_directory for r in config.runners])
+    return plan_groups(load_batches(state_dir, skip, max_size), graph)
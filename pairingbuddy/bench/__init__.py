@@ -0,0 +1 @@
+"""Micro-benchmarks for pairingbuddy (not run by the tests)."""
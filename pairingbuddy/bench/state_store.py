@@ -0,0 +1,96 @@
+"""Compares per-test update latency of the file and SQLite state stores.
+
+Builds a test-state.json of N tests (a 2,000-test feature by default) and
+marks UPDATES of them passing, one test per update, as implement-tests
+results arrive:
+- file: FileStore.update_item, which rewrites the whole file each time;
+- sqlite: SqliteStore.update_item, one row per transaction, with a single
+  export before the next agent step (timed separately);
+- sqlite+export: SqliteStore.update_item followed by export every time.
+
+Usage: python -m pairingbuddy.bench.state_store [tests ...]   (default: 2000)
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pairingbuddy.runner import write_json
+from pairingbuddy.store import FileStore, SqliteStore
+
+UPDATES = 200
+NAME = "test-state.json"
+
+
+def _results(count: int) -> dict:
+    return {
+        "results": [
+            {
+                "test_id": f"t{n}",
+                "test_file": f"tests/test_feature_{n // 50}.py",
+                "test_function": f"test_behaviour_{n}",
+                "test_case_id": f"tc{n}",
+                "status": "failing_correctly",
+                "failure_type": "AssertionError",
+                "failure_message": f"expected feature {n} to be implemented",
+            }
+            for n in range(count)
+        ]
+    }
+
+
+def _measure(store, ids: list[str], export_each: bool) -> list[float]:
+    times = []
+    for test_id in ids:
+        start = time.perf_counter()
+        store.update_item(NAME, test_id, {"status": "passing"})
+        if export_each:
+            store.export()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def _row(label: str, count: int, times: list[float], extra_ms: float = 0.0) -> tuple:
+    p95 = statistics.quantiles(times, n=20)[-1]
+    return label, count, statistics.median(times), p95, sum(times) + extra_ms
+
+
+def run(count: int) -> list[tuple]:
+    ids = [f"t{n}" for n in random.Random(count).sample(range(count), min(UPDATES, count))]
+    rows, outputs = [], {}
+    for label in ("file", "sqlite", "sqlite+export"):
+        with tempfile.TemporaryDirectory() as tmp:
+            state = Path(tmp)
+            write_json(state / NAME, _results(count))
+            store = FileStore(state) if label == "file" else SqliteStore(state)
+            extra = 0.0
+            if label != "file":
+                start = time.perf_counter()
+                store.read(NAME)
+                extra = (time.perf_counter() - start) * 1000
+            times = _measure(store, ids, export_each=label == "sqlite+export")
+            start = time.perf_counter()
+            store.export()
+            extra += (time.perf_counter() - start) * 1000
+            store.close()
+            outputs[label] = (state / NAME).read_bytes()
+            rows.append(_row(label, count, times, extra))
+    if len(set(outputs.values())) != 1:
+        raise SystemExit("benchmark sanity check failed: exported files differ")
+    return rows
+
+
+def main(argv: list[str]) -> None:
+    counts = [int(arg) for arg in argv] or [2000]
+    print(f"{'store':<14} {'tests':>6} {'median ms':>10} {'p95 ms':>8} {'total ms':>9}")
+    for count in counts:
+        for label, tests, median, p95, total in run(count):
+            print(f"{label:<14} {tests:>6} {median:>10.3f} {p95:>8.3f} {total:>9.1f}")
+    print(f"({UPDATES} updates per store; sqlite total includes the import and final export)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
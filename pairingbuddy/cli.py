@@ -0,0 +1,602 @@
+"""Command line entry point: `python -m pairingbuddy <command>`.
+
+Commands print a short summary on stdout and write their full result to a
+.pairingbuddy/ state file. Exit codes: 0 success, 1 the result is a failure
+(e.g. failing tests), 2 the command could not run.
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+from pairingbuddy.batches import BatchError, load_batches, load_groups
+from pairingbuddy.history import HistoryError, list_generations, load_generation, lookup
+from pairingbuddy.plan import PlanError, mark_task_complete, next_unchecked_task, read_plan_tasks
+from pairingbuddy.review import mark_reviewed, record_changes, review_scope
+from pairingbuddy.runner import (
+    ConfigError,
+    TestCache,
+    affected_tests,
+    aggregate,
+    cache_limits,
+    changed_files,
+    load_durations,
+    load_test_config,
+    record_durations,
+    run_runners,
+    run_targeted,
+    stop_daemon,
+    targeted_command,
+    update_index,
+    write_json,
+)
+from pairingbuddy.state import (
+    StateError,
+    cleanup_state_files,
+    filter_pending,
+    mark_unit_answered,
+)
+from pairingbuddy.store import StoreError, open_store
+from pairingbuddy.workflow import (
+    WorkflowError,
+    complete_step,
+    next_steps,
+    reset_workflow,
+    resume_run,
+)
+from pairingbuddy.worktrees import WorktreeError, create_worktree, merge_worktree
+
+STATE_DIR = ".pairingbuddy"
+LAUNCHER = Path(__file__).resolve().parent.parent / "scripts" / "pairingbuddy"
+
+
+def run_tests(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    state = project / STATE_DIR
+    try:
+        config = load_test_config(state / "test-config.json")
+    except ConfigError as e:
+        print(f"run-tests: {e}", file=sys.stderr)
+        return 2
+    runners = config.runners
+    if args.runner:
+        unknown = sorted(set(args.runner) - {runner.runner_id for runner in runners})
+        if unknown:
+            print(f"run-tests: unknown runner {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        runners = [runner for runner in runners if runner.runner_id in args.runner]
+    unsupported = [runner.runner_id for runner in runners if runner.report is None]
+    if unsupported:
+        print(
+            f"run-tests: no reporter known for runner {', '.join(unsupported)}; "
+            'add a "report" entry to test-config.json',
+            file=sys.stderr,
+        )
+        return 2
+
+    # The cache is refreshed even when bypassed, so a --no-cache gate seeds it
+    files = update_index(project, config, state)
+    cache = TestCache(state, project, config, files, dict(os.environ))
+    results = run_runners(
+        runners,
+        project,
+        parallel=config.parallel,
+        capacity=args.jobs,
+        durations=load_durations(state),
+        cache=None if args.no_cache else cache,
+    )
+    summary = aggregate(results, project)
+    write_json(state / "all-tests-results.json", summary)
+    record_durations(state, results, project)
+    cache.store(results)
+    cache.evict(*cache_limits(os.environ))
+    print(
+        f"{summary['passed']} passed, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped ({summary['cached']} cached): {summary['status']}"
+    )
+    return 0 if summary["status"] == "pass" else 1
+
+
+def affected(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    state = project / STATE_DIR
+    try:
+        config = load_test_config(state / "test-config.json")
+    except ConfigError as e:
+        print(f"affected-tests: {e}", file=sys.stderr)
+        return 2
+    if args.changed is None:
+        try:
+            changed = changed_files(project)
+        except (OSError, subprocess.CalledProcessError):
+            print("affected-tests: not a git repository; pass --changed", file=sys.stderr)
+            return 2
+    else:
+        changed = args.changed
+
+    files = update_index(project, config, state)
+    selected = affected_tests(project, config, files, changed)
+    runners = {}
+    for runner in config.runners:
+        tests = selected.get(runner.runner_id)
+        if tests:
+            if runner.daemon is None:
+                command = targeted_command(runner, tests)
+            else:
+                command = " ".join(
+                    shlex.quote(arg)
+                    for arg in [str(LAUNCHER), "run-targeted", "--runner", runner.runner_id, *tests]
+                )
+            runners[runner.runner_id] = {"tests": tests, "command": command}
+    print(json.dumps({"changed": changed, "runners": runners}, indent=2))
+    return 0
+
+
+def targeted(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    state = project / STATE_DIR
+    try:
+        config = load_test_config(state / "test-config.json")
+        runner = config.runner(args.runner)
+    except ConfigError as e:
+        print(f"run-targeted: {e}", file=sys.stderr)
+        return 2
+    if args.cold:
+        runner = dataclasses.replace(runner, daemon=None)
+    run = run_targeted(project, state, runner, args.targets)
+    sys.stdout.write(run.output)
+    if runner.daemon is not None and not run.warm:
+        print(f"run-targeted: {runner.runner_id} daemon unavailable, ran cold", file=sys.stderr)
+    return run.returncode
+
+
+def stop_daemons(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    try:
+        config = load_test_config(project / STATE_DIR / "test-config.json")
+    except ConfigError as e:
+        print(f"stop-daemons: {e}", file=sys.stderr)
+        return 2
+    stopped = [r.runner_id for r in config.runners if r.daemon and stop_daemon(project, r)]
+    print(f"{len(stopped)} daemons stopped")
+    return 0
+
+
+def batches(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    state = project / STATE_DIR
+    if args.max_size is not None and args.max_size < 1:
+        print("plan-batches: --max-size must be a positive integer", file=sys.stderr)
+        return 2
+    try:
+        if args.groups:
+            planned = {"groups": load_groups(project, state, set(args.skip), args.max_size)}
+        else:
+            planned = {"batches": load_batches(state, set(args.skip), args.max_size)}
+    except (BatchError, ConfigError) as e:
+        print(f"plan-batches: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(planned, indent=2))
+    return 0
+
+
+def new_worktree(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    try:
+        path = create_worktree(project, project / STATE_DIR, args.group)
+    except WorktreeError as e:
+        print(f"create-worktree: {e}", file=sys.stderr)
+        return 2
+    print(path)
+    return 0
+
+
+def merge(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    try:
+        conflicts = merge_worktree(project, project / STATE_DIR, args.group)
+    except WorktreeError as e:
+        print(f"merge-worktree: {e}", file=sys.stderr)
+        return 2
+    if conflicts:
+        print(f"{args.group}: conflicts in {', '.join(conflicts)}; nothing merged")
+        return 1
+    print(f"{args.group}: merged")
+    return 0
+
+
+def changes(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    entries = record_changes(project, project / STATE_DIR)
+    print(f"{len(entries)} files changed in this task")
+    return 0
+
+
+def scope(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    state = project / STATE_DIR
+    skip = set()
+    if args.skip_batch:
+        try:
+            batch = json.loads((state / "current-batch.json").read_text())["batch"]
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            print(f"review-scope: cannot read current-batch.json: {e}", file=sys.stderr)
+            return 2
+        skip = {test["test_file"] for test in batch}
+    doc = review_scope(project, state, skip, args.full)
+    print(f"{len(doc['test_files'])} test files, {len(doc['code_files'])} code files to review")
+    return 0
+
+
+def reviewed(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    print(f"{mark_reviewed(project, project / STATE_DIR)} files marked reviewed")
+    return 0
+
+
+def workflow_next(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    try:
+        if args.resume:
+            result = resume_run(project, project / STATE_DIR)
+        else:
+            result = next_steps(project, project / STATE_DIR)
+    except WorkflowError as e:
+        print(f"workflow-next: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(result, indent=2))
+    return 1 if result["status"] == "stopped" else 0
+
+
+def workflow_done(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    try:
+        result = json.loads(args.result) if args.result is not None else None
+    except json.JSONDecodeError as e:
+        print(f"workflow-done: --result is not JSON: {e}", file=sys.stderr)
+        return 2
+    try:
+        entry = complete_step(project / STATE_DIR, args.step, result)
+    except WorkflowError as e:
+        print(f"workflow-done: {e}", file=sys.stderr)
+        return 2
+    print(f"step {args.step} ({entry['call']}) done")
+    return 0
+
+
+def workflow_reset(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    reset_workflow(project / STATE_DIR)
+    print("workflow reset")
+    return 0
+
+
+def plan_tasks(args: argparse.Namespace) -> int:
+    plan = Path(args.project).resolve() / args.plan
+    try:
+        tasks = read_plan_tasks(plan)
+    except PlanError as e:
+        print(f"plan-tasks: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(next_unchecked_task(tasks) if args.next else tasks, indent=2))
+    return 0
+
+
+def task_complete(args: argparse.Namespace) -> int:
+    plan = Path(args.project).resolve() / args.plan
+    try:
+        changed = mark_task_complete(plan, args.index)
+    except PlanError as e:
+        print(f"mark-task-complete: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps({"index": args.index, "changed": changed}))
+    return 0
+
+
+def pending(args: argparse.Namespace) -> int:
+    path = Path(args.project).resolve() / STATE_DIR / f"{args.file}.json"
+    try:
+        doc = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"filter-pending: cannot read {path.name}: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(filter_pending(doc, set(args.skip)), indent=2))
+    return 0
+
+
+def unit_answered(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    try:
+        unit = mark_unit_answered(project / STATE_DIR, args.unit)
+    except StateError as e:
+        print(f"mark-unit-answered: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(unit))
+    return 0
+
+
+def cleanup(args: argparse.Namespace) -> int:
+    project = Path(args.project).resolve()
+    print(json.dumps(cleanup_state_files(project / STATE_DIR)))
+    return 0
+
+
+def _changes(assignments: list[str]) -> dict:
+    changes = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition("=")
+        if not sep or not key:
+            raise StoreError(f"--set takes KEY=VALUE, got {assignment!r}")
+        try:
+            changes[key] = json.loads(value)
+        except json.JSONDecodeError:
+            changes[key] = value
+    return changes
+
+
+def state_update(args: argparse.Namespace) -> int:
+    state = Path(args.project).resolve() / STATE_DIR
+    try:
+        changes = _changes(args.set)
+        store = open_store(state, os.environ)
+        try:
+            entry = store.update_item(args.file, args.item, changes)
+            if not args.defer_export:
+                store.export()
+        finally:
+            store.close()
+    except StoreError as e:
+        print(f"state-update: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(entry))
+    return 0
+
+
+def state_export(args: argparse.Namespace) -> int:
+    state = Path(args.project).resolve() / STATE_DIR
+    try:
+        store = open_store(state, os.environ)
+        try:
+            exported = store.export()
+        finally:
+            store.close()
+    except StoreError as e:
+        print(f"state-export: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps({"exported": exported}))
+    return 0
+
+
+def history(args: argparse.Namespace) -> int:
+    state = Path(args.project).resolve() / STATE_DIR
+    try:
+        if args.task:
+            result = load_generation(state, args.task)
+            if args.file:
+                if args.file not in result:
+                    print(f"history: {args.task} has no {args.file}", file=sys.stderr)
+                    return 2
+                result = result[args.file]
+        elif args.file:
+            result = lookup(state, args.file, args.search)
+        else:
+            result = list_generations(state, args.search)
+    except HistoryError as e:
+        print(f"history: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pairingbuddy")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    tests = commands.add_parser(
+        "run-tests", help="run every runner in test-config.json, write all-tests-results.json"
+    )
+    tests.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    tests.add_argument("--runner", action="append", help="run only this runner id (repeatable)")
+    tests.add_argument(
+        "--jobs",
+        type=int,
+        help="CPU slots shared by parallel runners and shards (default: CPUs available)",
+    )
+    tests.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="run every test, ignoring cached results (final gate)",
+    )
+    tests.set_defaults(handler=run_tests)
+
+    impact = commands.add_parser(
+        "affected-tests", help="print the test files affected by changed files, per runner"
+    )
+    impact.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    impact.add_argument(
+        "--changed", nargs="*", help="changed files relative to the project (default: git status)"
+    )
+    impact.set_defaults(handler=affected)
+
+    warm = commands.add_parser(
+        "run-targeted",
+        help="run some tests of one runner, through its daemon when it has one; "
+        "exits with the runner's exit code",
+    )
+    warm.add_argument("targets", nargs="+", help="test files or node ids")
+    warm.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    warm.add_argument("--runner", help="runner id (default: default_runner)")
+    warm.add_argument(
+        "--cold", action="store_true", help="use the runner's command, not its daemon"
+    )
+    warm.set_defaults(handler=targeted)
+
+    stop = commands.add_parser("stop-daemons", help="stop the warm daemons of test-config.json")
+    stop.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    stop.set_defaults(handler=stop_daemons)
+
+    plan = commands.add_parser(
+        "plan-batches", help="print the pending tests of tests.json as current-batch documents"
+    )
+    plan.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    plan.add_argument(
+        "--skip", nargs="*", default=[], help="test ids already processed in this session"
+    )
+    plan.add_argument(
+        "--max-size",
+        type=int,
+        help="most tests per batch (default: PAIRINGBUDDY_BATCH_SIZE, or 5)",
+    )
+    plan.add_argument(
+        "--groups",
+        action="store_true",
+        help="join batches into groups touching disjoint files, for parallel worktrees",
+    )
+    plan.set_defaults(handler=batches)
+
+    create = commands.add_parser(
+        "create-worktree", help="check out the project tree in a git worktree for a group"
+    )
+    create.add_argument("group", help="group id from plan-batches --groups")
+    create.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    create.set_defaults(handler=new_worktree)
+
+    merged = commands.add_parser(
+        "merge-worktree", help="apply a group's worktree changes to the project tree"
+    )
+    merged.add_argument("group", help="group id from plan-batches --groups")
+    merged.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    merged.set_defaults(handler=merge)
+
+    record = commands.add_parser(
+        "record-changes", help="add the files in code-state.json to files-changed.json"
+    )
+    record.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    record.set_defaults(handler=changes)
+
+    review = commands.add_parser(
+        "review-scope", help="write review-scope.json: changed files not reviewed since"
+    )
+    review.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    review.add_argument(
+        "--full", action="store_true", help="every test file and changed file (final sweep)"
+    )
+    review.add_argument(
+        "--skip-batch",
+        action="store_true",
+        help="leave out the test files of current-batch.json (being written during the review)",
+    )
+    review.set_defaults(handler=scope)
+
+    mark = commands.add_parser(
+        "mark-reviewed", help="record the files in review-scope.json as reviewed"
+    )
+    mark.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    mark.set_defaults(handler=reviewed)
+
+    step = commands.add_parser(
+        "workflow-next", help="print the next workflow steps to carry out (JSON)"
+    )
+    step.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    step.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run, redoing steps whose state files changed since",
+    )
+    step.set_defaults(handler=workflow_next)
+
+    done = commands.add_parser("workflow-done", help="record a workflow step as done")
+    done.add_argument("step", help="step id from workflow-next")
+    done.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    done.add_argument("--result", help="JSON return value of an orchestrator function (e.g. true)")
+    done.set_defaults(handler=workflow_done)
+
+    reset = commands.add_parser("workflow-reset", help="forget the workflow run in progress")
+    reset.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    reset.set_defaults(handler=workflow_reset)
+
+    tasks = commands.add_parser("plan-tasks", help="print the checkbox tasks of a plan MD (JSON)")
+    tasks.add_argument("plan", help="path of the plan MD")
+    tasks.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    tasks.add_argument(
+        "--next", action="store_true", help="print only the first unchecked task (or null)"
+    )
+    tasks.set_defaults(handler=plan_tasks)
+
+    check = commands.add_parser(
+        "mark-task-complete", help="check a task's box in the plan MD, in place"
+    )
+    check.add_argument("plan", help="path of the plan MD")
+    check.add_argument("index", type=int, help="1-based task index from plan-tasks")
+    check.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    check.set_defaults(handler=task_complete)
+
+    filtered = commands.add_parser(
+        "filter-pending", help="print the pending tests or spike units (JSON)"
+    )
+    filtered.add_argument("file", choices=["tests", "spike-questions"], help="state file to read")
+    filtered.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    filtered.add_argument(
+        "--skip", nargs="*", default=[], help="test ids already processed in this session"
+    )
+    filtered.set_defaults(handler=pending)
+
+    answered = commands.add_parser(
+        "mark-unit-answered", help="set a spike unit's status to answered"
+    )
+    answered.add_argument("unit", help="unit id in spike-questions.json")
+    answered.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    answered.set_defaults(handler=unit_answered)
+
+    clean = commands.add_parser(
+        "cleanup-state",
+        help="archive the per-task state files to .pairingbuddy/history/ and clear them",
+    )
+    clean.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    clean.set_defaults(handler=cleanup)
+
+    update = commands.add_parser(
+        "state-update", help="change fields of one entry of a state file, e.g. one test (JSON)"
+    )
+    update.add_argument("file", help="state file, e.g. test-state.json")
+    update.add_argument("item", help="entry id, e.g. a test_id")
+    update.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="field to set; VALUE is parsed as JSON, else taken as a string (repeatable)",
+    )
+    update.add_argument(
+        "--defer-export",
+        action="store_true",
+        help="sqlite backend: leave the JSON file to the next state-export or agent step",
+    )
+    update.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    update.set_defaults(handler=state_update)
+
+    export = commands.add_parser(
+        "state-export", help="write state changed in the SQLite store back to its JSON files"
+    )
+    export.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    export.set_defaults(handler=state_export)
+
+    past = commands.add_parser(
+        "history", help="look up the state of earlier tasks in .pairingbuddy/history/ (JSON)"
+    )
+    past.add_argument("--project", default=".", help="project root holding .pairingbuddy/")
+    past.add_argument("--task", help="task id of one generation (default: list them)")
+    past.add_argument("--file", help="state file to print, e.g. scenarios.json")
+    past.add_argument("--search", help="only tasks whose description has all these words")
+    past.set_defaults(handler=history)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,186 @@
+"""Generations of per-task state: .pairingbuddy/history/<task-id>/.
+
+Before a new task starts, cleanup_state_files archives the previous task's
+state files here instead of only deleting them, so its scenarios, tests and
+results can still be looked up. A generation is one directory:
+
+    history/20260105T100000Z-1a2b3c4d/
+      meta.json      {"task_id", "archived_at", "description", "files": {name: bytes}}
+      state.json.gz  {file name: file content}, gzip-compressed
+
+By the time cleanup runs, task.json already describes the next task, so it
+is not archived with the finished task's files. Instead start_task saves a
+copy of task.json when a task starts, history/.task.json, and archive
+bundles that copy as the finished task's task.json.
+
+The files are first renamed into a hidden staging directory,
+history/.<task-id>/, so the top level is clear after one rename per file and
+an interrupted archive leaves them there rather than losing them. They are
+then compressed into state.json.gz and the staging directory is renamed into
+place. Only the newest PAIRINGBUDDY_HISTORY_KEEP
+generations (default 20) are kept; 0 turns archiving off.
+"""
+
+import gzip
+import hashlib
+import json
+import shutil
+from datetime import UTC, datetime
+from pathlib import Path
+
+from pairingbuddy.runner import write_json
+
+HISTORY_DIR = "history"
+BUNDLE = "state.json.gz"
+META = "meta.json"
+# task.json of the task in progress, saved by start_task
+TASK_RECORD = ".task.json"
+DEFAULT_KEEP = 20
+
+
+class HistoryError(Exception):
+    """A generation does not exist or cannot be read."""
+
+
+def history_keep(env: dict) -> int:
+    """Generations to keep from PAIRINGBUDDY_HISTORY_KEEP; 0 turns archiving off."""
+    try:
+        keep = int(env.get("PAIRINGBUDDY_HISTORY_KEEP", DEFAULT_KEEP))
+    except ValueError:
+        return DEFAULT_KEEP
+    return max(keep, 0)
+
+
+def start_task(state_dir: Path) -> None:
+    """Saves task.json as the record of the task starting now; clears it without one."""
+    record = state_dir / HISTORY_DIR / TASK_RECORD
+    try:
+        task = (state_dir / "task.json").read_bytes()
+    except FileNotFoundError:
+        record.unlink(missing_ok=True)
+        return
+    record.parent.mkdir(parents=True, exist_ok=True)
+    tmp = record.with_name(record.name + ".tmp")
+    tmp.write_bytes(task)
+    tmp.replace(record)
+
+
+def _task_id(state_dir: Path, now: datetime) -> str:
+    try:
+        task = (state_dir / HISTORY_DIR / TASK_RECORD).read_bytes()
+    except OSError:
+        task = b""
+    base = f"{now:%Y%m%dT%H%M%SZ}-{hashlib.sha256(task).hexdigest()[:8]}"
+    task_id, n = base, 1
+    while (state_dir / HISTORY_DIR / task_id).exists():
+        n += 1
+        task_id = f"{base}-{n}"
+    return task_id
+
+
+def _description(text: str | None) -> str:
+    try:
+        return json.loads(text)["description"]
+    except (TypeError, json.JSONDecodeError, KeyError):
+        return ""
+
+
+def archive(state_dir: Path, paths: list[Path], keep: int) -> str | None:
+    """Moves paths into a new generation and prunes old ones; returns its task id.
+
+    paths are the finished task's files, without task.json: the task saved by
+    start_task goes in as task.json. None when there is nothing to archive.
+    """
+    if not paths:
+        return None
+    now = datetime.now(UTC)
+    task_id = _task_id(state_dir, now)
+    staging = state_dir / HISTORY_DIR / f".{task_id}"
+    staging.mkdir(parents=True)
+    for path in paths:
+        path.replace(staging / path.name)
+    names = [path.name for path in paths]
+    record = state_dir / HISTORY_DIR / TASK_RECORD
+    if record.exists():
+        record.replace(staging / "task.json")
+        names.append("task.json")
+    files = {name: (staging / name).read_text(errors="replace") for name in names}
+    bundle = json.dumps(files, sort_keys=True).encode()
+    (staging / BUNDLE).write_bytes(gzip.compress(bundle, mtime=0))
+    for name in names:
+        (staging / name).unlink()
+    meta = {
+        "task_id": task_id,
+        "archived_at": now.isoformat(timespec="microseconds"),
+        "description": _description(files.get("task.json")),
+        "files": {name: len(text.encode()) for name, text in sorted(files.items())},
+    }
+    write_json(staging / META, meta)
+    staging.rename(state_dir / HISTORY_DIR / task_id)
+    prune(state_dir, keep)
+    return task_id
+
+
+def prune(state_dir: Path, keep: int) -> list[str]:
+    """Deletes all but the newest keep generations; returns their task ids."""
+    removed = []
+    for meta in list_generations(state_dir)[keep:]:
+        shutil.rmtree(state_dir / HISTORY_DIR / meta["task_id"], ignore_errors=True)
+        removed.append(meta["task_id"])
+    return removed
+
+
+def list_generations(state_dir: Path, search: str | None = None) -> list[dict]:
+    """meta.json of each generation, newest first.
+
+    With search, only generations whose task description contains every word.
+    """
+    words = (search or "").lower().split()
+    generations = []
+    history = state_dir / HISTORY_DIR
+    for path in history.iterdir() if history.is_dir() else []:
+        if path.name.startswith("."):
+            continue
+        try:
+            meta = json.loads((path / META).read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if all(word in meta.get("description", "").lower() for word in words):
+            generations.append(meta)
+    return sorted(generations, key=lambda meta: meta.get("archived_at", ""), reverse=True)
+
+
+def load_generation(state_dir: Path, task_id: str) -> dict[str, object]:
+    """The state files of a generation, parsed, by file name."""
+    if task_id.startswith(".") or "/" in task_id:
+        raise HistoryError(f"no generation {task_id}")
+    path = state_dir / HISTORY_DIR / task_id / BUNDLE
+    try:
+        files = json.loads(gzip.decompress(path.read_bytes()))
+    except FileNotFoundError:
+        raise HistoryError(f"no generation {task_id}") from None
+    except (OSError, EOFError, json.JSONDecodeError) as e:
+        raise HistoryError(f"cannot read generation {task_id}: {e}") from None
+    docs = {}
+    for name, text in files.items():
+        try:
+            docs[name] = json.loads(text)
+        except json.JSONDecodeError:
+            docs[name] = text
+    return docs
+
+
+def lookup(state_dir: Path, file_name: str, search: str | None = None) -> list[dict]:
+    """A state file across generations, newest first: {task_id, description, document}."""
+    found = []
+    for meta in list_generations(state_dir, search):
+        if file_name in meta.get("files", {}):
+            docs = load_generation(state_dir, meta["task_id"])
+            found.append(
+                {
+                    "task_id": meta["task_id"],
+                    "description": meta.get("description", ""),
+                    "document": docs.get(file_name),
+                }
+            )
+    return found
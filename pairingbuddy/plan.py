@@ -0,0 +1,100 @@
+"""Plan MD tasks for plan execution mode.
+
+A plan (written by /pairingbuddy:plan) lists its tasks as checkboxes,
+`- [ ] **Task N: Title**`, under TB headings, each followed by an indented
+description. read_plan_tasks parses one with the same checkbox pattern and
+byte offsets as hooks/lib/plan-index.mjs. mark_task_complete flips a single
+byte at the checkbox offset instead of rewriting the plan, after checking the
+byte is still an unchecked box.
+"""
+
+import re
+from pathlib import Path
+
+_TASK = re.compile(rb"^([ \t]*)- \[([ x])\] (.*?)\r?$")
+_HEADING = re.compile(rb"^(#{1,6}) ")
+_MARKUP = re.compile(r"[*`]")
+
+
+class PlanError(Exception):
+    """The plan or the task in it cannot be read or updated."""
+
+
+def _text(line: bytes) -> str:
+    return line.decode(errors="replace").rstrip()
+
+
+def read_plan_tasks(path: Path) -> list[dict]:
+    """Checkbox tasks of a plan, in order.
+
+    Each task has its 1-based index, line, checkbox byte offset, checked
+    state, title, description (title plus indented body) and context (the
+    headings it sits under, with their introductory text).
+    """
+    try:
+        content = path.read_bytes()
+    except OSError as e:
+        raise PlanError(f"cannot read {path}: {e}") from None
+    tasks: list[dict] = []
+    sections: list[tuple[int, list[str]]] = []
+    body: list[str] | None = None
+    offset = 0
+    for number, line in enumerate(content.split(b"\n"), 1):
+        task = _TASK.match(line)
+        heading = _HEADING.match(line)
+        if task:
+            title = _MARKUP.sub("", task[3].decode(errors="replace")).strip()
+            body = [title]
+            tasks.append(
+                {
+                    "index": len(tasks) + 1,
+                    "line": number,
+                    "offset": offset + len(task[1]) + 3,
+                    "checked": task[2] == b"x",
+                    "title": title,
+                    "body": body,
+                    "context": "\n\n".join("\n".join(s).strip() for _, s in sections),
+                }
+            )
+        elif heading:
+            body = None
+            level = len(heading[1])
+            while sections and sections[-1][0] >= level:
+                sections.pop()
+            sections.append((level, [_text(line)]))
+        elif body is not None and (not line.strip() or line[:1] in b" \t"):
+            body.append(_text(line))
+        else:
+            body = None
+            if sections:
+                sections[-1][1].append(_text(line))
+        offset += len(line) + 1
+    for task in tasks:
+        lines = task.pop("body")
+        indent = min(
+            (len(line) - len(line.lstrip()) for line in lines[1:] if line.strip()), default=0
+        )
+        task["description"] = "\n".join([lines[0], *(line[indent:] for line in lines[1:])]).strip()
+    return tasks
+
+
+def next_unchecked_task(tasks: list[dict]) -> dict | None:
+    return next((task for task in tasks if not task["checked"]), None)
+
+
+def mark_task_complete(path: Path, index: int) -> bool:
+    """Checks task index in the plan; False if it was already checked."""
+    tasks = read_plan_tasks(path)
+    if not 1 <= index <= len(tasks):
+        raise PlanError(f"{path} has no task {index}")
+    offset = tasks[index - 1]["offset"]
+    with open(path, "r+b") as plan:
+        plan.seek(offset)
+        mark = plan.read(1)
+        if mark == b"x":
+            return False
+        if mark != b" ":
+            raise PlanError(f"{path} changed while marking task {index}")
+        plan.seek(offset)
+        plan.write(b"x")
+    return True
@@ -0,0 +1,144 @@
+"""Scoping the identify-*-issues reviews to what changed.
+
+files-changed.json is the task's list of changed files. record_changes adds
+the test file and production files of every code-state.json result after each
+GREEN; the refactor agents add theirs.
+
+review_scope writes review-scope.json: the changed test files for
+identify-test-issues and the other changed files for identify-code-issues,
+minus files whose content is unchanged since that agent last reviewed them.
+Content hashes of reviewed files are kept per agent in
+.pairingbuddy/cache/reviewed.json (outside the per-task state, so a file
+reviewed in an earlier task and untouched since is not reviewed again).
+mark_reviewed records the hashes once the review has run.
+
+A full scope (--full) lists every test file in tests.json and every changed
+file, whatever the cache says: the explicit final sweep.
+"""
+
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+
+from pairingbuddy.runner import write_json
+
+REVIEWED_FILE = Path("cache") / "reviewed.json"
+REVIEWED_VERSION = 1
+
+TEST_REVIEWER = "identify-test-issues"
+CODE_REVIEWER = "identify-code-issues"
+
+
+def _read(path: Path, key: str) -> list:
+    try:
+        return json.loads(path.read_text())[key]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return []
+
+
+def _hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _tracked(root: Path, paths: list[str]) -> set[str] | None:
+    """Which of paths exist in HEAD; None outside a git repository."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-tree", "-r", "--name-only", "HEAD", "--", *paths],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return set(result.stdout.splitlines())
+
+
+def record_changes(root: Path, state_dir: Path) -> list[dict]:
+    """Adds the files of code-state.json results to files-changed.json; returns its entries."""
+    changes: dict[str, list[str]] = {}
+    for result in _read(state_dir / "code-state.json", "results"):
+        for path in [result["test_file"], *result.get("files_changed", [])]:
+            changes.setdefault(path, []).append(result["test_id"])
+
+    entries = _read(state_dir / "files-changed.json", "files")
+    known = {entry["path"] for entry in entries}
+    new = [path for path in changes if path not in known]
+    tracked = _tracked(root, new) if new else set()
+    for path in new:
+        if not (root / path).exists():
+            action = "deleted"
+        elif tracked is not None and path not in tracked:
+            action = "created"
+        else:
+            action = "modified"
+        description = f"RED-GREEN for {', '.join(dict.fromkeys(changes[path]))}"
+        entries.append({"path": path, "action": action, "description": description})
+    if new:
+        write_json(state_dir / "files-changed.json", {"files": entries})
+    return entries
+
+
+def _load_reviewed(state_dir: Path) -> dict:
+    try:
+        reviewed = json.loads((state_dir / REVIEWED_FILE).read_text())
+        return reviewed["agents"] if reviewed.get("version") == REVIEWED_VERSION else {}
+    except (OSError, json.JSONDecodeError, KeyError, AttributeError):
+        return {}
+
+
+def review_scope(
+    root: Path, state_dir: Path, skip: set[str] = frozenset(), full: bool = False
+) -> dict:
+    """Writes review-scope.json for the two identify agents and returns it.
+
+    skip leaves out files another agent is writing while the review runs.
+    """
+    test_files = {test["test_file"] for test in _read(state_dir / "tests.json", "tests")}
+    changed = [
+        entry["path"]
+        for entry in _read(state_dir / "files-changed.json", "files")
+        if (root / entry["path"]).is_file()
+    ]
+    candidates = {
+        TEST_REVIEWER: sorted(test_files if full else test_files & set(changed)),
+        CODE_REVIEWER: sorted(set(changed) - test_files),
+    }
+    reviewed = {} if full else _load_reviewed(state_dir)
+    scope = {
+        agent: [
+            path
+            for path in paths
+            if path not in skip
+            and (root / path).is_file()
+            and reviewed.get(agent, {}).get(path) != _hash(root / path)
+        ]
+        for agent, paths in candidates.items()
+    }
+    doc = {"full": full, "test_files": scope[TEST_REVIEWER], "code_files": scope[CODE_REVIEWER]}
+    write_json(state_dir / "review-scope.json", doc)
+    return doc
+
+
+def mark_reviewed(root: Path, state_dir: Path) -> int:
+    """Records the current hashes of the files in review-scope.json; returns their count."""
+    try:
+        scope = json.loads((state_dir / "review-scope.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return 0
+    reviewed = _load_reviewed(state_dir)
+    count = 0
+    for agent, key in ((TEST_REVIEWER, "test_files"), (CODE_REVIEWER, "code_files")):
+        hashes = reviewed.setdefault(agent, {})
+        for path in scope.get(key, []):
+            digest = _hash(root / path)
+            if digest:
+                hashes[path] = digest
+                count += 1
+    write_json(state_dir / REVIEWED_FILE, {"version": REVIEWED_VERSION, "agents": reviewed})
+    return count
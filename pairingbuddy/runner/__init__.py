@@ -0,0 +1,64 @@
+"""Deterministic test execution for the run-all-tests step.
+
+Runs each runner in test-config.json with a machine-readable reporter and
+writes all-tests-results.json, so test output never passes through an agent.
+"""
+
+from pairingbuddy.runner.cache import TestCache, cache_limits
+from pairingbuddy.runner.config import (
+    ConfigError,
+    Daemon,
+    Report,
+    Runner,
+    TestConfig,
+    load_test_config,
+)
+from pairingbuddy.runner.daemon import DaemonError, TargetedRun, run_targeted, stop_daemon
+from pairingbuddy.runner.durations import load_durations, record_durations
+from pairingbuddy.runner.execute import RunnerResult, build_command, run_runner, targeted_command
+from pairingbuddy.runner.impact import (
+    affected_tests,
+    changed_files,
+    dependencies,
+    update_index,
+)
+from pairingbuddy.runner.reports import REPORT_FORMATS, ReportError, TestCase
+from pairingbuddy.runner.results import aggregate, write_json
+from pairingbuddy.runner.schedule import WorkerSlots, machine_workers, run_runners
+from pairingbuddy.runner.shards import Shard, partition, plan_shards
+
+__all__ = [
+    "REPORT_FORMATS",
+    "ConfigError",
+    "Daemon",
+    "DaemonError",
+    "Report",
+    "ReportError",
+    "Runner",
+    "RunnerResult",
+    "Shard",
+    "TargetedRun",
+    "TestCache",
+    "TestCase",
+    "TestConfig",
+    "WorkerSlots",
+    "affected_tests",
+    "aggregate",
+    "build_command",
+    "cache_limits",
+    "changed_files",
+    "dependencies",
+    "load_durations",
+    "load_test_config",
+    "machine_workers",
+    "partition",
+    "plan_shards",
+    "record_durations",
+    "run_runner",
+    "run_runners",
+    "run_targeted",
+    "stop_daemon",
+    "targeted_command",
+    "update_index",
+    "write_json",
+]
@@ -0,0 +1,191 @@
+"""Content-addressed cache of test file results.
+
+A test file whose every test passed (or was skipped) is stored under
+.pairingbuddy/cache/tests/<key[:2]>/<key>.json, keyed by a hash of:
+
+- the test file, the project files it imports transitively (from the impact
+  index) and the conftest.py files above it
+- project-level config and lockfiles (PROJECT_FILES)
+- the runner's command, run_args and reporter
+- KEY_ENV variables, plus any named in PAIRINGBUDDY_TEST_CACHE_ENV
+
+The next run with the same key reports the stored cases instead of running
+the file. Failing files are never stored, so they always run again.
+
+Hits refresh an entry's mtime; when the cache grows past
+PAIRINGBUDDY_TEST_CACHE_MAX_MB (default 64) or PAIRINGBUDDY_TEST_CACHE_MAX_ENTRIES
+(default 10000), the least recently used entries are removed.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path, PurePosixPath
+
+from pairingbuddy.runner.config import Runner, TestConfig
+from pairingbuddy.runner.execute import RunnerResult
+from pairingbuddy.runner.impact import dependencies
+from pairingbuddy.runner.reports import FAILED, TestCase
+from pairingbuddy.runner.results import relative_path, write_json
+from pairingbuddy.runner.shards import list_test_files
+
+CACHE_DIR = Path("cache") / "tests"
+CACHE_VERSION = 1
+
+KEY_ENV = ("PATH", "VIRTUAL_ENV", "PYTHONPATH", "NODE_ENV", "NODE_OPTIONS", "GOFLAGS", "CI")
+PROJECT_FILES = (
+    "pyproject.toml",
+    "setup.cfg",
+    "pytest.ini",
+    "tox.ini",
+    "uv.lock",
+    "poetry.lock",
+    "requirements.txt",
+    "package.json",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "tsconfig.json",
+    "jest.config.js",
+    "jest.config.ts",
+    "vitest.config.ts",
+    "go.mod",
+    "go.sum",
+)
+
+DEFAULT_MAX_MB = 64
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def _positive(env: dict, name: str, default: float) -> float:
+    try:
+        value = float(env.get(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def cache_limits(env: dict) -> tuple[int, int]:
+    """(max bytes, max entries) from the environment."""
+    max_mb = _positive(env, "PAIRINGBUDDY_TEST_CACHE_MAX_MB", DEFAULT_MAX_MB)
+    max_entries = _positive(env, "PAIRINGBUDDY_TEST_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+    return int(max_mb * 1024 * 1024), int(max_entries)
+
+
+class TestCache:
+    """Test file results of one project, looked up by content key."""
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, state_dir: Path, root: Path, config: TestConfig, files: dict, env: dict):
+        self.directory = state_dir / CACHE_DIR
+        self.root = root
+        self.env = env
+        self.graph = dependencies(
+            files, config.source_directory, [r.test_directory for r in config.runners]
+        )
+        self._hashes: dict[str, str] = {}
+        self._project = {name: self._hash(name) for name in PROJECT_FILES}
+        self._pending: dict[str, dict[str, str]] = {}
+
+    def _hash(self, path: str) -> str | None:
+        if path not in self._hashes:
+            try:
+                self._hashes[path] = hashlib.sha256((self.root / path).read_bytes()).hexdigest()
+            except OSError:
+                self._hashes[path] = None
+        return self._hashes[path]
+
+    def _inputs(self, test_file: str) -> list[str]:
+        """The test file, its transitive imports and the conftest.py files above it."""
+        seen, queue = set(), deque([test_file])
+        while queue:
+            path = queue.popleft()
+            if path not in seen:
+                seen.add(path)
+                queue.extend(self.graph.get(path, ()))
+        for parent in PurePosixPath(test_file).parents:
+            conftest = str(parent / "conftest.py") if str(parent) != "." else "conftest.py"
+            if conftest in self.graph:
+                seen.add(conftest)
+        return sorted(seen)
+
+    def key(self, runner: Runner, test_file: str) -> str:
+        extra = self.env.get("PAIRINGBUDDY_TEST_CACHE_ENV", "").split(",")
+        names = [*KEY_ENV, *(name.strip() for name in extra if name.strip())]
+        material = {
+            "version": CACHE_VERSION,
+            "runner": [runner.command, runner.run_args, runner.report and runner.report.args],
+            "env": {name: self.env.get(name) for name in names},
+            "project": self._project,
+            "files": {path: self._hash(path) for path in self._inputs(test_file)},
+        }
+        encoded = json.dumps(material, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def split(self, runner: Runner) -> tuple[list[TestCase], list[str]]:
+        """(cached cases, test files still to run) for runner."""
+        cached, pending = [], []
+        keys = self._pending.setdefault(runner.runner_id, {})
+        for test_file in list_test_files(runner, self.root):
+            key = self.key(runner, test_file)
+            path = self._path(key)
+            try:
+                entry = json.loads(path.read_text())
+                os.utime(path)
+            except (OSError, json.JSONDecodeError):
+                keys[test_file] = key
+                pending.append(test_file)
+                continue
+            for case in entry["cases"]:
+                cached.append(
+                    TestCase(test_file, case["name"], case["outcome"], "", case["duration_s"])
+                )
+        return cached, pending
+
+    def store(self, results: list[RunnerResult]) -> None:
+        """Stores every run test file whose tests all passed or were skipped."""
+        by_file: dict[tuple[str, str], list[TestCase]] = {}
+        for result in results:
+            if result.from_cache or result.runner_failed:
+                continue
+            for case in result.cases:
+                path = relative_path(case.file, self.root)
+                by_file.setdefault((result.runner_id, path), []).append(case)
+        for (runner_id, test_file), cases in by_file.items():
+            key = self._pending.get(runner_id, {}).get(test_file)
+            if key is None or any(case.outcome == FAILED for case in cases):
+                continue
+            entry = {
+                "runner": runner_id,
+                "file": test_file,
+                "cases": [
+                    {"name": c.name, "outcome": c.outcome, "duration_s": c.duration_s}
+                    for c in cases
+                ],
+            }
+            write_json(self._path(key), entry)
+
+    def evict(self, max_bytes: int, max_entries: int) -> int:
+        """Removes least recently used entries until within both limits; returns the count."""
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= max_bytes and len(entries) - removed <= max_entries:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
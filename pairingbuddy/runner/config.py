@@ -0,0 +1,155 @@
+"""Loading runners from .pairingbuddy/test-config.json."""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pairingbuddy.runner.reports import REPORT_FORMATS
+
+
+class ConfigError(Exception):
+    """test-config.json is missing, malformed or names an unknown reporter."""
+
+
+# Reporter settings used when a runner has no "report" entry, picked by the
+# first token of its command that names a known tool. {report} is replaced by
+# a temporary report path; formats without it are read from stdout.
+AUTO_REPORTS = {
+    "pytest": {"format": "junit", "args": ["--junitxml={report}", "-o", "junit_family=xunit1"]},
+    "jest": {"format": "jest-json", "args": ["--json", "--outputFile={report}"]},
+    "vitest": {"format": "junit", "args": ["--reporter=junit", "--outputFile={report}"]},
+    "go": {"format": "go-json", "args": ["-json"]},
+}
+
+
+@dataclass(frozen=True)
+class Report:
+    format: str
+    args: list[str] = field(default_factory=list)
+
+    @property
+    def uses_file(self) -> bool:
+        return any("{report}" in arg for arg in self.args)
+
+
+@dataclass(frozen=True)
+class Daemon:
+    """A warm runner process serving targeted runs (see daemon.py)."""
+
+    # Shell command starting it; {socket} is replaced by the socket path
+    command: str
+    startup_timeout: int = 30
+
+
+@dataclass(frozen=True)
+class Runner:
+    runner_id: str
+    name: str
+    command: str
+    test_directory: str
+    run_args: list[str]
+    report: Report | None
+    # CPU slots the runner occupies while running (its own worker processes)
+    max_workers: int = 1
+    file_pattern: str = "*"
+    shards: int = 1
+    # None: the engine partitions test files between shards itself
+    shard_args: list[str] | None = None
+    daemon: Daemon | None = None
+
+
+@dataclass(frozen=True)
+class TestConfig:
+    __test__ = False  # not a pytest test class
+
+    runners: list[Runner]
+    parallel: bool = False
+    source_directory: str = "."
+    # Independent test groups the RED-GREEN loop runs at once, one git worktree each
+    worktrees: int = 1
+    default_runner: str | None = None
+
+    def runner(self, runner_id: str | None = None) -> Runner:
+        """The runner with runner_id, else default_runner, else the only runner."""
+        runner_id = runner_id or self.default_runner
+        if runner_id is None and len(self.runners) == 1:
+            return self.runners[0]
+        for runner in self.runners:
+            if runner.runner_id == runner_id:
+                return runner
+        raise ConfigError(f"unknown runner {runner_id}" if runner_id else "no runner given")
+
+
+def _detect_report(command: str) -> Report | None:
+    for token in command.split():
+        tool = Path(token).name
+        if tool in AUTO_REPORTS:
+            return Report(**AUTO_REPORTS[tool])
+    return None
+
+
+def _parse_report(runner_id: str, raw: dict | None, command: str) -> Report | None:
+    if raw is None:
+        return _detect_report(command)
+    if raw.get("format") not in REPORT_FORMATS:
+        known = ", ".join(REPORT_FORMATS)
+        raise ConfigError(f"runner {runner_id}: report format must be one of {known}")
+    return Report(format=raw["format"], args=list(raw.get("args", [])))
+
+
+def _parse_daemon(runner_id: str, raw: dict | None) -> Daemon | None:
+    if raw is None:
+        return None
+    if "{socket}" not in raw.get("command", ""):
+        raise ConfigError(f"runner {runner_id}: daemon command must contain {{socket}}")
+    return Daemon(raw["command"], _positive_int(runner_id, raw, "startup_timeout", 30))
+
+
+def _positive_int(runner_id: str, raw: dict, key: str, default: int = 1) -> int:
+    value = raw.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ConfigError(f"runner {runner_id}: {key} must be a positive integer")
+    return value
+
+
+def load_test_config(config_path: Path) -> TestConfig:
+    """Read a test-config.json; runners keep their file order."""
+    try:
+        config = json.loads(config_path.read_text())
+    except FileNotFoundError:
+        raise ConfigError(f"{config_path} not found") from None
+    except json.JSONDecodeError as e:
+        raise ConfigError(f"{config_path} is not valid JSON: {e}") from None
+
+    runners = []
+    for runner_id, raw in config.get("runners", {}).items():
+        try:
+            runners.append(
+                Runner(
+                    runner_id=runner_id,
+                    name=raw["name"],
+                    command=raw["command"],
+                    test_directory=raw["test_directory"],
+                    run_args=list(raw["run_args"]),
+                    report=_parse_report(runner_id, raw.get("report"), raw["command"]),
+                    max_workers=_positive_int(runner_id, raw, "max_workers"),
+                    file_pattern=raw["file_pattern"],
+                    shards=_positive_int(runner_id, raw, "shards"),
+                    shard_args=raw.get("shard_args"),
+                    daemon=_parse_daemon(runner_id, raw.get("daemon")),
+                )
+            )
+        except KeyError as e:
+            raise ConfigError(f"runner {runner_id}: missing {e.args[0]}") from None
+    if not runners:
+        raise ConfigError(f"{config_path} defines no runners")
+    worktrees = config.get("worktrees", 1)
+    if not isinstance(worktrees, int) or isinstance(worktrees, bool) or worktrees < 1:
+        raise ConfigError(f"{config_path}: worktrees must be a positive integer")
+    return TestConfig(
+        runners=runners,
+        parallel=config.get("parallel") is True,
+        source_directory=config.get("source_directory", "."),
+        worktrees=worktrees,
+        default_runner=config.get("default_runner"),
+    )
@@ -0,0 +1,138 @@
+"""Routing targeted runs through a runner's warm daemon.
+
+A runner with a daemon entry in test-config.json names a command that starts
+a long-lived process listening on a Unix socket (warm.py is the one shipped
+for pytest). run_targeted sends it the targets and run_args and returns the
+exit code and output, starting the daemon on first use. Whenever the daemon
+cannot be reached, does not start within startup_timeout, dies mid-run or is
+stale twice in a row, the targets run with the runner's cold command instead,
+so a broken daemon costs time but never a result.
+
+The socket lives in the temp directory, named by a hash of the project root
+and runner id: Unix socket paths are limited to about 100 bytes.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from pairingbuddy.runner.config import Runner
+from pairingbuddy.runner.execute import targeted_command
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent.parent
+DAEMON_DIR = Path("daemons")
+PING_TIMEOUT = 2.0
+
+
+class DaemonError(Exception):
+    """The daemon could not be reached or gave no usable answer."""
+
+
+@dataclass(frozen=True)
+class TargetedRun:
+    returncode: int
+    output: str
+    # Served by the warm daemon, not the cold command
+    warm: bool
+
+
+def socket_path(root: Path, runner: Runner) -> Path:
+    key = hashlib.sha256(f"{root.resolve()}\0{runner.runner_id}".encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"pairingbuddy-{key}.sock"
+
+
+def _request(path: Path, payload: dict, timeout: float | None) -> dict:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(path))
+            conn.sendall(json.dumps(payload).encode() + b"\n")
+            line = conn.makefile("rb").readline()
+        return json.loads(line)
+    except (OSError, ValueError) as e:
+        raise DaemonError(str(e) or type(e).__name__) from e
+
+
+def is_running(root: Path, runner: Runner) -> bool:
+    try:
+        return _request(socket_path(root, runner), {"op": "ping"}, PING_TIMEOUT).get("ok", False)
+    except DaemonError:
+        return False
+
+
+def start_daemon(root: Path, state_dir: Path, runner: Runner) -> None:
+    """Starts the runner's daemon and waits until it answers; DaemonError if it does not."""
+    path = socket_path(root, runner)
+    log_dir = state_dir / DAEMON_DIR
+    log_dir.mkdir(parents=True, exist_ok=True)
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PLUGIN_ROOT), env.get("PYTHONPATH")]))
+    with open(log_dir / f"{runner.runner_id}.log", "ab") as log:
+        proc = subprocess.Popen(
+            runner.daemon.command.replace("{socket}", str(path)),
+            shell=True,
+            cwd=root,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + runner.daemon.startup_timeout
+    while time.monotonic() < deadline:
+        if is_running(root, runner):
+            return
+        if proc.poll() is not None:
+            raise DaemonError(f"daemon exited with code {proc.returncode}")
+        time.sleep(0.1)
+    proc.kill()
+    raise DaemonError(f"daemon did not answer within {runner.daemon.startup_timeout}s")
+
+
+def stop_daemon(root: Path, runner: Runner) -> bool:
+    """Asks the runner's daemon to exit; False if none was running."""
+    try:
+        _request(socket_path(root, runner), {"op": "stop"}, PING_TIMEOUT)
+    except DaemonError:
+        return False
+    return True
+
+
+def _run_warm(root: Path, state_dir: Path, runner: Runner, targets: list[str]) -> dict:
+    payload = {"op": "run", "args": [*targets, *runner.run_args]}
+    for _ in range(2):
+        if not is_running(root, runner):
+            start_daemon(root, state_dir, runner)
+        reply = _request(socket_path(root, runner), payload, None)
+        if not reply.get("stale"):
+            if "returncode" not in reply:
+                raise DaemonError(reply.get("error", "no returncode in reply"))
+            return reply
+    raise DaemonError("daemon stale after a restart")
+
+
+def run_targeted(root: Path, state_dir: Path, runner: Runner, targets: list[str]) -> TargetedRun:
+    """Runs targets warm when the runner has a daemon that works, cold otherwise."""
+    if runner.daemon is not None and hasattr(socket, "AF_UNIX"):
+        try:
+            reply = _run_warm(root, state_dir, runner, targets)
+            return TargetedRun(reply["returncode"], reply.get("output", ""), warm=True)
+        except DaemonError:
+            pass
+    proc = subprocess.run(
+        targeted_command(runner, targets),
+        shell=True,
+        cwd=root,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    return TargetedRun(proc.returncode, proc.stdout, warm=False)
@@ -0,0 +1,57 @@
+"""Historical test timings, used to balance shards.
+
+Kept in .pairingbuddy/cache/test-durations.json, outside the top-level state
+files that are cleaned up between tasks:
+
+    {"version": 1, "runners": {"unit": {
+        "files": {"tests/test_a.py": 1.25, ...},
+        "shards": [{"index": 1, "count": 4, "duration_s": 12.5}, ...]}}}
+
+files holds the summed test time of each test file from its latest run;
+shards holds the wall time of each shard of the latest sharded run.
+"""
+
+import json
+from pathlib import Path
+
+from pairingbuddy.runner.execute import RunnerResult
+from pairingbuddy.runner.results import relative_path, write_json
+
+DURATIONS_FILE = Path("cache") / "test-durations.json"
+DURATIONS_VERSION = 1
+
+
+def load_durations(state_dir: Path) -> dict:
+    """Runner id -> {"files": ..., "shards": ...}; empty when missing or unreadable."""
+    try:
+        durations = json.loads((state_dir / DURATIONS_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(durations, dict) or durations.get("version") != DURATIONS_VERSION:
+        return {}
+    return durations.get("runners", {})
+
+
+def record_durations(state_dir: Path, results: list[RunnerResult], root: Path) -> None:
+    """Merges the file and shard timings of a run into the durations file."""
+    runners = load_durations(state_dir)
+    for result in results:
+        if result.from_cache:
+            continue
+        entry = runners.setdefault(result.runner_id, {"files": {}, "shards": []})
+        file_times: dict[str, float] = {}
+        for case in result.cases:
+            path = relative_path(case.file, root)
+            file_times[path] = file_times.get(path, 0.0) + case.duration_s
+        entry["files"].update({path: round(t, 3) for path, t in file_times.items()})
+        if result.shard is not None and result.shard.count > 1:
+            if result.shard.index == 1:
+                entry["shards"] = []
+            entry["shards"].append(
+                {
+                    "index": result.shard.index,
+                    "count": result.shard.count,
+                    "duration_s": round(result.duration_s, 3),
+                }
+            )
+    write_json(state_dir / DURATIONS_FILE, {"version": DURATIONS_VERSION, "runners": runners})
@@ -0,0 +1,101 @@
+"""Running one runner and collecting its test cases."""
+
+import shlex
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from pairingbuddy.runner.config import Runner
+from pairingbuddy.runner.reports import FAILED, REPORT_FORMATS, ReportError, TestCase, clip_message
+from pairingbuddy.runner.shards import Shard
+
+
+@dataclass(frozen=True)
+class RunnerResult:
+    runner_id: str
+    cases: list[TestCase]
+    returncode: int
+    duration_s: float
+    shard: Shard | None = None
+    # Cases reported from the test cache, not run
+    from_cache: bool = False
+    # The run's results could not be fully read (see _runner_failure)
+    runner_failed: bool = False
+
+
+def build_command(
+    runner: Runner, report_path: Path | None = None, shard: Shard | None = None
+) -> str:
+    """Shell command for a full run: command, test directory, run_args, reporter args.
+
+    A shard with files runs them in place of the test directory; a shard of a
+    runner with shard_args adds those. command is a shell fragment (it may
+    carry a wrapper such as `uv run`), the rest is quoted.
+    """
+    report_args = runner.report.args if runner.report else []
+    targets = list(shard.files) if shard and shard.files is not None else [runner.test_directory]
+    args = [*targets, *runner.run_args]
+    if shard and runner.shard_args is not None and shard.count > 1:
+        args += [
+            arg.replace("{index}", str(shard.index)).replace("{count}", str(shard.count))
+            for arg in runner.shard_args
+        ]
+    args += [arg.replace("{report}", str(report_path)) for arg in report_args]
+    return " ".join([runner.command, *(shlex.quote(arg) for arg in args)])
+
+
+def targeted_command(runner: Runner, targets: list[str]) -> str:
+    """Shell command running only targets (test files or node ids), for a human or agent."""
+    return " ".join([runner.command, *(shlex.quote(arg) for arg in [*targets, *runner.run_args])])
+
+
+def _runner_failure(runner: Runner, shard: Shard | None, message: str) -> TestCase:
+    """Stands in for the tests of a runner whose results could not be read."""
+    sharded = shard is not None and shard.count > 1
+    name = f"<{runner.runner_id} shard {shard.label}>" if sharded else f"<{runner.runner_id}>"
+    return TestCase(runner.test_directory, name, FAILED, clip_message(message))
+
+
+def run_runner(runner: Runner, cwd: Path, shard: Shard | None = None) -> RunnerResult:
+    """Runs every test of one runner, or of one of its shards, in cwd.
+
+    A runner that crashes, writes no report or exits non-zero without a failing
+    test is reported as one failed case carrying the tail of its output, so a
+    broken run can never pass.
+    """
+    parse = REPORT_FORMATS[runner.report.format]
+    with tempfile.TemporaryDirectory(prefix="pairingbuddy-report-") as tmp:
+        report_path = Path(tmp) / "report" if runner.report.uses_file else None
+        started = time.monotonic()
+        proc = subprocess.run(
+            build_command(runner, report_path, shard),
+            shell=True,
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if report_path is None else subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        duration = time.monotonic() - started
+        output = proc.stdout + (proc.stderr or "")
+        runner_failed = False
+        try:
+            if report_path is None:
+                cases = parse(proc.stdout)
+            elif report_path.exists():
+                cases = parse(report_path.read_text(errors="replace"))
+            else:
+                raise ReportError("runner wrote no report")
+        except ReportError as e:
+            cases = [_runner_failure(runner, shard, f"{e} (exit code {proc.returncode})\n{output}")]
+            runner_failed = True
+
+    if proc.returncode != 0 and not any(case.outcome == FAILED for case in cases):
+        cases.append(_runner_failure(runner, shard, f"exit code {proc.returncode}\n{output}"))
+        runner_failed = True
+    return RunnerResult(
+        runner.runner_id, cases, proc.returncode, duration, shard, runner_failed=runner_failed
+    )
@@ -0,0 +1,239 @@
+"""Test impact index: which tests exercise which source files.
+
+Built from the import graph of the project's Python, JavaScript/TypeScript and
+Go files and kept in .pairingbuddy/cache/test-impact.json:
+
+    {"version": 1, "files": {"src/app/models.py": {
+        "mtime_ns": 1760000000000000000, "size": 2048, "refs": ["py:app.db"]}}}
+
+refs are the file's imports, stored unresolved ("py:" dotted module,
+"js:" path without extension, "go:" package directory) so only files whose
+mtime or size changed are parsed again. Resolving refs to files is cheap and
+redone on every query, so added and removed files are always accounted for.
+
+A test is affected by a change when it is the changed file or transitively
+imports it. A changed file outside the graph (a lockfile, a runner config, a
+deleted module) may affect anything, so every test is affected; documentation
+changes affect none.
+"""
+
+import ast
+import json
+import os
+import re
+import subprocess
+from collections import deque
+from pathlib import Path, PurePosixPath
+
+from pairingbuddy.runner.config import TestConfig
+from pairingbuddy.runner.results import write_json
+from pairingbuddy.runner.shards import list_test_files
+
+INDEX_FILE = Path("cache") / "test-impact.json"
+INDEX_VERSION = 1
+
+PY_SUFFIXES = {".py"}
+JS_SUFFIXES = [".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"]
+GO_SUFFIXES = {".go"}
+SOURCE_SUFFIXES = PY_SUFFIXES | set(JS_SUFFIXES) | GO_SUFFIXES
+
+# Changes that cannot affect a test run
+DOC_SUFFIXES = {".md", ".rst", ".txt"}
+
+SKIP_DIRS = {"node_modules", "__pycache__", "vendor", "dist", "build", "venv"}
+
+JS_IMPORT = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*\(?\s*|\brequire\s*\(\s*)["'](\.{1,2}/[^"']*)["']"""
+)
+GO_IMPORT_BLOCK = re.compile(r"^import\s*\((.*?)^\)", re.M | re.S)
+GO_IMPORT_LINE = re.compile(r'^import\s+(?:\w+\s+)?"([^"]+)"', re.M)
+GO_QUOTED = re.compile(r'"([^"]+)"')
+
+
+def _scan(root: Path, directories: list[str]) -> list[str]:
+    """Source files under directories, relative to root."""
+    found = set()
+    for directory in directories:
+        start = root / directory
+        if start.is_file():
+            found.add(str(start.relative_to(root)))
+            continue
+        for dirpath, dirnames, filenames in os.walk(start):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            for name in filenames:
+                if Path(name).suffix in SOURCE_SUFFIXES:
+                    found.add(str((Path(dirpath) / name).relative_to(root)))
+    return sorted(found)
+
+
+def _python_refs(path: str, text: str) -> list[str]:
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        return []
+    package = list(PurePosixPath(path).parent.parts)
+    refs = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            refs.extend(f"py:{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[: len(package) - node.level + 1]
+                module = ".".join([*base, *(node.module.split(".") if node.module else [])])
+            else:
+                module = node.module or ""
+            if module:
+                refs.append(f"py:{module}")
+            # `from pkg import name` may import the submodule pkg.name
+            refs.extend(f"py:{module}.{a.name}".replace("py:.", "py:") for a in node.names)
+    return refs
+
+
+def _js_refs(path: str, text: str) -> list[str]:
+    parent = PurePosixPath(path).parent
+    refs = []
+    for spec in JS_IMPORT.findall(text):
+        target = os.path.normpath(parent / spec)
+        refs.append(f"js:{PurePosixPath(target).as_posix()}")
+    return refs
+
+
+def _go_module(root: Path) -> str | None:
+    try:
+        match = re.search(r"^module\s+(\S+)", (root / "go.mod").read_text(), re.M)
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def _go_refs(path: str, text: str, module: str | None) -> list[str]:
+    refs = [f"go:{PurePosixPath(path).parent}"]  # the rest of its own package
+    imports = GO_IMPORT_LINE.findall(text)
+    for block in GO_IMPORT_BLOCK.findall(text):
+        imports.extend(GO_QUOTED.findall(block))
+    for imported in imports:
+        if module and (imported == module or imported.startswith(module + "/")):
+            refs.append(f"go:{imported[len(module) + 1 :] or '.'}")
+    return refs
+
+
+def _parse_refs(root: Path, path: str, go_module: str | None) -> list[str]:
+    try:
+        text = (root / path).read_text(errors="replace")
+    except OSError:
+        return []
+    suffix = Path(path).suffix
+    if suffix in PY_SUFFIXES:
+        return _python_refs(path, text)
+    if suffix in GO_SUFFIXES:
+        return _go_refs(path, text, go_module)
+    return _js_refs(path, text)
+
+
+def update_index(root: Path, config: TestConfig, state_dir: Path) -> dict:
+    """Brings the index up to date with the files on disk; returns path -> entry.
+
+    Only files whose mtime or size changed since the last update are parsed.
+    """
+    index_path = state_dir / INDEX_FILE
+    try:
+        previous = json.loads(index_path.read_text())
+        entries = previous["files"] if previous.get("version") == INDEX_VERSION else {}
+    except (OSError, json.JSONDecodeError, KeyError, AttributeError):
+        entries = {}
+
+    directories = [config.source_directory] + [r.test_directory for r in config.runners]
+    go_module = _go_module(root)
+    files = {}
+    for path in _scan(root, directories):
+        stat = (root / path).stat()
+        entry = entries.get(path)
+        if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            refs = _parse_refs(root, path, go_module)
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "refs": refs}
+        files[path] = entry
+    if files != entries:
+        write_json(index_path, {"version": INDEX_VERSION, "files": files})
+    return files
+
+
+def _resolve(ref: str, files: set[str], roots: list[str], packages: dict) -> list[str]:
+    kind, _, target = ref.partition(":")
+    if kind == "py":
+        module = target.replace(".", "/")
+        for base in roots:
+            prefix = f"{base}/{module}" if base != "." else module
+            for candidate in (f"{prefix}.py", f"{prefix}/__init__.py"):
+                if candidate in files:
+                    return [candidate]
+        return []
+    if kind == "js":
+        candidates = [target] + [target + s for s in JS_SUFFIXES]
+        candidates += [f"{target}/index{s}" for s in JS_SUFFIXES]
+        return next(([c] for c in candidates if c in files), [])
+    return packages.get(target, [])
+
+
+def dependencies(files: dict, source_directory: str, test_directories: list[str]) -> dict:
+    """path -> set of project files it imports directly."""
+    known = set(files)
+    roots = [os.path.normpath(d) for d in (".", source_directory, *test_directories, "src")]
+    packages: dict[str, list[str]] = {}
+    for path in known:
+        if path.endswith(".go") and not path.endswith("_test.go"):
+            packages.setdefault(str(PurePosixPath(path).parent), []).append(path)
+    return {
+        path: {dep for ref in entry["refs"] for dep in _resolve(ref, known, roots, packages)}
+        - {path}
+        for path, entry in files.items()
+    }
+
+
+def affected_tests(root: Path, config: TestConfig, files: dict, changed: list[str]) -> dict:
+    """Runner id -> sorted test files affected by the changed files.
+
+    Returns every test of every runner when a changed file is outside the graph.
+    Runners without affected tests are left out.
+    """
+    tests = {runner.runner_id: set(list_test_files(runner, root)) for runner in config.runners}
+    graph = dependencies(files, config.source_directory, [r.test_directory for r in config.runners])
+    dependents: dict[str, set[str]] = {}
+    for path, deps in graph.items():
+        for dep in deps:
+            dependents.setdefault(dep, set()).add(path)
+
+    reached: set[str] = set()
+    queue = deque()
+    for path in changed:
+        if path in graph:
+            queue.append(path)
+        elif Path(path).name == "conftest.py":
+            # Fixtures apply to every test below their directory
+            scope = str(PurePosixPath(path).parent)
+            reached.update(t for ts in tests.values() for t in ts if t.startswith(scope + "/"))
+        elif Path(path).suffix not in DOC_SUFFIXES:
+            return {runner_id: sorted(runner_tests) for runner_id, runner_tests in tests.items()}
+    while queue:
+        path = queue.popleft()
+        if path in reached:
+            continue
+        reached.add(path)
+        queue.extend(dependents.get(path, ()))
+    return {
+        runner_id: sorted(runner_tests & reached)
+        for runner_id, runner_tests in tests.items()
+        if runner_tests & reached
+    }
+
+
+def changed_files(root: Path) -> list[str]:
+    """Files changed since HEAD, plus untracked files, according to git."""
+    commands = [
+        ["git", "diff", "--name-only", "HEAD"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    ]
+    changed = set()
+    for command in commands:
+        result = subprocess.run(command, cwd=root, capture_output=True, text=True, check=True)
+        changed.update(line for line in result.stdout.splitlines() if line)
+    return sorted(changed)
@@ -0,0 +1,157 @@
+"""Parsers for machine-readable test reports.
+
+Each parser turns one report into a list of TestCase, whatever the runner:
+
+- junit: JUnit XML (pytest --junitxml, vitest, most other runners)
+- jest-json: jest --json
+- go-json: go test -json event stream
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Failure output kept per test. Tracebacks end with the assertion, so the tail
+# is kept.
+MAX_MESSAGE_CHARS = 4000
+
+
+class ReportError(Exception):
+    """A report could not be parsed."""
+
+
+@dataclass(frozen=True)
+class TestCase:
+    __test__ = False  # not a pytest test class
+
+    file: str
+    name: str
+    outcome: str
+    message: str = ""
+    duration_s: float = 0.0
+
+
+def clip_message(message: str) -> str:
+    message = message.strip()
+    if len(message) <= MAX_MESSAGE_CHARS:
+        return message
+    return "…" + message[-MAX_MESSAGE_CHARS:]
+
+
+def _seconds(value) -> float:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _junit_name(case: ET.Element) -> str:
+    """pytest xunit1 puts the module in classname; keep only the class part."""
+    name = case.get("name", "")
+    classname = case.get("classname", "")
+    file = case.get("file")
+    if file and file.endswith(".py"):
+        module = file[: -len(".py")].replace("/", ".")
+        if classname.startswith(module + "."):
+            return f"{classname[len(module) + 1 :]}::{name}"
+    return name
+
+
+def parse_junit(text: str) -> list[TestCase]:
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        raise ReportError(f"invalid JUnit XML: {e}") from None
+    cases = []
+    for case in root.iter("testcase"):
+        outcome, message = PASSED, ""
+        for child in case:
+            if child.tag in ("failure", "error"):
+                outcome = FAILED
+                message = child.text or child.get("message", "")
+                break
+            if child.tag == "skipped":
+                outcome = SKIPPED
+        file = case.get("file") or case.get("classname", "")
+        duration = _seconds(case.get("time"))
+        cases.append(TestCase(file, _junit_name(case), outcome, clip_message(message), duration))
+    return cases
+
+
+JEST_OUTCOMES = {
+    "passed": PASSED,
+    "failed": FAILED,
+    "pending": SKIPPED,
+    "skipped": SKIPPED,
+    "todo": SKIPPED,
+    "disabled": SKIPPED,
+}
+
+
+def parse_jest_json(text: str) -> list[TestCase]:
+    try:
+        report = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ReportError(f"invalid jest JSON: {e}") from None
+    cases = []
+    for suite in report.get("testResults", []):
+        file = suite.get("name", "")
+        assertions = suite.get("assertionResults", [])
+        for assertion in assertions:
+            outcome = JEST_OUTCOMES.get(assertion.get("status"), SKIPPED)
+            message = "\n".join(assertion.get("failureMessages") or [])
+            name = assertion.get("fullName") or assertion.get("title", "")
+            duration = _seconds(assertion.get("duration")) / 1000
+            cases.append(TestCase(file, name, outcome, clip_message(message), duration))
+        if not assertions and suite.get("status") == "failed":
+            # The file failed to load, so none of its tests ran
+            cases.append(TestCase(file, "<file>", FAILED, clip_message(suite.get("message", ""))))
+    return cases
+
+
+GO_OUTCOMES = {"pass": PASSED, "fail": FAILED, "skip": SKIPPED}
+
+
+def parse_go_json(text: str) -> list[TestCase]:
+    output: dict[tuple[str, str], list[str]] = {}
+    outcomes: dict[tuple[str, str], str] = {}
+    elapsed: dict[tuple[str, str], float] = {}
+    for line in text.splitlines():
+        if not line.startswith("{"):
+            continue  # build output interleaved with the events
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        key = (event.get("Package", ""), event.get("Test", ""))
+        action = event.get("Action")
+        if action == "output":
+            output.setdefault(key, []).append(event.get("Output", ""))
+        elif action in GO_OUTCOMES:
+            outcomes[key] = GO_OUTCOMES[action]
+            elapsed[key] = _seconds(event.get("Elapsed"))
+    if not outcomes and not output:
+        raise ReportError("no go test events in output")
+
+    cases = []
+    failed_packages = {package for (package, test), o in outcomes.items() if test and o == FAILED}
+    for (package, test), outcome in outcomes.items():
+        message = "".join(output.get((package, test), [])) if outcome == FAILED else ""
+        if test:
+            duration = elapsed[(package, test)]
+            cases.append(TestCase(package, test, outcome, clip_message(message), duration))
+        elif outcome == FAILED and package not in failed_packages:
+            # Package failed without a failing test: build error or panic
+            cases.append(TestCase(package, "<package>", FAILED, clip_message(message)))
+    return cases
+
+
+REPORT_FORMATS = {
+    "junit": parse_junit,
+    "jest-json": parse_jest_json,
+    "go-json": parse_go_json,
+}
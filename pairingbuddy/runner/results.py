@@ -0,0 +1,53 @@
+"""Aggregating runner results into all-tests-results.json."""
+
+import json
+import os
+from pathlib import Path
+
+from pairingbuddy.runner.execute import RunnerResult
+from pairingbuddy.runner.reports import FAILED, PASSED, SKIPPED
+
+
+def relative_path(path: str, root: Path) -> str:
+    """Report paths relative to the project when a runner gives absolute ones."""
+    if os.path.isabs(path):
+        try:
+            return str(Path(path).relative_to(root))
+        except ValueError:
+            return path
+    return path
+
+
+def aggregate(results: list[RunnerResult], root: Path) -> dict:
+    """Merges runner results into one all-tests-results.schema.json document."""
+    cases = [case for result in results for case in result.cases]
+    counts = {
+        outcome: sum(1 for case in cases if case.outcome == outcome)
+        for outcome in (PASSED, FAILED, SKIPPED)
+    }
+    failures = [
+        {
+            "test_file": relative_path(case.file, root),
+            "test_function": case.name,
+            "failure_message": case.message,
+        }
+        for case in cases
+        if case.outcome == FAILED
+    ]
+    return {
+        "total": len(cases),
+        "passed": counts[PASSED],
+        "failed": counts[FAILED],
+        "skipped": counts[SKIPPED],
+        "cached": sum(len(result.cases) for result in results if result.from_cache),
+        "status": "fail" if failures else "pass",
+        "failures": failures,
+    }
+
+
+def write_json(path: Path, document: dict) -> None:
+    """Replaces path atomically so readers never see a half-written file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(document, indent=2) + "\n")
+    os.replace(tmp, path)
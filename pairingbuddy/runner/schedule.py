@@ -0,0 +1,96 @@
+"""Running runners and their shards at once without oversubscribing the machine."""
+
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from pairingbuddy.runner.cache import TestCache
+from pairingbuddy.runner.config import Runner
+from pairingbuddy.runner.execute import RunnerResult, run_runner
+from pairingbuddy.runner.shards import Shard, plan_shards
+
+
+def machine_workers() -> int:
+    """CPUs this process may use."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class WorkerSlots:
+    """Counting semaphore where each job takes as many slots as it has workers.
+
+    A job wider than the whole machine still runs, alone.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._free = self.capacity
+        self._changed = threading.Condition()
+
+    @contextmanager
+    def hold(self, workers: int) -> Iterator[None]:
+        workers = min(workers, self.capacity)
+        with self._changed:
+            self._changed.wait_for(lambda: self._free >= workers)
+            self._free -= workers
+        try:
+            yield
+        finally:
+            with self._changed:
+                self._free += workers
+                self._changed.notify_all()
+
+
+def run_runners(
+    runners: list[Runner],
+    cwd: Path,
+    *,
+    parallel: bool,
+    capacity: int | None = None,
+    durations: dict | None = None,
+    cache: TestCache | None = None,
+) -> list[RunnerResult]:
+    """Runs every runner and returns one result per runner or shard, in runner order.
+
+    The shards of a runner always run concurrently; whole runners do when
+    parallel. Each runner or shard holds its runner's max_workers of the
+    capacity (default: the machine's CPUs) while it runs. Runners are
+    subprocesses, so the threads only wait on them.
+
+    With a cache, test files with a cached result are not run; their cases
+    come first, as one from_cache result per runner.
+    """
+    slots = WorkerSlots(capacity or machine_workers())
+    durations = durations or {}
+    cached: list[RunnerResult] = []
+    jobs = []
+    for runner in runners:
+        files = None
+        if cache is not None:
+            hits, pending = cache.split(runner)
+            if hits:
+                cached.append(RunnerResult(runner.runner_id, hits, 0, 0.0, from_cache=True))
+                files = pending
+        if files != []:
+            jobs.append([(runner, shard) for shard in plan_shards(runner, cwd, durations, files)])
+    batches = [[job for runner_jobs in jobs for job in runner_jobs]] if parallel else jobs
+
+    def run(job: tuple[Runner, Shard | None]) -> RunnerResult:
+        runner, shard = job
+        with slots.hold(runner.max_workers):
+            return run_runner(runner, cwd, shard)
+
+    results = cached
+    for batch in batches:
+        if not batch:
+            continue
+        if len(batch) == 1:
+            results.append(run(batch[0]))
+            continue
+        with ThreadPoolExecutor(max_workers=len(batch)) as pool:
+            results.extend(pool.map(run, batch))
+    return results
@@ -0,0 +1,72 @@
+"""Splitting a runner into shards.
+
+A runner with "shards": N runs as N commands. With shard_args, each command
+gets those args with {index} (1-based) and {count} filled in, and the runner
+splits the suite (or the given files) itself (pytest-split, jest --shard, ...). Without shard_args
+the engine partitions the test files matching file_pattern, balancing shards
+by each file's recorded duration, and passes the files in place of
+test_directory.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from pairingbuddy.runner.config import Runner
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    count: int
+    # Test files to run in place of test_directory; None for the whole directory
+    files: tuple[str, ...] | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def list_test_files(runner: Runner, root: Path) -> list[str]:
+    """Test files of a runner, relative to root, in sorted order."""
+    directory = root / runner.test_directory
+    pattern = runner.file_pattern
+    matches = directory.glob(pattern) if "/" in pattern else directory.rglob(pattern)
+    return sorted(str(path.relative_to(root)) for path in matches if path.is_file())
+
+
+def partition(files: list[str], count: int, weights: dict[str, float]) -> list[list[str]]:
+    """Splits files into count groups of similar total weight.
+
+    Longest files first, each onto the currently lightest group. Files with
+    no recorded weight count as the average recorded file.
+    """
+    known = [weights[f] for f in files if f in weights]
+    default = sum(known) / len(known) if known else 1.0
+    groups: list[list[str]] = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for file in sorted(files, key=lambda f: (-weights.get(f, default), f)):
+        lightest = loads.index(min(loads))
+        groups[lightest].append(file)
+        loads[lightest] += weights.get(file, default)
+    return [sorted(group) for group in groups]
+
+
+def plan_shards(
+    runner: Runner, root: Path, durations: dict, files: list[str] | None = None
+) -> list[Shard | None]:
+    """The shards to run for runner; [None] for a plain full run.
+
+    files limits the run to those test files (e.g. the ones not in the test
+    cache) instead of the whole test directory.
+    """
+    if runner.shards == 1:
+        return [None] if files is None else [Shard(1, 1, tuple(files))]
+    if runner.shard_args is not None:
+        targets = None if files is None else tuple(files)
+        return [Shard(index, runner.shards, targets) for index in range(1, runner.shards + 1)]
+    weights = durations.get(runner.runner_id, {}).get("files", {})
+    candidates = list_test_files(runner, root) if files is None else files
+    groups = [g for g in partition(candidates, runner.shards, weights) if g]
+    if not groups:
+        return [None]  # nothing matched file_pattern; let the runner report it
+    return [Shard(index, len(groups), tuple(group)) for index, group in enumerate(groups, 1)]
@@ -0,0 +1,147 @@
+"""Warm pytest daemon: python -m pairingbuddy.runner.warm --socket PATH.
+
+Started in the project root by a runner's daemon command (test-config.json).
+It imports pytest and the --preload modules once, then serves requests on a
+Unix socket, one JSON object per connection (see daemon.py for the client):
+
+    {"op": "ping"}                      -> {"ok": true}
+    {"op": "run", "args": [...]}        -> {"returncode": 0, "output": "..."}
+    {"op": "stop"}                      -> {"ok": true}, then exits
+
+Each run forks, so the child starts with everything imported and exits when
+pytest.main returns: no test can leak state into the next run. Project modules
+imported before the fork would go stale once edited, so a run is refused with
+{"stale": true} (and the daemon exits) when one of them changed on disk; the
+client then starts a fresh daemon. The daemon also exits after --idle-timeout
+seconds without a request.
+
+Runs inside the project's interpreter, so it needs only pytest and the stdlib.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+DEFAULT_IDLE_TIMEOUT = 1800
+
+
+def _project_modules(root: Path) -> dict[str, int]:
+    """mtime of each imported module file under root, outside virtualenvs."""
+    mtimes = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path:
+            continue
+        path = Path(path).resolve()
+        if root not in path.parents or {"site-packages", ".venv"} & set(path.parts):
+            continue
+        try:
+            mtimes[str(path)] = path.stat().st_mtime_ns
+        except OSError:
+            mtimes[str(path)] = -1
+    return mtimes
+
+
+def _stale(loaded: dict[str, int]) -> bool:
+    for path, mtime in loaded.items():
+        try:
+            if Path(path).stat().st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def _run(args: list[str]) -> dict:
+    import pytest
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with tempfile.TemporaryFile() as output:
+        pid = os.fork()
+        if pid == 0:
+            code = 3
+            try:
+                os.dup2(output.fileno(), 1)
+                os.dup2(output.fileno(), 2)
+                code = int(pytest.main(args))
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        output.seek(0)
+        text = output.read().decode(errors="replace")
+    return {"returncode": os.waitstatus_to_exitcode(status), "output": text}
+
+
+def serve(socket_path: str, preload: list[str], idle_timeout: float) -> None:
+    import pytest  # noqa: F401 - imported once, before any fork
+
+    for name in preload:
+        importlib.import_module(name)
+    loaded = _project_modules(Path.cwd().resolve())
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    bound = os.stat(socket_path).st_ino
+    server.listen()
+    server.settimeout(idle_timeout)
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                return
+            with conn:
+                conn.settimeout(None)
+                request = json.loads(conn.makefile("rb").readline() or b"{}")
+                op = request.get("op")
+                if op == "run":
+                    if _stale(loaded):
+                        conn.sendall(b'{"stale": true}\n')
+                        return
+                    reply = _run([str(arg) for arg in request.get("args", [])])
+                elif op in ("ping", "stop"):
+                    reply = {"ok": True}
+                else:
+                    reply = {"error": f"unknown op {op!r}"}
+                conn.sendall(json.dumps(reply).encode() + b"\n")
+                if op == "stop":
+                    return
+    finally:
+        server.close()
+        # A replacement daemon may already be listening on the same path
+        if os.path.exists(socket_path) and os.stat(socket_path).st_ino == bound:
+            os.unlink(socket_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pairingbuddy.runner.warm")
+    parser.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    parser.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        help="module to import before serving (repeatable), e.g. a settings module",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"exit after this many seconds without a request (default {DEFAULT_IDLE_TIMEOUT})",
+    )
+    args = parser.parse_args(argv)
+    serve(args.socket, args.preload, args.idle_timeout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Per-task state files in .pairingbuddy/.
+
+cleanup_state_files starts a task fresh: it clears every top-level state
+file except the three that persist across tasks (test-config.json,
+doc-config.json, human-guidance.json). The cleared files are archived as a
+generation in history/ (see pairingbuddy/history.py) unless
+PAIRINGBUDDY_HISTORY_KEEP=0, which deletes them. task.json already holds the
+next task then: it is deleted too, but saved as the new task's record rather
+than archived with the finished task. Subdirectories (cache/,
+history/, workflow/, worktrees/) are not state files and are left alone.
+
+filter_pending and mark_unit_answered track progress through tests.json and
+spike-questions.json. mark_unit_answered goes through the state store, so
+with PAIRINGBUDDY_STATE_BACKEND=sqlite it updates one row (see store.py).
+"""
+
+import os
+from pathlib import Path
+
+from pairingbuddy.history import archive, history_keep, start_task
+from pairingbuddy.store import StoreError, open_store
+
+KEPT_FILES = ("test-config.json", "doc-config.json", "human-guidance.json")
+
+
+class StateError(Exception):
+    """A state file is missing or does not hold what it should."""
+
+
+def cleanup_state_files(state_dir: Path, env: dict | None = None) -> dict:
+    """Clears the per-task state files: {"removed": [names], "archived": task id or None}."""
+    paths = [
+        path
+        for path in sorted(state_dir.glob("*.json"))
+        if path.name not in KEPT_FILES and path.is_file()
+    ]
+    removed = [path.name for path in paths]
+    keep = history_keep(os.environ if env is None else env)
+    archived = None
+    if keep:
+        archived = archive(state_dir, [path for path in paths if path.name != "task.json"], keep)
+        start_task(state_dir)
+    for path in paths:
+        path.unlink(missing_ok=True)
+    return {"removed": removed, "archived": archived}
+
+
+def filter_pending(doc: dict, skip: set[str] = frozenset()) -> list[dict]:
+    """Units of spike-questions.json still pending, or tests of tests.json not in skip."""
+    if "units" in doc:
+        return [unit for unit in doc["units"] if unit.get("status") == "pending"]
+    return [test for test in doc.get("tests", []) if test["test_id"] not in skip]
+
+
+def mark_unit_answered(state_dir: Path, unit_id: str, env: dict | None = None) -> dict:
+    """Sets the unit's status in spike-questions.json to answered; returns the unit."""
+    try:
+        store = open_store(state_dir, os.environ if env is None else env)
+        try:
+            unit = store.update_item("spike-questions.json", unit_id, {"status": "answered"})
+            store.export()
+        finally:
+            store.close()
+    except StoreError as e:
+        raise StateError(str(e)) from None
+    return unit
@@ -0,0 +1,286 @@
+"""Storage backends for the state files in .pairingbuddy/.
+
+The state files are the contract between agents, which read and write them
+as JSON. FileStore reads and writes them directly and rewrites a whole file
+to change one entry. SqliteStore (PAIRINGBUDDY_STATE_BACKEND=sqlite) keeps
+them in .pairingbuddy/state.db instead:
+- one table per contract, with one row per entry of the contract's list
+  (ENTRIES), or one row for the whole document;
+- update_item changes a single row in one transaction.
+
+The JSON files stay the interface. export() writes every contract changed in
+the database back to its file. The bytes are exactly those FileStore writes
+(write_json), and the workflow engine exports before each agent runs. read()
+imports a file again when an agent has rewritten it since: its mtime or size
+differ from the last import or export. The file wins over unexported changes.
+"""
+
+import json
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+from pairingbuddy.runner import write_json
+
+DB_FILE = "state.db"
+BACKENDS = ("file", "sqlite")
+
+# Contracts holding a list of entries: file -> (list key, entry id key)
+ENTRIES = {
+    "tests.json": ("tests", "test_id"),
+    "scenarios.json": ("scenarios", "scenario_id"),
+    "current-batch.json": ("batch", "test_id"),
+    "test-state.json": ("results", "test_id"),
+    "code-state.json": ("results", "test_id"),
+    "files-changed.json": ("files", "path"),
+    "spike-questions.json": ("units", "id"),
+}
+
+_NAME = re.compile(r"^[a-z][a-z0-9-]*\.json$")
+
+
+class StoreError(Exception):
+    """A state file or entry cannot be read or updated."""
+
+
+def _check(name: str) -> str:
+    if not _NAME.match(name):
+        raise StoreError(f"{name} is not a state file name")
+    return name
+
+
+def _read_doc(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        raise StoreError(f"cannot read {path.name}: {e}") from None
+
+
+def _entries(name: str, doc) -> list:
+    key = ENTRIES[name][0]
+    if not isinstance(doc, dict) or not isinstance(doc.get(key), list):
+        raise StoreError(f'{name} has no "{key}" list')
+    return doc[key]
+
+
+class FileStore:
+    """State files read and written whole."""
+
+    def __init__(self, state_dir: Path):
+        self.state_dir = state_dir
+
+    def read(self, name: str):
+        """The document in name; None if there is none."""
+        return _read_doc(self.state_dir / _check(name))
+
+    def write(self, name: str, doc) -> None:
+        write_json(self.state_dir / _check(name), doc)
+
+    def update_item(self, name: str, item_id: str, changes: dict) -> dict:
+        """Merges changes into the entry with item_id; returns the entry."""
+        if name not in ENTRIES:
+            raise StoreError(f"{name} has no entries")
+        doc = self.read(name)
+        if doc is None:
+            raise StoreError(f"{name} not found")
+        id_key = ENTRIES[name][1]
+        entry = next((e for e in _entries(name, doc) if e.get(id_key) == item_id), None)
+        if entry is None:
+            raise StoreError(f"{name} has no entry {item_id}")
+        entry.update(changes)
+        self.write(name, doc)
+        return entry
+
+    def export(self) -> list[str]:
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteStore:
+    """State files as tables of .pairingbuddy/state.db, exported as JSON views."""
+
+    def __init__(self, state_dir: Path):
+        try:
+            import sqlite3
+        except ImportError:
+            raise StoreError("this Python has no sqlite3 module; use the file backend") from None
+        self.sqlite_error = sqlite3.Error
+        self.state_dir = state_dir
+        state_dir.mkdir(parents=True, exist_ok=True)
+        with self._errors():
+            self.db = sqlite3.connect(state_dir / DB_FILE, isolation_level=None)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            # head: the document without its entries (or null), stat: of the file last seen
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS views (name TEXT PRIMARY KEY, head TEXT,"
+                " mtime_ns INTEGER, size INTEGER, dirty INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    @contextmanager
+    def _errors(self):
+        """Raises sqlite3 errors (a locked or corrupt database) as StoreError."""
+        try:
+            yield
+        except self.sqlite_error as e:
+            raise StoreError(f"{DB_FILE}: {e}") from None
+
+    def _table(self, name: str) -> str:
+        table = "state_" + _check(name)[:-5].replace("-", "_")
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}"
+            " (position INTEGER PRIMARY KEY, item_id TEXT, body TEXT NOT NULL)"
+        )
+        self.db.execute(f"CREATE INDEX IF NOT EXISTS {table}_item ON {table} (item_id)")
+        return table
+
+    def _stat(self, name: str) -> tuple[int, int] | None:
+        try:
+            stat = (self.state_dir / name).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _store(self, name: str, doc, stat: tuple[int, int] | None, dirty: bool) -> None:
+        table = self._table(name)
+        if name in ENTRIES:
+            list_key, id_key = ENTRIES[name]
+            rows = [(e.get(id_key), json.dumps(e)) for e in _entries(name, doc)]
+            head = json.dumps({**doc, list_key: []})
+        else:
+            rows, head = [(None, json.dumps(doc))], None
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.execute(f"DELETE FROM {table}")
+            self.db.executemany(
+                f"INSERT INTO {table} (position, item_id, body) VALUES (?, ?, ?)",
+                [(position, item_id, body) for position, (item_id, body) in enumerate(rows)],
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO views VALUES (?, ?, ?, ?, ?)",
+                (name, head, *(stat or (None, None)), int(dirty)),
+            )
+            self.db.execute("COMMIT")
+        except BaseException:
+            if self.db.in_transaction:
+                self.db.execute("ROLLBACK")
+            raise
+
+    def _forget(self, name: str) -> None:
+        table = self._table(name)
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.execute(f"DELETE FROM {table}")
+            self.db.execute("DELETE FROM views WHERE name = ?", (name,))
+            self.db.execute("COMMIT")
+        except BaseException:
+            if self.db.in_transaction:
+                self.db.execute("ROLLBACK")
+            raise
+
+    def _sync(self, name: str) -> bool:
+        """Imports the file if it changed since last seen; False if there is no document."""
+        view = self.db.execute(
+            "SELECT mtime_ns, size FROM views WHERE name = ?", (_check(name),)
+        ).fetchone()
+        stat = self._stat(name)
+        if view is not None and tuple(view) == (stat or (None, None)):
+            return True
+        if stat is None:
+            if view is not None:
+                self._forget(name)
+            return False
+        self._store(name, _read_doc(self.state_dir / name), stat, dirty=False)
+        return True
+
+    def _assemble(self, name: str):
+        table = self._table(name)
+        bodies = [
+            json.loads(body)
+            for (body,) in self.db.execute(f"SELECT body FROM {table} ORDER BY position")
+        ]
+        if name not in ENTRIES:
+            return bodies[0] if bodies else None
+        (head,) = self.db.execute("SELECT head FROM views WHERE name = ?", (name,)).fetchone()
+        doc = json.loads(head)
+        doc[ENTRIES[name][0]] = bodies
+        return doc
+
+    def read(self, name: str):
+        """The document in name; None if there is none."""
+        with self._errors():
+            return self._assemble(name) if self._sync(name) else None
+
+    def write(self, name: str, doc) -> None:
+        with self._errors():
+            self._sync(name)
+            self._store(name, doc, self._stat(name), dirty=True)
+
+    def update_item(self, name: str, item_id: str, changes: dict) -> dict:
+        """Merges changes into the entry with item_id, in one transaction; returns the entry."""
+        if name not in ENTRIES:
+            raise StoreError(f"{name} has no entries")
+        with self._errors():
+            if not self._sync(name):
+                raise StoreError(f"{name} not found")
+            table = self._table(name)
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(
+                    f"SELECT position, body FROM {table} WHERE item_id = ?"
+                    " ORDER BY position LIMIT 1",
+                    (item_id,),
+                ).fetchone()
+                if row is None:
+                    raise StoreError(f"{name} has no entry {item_id}")
+                entry = {**json.loads(row[1]), **changes}
+                self.db.execute(
+                    f"UPDATE {table} SET body = ? WHERE position = ?", (json.dumps(entry), row[0])
+                )
+                self.db.execute("UPDATE views SET dirty = 1 WHERE name = ?", (name,))
+                self.db.execute("COMMIT")
+            except BaseException:
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+                raise
+        return entry
+
+    def export(self) -> list[str]:
+        """Writes the JSON view of every contract changed in the database; returns their names."""
+        with self._errors():
+            dirty = "SELECT name FROM views WHERE dirty = 1"
+            for (name,) in self.db.execute(dirty).fetchall():
+                self._sync(name)
+            names = [name for (name,) in self.db.execute(dirty)]
+            for name in names:
+                write_json(self.state_dir / name, self._assemble(name))
+                mtime_ns, size = self._stat(name)
+                self.db.execute(
+                    "UPDATE views SET mtime_ns = ?, size = ?, dirty = 0 WHERE name = ?",
+                    (mtime_ns, size, name),
+                )
+        return names
+
+    def close(self) -> None:
+        with self._errors():
+            self.db.close()
+
+
+def state_backend(env: dict) -> str:
+    backend = env.get("PAIRINGBUDDY_STATE_BACKEND") or "file"
+    if backend not in BACKENDS:
+        raise StoreError(
+            f"unknown PAIRINGBUDDY_STATE_BACKEND {backend!r} (expected {' or '.join(BACKENDS)})"
+        )
+    return backend
+
+
+def open_store(state_dir: Path, env: dict) -> FileStore | SqliteStore:
+    """The state store PAIRINGBUDDY_STATE_BACKEND selects (default: file)."""
+    if state_backend(env) == "sqlite":
+        return SqliteStore(state_dir)
+    return FileStore(state_dir)
@@ -0,0 +1,24 @@
+"""Workflow engine for the coding skill.
+
+Runs the control flow of the Workflow pseudocode in skills/coding/SKILL.md
+deterministically and hands the orchestrator only the steps that need an
+agent, the model or the human (`scripts/pairingbuddy workflow-next`).
+"""
+
+from pairingbuddy.workflow.engine import complete_step, next_steps, reset_workflow, resume_run
+from pairingbuddy.workflow.journal import JOURNAL_FILE, Journal, load_journal
+from pairingbuddy.workflow.program import Program, WorkflowError, load_program, parse_program
+
+__all__ = [
+    "JOURNAL_FILE",
+    "Journal",
+    "Program",
+    "WorkflowError",
+    "complete_step",
+    "load_journal",
+    "load_program",
+    "next_steps",
+    "parse_program",
+    "reset_workflow",
+    "resume_run",
+]
@@ -0,0 +1,800 @@
+"""Running the coding workflow one step at a time.
+
+next_steps runs the program from the top, replaying every step the journal
+holds, until it reaches steps that have not run yet. It then returns them for
+the orchestrator: agent invocations, or orchestrator functions that need the
+model or the human (_ask_human, Claude Code Tasks, the Solo report).
+complete_step records one as done; for an agent it reads the agent's output
+files into the journal, so later control flow (task type, coverage status,
+whether issues were found) is decided here, not by the model.
+
+The rest runs natively, journaled like any other step so a replay never
+repeats its side effects: batch and group planning, worktrees, review scopes,
+_not_green, the state file functions (_cleanup_state_files, _filter_pending,
+_mark_unit_answered) and the plan functions (_detect_plan_file,
+_read_plan_tasks, _next_unchecked_task, _mark_task_complete). _stop ends the
+run.
+
+Several steps come back at once where the workflow allows it: the agents of a
+`with _in_parallel():` block when PAIRINGBUDDY_PIPELINE=true, and up to n
+groups of a `for group in _plan_groups(tests, n):` loop.
+
+Values are the JSON documents of the state files. An attribute reads a key
+(None when absent). A document is false when it has list values and all of
+them are empty (no issues, nothing in review scope), and iterating one
+iterates its list. A state variable assigned a plain value (current_batch,
+spike_findings, the task of a plan step) is written to its state file before
+each agent runs, which also restores task.json after _cleanup_state_files.
+
+resume_run continues a run after an interruption (a crash, a new session).
+The journal holds the hashes of the state files each step read and wrote, so
+only the steps that saw a file changed since are redone; the rest of the task
+(scenarios, tests, the batches done) is kept.
+"""
+
+import ast
+import hashlib
+import json
+import operator
+import os
+import re
+from datetime import UTC, datetime
+from pathlib import Path
+
+from pairingbuddy.batches import BatchError, load_batches, load_groups
+from pairingbuddy.plan import PlanError, mark_task_complete, next_unchecked_task, read_plan_tasks
+from pairingbuddy.review import mark_reviewed, record_changes, review_scope
+from pairingbuddy.runner import ConfigError, write_json
+from pairingbuddy.state import (
+    KEPT_FILES,
+    StateError,
+    cleanup_state_files,
+    filter_pending,
+    mark_unit_answered,
+)
+from pairingbuddy.store import StoreError, open_store
+from pairingbuddy.workflow.journal import (
+    JOURNAL_FILE,
+    Journal,
+    load_journal,
+    save_journal,
+)
+from pairingbuddy.workflow.program import Program, WorkflowError, load_program
+from pairingbuddy.worktrees import WorktreeError, create_worktree, merge_worktree
+
+STATE_DIR = ".pairingbuddy"
+
+# Defaults for keys the workflow reads from optional state
+DEFAULTS = {"test_config": {"worktrees": 1}}
+
+# Loops whose iterations run side by side, up to the call's second argument at a time
+PARALLEL = {"_plan_groups"}
+
+# State variables holding a bare list, written under this key
+LIST_KEYS = {"current_batch": "batch"}
+
+# State files written by native steps, hashed into their journal entries
+NATIVE_WRITES = {
+    "_merge_worktree": ("test-state.json", "code-state.json"),
+    "_record_changes": ("files-changed.json",),
+    "_review_scope": ("review-scope.json",),
+    "_mark_unit_answered": ("spike-questions.json",),
+}
+
+COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_PLAN_PATH = re.compile(r"[\w./~-]+\.md\b")
+_CHECKBOX = re.compile(r"^\s*- \[[ xX]\] ", re.MULTILINE)
+
+
+class _Pending:
+    """Result of a step handed out in this call but not finished yet."""
+
+    def __repr__(self) -> str:
+        return "<pending>"
+
+
+PENDING = _Pending()
+
+
+# Control flow signals raised through the interpreter, not errors
+
+
+class _Suspend(Exception):  # noqa: N818
+    def __init__(self, steps: list[dict]):
+        self.steps = steps
+
+
+class _Stopped(Exception):  # noqa: N818
+    def __init__(self, message: str):
+        self.message = message
+
+
+class _Break(Exception):  # noqa: N818
+    pass
+
+
+class _Continue(Exception):  # noqa: N818
+    pass
+
+
+def _truthy(value) -> bool:
+    if value is PENDING:
+        raise WorkflowError("the workflow reads the result of a step that is still running")
+    if isinstance(value, dict):
+        lists = [item for item in value.values() if isinstance(item, list)]
+        return any(lists) if lists else bool(value)
+    return bool(value)
+
+
+def _items(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        lists = [item for item in value.values() if isinstance(item, list)]
+        if len(lists) != 1:
+            raise WorkflowError(f"cannot iterate over a document with keys {sorted(value)}")
+        return lists[0]
+    if isinstance(value, list | tuple):
+        return list(value)
+    _truthy(value)
+    raise WorkflowError(f"cannot iterate over {type(value).__name__}")
+
+
+def _read_doc(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _hashes(state_dir: Path, names) -> dict[str, str]:
+    """Content hashes of the state files that exist, by file name."""
+    hashes = {name: _hash(state_dir / name) for name in names}
+    return {name: digest for name, digest in hashes.items() if digest is not None}
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds")
+
+
+def _agent_result(base: Path, program: Program, agent: str):
+    docs = [_read_doc(base / name) for name in program.outputs(agent)]
+    return docs[0] if len(docs) == 1 else docs
+
+
+class _Run:
+    """One pass over the program."""
+
+    def __init__(
+        self, root: Path, state_dir: Path, program: Program, journal: Journal, environ: dict
+    ):
+        self.root = root
+        self.state_dir = state_dir
+        self.program = program
+        self.journal = journal
+        self.environ = environ
+        self.pipeline = environ.get("PAIRINGBUDDY_PIPELINE") == "true"
+        self.env: dict = {}
+        # State variables assigned plain values, written before each agent runs
+        self.written: set[str] = set()
+        self.functions: dict[str, ast.FunctionDef] = {}
+        # Test ids that went through implement_tests in this run
+        self.processed: set[str] = set()
+        # Test ids implemented in a worktree, by group id: processed once the group merges
+        self.unmerged: dict[str, set[str]] = {}
+        self.keys: list[list] = [["", 0]]
+        # Steps handed out together (a parallel block), or None
+        self.collecting: list[dict] | None = None
+
+    def run(self) -> dict:
+        try:
+            self._block(self.program.tree.body)
+        except _Suspend as suspend:
+            self.journal.pending = {step["step"]: step for step in suspend.steps}
+            save_journal(self.state_dir, self.journal)
+            return {"status": "run", "steps": suspend.steps}
+        except _Stopped as stopped:
+            save_journal(self.state_dir, self.journal)
+            return {"status": "stopped", "message": stopped.message}
+        except (_Break, _Continue):
+            raise WorkflowError("break or continue outside a loop") from None
+        save_journal(self.state_dir, self.journal)
+        return {"status": "done"}
+
+    # Statements
+
+    def _block(self, body: list[ast.stmt]) -> None:
+        for node in body:
+            self._exec(node)
+
+    def _exec(self, node: ast.stmt) -> None:
+        if isinstance(node, ast.Expr):
+            self._eval(node.value)
+        elif isinstance(node, ast.Assign):
+            value = self._eval(node.value)
+            plain = not isinstance(node.value, ast.Call)
+            for target in node.targets:
+                self._bind(target, value, plain)
+        elif isinstance(node, ast.If):
+            self._block(node.body if _truthy(self._eval(node.test)) else node.orelse)
+        elif isinstance(node, ast.While):
+            while _truthy(self._eval(node.test)):
+                if not self._iteration(node.body):
+                    break
+        elif isinstance(node, ast.For):
+            if isinstance(node.iter, ast.Call) and getattr(node.iter.func, "id", "") in PARALLEL:
+                self._group_loop(node)
+                return
+            for item in _items(self._eval(node.iter)):
+                self._bind(node.target, item, plain=True)
+                if not self._iteration(node.body):
+                    break
+        elif isinstance(node, ast.Break):
+            raise _Break
+        elif isinstance(node, ast.Continue):
+            raise _Continue
+        elif isinstance(node, ast.With):
+            self._with(node)
+        elif isinstance(node, ast.FunctionDef):
+            self.functions[node.name] = node
+        elif not isinstance(node, ast.Pass):
+            raise WorkflowError(f"line {node.lineno}: {type(node).__name__} is not supported")
+
+    def _iteration(self, body: list[ast.stmt]) -> bool:
+        """Runs one loop iteration; False on break."""
+        try:
+            self._block(body)
+        except _Break:
+            return False
+        except _Continue:
+            pass
+        return True
+
+    def _bind(self, target: ast.expr, value, plain: bool) -> None:
+        if isinstance(target, ast.Tuple):
+            values = [value] * len(target.elts) if value is PENDING else list(value)
+            if len(values) != len(target.elts):
+                raise WorkflowError(f"line {target.lineno}: cannot unpack {len(values)} values")
+            for element, item in zip(target.elts, values, strict=True):
+                self._bind(element, item, plain)
+            return
+        if not isinstance(target, ast.Name):
+            raise WorkflowError(f"line {target.lineno}: can only assign to names")
+        self.env[target.id] = value
+        if target.id in self.program.state_files:
+            if plain:
+                self.written.add(target.id)
+            else:
+                self.written.discard(target.id)
+
+    def _with(self, node: ast.With) -> None:
+        for item in node.items:
+            call = item.context_expr
+            if not (isinstance(call, ast.Call) and getattr(call.func, "id", "") == "_in_parallel"):
+                raise WorkflowError(f"line {node.lineno}: only `with _in_parallel():` is supported")
+        if not self.pipeline:
+            self._block(node.body)
+            return
+        outer, self.collecting = self.collecting, []
+        try:
+            self._block(node.body)
+        finally:
+            collected, self.collecting = self.collecting, outer
+        if collected:
+            if outer is None:
+                raise _Suspend(collected)
+            outer.extend(collected)
+
+    def _group_loop(self, node: ast.For) -> None:
+        """Runs the body once per group, up to n groups waiting on steps at a time."""
+        groups = _items(self._eval(node.iter))
+        args = node.iter.args
+        limit = (self._eval(args[1]) if len(args) > 1 else None) or len(groups)
+        key = self._next_key()
+        outer, self.collecting = self.collecting, None
+        waiting: list[dict] = []
+        started = 0
+        try:
+            for group in groups:
+                if started >= max(1, limit):
+                    break
+                self.keys.append([f"{key}.{group['group_id']}.", 0])
+                try:
+                    self._bind(node.target, group, plain=True)
+                    self._block(node.body)
+                except _Suspend as suspend:
+                    waiting.extend(suspend.steps)
+                    started += 1
+                finally:
+                    self.keys.pop()
+        finally:
+            self.collecting = outer
+        if waiting:
+            if outer is None:
+                raise _Suspend(waiting)
+            outer.extend(waiting)
+
+    # Expressions
+
+    def _eval(self, node: ast.expr):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self._lookup(node.id)
+        if isinstance(node, ast.Attribute):
+            value = self._eval(node.value)
+            if value is PENDING:
+                _truthy(value)
+            return value.get(node.attr) if isinstance(value, dict) else None
+        if isinstance(node, ast.Dict):
+            pairs = zip(node.keys, node.values, strict=True)
+            return {self._eval(key): self._eval(value) for key, value in pairs}
+        if isinstance(node, ast.List | ast.Tuple):
+            return [self._eval(element) for element in node.elts]
+        if isinstance(node, ast.JoinedStr):
+            return "".join(str(self._eval(value)) for value in node.values)
+        if isinstance(node, ast.FormattedValue):
+            return self._eval(node.value)
+        if isinstance(node, ast.BoolOp):
+            want = isinstance(node.op, ast.Or)
+            for operand in node.values:
+                value = self._eval(operand)
+                if _truthy(value) == want:
+                    return value
+            return value
+        if isinstance(node, ast.UnaryOp):
+            return not _truthy(self._eval(node.operand))
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left)
+            for op, comparator in zip(node.ops, node.comparators, strict=True):
+                right = self._eval(comparator)
+                if PENDING in (left, right):
+                    _truthy(PENDING)
+                try:
+                    if not COMPARISONS[type(op)](left, right):
+                        return False
+                except TypeError as e:
+                    raise WorkflowError(f"line {node.lineno}: {e}") from None
+                left = right
+            return True
+        if isinstance(node, ast.Call):
+            return self._call(node)
+        raise WorkflowError(f"line {node.lineno}: {type(node).__name__} is not supported")
+
+    def _lookup(self, name: str):
+        if name in self.env:
+            return self.env[name]
+        if name not in self.journal.inputs:
+            if name not in self.program.state_files:
+                raise WorkflowError(f"{name} is not defined")
+            path = self.state_dir / self.program.state_files[name]
+            doc = _read_doc(path)
+            if doc is None:
+                raise WorkflowError(f"{name} is not defined: {path} not found")
+            self.journal.inputs[name] = doc
+        value = self.journal.inputs[name]
+        if name in DEFAULTS:
+            value = {**DEFAULTS[name], **value}
+        self.env[name] = value
+        return value
+
+    # Calls and steps
+
+    def _call(self, node: ast.Call):
+        if not isinstance(node.func, ast.Name):
+            raise WorkflowError(f"line {node.lineno}: only plain function calls are supported")
+        name = node.func.id
+        if name in self.functions:
+            return self._function(self.functions[name], node)
+        if not name.startswith("_"):
+            return self._agent(name, node)
+        args = [self._eval(arg) for arg in node.args]
+        kwargs = {keyword.arg: self._eval(keyword.value) for keyword in node.keywords}
+        if name == "_stop":
+            raise _Stopped(str(args[0]) if args else "")
+        if name == "_in_parallel":
+            raise WorkflowError(f"line {node.lineno}: _in_parallel() needs a with statement")
+        if name in NATIVE:
+            return self._native(name, args, kwargs)
+        return self._orchestrator(name, args, kwargs)
+
+    def _function(self, definition: ast.FunctionDef, node: ast.Call):
+        params = [arg.arg for arg in definition.args.args]
+        if len(node.args) != len(params) or node.keywords:
+            raise WorkflowError(f"line {node.lineno}: {definition.name} takes {params}")
+        for param, arg in zip(params, node.args, strict=True):
+            self._bind(ast.Name(param, lineno=node.lineno), self._eval(arg), plain=True)
+        self._block(definition.body)
+
+    def _next_key(self) -> str:
+        frame = self.keys[-1]
+        frame[1] += 1
+        return f"{frame[0]}{frame[1] - 1}"
+
+    def _replay(self, call: str) -> tuple[str, dict | None]:
+        key = self._next_key()
+        record = self.journal.steps.get(key)
+        if record is not None and record["call"] != call:
+            raise WorkflowError(
+                f"step {key} is {record['call']} in the journal but {call} in the workflow; "
+                "run workflow-reset"
+            )
+        return key, record
+
+    def _suspend(self, step: dict):
+        if self.collecting is None:
+            raise _Suspend([step])
+        self.collecting.append(step)
+        return PENDING
+
+    def _agent(self, name: str, node: ast.Call):
+        key, record = self._replay(name)
+        agent = name.replace("_", "-")
+        if record is None:
+            kwargs = {keyword.arg: self._eval(keyword.value) for keyword in node.keywords}
+            step = {
+                "step": key,
+                "agent": agent,
+                "prompt": " ".join(f"{arg}={value}" for arg, value in kwargs.items()),
+            }
+            state_dir = self.state_dir
+            if kwargs.get("worktree"):
+                step["worktree"] = str(kwargs["worktree"])
+                state_dir = Path(step["worktree"]) / STATE_DIR
+            self._write_inputs(state_dir)
+            self._export_views()
+            if "worktree" not in step:
+                names = [arg.id for arg in node.args if isinstance(arg, ast.Name)]
+                files = {
+                    self.program.state_files[name]
+                    for name in [*names, *self.written]
+                    if name in self.program.state_files
+                }
+                self.journal.started[key] = {
+                    "inputs": _hashes(self.state_dir, sorted(files)),
+                    "started_at": _now(),
+                }
+            return self._suspend(step)
+        if agent == "implement-tests":
+            batch = {test["test_id"] for test in _items(self.env.get("current_batch"))}
+            worktree = next((k.value for k in node.keywords if k.arg == "worktree"), None)
+            if worktree is None:
+                self.processed.update(batch)
+            else:
+                self.unmerged.setdefault(Path(self._eval(worktree)).name, set()).update(batch)
+        result = record["result"]
+        return tuple(result) if len(self.program.outputs(agent)) > 1 else result
+
+    def _write_inputs(self, state_dir: Path) -> None:
+        for name in sorted(self.written):
+            value = self.env[name]
+            if value is None or value is PENDING:
+                continue
+            if isinstance(value, list):
+                value = {LIST_KEYS.get(name, name): value}
+            write_json(state_dir / self.program.state_files[name], value)
+
+    def _export_views(self) -> None:
+        """Writes state changed in the SQLite store back to its files before an agent reads them."""
+        try:
+            store = open_store(self.state_dir, self.environ)
+            try:
+                store.export()
+            finally:
+                store.close()
+        except StoreError as e:
+            raise WorkflowError(str(e)) from None
+
+    def _orchestrator(self, name: str, args: list, kwargs: dict):
+        key, record = self._replay(name)
+        if record is not None:
+            return record["result"]
+        if PENDING in args or PENDING in kwargs.values():
+            _truthy(PENDING)
+        step = {"step": key, "function": name, "args": args}
+        if kwargs:
+            step["kwargs"] = kwargs
+        return self._suspend(step)
+
+    def _native(self, name: str, args: list, kwargs: dict):
+        if name == "_cleanup_state_files":
+            # A new task starts (each task of a plan runs one): its tests are all pending
+            self.processed.clear()
+        key, record = self._replay(name)
+        if record is not None:
+            result = record["result"]
+        else:
+            try:
+                result = NATIVE[name](self, *args, **kwargs)
+            except (BatchError, ConfigError, PlanError, StateError, WorktreeError, TypeError) as e:
+                raise WorkflowError(f"{name}: {e}") from None
+            self.journal.steps[key] = {"call": name, "result": result}
+            if name in NATIVE_WRITES:
+                self.journal.steps[key]["outputs"] = _hashes(self.state_dir, NATIVE_WRITES[name])
+            save_journal(self.state_dir, self.journal)
+        if name == "_merge_worktree":
+            # A conflicting group applied nothing: its tests stay pending for the serial loop
+            tests = self.unmerged.pop(args[0]["group_id"], set())
+            if not result:
+                self.processed.update(tests)
+        return result
+
+
+# Orchestrator functions run by the engine itself
+
+
+def _skip(run: _Run, tests) -> set[str]:
+    """Test ids in tests.json that are not in tests."""
+    wanted = {test["test_id"] for test in _items(tests)}
+    listed = _items(_read_doc(run.state_dir / "tests.json") or {"tests": []})
+    return {test["test_id"] for test in listed} - wanted
+
+
+def _cleanup_state_files(run: _Run) -> dict:
+    return cleanup_state_files(run.state_dir, run.environ)
+
+
+def _filter_pending(run: _Run, doc) -> list:
+    if not (isinstance(doc, dict) and "units" in doc):
+        doc = {"tests": _items(doc)}
+    return filter_pending(doc, run.processed)
+
+
+def _mark_unit_answered(run: _Run, spike_questions, unit_id: str) -> str:
+    return mark_unit_answered(run.state_dir, unit_id, run.environ)["status"]
+
+
+def _plan_batches(run: _Run, tests) -> list[dict]:
+    return load_batches(run.state_dir, _skip(run, tests))
+
+
+def _plan_groups(run: _Run, tests, n: int | None = None) -> list[dict]:
+    return load_groups(run.root, run.state_dir, _skip(run, tests))
+
+
+def _create_worktree(run: _Run, group: dict) -> str:
+    return str(create_worktree(run.root, run.state_dir, group["group_id"]))
+
+
+def _merge_worktree(run: _Run, group: dict) -> list[str]:
+    return merge_worktree(run.root, run.state_dir, group["group_id"])
+
+
+def _record_changes(run: _Run, code_state=None) -> int:
+    return len(record_changes(run.root, run.state_dir))
+
+
+def _review_scope(run: _Run, skip=None, full: bool = False) -> dict:
+    files = {test["test_file"] for test in _items(skip)}
+    return review_scope(run.root, run.state_dir, files, full)
+
+
+def _mark_reviewed(run: _Run, scope) -> int:
+    return mark_reviewed(run.root, run.state_dir) if _truthy(scope) else 0
+
+
+def _full_review_requested(run: _Run) -> bool:
+    return run.environ.get("PAIRINGBUDDY_FULL_REVIEW") == "true"
+
+
+def _pipelining(run: _Run) -> bool:
+    return run.pipeline
+
+
+def _not_green(run: _Run, batch, code_state) -> list[dict]:
+    tests = _items(batch)
+    if len(tests) < 2:
+        return []
+    passing = {r["test_id"] for r in _items(code_state) if r.get("status") == "passing"}
+    wrong = {
+        r["test_id"]
+        for r in _items(run.env.get("test_state"))
+        if r.get("status") in ("failing_wrong_reason", "error")
+    }
+    return [t for t in tests if t["test_id"] not in passing or t["test_id"] in wrong]
+
+
+def _detect_plan_file(run: _Run, task) -> str | bool:
+    """Path of a plan MD (one with checkbox tasks) the task refers to, else False."""
+    text = " ".join(str(task.get(key) or "") for key in ("description", "context"))
+    for candidate in _PLAN_PATH.findall(text):
+        path = (run.root / Path(candidate).expanduser()).resolve()
+        try:
+            if _CHECKBOX.search(path.read_text(errors="replace")):
+                return str(path)
+        except OSError:
+            continue
+    return False
+
+
+def _read_plan_tasks(run: _Run, plan_path: str) -> list[dict]:
+    return read_plan_tasks(Path(plan_path))
+
+
+def _next_unchecked_task(run: _Run, plan_tasks) -> dict | None:
+    return next_unchecked_task(_items(plan_tasks))
+
+
+def _mark_task_complete(run: _Run, plan_path: str, index: int) -> bool:
+    return mark_task_complete(Path(plan_path), index)
+
+
+NATIVE = {
+    "_cleanup_state_files": _cleanup_state_files,
+    "_filter_pending": _filter_pending,
+    "_mark_unit_answered": _mark_unit_answered,
+    "_plan_batches": _plan_batches,
+    "_plan_groups": _plan_groups,
+    "_create_worktree": _create_worktree,
+    "_merge_worktree": _merge_worktree,
+    "_record_changes": _record_changes,
+    "_review_scope": _review_scope,
+    "_mark_reviewed": _mark_reviewed,
+    "_full_review_requested": _full_review_requested,
+    "_pipelining": _pipelining,
+    "_not_green": _not_green,
+    "_detect_plan_file": _detect_plan_file,
+    "_read_plan_tasks": _read_plan_tasks,
+    "_next_unchecked_task": _next_unchecked_task,
+    "_mark_task_complete": _mark_task_complete,
+}
+
+
+# Entry points
+
+
+def next_steps(
+    root: Path, state_dir: Path, program: Program | None = None, environ: dict | None = None
+) -> dict:
+    """The steps to carry out next: {"status": "run", "steps": [...]}, "stopped" or "done".
+
+    Steps handed out earlier and not completed yet are returned again as they are.
+    """
+    program = program or load_program()
+    journal = load_journal(state_dir)
+    if journal is None:
+        journal = Journal(program.digest)
+    elif journal.program != program.digest:
+        raise WorkflowError("the workflow changed since this run started; run workflow-reset")
+    if journal.pending:
+        return {"status": "run", "steps": list(journal.pending.values())}
+    run = _Run(root, state_dir, program, journal, dict(os.environ if environ is None else environ))
+    return run.run()
+
+
+def complete_step(state_dir: Path, key: str, result=None, program: Program | None = None) -> dict:
+    """Records a pending step as done and returns its journal entry.
+
+    An agent's result is read from its output files; an orchestrator
+    function's result is the value given (e.g. the answer to _ask_human).
+    """
+    program = program or load_program()
+    journal = load_journal(state_dir)
+    if journal is None:
+        raise WorkflowError(f"no workflow run in {state_dir / JOURNAL_FILE}")
+    step = journal.pending.pop(key, None)
+    if step is None:
+        raise WorkflowError(f"step {key} is not pending")
+    if "agent" not in step:
+        journal.steps[key] = {"call": step["function"], "result": result}
+        save_journal(state_dir, journal)
+        return journal.steps[key]
+    agent = step["agent"]
+    started = journal.started.pop(key, {})
+    base = Path(step["worktree"]) / STATE_DIR if "worktree" in step else state_dir
+    entry = {"call": agent.replace("-", "_"), "result": _agent_result(base, program, agent)}
+    entry["agent"] = agent
+    if "worktree" not in step:
+        entry["inputs"] = started.get("inputs", {})
+        entry["outputs"] = _hashes(state_dir, program.outputs(agent))
+    if "started_at" in started:
+        entry["started_at"] = started["started_at"]
+    entry["completed_at"] = _now()
+    journal.steps[key] = entry
+    save_journal(state_dir, journal)
+    return entry
+
+
+def _stale_steps(state_dir: Path, journal: Journal, program: Program) -> tuple[int | None, list]:
+    """Where to redo the run from, as an index into journal.steps, and the changed files.
+
+    A state file has changed when its content differs from the last version a
+    completed step read or wrote. The steps from the first one that saw that
+    version are redone. If an agent wrote it, the agent's result is read again
+    from the file and only the steps after it are redone. Outputs of pending
+    agents are expected to change, and a file no agent writes may be missing:
+    the engine writes its value again before the next agent runs.
+    """
+    # File -> (hash, key of the first step that saw it, whether an agent wrote it)
+    seen: dict[str, tuple[str, str, bool]] = {}
+    for key, record in journal.steps.items():
+        if record["call"] == "_cleanup_state_files":
+            # Agent outputs are gone; files the engine writes come back as they were
+            seen = {
+                name: entry for name, entry in seen.items() if name in KEPT_FILES or not entry[2]
+            }
+        for kind in ("inputs", "outputs"):
+            for name, digest in record.get(kind, {}).items():
+                if name not in seen or seen[name][0] != digest:
+                    seen[name] = (digest, key, kind == "outputs" and "agent" in record)
+    expected = {
+        name
+        for step in journal.pending.values()
+        if "agent" in step
+        for name in program.outputs(step["agent"])
+    }
+    keys = list(journal.steps)
+    redo = None
+    changed = []
+    for name, (digest, key, written) in sorted(seen.items()):
+        current = _hash(state_dir / name)
+        if name in expected or current == digest or (current is None and not written):
+            continue
+        changed.append(name)
+        index = keys.index(key)
+        if written and current is not None:
+            record = journal.steps[key]
+            record["result"] = _agent_result(state_dir, program, record["agent"])
+            record["outputs"][name] = current
+            index += 1
+        redo = index if redo is None else min(redo, index)
+    return redo, changed
+
+
+def resume_run(
+    root: Path, state_dir: Path, program: Program | None = None, environ: dict | None = None
+) -> dict:
+    """Continues an interrupted run: next_steps, after dropping the steps to redo.
+
+    Completed steps whose state files are as they left them are kept, so the run
+    carries on at the batch where it stopped. The result adds "resumed": the
+    key of the first step redone (None if none) and the changed files.
+    """
+    program = program or load_program()
+    journal = load_journal(state_dir)
+    if journal is None:
+        raise WorkflowError(f"no workflow run to resume in {state_dir / JOURNAL_FILE}")
+    if journal.program != program.digest:
+        raise WorkflowError("the workflow changed since this run started; run workflow-reset")
+    redo, changed = _stale_steps(state_dir, journal, program)
+    redo_from = None
+    if redo is not None:
+        keys = list(journal.steps)
+        redo_from = keys[redo] if redo < len(keys) else None
+        journal.steps = {key: journal.steps[key] for key in keys[:redo]}
+        journal.pending = {}
+        journal.started = {}
+    for name, file_name in program.state_files.items():
+        if file_name in changed:
+            journal.inputs.pop(name, None)
+    save_journal(state_dir, journal)
+    result = next_steps(root, state_dir, program, environ)
+    return {**result, "resumed": {"redo_from": redo_from, "changed": changed}}
+
+
+def reset_workflow(state_dir: Path) -> bool:
+    """Forgets the current run; False if there was none."""
+    try:
+        (state_dir / JOURNAL_FILE).unlink()
+    except FileNotFoundError:
+        return False
+    return True
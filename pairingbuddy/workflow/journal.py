@@ -0,0 +1,80 @@
+"""The record of a workflow run: .pairingbuddy/workflow/journal.json.
+
+The engine re-runs the program from the top on every call and replays each
+step already in the journal instead of repeating it, so the journal alone
+holds the run's progress. It lives below workflow/, so _cleanup_state_files
+(which deletes only top-level state files) leaves it alone.
+
+    {
+      "version": 1,
+      "program": "<sha256 of the pseudocode>",
+      "inputs": {"task": {...}, "test_config": {...}},
+      "steps": {
+        "4": {
+          "call": "classify_task",
+          "result": {...},
+          "agent": "classify-task",
+          "inputs": {"task.json": "<sha256>"},
+          "outputs": {"task-classification.json": "<sha256>"},
+          "started_at": "2026-01-05T10:00:00+00:00",
+          "completed_at": "2026-01-05T10:01:12+00:00"
+        }
+      },
+      "pending": {"5": {"step": "5", "agent": "enumerate-scenarios-and-test-cases", ...}},
+      "started": {"5": {"inputs": {...}, "started_at": "..."}}
+    }
+
+A step is written ahead: when it is handed out, with the hashes of the state
+files it reads (started), and again when it completes, with the hashes of the
+files it wrote. Native steps that write state files record their outputs too.
+Resuming compares these hashes with the files on disk (see resume_run).
+
+Step keys count calls in program order; calls inside a parallel group loop
+are keyed "<loop step>.<group id>.<n>".
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pairingbuddy.runner import write_json
+
+JOURNAL_FILE = Path("workflow") / "journal.json"
+JOURNAL_VERSION = 1
+
+
+@dataclass
+class Journal:
+    program: str
+    inputs: dict = field(default_factory=dict)
+    steps: dict[str, dict] = field(default_factory=dict)
+    pending: dict[str, dict] = field(default_factory=dict)
+    # Input hashes and start time of pending agent steps, by step key
+    started: dict[str, dict] = field(default_factory=dict)
+
+
+def load_journal(state_dir: Path) -> Journal | None:
+    """The journal in state_dir; None if there is none or it is unreadable."""
+    try:
+        raw = json.loads((state_dir / JOURNAL_FILE).read_text())
+        if raw.get("version") != JOURNAL_VERSION:
+            return None
+        return Journal(
+            raw["program"], raw["inputs"], raw["steps"], raw["pending"], raw.get("started", {})
+        )
+    except (OSError, json.JSONDecodeError, KeyError, AttributeError):
+        return None
+
+
+def save_journal(state_dir: Path, journal: Journal) -> None:
+    write_json(
+        state_dir / JOURNAL_FILE,
+        {
+            "version": JOURNAL_VERSION,
+            "program": journal.program,
+            "inputs": journal.inputs,
+            "steps": journal.steps,
+            "pending": journal.pending,
+            "started": journal.started,
+        },
+    )
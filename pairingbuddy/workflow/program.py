@@ -0,0 +1,117 @@
+"""The coding workflow as the engine reads it.
+
+The program is the python block of the Workflow section in
+skills/coding/SKILL.md, the same pseudocode the orchestrator used to follow by
+hand, so the engine and the documented workflow cannot drift apart. Variables
+map to state files through the State File Mappings table of the same skill,
+and an agent's return value is the file(s) its Output section writes.
+"""
+
+import ast
+import functools
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parent.parent.parent
+SKILL = PLUGIN_ROOT / "skills" / "coding" / "SKILL.md"
+AGENTS_DIR = PLUGIN_ROOT / "agents"
+
+# Statements and expressions the pseudocode may use
+SUPPORTED = (
+    ast.Module,
+    ast.FunctionDef,
+    ast.arguments,
+    ast.arg,
+    ast.If,
+    ast.For,
+    ast.While,
+    ast.Break,
+    ast.Continue,
+    ast.Pass,
+    ast.With,
+    ast.withitem,
+    ast.Expr,
+    ast.Assign,
+    ast.Call,
+    ast.keyword,
+    ast.Name,
+    ast.Attribute,
+    ast.Constant,
+    ast.Dict,
+    ast.List,
+    ast.Tuple,
+    ast.JoinedStr,
+    ast.FormattedValue,
+    ast.BoolOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.expr_context,
+    ast.boolop,
+    ast.cmpop,
+    ast.Not,
+)
+
+_WORKFLOW = re.compile(r"^## Workflow\s*$(.*?)^```python\n(.*?)^```", re.DOTALL | re.MULTILINE)
+_MAPPING_ROW = re.compile(r"^\| (\w+) \| \.pairingbuddy/([\w.-]+\.json) \|", re.MULTILINE)
+_OUTPUT = re.compile(r"^## Output\s*$(.*?)(?=^## |\Z)", re.DOTALL | re.MULTILINE)
+_WRITES = re.compile(r"(?:[Ww]rites|[Aa]ppends) to `\.pairingbuddy/([\w.-]+\.json)`")
+
+
+class WorkflowError(Exception):
+    """The workflow cannot be loaded or run."""
+
+
+@dataclass(frozen=True)
+class Program:
+    tree: ast.Module
+    # sha256 of the pseudocode: a journal only replays against the program it ran
+    digest: str
+    # Variable name -> state file name in .pairingbuddy/
+    state_files: dict[str, str]
+    agents_dir: Path = AGENTS_DIR
+
+    def outputs(self, agent: str) -> list[str]:
+        """State files the agent writes, in the order of its Output section."""
+        return _outputs(self.agents_dir, agent)
+
+
+@functools.cache
+def _outputs(agents_dir: Path, agent: str) -> list[str]:
+    try:
+        text = (agents_dir / f"{agent}.md").read_text()
+    except OSError:
+        raise WorkflowError(f"unknown agent {agent}") from None
+    section = _OUTPUT.search(text)
+    return list(dict.fromkeys(_WRITES.findall(section.group(1) if section else "")))
+
+
+def parse_program(
+    source: str, state_files: dict[str, str], agents_dir: Path = AGENTS_DIR
+) -> Program:
+    """Program for pseudocode source; WorkflowError if it uses unsupported syntax."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        raise WorkflowError(f"workflow pseudocode line {e.lineno}: {e.msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, SUPPORTED):
+            raise WorkflowError(
+                f"workflow pseudocode line {getattr(node, 'lineno', '?')}: "
+                f"{type(node).__name__} is not supported"
+            )
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    return Program(tree, digest, state_files, agents_dir)
+
+
+def load_program(skill: Path = SKILL, agents_dir: Path = AGENTS_DIR) -> Program:
+    """The workflow of the coding skill."""
+    try:
+        text = skill.read_text()
+    except OSError as e:
+        raise WorkflowError(f"cannot read {skill}: {e}") from None
+    match = _WORKFLOW.search(text)
+    if not match:
+        raise WorkflowError(f"{skill} has no python block in its Workflow section")
+    return parse_program(match.group(2), dict(_MAPPING_ROW.findall(text)), agents_dir)
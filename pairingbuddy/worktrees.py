@@ -0,0 +1,166 @@
+"""Git worktrees for running independent RED-GREEN groups in parallel.
+
+create_worktree snapshots the project's working tree into a commit that no
+branch points to, uncommitted and untracked files included, and checks it
+out as a detached worktree in .pairingbuddy/worktrees/<group_id>/. The state
+files agents read (SHARED_STATE) are copied into the worktree's own
+.pairingbuddy/, so agents pointed at the worktree find everything they need.
+
+merge_worktree snapshots the worktree the same way and applies its diff
+against the base snapshot to the project tree. The patch is checked before
+anything is written: if the project tree changed under it since the worktree
+was created (typically another group merged edits to the same lines, or
+created the same file), nothing is applied and the conflicting files are
+returned, so the orchestrator can redo the group serially. The worktree is
+removed either way.
+
+Snapshots are built with a temporary index file, so the user's branch, index
+and stash are never touched.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from pairingbuddy.runner import write_json
+
+STATE_DIR = ".pairingbuddy"
+WORKTREES_DIR = Path("worktrees")
+
+# Copied into each worktree when it is created
+SHARED_STATE = ("test-config.json", "human-guidance.json", "scenarios.json", "tests.json")
+# Agent results copied back on merge; entries replace those with the same test_id
+MERGED_STATE = ("test-state.json", "code-state.json")
+
+SNAPSHOT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "pairingbuddy",
+    "GIT_AUTHOR_EMAIL": "pairingbuddy@localhost",
+    "GIT_COMMITTER_NAME": "pairingbuddy",
+    "GIT_COMMITTER_EMAIL": "pairingbuddy@localhost",
+}
+
+APPLY_ERROR = re.compile(r"^error: (?:patch failed: )?(.+?)(?::\d+)?(?:: .*)?$", re.M)
+
+
+class WorktreeError(Exception):
+    """A git command failed, or the group's worktree does not exist."""
+
+
+def _git(cwd: Path, *args: str, env: dict | None = None, stdin: str | None = None) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, env=env, input=stdin
+    )
+    if result.returncode != 0:
+        raise WorktreeError(f"git {args[0]}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def toplevel(root: Path) -> Path:
+    """The root of the git repository holding root."""
+    return Path(_git(root, "rev-parse", "--show-toplevel").strip())
+
+
+def snapshot(tree: Path, parent: str) -> str:
+    """Commit of tree's working files outside .pairingbuddy/, with parent as its parent."""
+    with tempfile.TemporaryDirectory(prefix="pairingbuddy-index-") as tmp:
+        index = Path(tmp) / "index"
+        real_index = tree / _git(tree, "rev-parse", "--git-path", "index").strip()
+        if real_index.exists():
+            # Starting from the real index keeps git's stat cache: unchanged files aren't
+            # hashed. copy2 keeps its mtime, which git needs to spot racily clean entries
+            shutil.copy2(real_index, index)
+        env = {**os.environ, "GIT_INDEX_FILE": str(index)}
+        # git add refuses an explicit pathspec for ignored paths, so the state directory
+        # is only excluded by pathspec when no ignore rule keeps it out already
+        ignored = (
+            subprocess.run(
+                ["git", "check-ignore", "-q", STATE_DIR], cwd=tree, capture_output=True
+            ).returncode
+            == 0
+        )
+        exclude = [] if ignored else [f":(exclude){STATE_DIR}"]
+        _git(tree, "add", "-A", "--", ".", *exclude, env=env)
+        written = _git(tree, "write-tree", env=env).strip()
+    env = {**os.environ, **SNAPSHOT_IDENTITY}
+    commit = ["commit-tree", written, "-p", parent, "--no-gpg-sign", "-m", "pairingbuddy snapshot"]
+    return _git(tree, *commit, env=env).strip()
+
+
+def _metadata(state_dir: Path, group_id: str) -> Path:
+    return state_dir / WORKTREES_DIR / f"{group_id}.json"
+
+
+def create_worktree(root: Path, state_dir: Path, group_id: str) -> Path:
+    """Checks out the current project tree in a new worktree for group_id; returns its path."""
+    path = state_dir / WORKTREES_DIR / group_id
+    if path.exists():
+        raise WorktreeError(f"worktree for {group_id} already exists: {path}")
+    repo = toplevel(root)
+    try:
+        head = _git(repo, "rev-parse", "--verify", "HEAD").strip()
+    except WorktreeError:
+        raise WorktreeError("the project has no commits yet") from None
+    base = snapshot(repo, head)
+    _git(repo, "worktree", "add", "--detach", str(path), base)
+
+    (path / STATE_DIR).mkdir(exist_ok=True)
+    for name in SHARED_STATE:
+        if (state_dir / name).exists():
+            shutil.copyfile(state_dir / name, path / STATE_DIR / name)
+    write_json(_metadata(state_dir, group_id), {"path": str(path), "base": base})
+    return path
+
+
+def _merge_results(source: Path, target: Path) -> None:
+    try:
+        incoming = json.loads(source.read_text())["results"]
+    except (OSError, json.JSONDecodeError, KeyError):
+        return
+    try:
+        results = json.loads(target.read_text())["results"]
+    except (OSError, json.JSONDecodeError, KeyError):
+        results = []
+    replaced = {entry.get("test_id") for entry in incoming}
+    results = [entry for entry in results if entry.get("test_id") not in replaced]
+    write_json(target, {"results": results + incoming})
+
+
+def merge_worktree(root: Path, state_dir: Path, group_id: str) -> list[str]:
+    """Applies group_id's changes to the project tree and removes its worktree.
+
+    Returns the conflicting files; when there are any, nothing was applied.
+    """
+    try:
+        metadata = json.loads(_metadata(state_dir, group_id).read_text())
+    except (OSError, json.JSONDecodeError):
+        raise WorktreeError(f"no worktree for {group_id}") from None
+    path, base = Path(metadata["path"]), metadata["base"]
+    repo = toplevel(root)
+
+    done = snapshot(path, base)
+    patch = _git(path, "diff", "--binary", base, done)
+    conflicts = []
+    if patch:
+        check = subprocess.run(
+            ["git", "apply", "--check", "--binary", "-"],
+            cwd=repo,
+            input=patch,
+            capture_output=True,
+            text=True,
+        )
+        if check.returncode != 0:
+            touched = _git(path, "diff", "--name-only", base, done).split()
+            conflicts = sorted(set(APPLY_ERROR.findall(check.stderr)) & set(touched)) or touched
+        else:
+            _git(repo, "apply", "--binary", "-", stdin=patch)
+    if not conflicts:
+        for name in MERGED_STATE:
+            _merge_results(path / STATE_DIR / name, state_dir / name)
+
+    _git(repo, "worktree", "remove", "--force", str(path))
+    _metadata(state_dir, group_id).unlink()
+    return conflicts
@@ -21,6 +21,11 @@ MAX_RETRIES=5
 USE_API_KEY=false
 STATUS_FILE=".pairingbuddy/solo-status"
 RENDER_INTERVAL=0.08
+# Redraw delays (seconds) while no watched file changes: the renderer moves one
+# step down the list per quiet frame and returns to the first on any change.
+RENDER_BACKOFF=("$RENDER_INTERVAL" 0.16 0.32 0.64 1)
+# Most plan tasks shown at once; the rest are summarised as "… N earlier/more"
+RENDER_VIEWPORT=15
 
 # Build invocation arguments
 CLAUDE_ARGS=(-p --dangerously-skip-permissions --output-format json)
@@ -160,7 +165,9 @@ fi
 
 export PAIRINGBUDDY_SOLO=true
 export PAIRINGBUDDY_SOLO_MAX_RETRIES="$MAX_RETRIES"
-export PAIRINGBUDDY_PLAN_PATH="$PLAN_FILE"
+# Absolute, so the hooks key the plan index (.pairingbuddy/cache/plan-index.json)
+# by the same path the renderer looks it up with
+export PAIRINGBUDDY_PLAN_PATH="$(cd "$(dirname "$PLAN_FILE")" && pwd)/$(basename "$PLAN_FILE")"
 export FORCE_COLOR=1
 
 BRANCH=$(git branch --show-current)
@@ -171,23 +178,68 @@ if [[ "$BRANCH" == "main" || "$BRANCH" == "master" ]]; then
 fi
 
 LAST_RENDER_LINES=0
+LAST_FRAME_LINES=()
 SPINNER_INDEX=0
+PLAN_TASKS_LOADED=""
+PLAN_TASK_STATES=()
+PLAN_TASK_TEXTS=()
 FINAL_RENDERED=""
 
+# Fill the arrays named $1 (task states: true/false) and $2 (task texts) with
+# the plan's tasks: from the hook's plan index when it is newer than the plan
+# and was written for it (its path matches PAIRINGBUDDY_PLAN_PATH, or the
+# plan made absolute), otherwise from the plan itself. Shared by
+# render_status and write_final_status. Array names are assigned with eval
+# (no namerefs on bash 3); the values themselves are never evaluated.
+load_plan_tasks() {
+    local states_var="$1" texts_var="$2"
+    local plan_index=".pairingbuddy/cache/plan-index.json"
+    local plan_abs="${PAIRINGBUDDY_PLAN_PATH:-$PLAN_FILE}"
+    [[ "$plan_abs" == /* ]] || plan_abs="$PWD/${plan_abs#./}"
+    local from_index=false line task_state task_text
+    eval "$states_var=(); $texts_var=()"
+    if [[ "$plan_index" -nt "$PLAN_FILE" ]]; then
+        while IFS= read -r line; do
+            if [[ "$line" =~ ^\ *\"path\":\ \"(.*)\",?$ ]]; then
+                [[ "${BASH_REMATCH[1]}" == "$plan_abs" ]] || break
+                from_index=true
+            elif [[ "$from_index" == "true" && "$line" =~ \"checked\":(true|false),\"text\":\"(.*)\"\},?$ ]]; then
+                task_state="${BASH_REMATCH[1]}"
+                task_text="${BASH_REMATCH[2]}"
+                task_text="${task_text//'\\'/$'\001'}"
+                task_text="${task_text//'\"'/\"}"
+                task_text="${task_text//'\t'/$'\t'}"
+                task_text="${task_text//$'\001'/\\}"
+                eval "$states_var+=(\"\$task_state\"); $texts_var+=(\"\$task_text\")"
+            fi
+        done < "$plan_index"
+    fi
+    [[ "$from_index" == "true" ]] && return 0
+    eval "$states_var=(); $texts_var=()"
+    while IFS= read -r line || [[ -n "$line" ]]; do
+        if [[ "$line" =~ ^[[:blank:]]*-\ \[([\ x])\]\ (.*)$ ]]; then
+            task_text="${BASH_REMATCH[2]}"
+            # Strip markdown: **, *, `
+            task_text="${task_text//\*\*/}"
+            task_text="${task_text//\*/}"
+            task_text="${task_text//\`/}"
+            task_text="${task_text#"${task_text%%[![:space:]]*}"}"
+            task_text="${task_text%"${task_text##*[![:space:]]}"}"
+            task_state=false
+            [[ "${BASH_REMATCH[1]}" == "x" ]] && task_state=true
+            eval "$states_var+=(\"\$task_state\"); $texts_var+=(\"\$task_text\")"
+        fi
+    done < "$PLAN_FILE"
+}
+
 render_status() {
     local spinner_chars=(⠋ ⠙ ⠹ ⠸ ⠼ ⠴ ⠦ ⠧ ⠇ ⠏)
     local spinner_count=${#spinner_chars[@]}
 
-    # Advance spinner
-    local spinner_index_file=".pairingbuddy/.solo-spinner-index"
-    mkdir -p .pairingbuddy 2>/dev/null || true
-    local idx=0
-    if [[ -f "$spinner_index_file" ]]; then
-        idx=$(cat "$spinner_index_file" 2>/dev/null || echo 0)
-    fi
+    # Advance spinner (in memory: the renderer loop keeps SPINNER_INDEX between frames)
+    local idx=$(( ${SPINNER_INDEX:-0} % spinner_count ))
     local spinner_char="${spinner_chars[$idx]}"
-    local next_idx=$(( (idx + 1) % spinner_count ))
-    printf '%d' "$next_idx" > "$spinner_index_file"
+    SPINNER_INDEX=$(( (idx + 1) % spinner_count ))
 
     # ANSI colors
     local green="" cyan="" dim="" bold="" bold_white="" reset=""
@@ -203,41 +255,65 @@ render_status() {
     local NL=$'\n'
     local content=""
 
-    # Read plan file for task list and progress
+    # Read plan tasks (load_plan_tasks) once per plan or plan index change.
+    # Parsed tasks are kept in PLAN_TASK_STATES / PLAN_TASK_TEXTS between
+    # frames, and the stamp file marks when they were loaded.
     if [[ -f "$PLAN_FILE" ]]; then
-        local completed=0 total=0
+        local plan_index=".pairingbuddy/cache/plan-index.json"
+        local plan_stamp=".pairingbuddy/.solo-plan-stamp"
+        if [[ "${PLAN_TASKS_LOADED:-}" != "true" || ! "$plan_stamp" -nt "$PLAN_FILE" ]] \
+            || [[ -f "$plan_index" && ! "$plan_stamp" -nt "$plan_index" ]]; then
+            : > "$plan_stamp" 2>/dev/null || true
+            load_plan_tasks PLAN_TASK_STATES PLAN_TASK_TEXTS
+            PLAN_TASKS_LOADED=true
+        fi
+
+        local completed=0 total=${#PLAN_TASK_STATES[@]}
         local task_lines=()
         local first_incomplete=true
-
-        while IFS= read -r line || [[ -n "$line" ]]; do
-            if [[ "$line" =~ ^\-\ \[x\]\ (.*)$ ]]; then
-                local task_text="${BASH_REMATCH[1]}"
-                task_text="${task_text//\*\*/}"
-                task_text="${task_text//\*/}"
-                task_text="${task_text//\`/}"
+        local current_task=$(( total - 1 ))
+        local t=0
+        while [[ $t -lt $total ]]; do
+            local task_text="${PLAN_TASK_TEXTS[$t]}"
+            if [[ "${PLAN_TASK_STATES[$t]}" == "true" ]]; then
                 task_lines+=("  ${green}✓${reset} ${task_text}")
                 completed=$(( completed + 1 ))
-                total=$(( total + 1 ))
-            elif [[ "$line" =~ ^\-\ \[\ \]\ (.*)$ ]]; then
-                local task_text="${BASH_REMATCH[1]}"
-                task_text="${task_text//\*\*/}"
-                task_text="${task_text//\*/}"
-                task_text="${task_text//\`/}"
-                if [[ "$first_incomplete" == "true" ]]; then
-                    task_lines+=("  ${cyan}→${reset} ${bold_white}${task_text}${reset}")
-                    first_incomplete=false
-                else
-                    task_lines+=("  ${dim}○ ${task_text}${reset}")
-                fi
-                total=$(( total + 1 ))
+            elif [[ "$first_incomplete" == "true" ]]; then
+                task_lines+=("  ${cyan}→${reset} ${bold_white}${task_text}${reset}")
+                first_incomplete=false
+                current_task=$t
+            else
+                task_lines+=("  ${dim}○ ${task_text}${reset}")
             fi
-        done < "$PLAN_FILE"
+            t=$(( t + 1 ))
+        done
 
-        # Build task list
-        if [[ ${#task_lines[@]} -gt 0 ]]; then
-            for tl in "${task_lines[@]}"; do
-                content="${content}${tl}${NL}"
+        # Build task list, capped to a RENDER_VIEWPORT window that keeps a few
+        # finished tasks above the current one
+        if [[ $total -gt 0 ]]; then
+            local viewport=${RENDER_VIEWPORT:-15}
+            local first=0 last=$(( total - 1 ))
+            if [[ $total -gt $viewport ]]; then
+                first=$(( current_task - viewport / 4 ))
+                if [[ $first -gt $(( total - viewport )) ]]; then
+                    first=$(( total - viewport ))
+                fi
+                if [[ $first -lt 0 ]]; then
+                    first=0
+                fi
+                last=$(( first + viewport - 1 ))
+            fi
+            if [[ $first -gt 0 ]]; then
+                content="${content}  ${dim}… ${first} earlier${reset}${NL}"
+            fi
+            t=$first
+            while [[ $t -le $last ]]; do
+                content="${content}${task_lines[$t]}${NL}"
+                t=$(( t + 1 ))
             done
+            if [[ $last -lt $(( total - 1 )) ]]; then
+                content="${content}  ${dim}… $(( total - 1 - last )) more${reset}${NL}"
+            fi
             content="${content}${NL}"
         fi
 
@@ -258,13 +334,31 @@ render_status() {
         content="${content}[${completed}/${total}] ${cyan}${filled_str}${reset}${dim}${empty_str}${reset} ${pct_str}${NL}"
     fi
 
-    # Read agent info from guardian session file
+    # Read agent info from the session named by the guardian's active-session
+    # pointer; without a pointer, fall back to the newest session file
     local agent_name="" agent_desc=""
-    local hooks_file
-    hooks_file=$(ls -t .pairingbuddy/hooks/*.json 2>/dev/null | head -1 || true)
-    if [[ -n "$hooks_file" && -f "$hooks_file" ]]; then
-        agent_name=$(grep -o '"lastAgent"[[:space:]]*:[[:space:]]*"[^"]*"' "$hooks_file" 2>/dev/null | sed 's/.*: *"//;s/"$//' || true)
-        agent_desc=$(grep -o '"lastDescription"[[:space:]]*:[[:space:]]*"[^"]*"' "$hooks_file" 2>/dev/null | sed 's/.*: *"//;s/"$//' || true)
+    local hooks_file="" session_id="" session_file
+    if [[ -f .pairingbuddy/hooks/active-session ]]; then
+        IFS= read -r session_id < .pairingbuddy/hooks/active-session || true
+    fi
+    if [[ "$session_id" =~ ^[A-Za-z0-9._-]+$ && -f ".pairingbuddy/hooks/${session_id}.json" ]]; then
+        hooks_file=".pairingbuddy/hooks/${session_id}.json"
+    else
+        for session_file in .pairingbuddy/hooks/*.json; do
+            if [[ -f "$session_file" && ( -z "$hooks_file" || "$session_file" -nt "$hooks_file" ) ]]; then
+                hooks_file="$session_file"
+            fi
+        done
+    fi
+    if [[ -n "$hooks_file" ]]; then
+        local hooks_json=""
+        IFS= read -r -d '' hooks_json < "$hooks_file" || true
+        if [[ "$hooks_json" =~ \"lastAgent\"[[:space:]]*:[[:space:]]*\"([^\"]*)\" ]]; then
+            agent_name="${BASH_REMATCH[1]}"
+        fi
+        if [[ "$hooks_json" =~ \"lastDescription\"[[:space:]]*:[[:space:]]*\"([^\"]*)\" ]]; then
+            agent_desc="${BASH_REMATCH[1]}"
+        fi
     fi
 
     if [[ -n "$agent_name" ]]; then
@@ -282,20 +376,59 @@ render_status() {
     # Replace → with spinner char
     content="${content//→/$spinner_char}"
 
-    # Print with ANSI cursor management
-    local new_lines
-    new_lines=$(printf '%s' "$content" | wc -l | tr -d ' ')
+    # Split the frame into lines (content always ends with a newline)
+    local frame_lines=() rest="$content"
+    while [[ -n "$rest" ]]; do
+        frame_lines+=("${rest%%$'\n'*}")
+        rest="${rest#*$'\n'}"
+    done
+    local new_lines=${#frame_lines[@]}
 
+    # On a terminal, rewrite only the lines that differ from the previous
+    # frame (usually the spinner line), then park the cursor below the frame
+    # and clear whatever is left of a longer previous frame
+    local out="" i=0 pos=$LAST_RENDER_LINES
     if [[ "$LAST_RENDER_LINES" -gt 0 ]] && [[ -t 1 ]]; then
-        local n=0
-        while [[ $n -lt $LAST_RENDER_LINES ]]; do
-            printf "\033[1A\033[2K"
-            n=$(( n + 1 ))
+        while [[ $i -lt $new_lines ]]; do
+            if [[ $i -ge $LAST_RENDER_LINES || "${frame_lines[$i]}" != "${LAST_FRAME_LINES[$i]-}" ]]; then
+                while [[ $pos -gt $i ]]; do out="${out}"$'\033[1A'; pos=$(( pos - 1 )); done
+                while [[ $pos -lt $i ]]; do out="${out}"$'\033[1B'; pos=$(( pos + 1 )); done
+                out="${out}"$'\033[2K'"${frame_lines[$i]}${NL}"
+                pos=$(( i + 1 ))
+            fi
+            i=$(( i + 1 ))
         done
+        while [[ $pos -gt $new_lines ]]; do out="${out}"$'\033[1A'; pos=$(( pos - 1 )); done
+        while [[ $pos -lt $new_lines ]]; do out="${out}"$'\033[1B'; pos=$(( pos + 1 )); done
+        if [[ $LAST_RENDER_LINES -gt $new_lines ]]; then
+            out="${out}"$'\033[J'
+        fi
+    else
+        out="$content"
     fi
 
-    printf '%s' "$content"
+    printf '%s' "$out"
+
+    # Terminal bytes per minute, next to what a full redraw would have cost,
+    # appended to .pairingbuddy/solo-render-stats (LC_ALL=C: count bytes)
+    local full_redraw=$(( LAST_RENDER_LINES * 8 ))
+    LAST_FRAME_LINES=("${frame_lines[@]}")
     LAST_RENDER_LINES=$new_lines
+    local LC_ALL=C
+    RENDER_BYTES=$(( ${RENDER_BYTES:-0} + ${#out} ))
+    RENDER_FULL_BYTES=$(( ${RENDER_FULL_BYTES:-0} + full_redraw + ${#content} ))
+    RENDER_FRAMES=$(( ${RENDER_FRAMES:-0} + 1 ))
+    RENDER_STATS_START=${RENDER_STATS_START:-$SECONDS}
+    if [[ $(( SECONDS - RENDER_STATS_START )) -ge 60 ]]; then
+        RENDER_STATS_MINUTE=$(( ${RENDER_STATS_MINUTE:-0} + 1 ))
+        printf 'minute=%d bytes=%d full_redraw_bytes=%d frames=%d\n' \
+            "$RENDER_STATS_MINUTE" "$RENDER_BYTES" "$RENDER_FULL_BYTES" "$RENDER_FRAMES" \
+            2>/dev/null >> .pairingbuddy/solo-render-stats || true
+        RENDER_BYTES=0
+        RENDER_FULL_BYTES=0
+        RENDER_FRAMES=0
+        RENDER_STATS_START=$SECONDS
+    fi
 }
 
 start_renderer() {
@@ -306,10 +439,56 @@ start_renderer() {
     if (printf '' > /dev/tty) 2>/dev/null; then
         tty_out="/dev/tty"
     fi
-    while true; do
-        render_status
-        sleep "$RENDER_INTERVAL"
-    done >"$tty_out" 2>/dev/null &
+    # Redraw when a watched file changes (plan, plan index, solo-status, the
+    # active guardian session); while nothing changes, step down
+    # RENDER_BACKOFF so an idle session only advances the spinner about once
+    # a second. Change checks use [[ -nt ]] against a stamp file and the wait
+    # uses read -t on a never-written pipe (bash 4+), so frames fork nothing.
+    (
+        local stamp=".pairingbuddy/.solo-render-stamp"
+        local step=0 wait_fd="" waited watched changed session_id watched_files
+        if [[ "${BASH_VERSINFO[0]}" -ge 4 ]]; then
+            exec {wait_fd}<> <(:) || wait_fd=""
+        fi
+        : > "$stamp" || true
+        while true; do
+            render_status
+            if [[ -n "$wait_fd" ]]; then
+                waited=0
+                read -r -t "${RENDER_BACKOFF[$step]}" -u "$wait_fd" _ || waited=$?
+                # Only a timeout (status > 128) means we waited; otherwise fall back to sleep
+                [[ $waited -gt 128 ]] || wait_fd=""
+            fi
+            if [[ -z "$wait_fd" ]]; then
+                sleep "${RENDER_BACKOFF[$step]}"
+            fi
+            # Watch only the active session's file; scan them all without a pointer
+            watched_files=("$PLAN_FILE" "$STATUS_FILE" .pairingbuddy/cache/plan-index.json .pairingbuddy/hooks/active-session)
+            session_id=""
+            if [[ -f .pairingbuddy/hooks/active-session ]]; then
+                IFS= read -r session_id < .pairingbuddy/hooks/active-session || true
+            fi
+            if [[ "$session_id" =~ ^[A-Za-z0-9._-]+$ ]]; then
+                watched_files+=(".pairingbuddy/hooks/${session_id}.json")
+            else
+                watched_files+=(.pairingbuddy/hooks/*.json)
+            fi
+            changed=false
+            for watched in "${watched_files[@]}"; do
+                # Same-tick mtimes count as changed; the fresh stamp settles it next frame
+                if [[ -e "$watched" && ! "$stamp" -nt "$watched" ]]; then
+                    changed=true
+                    break
+                fi
+            done
+            if [[ "$changed" == "true" ]]; then
+                : > "$stamp" || true
+                step=0
+            elif [[ $step -lt $(( ${#RENDER_BACKOFF[@]} - 1 )) ]]; then
+                step=$(( step + 1 ))
+            fi
+        done
+    ) >"$tty_out" 2>/dev/null &
     RENDERER_PID=$!
 }
 
@@ -410,31 +589,26 @@ write_final_status() {
         reset=$'\033[0m'
     fi
 
+    # Tasks come from load_plan_tasks, like render_status
     if [[ -f "$PLAN_FILE" ]]; then
-        while IFS= read -r line || [[ -n "$line" ]]; do
-            if [[ "$line" =~ ^\-\ \[x\]\ (.*)$ ]]; then
-                local task_text="${BASH_REMATCH[1]}"
-                # Strip markdown: **, *, `
-                task_text="${task_text//\*\*/}"
-                task_text="${task_text//\*/}"
-                task_text="${task_text//\`/}"
+        local task_states=() task_texts=()
+        load_plan_tasks task_states task_texts
+
+        local t=0
+        while [[ $t -lt ${#task_states[@]} ]]; do
+            local task_text="${task_texts[$t]}"
+            if [[ "${task_states[$t]}" == "true" ]]; then
                 task_lines+=("  ${green}✓${reset} ${task_text}")
                 completed=$(( completed + 1 ))
-                total=$(( total + 1 ))
-            elif [[ "$line" =~ ^\-\ \[\ \]\ (.*)$ ]]; then
-                local task_text="${BASH_REMATCH[1]}"
-                task_text="${task_text//\*\*/}"
-                task_text="${task_text//\*/}"
-                task_text="${task_text//\`/}"
-                if [[ "$first_incomplete" == "true" ]]; then
-                    task_lines+=("  ${cyan}→${reset} ${bold_white}${task_text}${reset}")
-                    first_incomplete=false
-                else
-                    task_lines+=("  ${dim}○ ${task_text}${reset}")
-                fi
-                total=$(( total + 1 ))
+            elif [[ "$first_incomplete" == "true" ]]; then
+                task_lines+=("  ${cyan}→${reset} ${bold_white}${task_text}${reset}")
+                first_incomplete=false
+            else
+                task_lines+=("  ${dim}○ ${task_text}${reset}")
             fi
-        done < "$PLAN_FILE"
+            total=$(( total + 1 ))
+            t=$(( t + 1 ))
+        done
     fi
 
     # Build progress bar
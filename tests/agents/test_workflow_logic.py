@@ -90,3 +90,30 @@ def test_workflow_references_resolve_to_agents():
     assert not unresolved, (
         f"Workflow calls functions that don't resolve to registered agents: {unresolved}"
     )
+
+
+def _parallel_blocks(tree: ast.AST) -> list[ast.With]:
+    return [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.With)
+        and any(
+            isinstance(item.context_expr, ast.Call)
+            and getattr(item.context_expr.func, "id", None) == "_in_parallel"
+            for item in node.items
+        )
+    ]
+
+
+def test_pipelined_review_only_overlaps_red():
+    """Only read-only review agents may run alongside implement_tests."""
+    tree = ast.parse(extract_workflow_code())
+    blocks = _parallel_blocks(tree)
+    assert blocks, "Workflow has no _in_parallel() block"
+
+    for block in blocks:
+        calls = set(extract_function_calls(ast.unparse(block)))
+        agents = {name for name in calls if not name.startswith("_")}
+        assert agents <= {"implement_tests", "identify_test_issues", "identify_code_issues"}, (
+            f"Agents that write shared state run in parallel: {sorted(agents)}"
+        )
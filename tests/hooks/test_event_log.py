@@ -0,0 +1,194 @@
+"""Tests for the solo event log (hooks/lib/event-log.mjs, hooks/solo-events.mjs).
+
+Scenarios covered:
+- rotation: The active segment is rotated by size and only the newest segments are kept
+- checkpoints: The index records the byte offset of the first event of each minute
+- seek: Reading recent events starts at a checkpoint instead of the start of the log
+- cli: solo-events.mjs prints the events of the last N minutes
+- task-cleanup: Segments and the index survive task cleanup, so retention and reads cover them
+"""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from pairingbuddy.state import cleanup_state_files
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+EVENT_LOG_URL = (HOOKS_DIR / "lib" / "event-log.mjs").as_uri()
+CLI_PATH = HOOKS_DIR / "solo-events.mjs"
+
+MINUTE_MS = 60_000
+
+
+def _node(script: str, cwd) -> str:
+    result = subprocess.run(
+        [
+            "node",
+            "--input-type=module",
+            "-e",
+            f"import * as log from {json.dumps(EVENT_LOG_URL)};\n{script}",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(cwd),
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def _event(ms: int, agent: str = "agent") -> dict:
+    ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ms / 1000)) + f".{ms % 1000:03d}Z"
+    return {
+        "ts": ts,
+        "session": "s1",
+        "tool": "Agent",
+        "agent": agent,
+        "description": None,
+        "plan": None,
+        "file": None,
+        "latency_ms": 1.5,
+    }
+
+
+def _append(project, events, max_bytes=10**6, segments=8):
+    script = f"""
+for (const event of {json.dumps(events)}) {{
+  log.appendEvent(".pairingbuddy", event, {{ maxBytes: {max_bytes}, segments: {segments} }});
+}}
+"""
+    _node(script, project)
+
+
+def _index(project) -> dict:
+    return json.loads((project / ".pairingbuddy" / "events" / "solo-events.index.json").read_text())
+
+
+def test_segments_rotate_by_size(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    start = 1_760_000_000_000
+    events = [_event(start + i * 1000, agent=f"agent-{i:02d}") for i in range(12)]
+    line_bytes = len(json.dumps(events[0], separators=(",", ":"))) + 1
+
+    _append(tmp_path, events, max_bytes=line_bytes * 3, segments=2)
+
+    index = _index(tmp_path)
+    files = sorted(path.name for path in (tmp_path / ".pairingbuddy").rglob("solo-events*.ndjson"))
+    assert [segment["file"] for segment in index["segments"]][-1] == "solo-events.ndjson"
+    assert sorted(segment["file"] for segment in index["segments"]) == files
+    assert len(files) == 2
+    active = (tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson").read_text().splitlines()
+    assert [json.loads(line)["agent"] for line in active] == ["agent-09", "agent-10", "agent-11"]
+
+
+def test_checkpoint_per_minute(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    start = 1_760_000_000_000 - 1_760_000_000_000 % MINUTE_MS
+    times = [
+        start,
+        start + 10_000,
+        start + MINUTE_MS + 5,
+        start + MINUTE_MS + 20_000,
+        start + 3 * MINUTE_MS,
+    ]
+
+    _append(tmp_path, [_event(ms) for ms in times])
+
+    checkpoints = _index(tmp_path)["segments"][-1]["checkpoints"]
+    assert [ms for ms, _ in checkpoints] == [times[0], times[2], times[4]]
+    content = (tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson").read_bytes()
+    for ms, offset in checkpoints:
+        line = content[offset:].split(b"\n", 1)[0]
+        assert json.loads(line)["ts"] == _event(ms)["ts"]
+
+
+def test_recent_events_read_from_checkpoint(tmp_path):
+    """Bytes before the chosen checkpoint are never read, even if they look recent."""
+    state = tmp_path / ".pairingbuddy" / "events"
+    state.mkdir(parents=True)
+    now = int(time.time() * 1000)
+    decoy = json.dumps(_event(now, agent="decoy")) + "\n"
+    recent = json.dumps(_event(now, agent="recent")) + "\n"
+    (state / "solo-events.ndjson").write_text(decoy + recent)
+    index = {
+        "version": 1,
+        "segments": [
+            {
+                "file": "solo-events.ndjson",
+                "checkpoints": [[now - 10 * MINUTE_MS, 0], [now - MINUTE_MS, len(decoy)]],
+            }
+        ],
+    }
+    (state / "solo-events.index.json").write_text(json.dumps(index))
+
+    output = _node(
+        f"console.log(JSON.stringify(log.readEvents('.pairingbuddy', {{ since: {now - 5000} }})));",
+        tmp_path,
+    )
+
+    assert [event["agent"] for event in json.loads(output)] == ["recent"]
+
+
+def test_rotated_segments_before_since_are_skipped(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    start = int(time.time() * 1000) - 30 * MINUTE_MS
+    events = [_event(start + i * MINUTE_MS, agent=f"agent-{i}") for i in range(30)]
+    line_bytes = len(json.dumps(events[0], separators=(",", ":"))) + 1
+    _append(tmp_path, events, max_bytes=line_bytes * 5)
+    oldest = _index(tmp_path)["segments"][0]["file"]
+    (state / "events" / oldest).write_text(
+        json.dumps(_event(start + 29 * MINUTE_MS, agent="decoy")) + "\n"
+    )
+
+    since = start + 20 * MINUTE_MS
+    output = _node(
+        f"console.log(JSON.stringify(log.readEvents('.pairingbuddy', {{ since: {since} }})));",
+        tmp_path,
+    )
+
+    assert [event["agent"] for event in json.loads(output)] == [f"agent-{i}" for i in range(20, 30)]
+
+
+def test_cli_prints_last_minutes(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    now = int(time.time() * 1000)
+    _append(tmp_path, [_event(now - 20 * MINUTE_MS, agent="old"), _event(now - 1000, agent="new")])
+
+    recent = subprocess.run(
+        ["node", str(CLI_PATH), "--minutes", "5"], capture_output=True, text=True, cwd=str(tmp_path)
+    )
+    everything = subprocess.run(
+        ["node", str(CLI_PATH)], capture_output=True, text=True, cwd=str(tmp_path)
+    )
+    invalid = subprocess.run(
+        ["node", str(CLI_PATH), "--minutes"], capture_output=True, text=True, cwd=str(tmp_path)
+    )
+
+    assert recent.returncode == 0, recent.stderr
+    assert [json.loads(line)["agent"] for line in recent.stdout.splitlines()] == ["new"]
+    assert [json.loads(line)["agent"] for line in everything.stdout.splitlines()] == ["old", "new"]
+    assert invalid.returncode == 2
+    assert "usage" in invalid.stderr
+
+
+def test_segments_survive_task_cleanup(tmp_path):
+    """Cleanup between appends leaves the log alone: old segments are still pruned and read."""
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    start = int(time.time() * 1000) - 10 * MINUTE_MS
+    events = [_event(start + i * 1000, agent=f"agent-{i:02d}") for i in range(12)]
+    line_bytes = len(json.dumps(events[0], separators=(",", ":"))) + 1
+
+    _append(tmp_path, events[:6], max_bytes=line_bytes * 3, segments=2)
+    cleanup_state_files(state, env={})
+    _append(tmp_path, events[6:], max_bytes=line_bytes * 3, segments=2)
+
+    files = sorted(path.name for path in state.rglob("solo-events*.ndjson"))
+    assert sorted(segment["file"] for segment in _index(tmp_path)["segments"]) == files
+    assert len(files) == 2
+    output = _node("console.log(JSON.stringify(log.readEvents('.pairingbuddy')));", tmp_path)
+    assert [event["agent"] for event in json.loads(output)] == [
+        f"agent-{i:02d}" for i in range(6, 12)
+    ]
@@ -0,0 +1,204 @@
+"""Tests for hook latency instrumentation (hooks/lib/latency.mjs, hooks/hook-latency.mjs).
+
+Scenarios covered:
+- recorded: Standalone hooks and the daemon add parse, I/O and total samples to hook-latency.json
+- rolling: Samples older than the kept windows drop out of the histogram
+- budget: Going over the p95 budget logs one warning per window
+- summary: hook-latency.mjs prints percentiles per hook and fails when over budget
+"""
+
+import json
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).parent.parent.parent / "hooks"
+LATENCY_URL = (HOOKS_DIR / "lib" / "latency.mjs").as_uri()
+HOOKD_URL = (HOOKS_DIR / "lib" / "hookd.mjs").as_uri()
+
+MINUTE_MS = 60_000
+
+
+def _env(extra=None):
+    env = os.environ.copy()
+    for name in ("PAIRINGBUDDY_SOLO", "PAIRINGBUDDY_HOOK_P95_BUDGET_MS"):
+        env.pop(name, None)
+    env["PAIRINGBUDDY_HOOKD"] = "0"
+    env.update(extra or {})
+    return env
+
+
+def _run(script, project, payload, env_extra=None, args=()):
+    result = subprocess.run(
+        ["node", str(HOOKS_DIR / script), *args],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=str(project),
+        env=_env(env_extra),
+        timeout=10,
+    )
+    return result
+
+
+def _histogram(project) -> dict:
+    return json.loads((project / ".pairingbuddy" / "cache" / "hook-latency.json").read_text())
+
+
+def _record_samples(project, samples, budget=None) -> list:
+    """Feed (hook, total_ms, now_ms) samples through recordSample; return the overBudget results."""
+    script = f"""
+import {{ recordSample }} from {json.dumps(LATENCY_URL)};
+let histogram = null;
+const warnings = [];
+for (const [hook, total, now] of {json.dumps(samples)}) {{
+  const sample = {{ total, parse: 0.1, io: 0.2 }};
+  const result = recordSample(histogram, hook, sample, {{ now, budget: {json.dumps(budget)} }});
+  histogram = result.histogram;
+  warnings.push(result.overBudget);
+}}
+console.log(JSON.stringify({{ histogram, warnings }}));
+"""
+    result = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        capture_output=True,
+        text=True,
+        cwd=str(project),
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    return tmp_path
+
+
+def test_standalone_hooks_record_samples(project):
+    payload = {"session_id": "s1", "hook_event_name": "PostToolUse", "tool_name": "Read"}
+
+    assert _run("guardian.mjs", project, payload).returncode == 0
+    assert _run("post-tool-use.mjs", project, payload).returncode == 0
+    assert _run("post-tool-use.mjs", project, payload).returncode == 0
+
+    hooks = _histogram(project)["windows"][-1]["hooks"]
+    assert hooks["guardian"]["total"]["n"] == 1
+    assert hooks["post-tool-use"]["total"]["n"] == 2
+    for metrics in hooks.values():
+        assert set(metrics) == {"total", "parse", "io"}
+        assert metrics["total"]["sum"] >= metrics["parse"]["sum"] + metrics["io"]["sum"] > 0
+
+
+def test_daemon_records_client_time(project):
+    """The daemon adds the shim's elapsed time and flushes the histogram when it stops."""
+    sock_path = subprocess.run(
+        [
+            "node",
+            "--input-type=module",
+            "-e",
+            f"import({json.dumps(HOOKD_URL)})"
+            ".then((m) => console.log(m.socketPathFor(process.cwd())))",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(project),
+        check=True,
+    ).stdout.strip()
+    env = _env()
+    env.pop("PAIRINGBUDDY_HOOKD")
+    proc = subprocess.Popen(
+        ["node", str(HOOKS_DIR / "hook-server.mjs")],
+        cwd=str(project),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 5
+        while not os.path.exists(sock_path) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        header = {"cwd": str(project), "env": {}, "timing": {"elapsedMs": 500, "parseMs": 3}}
+        payload = {"session_id": "s1", "hook_event_name": "PostToolUse", "tool_name": "Read"}
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(5)
+            client.connect(sock_path)
+            client.sendall((json.dumps(header) + "\n" + json.dumps(payload)).encode())
+            client.shutdown(socket.SHUT_WR)
+            while client.recv(65536):
+                pass
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+    metrics = _histogram(project)["windows"][-1]["hooks"]["post-tool-use"]
+    assert metrics["total"]["max"] >= 500
+    assert metrics["parse"]["max"] >= 3
+
+
+def test_old_windows_roll_off(project):
+    start = 1_760_000_000_000
+    samples = [
+        ["guardian", 4, start],
+        ["guardian", 4, start + 30 * MINUTE_MS],
+        ["guardian", 4, start + 70 * MINUTE_MS],
+    ]
+
+    histogram = _record_samples(project, samples)["histogram"]
+
+    assert [window["hooks"]["guardian"]["total"]["n"] for window in histogram["windows"]] == [1, 1]
+
+
+def test_budget_warns_once_per_window(project):
+    start = 1_760_000_000_000
+    samples = [["guardian", 40, start + i] for i in range(12)]
+
+    warnings = _record_samples(project, samples, budget=30)["warnings"]
+
+    assert warnings[:9] == [None] * 9, "Too few runs for a p95 must not warn"
+    assert warnings[9] == {"p95": 40, "n": 10}
+    assert warnings[10:] == [None, None]
+
+
+def test_budget_warning_logged(project):
+    payload = {"session_id": "s1", "hook_event_name": "PostToolUse", "tool_name": "Read"}
+
+    for _ in range(10):
+        _run("guardian.mjs", project, payload, {"PAIRINGBUDDY_HOOK_P95_BUDGET_MS": "0.01"})
+
+    warnings = (project / ".pairingbuddy" / "hook-latency-warnings.log").read_text().splitlines()
+    assert len(warnings) == 1
+    assert "guardian p95" in warnings[0] and "exceeds budget 0.01 ms (10 runs)" in warnings[0]
+
+
+def test_summary_reports_percentiles_and_budget(project):
+    start = int(time.time() * 1000)
+    samples = [["guardian", 4, start + i] for i in range(19)] + [["guardian", 90, start + 19]]
+    histogram = _record_samples(project, samples)["histogram"]
+    (project / ".pairingbuddy" / "cache").mkdir()
+    (project / ".pairingbuddy" / "cache" / "hook-latency.json").write_text(json.dumps(histogram))
+
+    table = _run("hook-latency.mjs", project, {})
+    as_json = _run("hook-latency.mjs", project, {}, args=["--json"])
+    within = _run("hook-latency.mjs", project, {}, {"PAIRINGBUDDY_HOOK_P95_BUDGET_MS": "10"})
+    over = _run("hook-latency.mjs", project, {}, {"PAIRINGBUDDY_HOOK_P95_BUDGET_MS": "3"})
+
+    assert table.returncode == 0, table.stderr
+    assert table.stdout.splitlines()[1].split() == [
+        "guardian",
+        "20",
+        "5.0",
+        "5.0",
+        "90.0",
+        "90.0",
+        "0.1",
+        "0.2",
+    ]
+    row = json.loads(as_json.stdout)["hooks"][0]
+    assert row["runs"] == 20 and row["total"]["p95"] == 5 and row["total"]["max"] == 90
+    assert within.returncode == 0 and "all hooks within budget" in within.stdout
+    assert over.returncode == 1 and "over: guardian" in over.stdout
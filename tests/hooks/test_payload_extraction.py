@@ -0,0 +1,160 @@
+"""Tests for selective field extraction from raw hook payloads (hooks/lib/payload.mjs).
+
+Scenarios covered:
+- agreement: Extracted fields equal the same fields read through JSON.parse
+- escapes: Escaped quotes and backslashes inside skipped strings are handled
+- early-exit: Scanning stops once every selected key has been seen
+- invalid: Malformed payloads raise a SyntaxError
+- large-payload: The PostToolUse shim handles a multi-megabyte Write payload
+"""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+PAYLOAD_LIB = REPO_ROOT / "hooks" / "lib" / "payload.mjs"
+SHIM_PATH = REPO_ROOT / "hooks" / "post-tool-use.mjs"
+
+SELECTED = ("session_id", "hook_event_name", "tool_name")
+SELECTED_TOOL_INPUT = ("subagent_type", "description")
+
+
+def _extract(raw: str) -> dict:
+    """Run extractFields over *raw* and return {"fields": ...} or {"error": name}."""
+    script = (
+        f"const {{ extractFields }} = await import({json.dumps(PAYLOAD_LIB.as_uri())});"
+        "const raw = require('fs').readFileSync(0);"
+        "try { console.log(JSON.stringify({ fields: extractFields(raw) })); }"
+        "catch (err) { console.log(JSON.stringify({ error: err.name })); }"
+    )
+    result = subprocess.run(
+        ["node", "--input-type=commonjs", "-e", f"(async () => {{ {script} }})()"],
+        input=raw,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def _expected(payload: dict) -> dict:
+    expected = {key: payload[key] for key in SELECTED if key in payload}
+    tool_input = payload.get("tool_input")
+    if isinstance(tool_input, dict):
+        expected["tool_input"] = {
+            key: tool_input[key] for key in SELECTED_TOOL_INPUT if key in tool_input
+        }
+    return expected
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {
+            "session_id": "s1",
+            "hook_event_name": "PostToolUse",
+            "tool_name": "Agent",
+            "tool_input": {"subagent_type": "pairingbuddy:plan-tests", "description": "Plan"},
+        },
+        {
+            "tool_response": {"stdout": 'echo "}{" ] [ \\\\', "interrupted": False},
+            "tool_input": {"command": "ls", "timeout": 1.5e3, "flags": [1, [2, {"a": None}]]},
+            "tool_name": "Bash",
+            "session_id": "s2",
+            "hook_event_name": "PostToolUse",
+        },
+        {
+            "session_id": "ünïcödé ☃",
+            "tool_name": "Agent",
+            "tool_input": {"description": 'quote " and backslash \\ and \\"', "subagent_type": "x"},
+        },
+        {"tool_name": "Read", "tool_input": None},
+        {"hook_event_name": "SessionStart", "source": "compact"},
+        {},
+    ],
+    ids=["agent", "bash-reordered", "escapes", "null-tool-input", "session-start", "empty"],
+)
+def test_extracted_fields_match_json_parse(payload):
+    """Extraction returns exactly the selected fields JSON.parse would see."""
+    assert _extract(json.dumps(payload, indent=2)) == {"fields": _expected(payload)}
+
+
+def test_stops_after_last_selected_key():
+    """Bytes after the last selected key are never scanned."""
+    head = json.dumps(
+        {
+            "session_id": "s",
+            "hook_event_name": "PostToolUse",
+            "tool_name": "Write",
+            "tool_input": {"file_path": "a.py"},
+        }
+    )
+    raw = head[:-1] + ', "tool_response": <not json at all'
+
+    assert _extract(raw) == {
+        "fields": {
+            "session_id": "s",
+            "hook_event_name": "PostToolUse",
+            "tool_name": "Write",
+            "tool_input": {},
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "not json{",
+        "",
+        "[1, 2]",
+        '{"tool_name": "Bash"',
+        '{"tool_name": "unterminated}',
+        '{"a": 1} trailing',
+    ],
+    ids=[
+        "garbage",
+        "empty",
+        "array",
+        "unterminated-object",
+        "unterminated-string",
+        "trailing-data",
+    ],
+)
+def test_invalid_payload_raises_syntax_error(raw):
+    """Malformed payloads fail like JSON.parse."""
+    assert _extract(raw) == {"error": "SyntaxError"}
+
+
+def test_shim_handles_multi_megabyte_write_payload(tmp_path):
+    """A Write payload carrying megabytes of content is processed normally."""
+    (tmp_path / ".pairingbuddy").mkdir()
+    content = 'print("\\"hello\\"")\n' * 250_000
+    payload = {
+        "session_id": "big-write",
+        "hook_event_name": "PostToolUse",
+        "tool_name": "Write",
+        "tool_input": {"file_path": "big.py", "content": content},
+        "tool_response": {"filePath": "big.py", "content": content},
+    }
+    env = os.environ.copy()
+    env.pop("PAIRINGBUDDY_SOLO", None)
+    env["PAIRINGBUDDY_HOOKD"] = "0"
+
+    result = subprocess.run(
+        ["node", str(SHIM_PATH)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=str(tmp_path),
+        env=env,
+        timeout=10,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
+    state = json.loads((tmp_path / ".pairingbuddy" / "hooks" / "big-write.json").read_text())
+    assert state["lastTool"] == "Write"
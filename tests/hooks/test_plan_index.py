@@ -0,0 +1,154 @@
+"""Tests for the shared plan index (.pairingbuddy/cache/plan-index.json).
+
+Scenarios covered:
+- index-written: The hook writes tasks, counts, byte offsets and the plan key, for LF and CRLF plans
+- index-reused: An index whose key matches the plan is used without re-parsing
+- index-refreshed: Editing the plan re-parses it; touching it only updates the key
+- any-tool: The index is refreshed on non-Agent tool calls too
+"""
+
+import hashlib
+import json
+import os
+
+import pytest
+
+from tests.conftest import run_hook
+
+PLAN = (
+    "# Plan\n\n- [x] **Parse** `input`\n- [ ] Café ✓ output\n"
+    "  - [ ] Indented subtask\n- [] not a task\n"
+)
+
+
+@pytest.fixture
+def plan_project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    plan_file = tmp_path / "plan.md"
+    plan_file.write_text(PLAN, encoding="utf-8")
+    return tmp_path, plan_file
+
+
+def _run(project, plan_file, tool_name="Agent"):
+    env_vars = {"PAIRINGBUDDY_SOLO": "true", "PAIRINGBUDDY_PLAN_PATH": str(plan_file)}
+    payload = {"tool_name": tool_name, "tool_input": {"subagent_type": "test-agent"}}
+    result = run_hook(env_vars, stdin_payload=payload, cwd=str(project))
+    assert result.returncode == 0, result.stderr
+
+
+def _index(project) -> dict:
+    return json.loads((project / ".pairingbuddy" / "cache" / "plan-index.json").read_text())
+
+
+def test_hook_writes_plan_index(plan_project):
+    """The index holds the plan key, counts and one entry per checkbox line."""
+    project, plan_file = plan_project
+    _run(project, plan_file)
+
+    index = _index(project)
+    raw = plan_file.read_bytes()
+    stat = plan_file.stat()
+    assert index["plan"]["path"] == str(plan_file)
+    assert index["plan"]["size"] == stat.st_size
+    assert index["plan"]["sha1"] == hashlib.sha1(raw).hexdigest()
+    assert (index["completed"], index["total"]) == (1, 3)
+    assert [(t["line"], t["checked"], t["text"]) for t in index["tasks"]] == [
+        (3, True, "Parse input"),
+        (4, False, "Café ✓ output"),
+        (5, False, "Indented subtask"),
+    ]
+
+
+def test_task_offsets_point_at_checkbox_marks(plan_project):
+    """Each offset is the byte position of the checkbox mark, even after multi-byte text."""
+    project, plan_file = plan_project
+    _run(project, plan_file)
+
+    raw = plan_file.read_bytes()
+    marks = [raw[t["offset"] : t["offset"] + 1] for t in _index(project)["tasks"]]
+    assert marks == [b"x", b" ", b" "]
+
+
+def test_crlf_plan_is_indexed(plan_project):
+    """A plan with CRLF line endings has the same tasks, and offsets still hit the marks."""
+    project, plan_file = plan_project
+    plan_file.write_bytes(PLAN.replace("\n", "\r\n").encode("utf-8"))
+    _run(project, plan_file)
+
+    index = _index(project)
+    raw = plan_file.read_bytes()
+    assert (index["completed"], index["total"]) == (1, 3)
+    assert [t["text"] for t in index["tasks"]] == [
+        "Parse input",
+        "Café ✓ output",
+        "Indented subtask",
+    ]
+    assert [raw[t["offset"] : t["offset"] + 1] for t in index["tasks"]] == [b"x", b" ", b" "]
+
+
+def test_tasks_are_serialized_one_per_line(plan_project):
+    """The renderer reads tasks line by line, so each task must sit on its own line."""
+    project, plan_file = plan_project
+    _run(project, plan_file)
+
+    lines = (project / ".pairingbuddy" / "cache" / "plan-index.json").read_text().splitlines()
+    task_lines = [line for line in lines if '"checked":' in line]
+    assert len(task_lines) == 3
+    assert all(json.loads(line.strip().rstrip(",")) for line in task_lines)
+
+
+def test_matching_index_is_reused(plan_project):
+    """While mtime and size match, the hook trusts the index instead of the plan."""
+    project, plan_file = plan_project
+    _run(project, plan_file)
+    index_path = project / ".pairingbuddy" / "cache" / "plan-index.json"
+    index = _index(project)
+    index["tasks"][1]["text"] = "From the index"
+    index_path.write_text(json.dumps(index))
+
+    _run(project, plan_file)
+
+    status = (project / ".pairingbuddy" / "solo-status").read_text()
+    assert "From the index" in status
+
+
+def test_edited_plan_is_reparsed(plan_project):
+    """Changing the plan content invalidates the index."""
+    project, plan_file = plan_project
+    _run(project, plan_file)
+
+    plan_file.write_text(PLAN.replace("- [ ] Café", "- [x] Café"), encoding="utf-8")
+    stat = plan_file.stat()
+    os.utime(plan_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    _run(project, plan_file)
+
+    index = _index(project)
+    assert (index["completed"], index["total"]) == (2, 3)
+    assert index["plan"]["sha1"] == hashlib.sha1(plan_file.read_bytes()).hexdigest()
+
+
+def test_touched_plan_keeps_tasks_and_updates_key(plan_project):
+    """A new mtime with identical content only refreshes the index key."""
+    project, plan_file = plan_project
+    _run(project, plan_file)
+    index_path = project / ".pairingbuddy" / "cache" / "plan-index.json"
+    index = _index(project)
+    index["tasks"][1]["text"] = "Kept from the index"
+    index_path.write_text(json.dumps(index))
+
+    stat = plan_file.stat()
+    os.utime(plan_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    _run(project, plan_file)
+
+    refreshed = _index(project)
+    assert refreshed["tasks"][1]["text"] == "Kept from the index"
+    assert refreshed["plan"]["mtimeMs"] == pytest.approx(plan_file.stat().st_mtime_ns / 1e6)
+
+
+def test_index_refreshed_on_non_agent_tool_calls(plan_project):
+    """An Edit of the plan is indexed without waiting for the next Agent call."""
+    project, plan_file = plan_project
+    _run(project, plan_file, tool_name="Edit")
+
+    assert _index(project)["total"] == 3
+    assert not (project / ".pairingbuddy" / "solo-status").exists()
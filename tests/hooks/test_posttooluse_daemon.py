@@ -0,0 +1,228 @@
+"""Tests for the PostToolUse hook daemon and its client shim.
+
+Scenarios covered:
+- shim-fallback: With no daemon running, post-tool-use.mjs runs guardian and
+  solo-progress in-process and prints the guardian output
+- daemon-request: hook-server.mjs answers a forwarded payload over its Unix socket
+- shim-via-daemon: With the daemon up, the shim output matches the fallback output
+- stale-socket: A dead socket path does not break the shim
+- daemon-error-fallback: An error reply or a truncated reply makes the shim run in-process
+- lazy-handlers: The shim imports the handlers only on its fallback path
+"""
+
+import json
+import os
+import re
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+HOOKS_DIR = REPO_ROOT / "hooks"
+SHIM_PATH = HOOKS_DIR / "post-tool-use.mjs"
+SERVER_PATH = HOOKS_DIR / "hook-server.mjs"
+
+
+def _agent_payload(session_id: str = "daemon-session") -> dict:
+    return {
+        "session_id": session_id,
+        "hook_event_name": "PostToolUse",
+        "tool_name": "Agent",
+        "tool_input": {
+            "subagent_type": "pairingbuddy:implement-tests",
+            "description": "Implement tests",
+        },
+    }
+
+
+def _clean_env(extra: dict | None = None) -> dict:
+    env = os.environ.copy()
+    env.pop("PAIRINGBUDDY_SOLO", None)
+    env.pop("PAIRINGBUDDY_HOOKD", None)
+    env.update(extra or {})
+    return env
+
+
+def _socket_path(cwd: Path) -> str:
+    """Ask the hook library for the socket path it derives for *cwd*."""
+    script = (
+        f"import({json.dumps((HOOKS_DIR / 'lib' / 'hookd.mjs').as_uri())})"
+        ".then((m) => console.log(m.socketPathFor(process.cwd())))"
+    )
+    result = subprocess.run(
+        ["node", "--input-type=module", "-e", script],
+        capture_output=True,
+        text=True,
+        cwd=str(cwd),
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def _run_shim(cwd: Path, payload: dict, env_extra: dict | None = None):
+    return subprocess.run(
+        ["node", str(SHIM_PATH)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=str(cwd),
+        env=_clean_env(env_extra),
+        timeout=10,
+    )
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def daemon(project):
+    """Start hook-server.mjs for *project* and yield its socket path."""
+    sock_path = _socket_path(project)
+    proc = subprocess.Popen(
+        ["node", str(SERVER_PATH)],
+        cwd=str(project),
+        env=_clean_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 5
+    while not os.path.exists(sock_path) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    yield sock_path
+    proc.terminate()
+    proc.wait(timeout=5)
+
+
+def test_shim_falls_back_without_daemon(project):
+    """With no daemon, the shim prints guardian output and writes solo-status."""
+    result = _run_shim(project, _agent_payload(), {"PAIRINGBUDDY_SOLO": "true"})
+
+    output = json.loads(result.stdout)
+    assert output["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
+    assert (project / ".pairingbuddy" / "solo-status").exists()
+    state = json.loads((project / ".pairingbuddy" / "hooks" / "daemon-session.json").read_text())
+    assert state["lastAgent"] == "pairingbuddy:implement-tests"
+
+
+def test_daemon_answers_forwarded_payload(project, daemon):
+    """The daemon replies with the guardian stdout for a forwarded payload."""
+    header = json.dumps({"cwd": str(project), "env": {"PAIRINGBUDDY_SOLO": "true"}})
+    request = (header + "\n" + json.dumps(_agent_payload())).encode()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(5)
+        client.connect(daemon)
+        client.sendall(request)
+        client.shutdown(socket.SHUT_WR)
+        reply = b""
+        while chunk := client.recv(65536):
+            reply += chunk
+
+    stdout = json.loads(reply)["stdout"]
+    assert json.loads(stdout)["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
+    assert (project / ".pairingbuddy" / "solo-status").exists(), (
+        "Forwarded PAIRINGBUDDY_SOLO must enable solo-progress inside the daemon"
+    )
+
+
+def test_shim_output_via_daemon_matches_fallback(project, daemon, tmp_path_factory):
+    """Daemon and in-process fallback produce the same hook output."""
+    fallback_project = tmp_path_factory.mktemp("fallback")
+    (fallback_project / ".pairingbuddy").mkdir()
+
+    via_daemon = _run_shim(project, _agent_payload())
+    in_process = _run_shim(fallback_project, _agent_payload())
+
+    assert json.loads(via_daemon.stdout) == json.loads(in_process.stdout)
+
+
+def test_shim_reports_daemon_errors(project, daemon):
+    """Invalid JSON handled by the daemon fails the hook like the standalone guardian."""
+    result = subprocess.run(
+        ["node", str(SHIM_PATH)],
+        input="not json{",
+        capture_output=True,
+        text=True,
+        cwd=str(project),
+        env=_clean_env(),
+        timeout=10,
+    )
+
+    assert result.returncode != 0
+    assert result.stdout == ""
+
+
+def test_shim_ignores_stale_socket(project):
+    """A leftover non-socket file at the socket path makes the shim fall back."""
+    sock_path = _socket_path(project)
+    Path(sock_path).write_text("")
+    try:
+        result = _run_shim(project, _agent_payload())
+    finally:
+        os.unlink(sock_path)
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
+
+
+@pytest.fixture
+def fake_daemon(project):
+    """Serve canned replies on the project's socket; set the reply via the yielded list."""
+    sock_path = _socket_path(project)
+    replies = []
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(sock_path)
+    server.listen()
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                while conn.recv(65536):
+                    pass
+                conn.sendall(replies[0])
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield replies
+    server.close()
+    os.unlink(sock_path)
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [b'{"error": "hook daemon: handler crashed"}', b'{"stdout": "{\\"hookSpecific'],
+    ids=["error-reply", "truncated-reply"],
+)
+def test_shim_falls_back_when_daemon_reply_is_unusable(project, fake_daemon, reply):
+    """A daemon error or a cut-off reply is answered in-process instead of failing the hook."""
+    fake_daemon.append(reply)
+
+    result = _run_shim(project, _agent_payload(), {"PAIRINGBUDDY_SOLO": "true"})
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout)["hookSpecificOutput"]["hookEventName"] == "PostToolUse"
+    assert (project / ".pairingbuddy" / "solo-status").exists()
+
+
+def test_shim_loads_handlers_only_for_fallback():
+    """The shim has no static imports of the guardian, solo-progress or the dispatcher."""
+    imported = re.findall(r'^import [^;]*?"([^"]+)";', SHIM_PATH.read_text(), re.M)
+    assert "./lib/hookd.mjs" in imported
+
+    for module in (
+        "./guardian.mjs",
+        "./solo-progress.mjs",
+        "./lib/dispatcher.mjs",
+        "./post-tool-use-handlers.mjs",
+    ):
+        assert module not in imported, f"post-tool-use.mjs must not statically import {module}"
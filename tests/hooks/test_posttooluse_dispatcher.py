@@ -0,0 +1,112 @@
+"""Tests for the PostToolUse dispatcher (hooks/lib/dispatcher.mjs).
+
+Scenarios covered:
+- single-parse: One post-tool-use.mjs run drives the guardian, solo status and
+  progress log handlers from one parsed payload
+- combined-output: Extra context from several handlers is merged into one
+  hookSpecificOutput
+- handler-isolation: A failing handler does not stop later handlers
+"""
+
+import json
+import os
+import subprocess
+import textwrap
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+SHIM_PATH = REPO_ROOT / "hooks" / "post-tool-use.mjs"
+DISPATCHER_URL = (REPO_ROOT / "hooks" / "lib" / "dispatcher.mjs").as_uri()
+
+
+def _run_node_module(source: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["node", "--input-type=module", "-e", source],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+
+
+def test_one_run_drives_all_registered_handlers(tmp_path):
+    """Guardian state, solo-status and the progress log all come from one process."""
+    (tmp_path / ".pairingbuddy").mkdir()
+    payload = {
+        "session_id": "dispatch-session",
+        "hook_event_name": "PostToolUse",
+        "tool_name": "Agent",
+        "tool_input": {"subagent_type": "implement-code", "description": "Make it pass"},
+    }
+    env = os.environ.copy()
+    env.update({"PAIRINGBUDDY_SOLO": "true", "PAIRINGBUDDY_HOOKD": "0"})
+
+    result = subprocess.run(
+        ["node", str(SHIM_PATH)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=str(tmp_path),
+        env=env,
+        timeout=10,
+    )
+
+    assert result.returncode == 0, result.stderr
+    state = json.loads((tmp_path / ".pairingbuddy" / "hooks" / "dispatch-session.json").read_text())
+    assert state["lastAgent"] == "implement-code"
+    assert "Agent: implement-code" in (tmp_path / ".pairingbuddy" / "solo-status").read_text()
+    assert (
+        "Make it pass" in (tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson").read_text()
+    )
+
+
+def test_dispatch_combines_handler_context():
+    """additionalContext joins every handler's contribution in registration order."""
+    source = textwrap.dedent(
+        f"""
+        import {{ createContext, dispatch }} from {json.dumps(DISPATCHER_URL)};
+        const ctx = createContext({{ hook_event_name: "PostToolUse" }}, {{ cwd: ".", env: {{}} }});
+        const handlers = [
+          {{ name: "a", run: () => "first" }},
+          {{ name: "b", run: () => undefined }},
+          {{ name: "c", run: () => "second" }},
+        ];
+        console.log(JSON.stringify(dispatch(ctx, handlers)));
+        """
+    )
+
+    result = _run_node_module(source)
+
+    output = json.loads(result.stdout)["hookSpecificOutput"]
+    assert output == {"hookEventName": "PostToolUse", "additionalContext": "first\nsecond"}
+
+
+@pytest.mark.parametrize("with_on_error", [True, False], ids=["handled", "unhandled"])
+def test_failing_handler_does_not_stop_later_handlers(with_on_error):
+    """Later handlers still run; unhandled errors surface after all handlers ran."""
+    on_error = "onError: () => console.log('handled')," if with_on_error else ""
+    source = textwrap.dedent(
+        f"""
+        import {{ createContext, dispatch }} from {json.dumps(DISPATCHER_URL)};
+        const ctx = createContext({{}}, {{ cwd: ".", env: {{}} }});
+        const handlers = [
+          {{ name: "boom", run: () => {{ throw new Error("boom"); }}, {on_error} }},
+          {{ name: "after", run: () => {{ console.log("after ran"); }} }},
+        ];
+        try {{
+          dispatch(ctx, handlers);
+          console.log("completed");
+        }} catch (err) {{
+          console.log("rethrown " + err.message);
+        }}
+        """
+    )
+
+    result = _run_node_module(source)
+
+    assert "after ran" in result.stdout
+    if with_on_error:
+        assert "handled" in result.stdout and "completed" in result.stdout
+    else:
+        assert "rethrown boom" in result.stdout
@@ -203,7 +203,7 @@ def test_successful_invocation_still_writes_progress_log(solo_tmp_path):
     Scenario: normal-operation-unaffected
     Test Case: successful-invocation-still-writes-progress-log
 
-    Valid invocations still write to solo-progress.log as expected; error logging
+    Valid invocations still write to solo-events.ndjson as expected; error logging
     does not interfere with normal operation.
     """
     run_hook(
@@ -212,8 +212,8 @@ def test_successful_invocation_still_writes_progress_log(solo_tmp_path):
         cwd=str(solo_tmp_path),
     )
 
-    progress_log = solo_tmp_path / ".pairingbuddy" / "solo-progress.log"
-    assert progress_log.exists(), "Expected solo-progress.log to exist after valid invocation"
+    progress_log = solo_tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
+    assert progress_log.exists(), "Expected solo-events.ndjson to exist after valid invocation"
     content = progress_log.read_text()
     assert "write-tests" in content, (
         f"Expected agent name 'write-tests' in progress log, got: {content!r}"
@@ -1,7 +1,7 @@
 """Tests for PostToolUse hook file extraction functionality.
 
 Tests verify the hook extracts the current file path from state files and includes
-it in solo-status and solo-progress.log for tracking which file is being worked on.
+it in solo-status and solo-events.ndjson for tracking which file is being worked on.
 """
 
 import json
@@ -29,9 +29,9 @@ def _task_stdin(agent_name: str = "test-agent", description: str | None = None)
 
 
 def _read_log_lines(tmp_path) -> list[str]:
-    """Assert solo-progress.log exists and return its non-empty lines."""
-    log_file = tmp_path / ".pairingbuddy" / "solo-progress.log"
-    assert log_file.exists(), "Expected .pairingbuddy/solo-progress.log to be created"
+    """Assert solo-events.ndjson exists and return its non-empty lines."""
+    log_file = tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
+    assert log_file.exists(), "Expected .pairingbuddy/events/solo-events.ndjson to be created"
     return [line for line in log_file.read_text().splitlines() if line.strip()]
 
 
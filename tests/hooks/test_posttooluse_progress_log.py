@@ -1,15 +1,22 @@
 """Tests for PostToolUse hook progress log functionality.
 
-Tests verify the hook creates and maintains solo-progress.log with proper formatting
-for tracking task execution progress in Solo mode.
+Tests verify the hook appends one structured event per Agent call to
+solo-events.ndjson for tracking task execution progress in Solo mode.
 """
 
+import json
 import re
+from pathlib import Path
 
 import pytest
+from jsonschema import Draft7Validator, FormatChecker
 
 from tests.conftest import run_hook
 
+SCHEMA_PATH = (
+    Path(__file__).parent.parent.parent / "contracts" / "schemas" / "solo-event.schema.json"
+)
+
 
 def _make_plan_markdown(checked: int, unchecked: int) -> str:
     lines = ["# Plan\n"]
@@ -27,11 +34,11 @@ def _task_stdin(agent_name: str = "test-agent", description: str | None = None)
     return {"tool_name": "Agent", "tool_input": tool_input}
 
 
-def _read_log_lines(tmp_path) -> list[str]:
-    """Assert solo-progress.log exists and return its non-empty lines."""
-    log_file = tmp_path / ".pairingbuddy" / "solo-progress.log"
-    assert log_file.exists(), "Expected .pairingbuddy/solo-progress.log to be created"
-    return [line for line in log_file.read_text().splitlines() if line.strip()]
+def _read_events(tmp_path) -> list[dict]:
+    """Assert solo-events.ndjson exists and return its parsed events."""
+    log_file = tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
+    assert log_file.exists(), "Expected .pairingbuddy/events/solo-events.ndjson to be created"
+    return [json.loads(line) for line in log_file.read_text().splitlines() if line.strip()]
 
 
 @pytest.fixture
@@ -55,121 +62,100 @@ def plan_env(solo_tmp_path):
 def test_log_file_created_when_absent(solo_tmp_path):
     """Scenario: log-file-creation | Test Case: log-file-created-when-absent
 
-    When solo-progress.log does not exist, the hook creates it and writes a single line.
+    When solo-events.ndjson does not exist, the hook creates it and writes a single event.
     """
     run_hook({"PAIRINGBUDDY_SOLO": "true"}, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
 
-    _read_log_lines(solo_tmp_path)
+    assert len(_read_events(solo_tmp_path)) == 1
 
 
-def test_log_line_has_iso8601_timestamp(solo_tmp_path, plan_env):
-    """Scenario: log-line-format-with-progress | Test Case: log-line-has-iso8601-timestamp
+def test_event_matches_schema(solo_tmp_path, plan_env):
+    """Scenario: event-format | Test Case: event-matches-schema
 
-    The log line starts with an ISO-8601 timestamp (e.g. '2025-01-01T00:00:00.000Z').
+    Every event validates against contracts/schemas/solo-event.schema.json.
     """
-    run_hook(plan_env, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
+    run_hook(plan_env, stdin_payload=_task_stdin(description="Write tests"), cwd=str(solo_tmp_path))
+    run_hook({"PAIRINGBUDDY_SOLO": "true"}, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
 
-    first_line = _read_log_lines(solo_tmp_path)[0]
-    iso8601_pattern = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"
-    assert re.match(iso8601_pattern, first_line), (
-        f"Expected log line to start with ISO 8601 timestamp, got: {first_line!r}"
-    )
+    validator = Draft7Validator(json.loads(SCHEMA_PATH.read_text()), format_checker=FormatChecker())
+    for event in _read_events(solo_tmp_path):
+        errors = [error.message for error in validator.iter_errors(event)]
+        assert not errors, f"Event {event!r} does not match the schema: {errors}"
 
 
-def test_log_line_has_nm_bracket_notation(solo_tmp_path, plan_env):
-    """Scenario: log-line-format-with-progress | Test Case: log-line-has-nm-bracket-notation
+def test_event_has_iso8601_timestamp(solo_tmp_path, plan_env):
+    """Scenario: event-format | Test Case: event-has-iso8601-timestamp
 
-    When progress is known, the log line contains '[N/M]' with correct
-    completed and total counts.
+    The event's ts field is an ISO-8601 timestamp (e.g. '2025-01-01T00:00:00.000Z').
     """
     run_hook(plan_env, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
 
-    log_content = "\n".join(_read_log_lines(solo_tmp_path))
-    assert "[3/7]" in log_content, (
-        f"Expected '[3/7]' in solo-progress.log for 3 completed out of 7, got: {log_content!r}"
-    )
+    event = _read_events(solo_tmp_path)[0]
+    assert re.match(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", event["ts"]), event
 
 
-def test_log_line_has_agent_name(solo_tmp_path):
-    """Scenario: log-line-format-with-progress | Test Case: log-line-has-agent-name
+def test_event_has_plan_counts(solo_tmp_path, plan_env):
+    """Scenario: event-format | Test Case: event-has-plan-counts
 
-    The log line contains the agent name from tool_input.subagent_type.
+    When progress is known, the event carries the completed and total counts.
     """
-    agent_name = "my-special-agent"
-
-    run_hook(
-        {"PAIRINGBUDDY_SOLO": "true"},
-        stdin_payload=_task_stdin(agent_name=agent_name),
-        cwd=str(solo_tmp_path),
-    )
+    run_hook(plan_env, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
 
-    log_content = "\n".join(_read_log_lines(solo_tmp_path))
-    assert agent_name in log_content, (
-        f"Expected agent name '{agent_name}' in solo-progress.log, got: {log_content!r}"
-    )
+    assert _read_events(solo_tmp_path)[0]["plan"] == {"completed": 3, "total": 7}
 
 
-def test_log_line_has_task_description(solo_tmp_path):
-    """Scenario: log-line-format-with-progress | Test Case: log-line-has-task-description
+def test_event_has_session_tool_agent_and_description(solo_tmp_path):
+    """Scenario: event-format | Test Case: event-has-session-tool-agent-and-description
 
-    The log line contains the task description from tool_input.description.
+    The event carries the session id, tool name, tool_input.subagent_type and
+    tool_input.description.
     """
-    task_description = "running the integration tests"
-
-    run_hook(
-        {"PAIRINGBUDDY_SOLO": "true"},
-        stdin_payload=_task_stdin(description=task_description),
-        cwd=str(solo_tmp_path),
+    payload = _task_stdin(
+        agent_name="my-special-agent", description="running the integration tests"
     )
+    payload["session_id"] = "session-42"
 
-    log_content = "\n".join(_read_log_lines(solo_tmp_path))
-    assert task_description in log_content, (
-        f"Expected task description '{task_description}' in solo-progress.log, got: {log_content!r}"
-    )
+    run_hook({"PAIRINGBUDDY_SOLO": "true"}, stdin_payload=payload, cwd=str(solo_tmp_path))
+
+    event = _read_events(solo_tmp_path)[0]
+    assert event["session"] == "session-42"
+    assert event["tool"] == "Agent"
+    assert event["agent"] == "my-special-agent"
+    assert event["description"] == "running the integration tests"
 
 
-def test_log_line_unknown_uses_question_mark_notation(solo_tmp_path):
-    """Scenario: log-line-format-unknown-progress | Test: unknown-question-mark
+def test_event_has_hook_latency(solo_tmp_path):
+    """Scenario: event-format | Test Case: event-has-hook-latency
 
-    When no plan is available, the log line contains '[?/?]' instead of
-    '[N/M]'.
+    The event records how long the hook had been running, in milliseconds.
     """
     run_hook({"PAIRINGBUDDY_SOLO": "true"}, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
 
-    log_content = "\n".join(_read_log_lines(solo_tmp_path))
-    assert "[?/?]" in log_content, (
-        f"Expected '[?/?]' in solo-progress.log when no plan available, got: {log_content!r}"
-    )
+    latency = _read_events(solo_tmp_path)[0]["latency_ms"]
+    assert 0 < latency < 10_000, latency
 
 
-def test_log_line_unknown_still_has_timestamp_and_agent(solo_tmp_path):
-    """Scenario: log-line-format-unknown-progress | Test: unknown-timestamp-agent
+def test_unknown_progress_is_null(solo_tmp_path):
+    """Scenario: event-format-unknown-progress | Test: unknown-progress-null
 
-    When no plan is available, the log line still contains an ISO-8601
-    timestamp and the agent name.
+    When no plan is available, plan is null and the agent name and timestamp are still recorded.
     """
-    agent_name = "some-agent"
-
     run_hook(
         {"PAIRINGBUDDY_SOLO": "true"},
-        stdin_payload=_task_stdin(agent_name=agent_name),
+        stdin_payload=_task_stdin(agent_name="some-agent"),
         cwd=str(solo_tmp_path),
     )
 
-    first_line = _read_log_lines(solo_tmp_path)[0]
-    iso8601_pattern = r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"
-    assert re.search(iso8601_pattern, first_line), (
-        f"Expected ISO 8601 timestamp in log line, got: {first_line!r}"
-    )
-    assert agent_name in first_line, (
-        f"Expected agent name '{agent_name}' in log line, got: {first_line!r}"
-    )
+    event = _read_events(solo_tmp_path)[0]
+    assert event["plan"] is None
+    assert event["agent"] == "some-agent"
+    assert event["ts"]
 
 
-def test_second_invocation_appends_new_line(solo_tmp_path):
-    """Scenario: append-only-behavior | Test Case: second-invocation-appends-new-line
+def test_second_invocation_appends_new_event(solo_tmp_path):
+    """Scenario: append-only-behavior | Test Case: second-invocation-appends-new-event
 
-    Running the hook twice produces a log file with exactly two lines, preserving the first entry.
+    Running the hook twice produces a log with exactly two events, preserving the first.
     """
     run_hook(
         {"PAIRINGBUDDY_SOLO": "true"},
@@ -182,42 +168,33 @@ def test_second_invocation_appends_new_line(solo_tmp_path):
         cwd=str(solo_tmp_path),
     )
 
-    lines = _read_log_lines(solo_tmp_path)
-    assert len(lines) == 2, (
-        f"Expected exactly 2 lines after two invocations, got {len(lines)}: {lines!r}"
-    )
-    assert "agent-one" in lines[0], (
-        f"Expected first entry to contain 'agent-one', got: {lines[0]!r}"
-    )
-    assert "agent-two" in lines[1], (
-        f"Expected second entry to contain 'agent-two', got: {lines[1]!r}"
-    )
+    assert [event["agent"] for event in _read_events(solo_tmp_path)] == ["agent-one", "agent-two"]
 
 
 def test_no_log_when_not_solo_mode(solo_tmp_path):
     """Scenario: solo-mode-guard | Test Case: no-log-when-not-solo-mode
 
-    When PAIRINGBUDDY_SOLO is unset or false, solo-progress.log is not created.
+    When PAIRINGBUDDY_SOLO is unset or false, solo-events.ndjson is not created.
     """
     # run_hook removes PAIRINGBUDDY_SOLO by default; pass empty dict to leave it unset
     run_hook({}, stdin_payload=_task_stdin(), cwd=str(solo_tmp_path))
 
-    log_file = solo_tmp_path / ".pairingbuddy" / "solo-progress.log"
+    log_file = solo_tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
     assert not log_file.exists(), (
-        "Expected solo-progress.log NOT to be created when PAIRINGBUDDY_SOLO is unset"
+        "Expected solo-events.ndjson NOT to be created when PAIRINGBUDDY_SOLO is unset"
     )
 
 
 def test_no_log_for_non_task_tool(solo_tmp_path):
     """Scenario: solo-mode-guard | Test Case: no-log-for-non-task-tool
 
-    When the tool_name is not 'Agent' (e.g. 'Write'), solo-progress.log is not written to.
+    When the tool_name is not 'Agent' (e.g. 'Write'), solo-events.ndjson is not written to.
     """
     stdin_payload = {"tool_name": "Read", "tool_input": {"path": "some/file.py"}}
 
     run_hook({"PAIRINGBUDDY_SOLO": "true"}, stdin_payload=stdin_payload, cwd=str(solo_tmp_path))
 
-    log_file = solo_tmp_path / ".pairingbuddy" / "solo-progress.log"
+    log_file = solo_tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
     assert not log_file.exists(), (
-        "Expected solo-progress.log NOT to be created for non-Task tool (Read)"
+        "Expected solo-events.ndjson NOT to be created for non-Task tool (Read)"
     )
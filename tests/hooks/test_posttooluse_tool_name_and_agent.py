@@ -39,9 +39,9 @@ def _non_agent_stdin(tool_name: str = "Read") -> dict:
 
 
 def _read_log_lines(tmp_path) -> list[str]:
-    """Assert solo-progress.log exists and return its non-empty lines."""
-    log_file = tmp_path / ".pairingbuddy" / "solo-progress.log"
-    assert log_file.exists(), "Expected .pairingbuddy/solo-progress.log to be created"
+    """Assert solo-events.ndjson exists and return its non-empty lines."""
+    log_file = tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
+    assert log_file.exists(), "Expected .pairingbuddy/events/solo-events.ndjson to be created"
     return [line for line in log_file.read_text().splitlines() if line.strip()]
 
 
@@ -96,7 +96,7 @@ def test_skips_non_agent_tool_events_read(solo_tmp_path):
         cwd=str(solo_tmp_path),
     )
 
-    log_file = solo_tmp_path / ".pairingbuddy" / "solo-progress.log"
+    log_file = solo_tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
     assert not log_file.exists(), "Expected hook to skip non-Agent tool_name"
 
 
@@ -111,7 +111,7 @@ def test_skips_non_agent_tool_events_write(solo_tmp_path):
         cwd=str(solo_tmp_path),
     )
 
-    log_file = solo_tmp_path / ".pairingbuddy" / "solo-progress.log"
+    log_file = solo_tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
     assert not log_file.exists(), "Expected hook to skip non-Agent tool_name"
 
 
@@ -126,7 +126,7 @@ def test_skips_non_agent_tool_events_task(solo_tmp_path):
         cwd=str(solo_tmp_path),
     )
 
-    log_file = solo_tmp_path / ".pairingbuddy" / "solo-progress.log"
+    log_file = solo_tmp_path / ".pairingbuddy" / "events" / "solo-events.ndjson"
     assert not log_file.exists(), "Expected hook to skip non-Agent tool_name"
 
 
@@ -0,0 +1,118 @@
+"""Tests for the hook state store (hooks/lib/state-store.mjs).
+
+Scenarios covered:
+- unchanged-skipped: Writing the content a file already holds leaves it untouched
+- atomic-write: Changed content replaces the file via rename, leaving no temp files
+- appends-batched: Queued appends reach the file together, on exit or after the flush delay
+- guardian-unchanged: A repeated tool call does not rewrite the guardian state file
+"""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+STORE_URL = (Path(__file__).parent.parent.parent / "hooks" / "lib" / "state-store.mjs").as_uri()
+GUARDIAN_PATH = Path(__file__).parent.parent.parent / "hooks" / "guardian.mjs"
+
+
+def _node(script: str, cwd) -> str:
+    result = subprocess.run(
+        [
+            "node",
+            "--input-type=module",
+            "-e",
+            f"import * as store from {json.dumps(STORE_URL)};\n{script}",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(cwd),
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    target = tmp_path / "state.json"
+    target.write_text("same")
+    os.utime(target, (1_000_000, 1_000_000))
+
+    output = _node('console.log(store.writeText("state.json", "same"));', tmp_path)
+
+    assert output.strip() == "false"
+    assert target.stat().st_mtime == 1_000_000
+
+
+def test_changed_content_is_written_atomically(tmp_path):
+    (tmp_path / "state.json").write_text("old")
+
+    output = _node(
+        'console.log(store.writeJson("nested/state.json", {a: 1}),'
+        ' store.writeText("state.json", "new"));',
+        tmp_path,
+    )
+
+    assert output.strip() == "true true"
+    assert json.loads((tmp_path / "nested" / "state.json").read_text()) == {"a": 1}
+    assert (tmp_path / "state.json").read_text() == "new"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_appends_are_flushed_on_exit(tmp_path):
+    output = _node(
+        """
+import { existsSync } from "fs";
+store.appendText("events.log", "one\\n");
+store.appendText("events.log", "two\\n");
+console.log(existsSync("events.log"));
+""",
+        tmp_path,
+    )
+
+    assert output.strip() == "false"
+    assert (tmp_path / "events.log").read_text() == "one\ntwo\n"
+
+
+def test_appends_are_flushed_after_delay(tmp_path):
+    output = _node(
+        """
+import { readFileSync } from "fs";
+store.appendText("events.log", "one\\n");
+setTimeout(() => {
+  console.log(JSON.stringify(readFileSync("events.log", "utf8")));
+  store.appendText("events.log", "two\\n");
+}, store.APPEND_FLUSH_MS + 100);
+setTimeout(() => {}, store.APPEND_FLUSH_MS + 200);
+""",
+        tmp_path,
+    )
+
+    assert json.loads(output) == "one\n"
+    assert (tmp_path / "events.log").read_text() == "one\ntwo\n"
+
+
+def test_guardian_skips_unchanged_state(tmp_path):
+    payload = json.dumps(
+        {"session_id": "s1", "hook_event_name": "PostToolUse", "tool_name": "Read"}
+    )
+    env = {**os.environ, "PAIRINGBUDDY_HOOKD": "0"}
+    env.pop("PAIRINGBUDDY_SOLO", None)
+
+    def run():
+        result = subprocess.run(
+            ["node", str(GUARDIAN_PATH)],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=str(tmp_path),
+            env=env,
+        )
+        assert result.returncode == 0, result.stderr
+
+    run()
+    state_file = tmp_path / ".pairingbuddy" / "hooks" / "s1.json"
+    os.utime(state_file, (1_000_000, 1_000_000))
+    run()
+
+    assert state_file.stat().st_mtime == 1_000_000
+    assert json.loads(state_file.read_text())["lastTool"] == "Read"
@@ -0,0 +1 @@
+# Runner engine tests package
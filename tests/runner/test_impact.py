@@ -0,0 +1,151 @@
+"""Tests for the test impact index (pairingbuddy/runner/impact.py).
+
+Scenarios covered:
+- python: Tests are selected through direct, relative and transitive imports
+- js and go: Relative JS/TS imports and Go packages are followed the same way
+- outside the graph: Config changes select every test, documentation changes none
+- incremental: Only files that changed on disk are parsed again
+- cli: affected-tests prints the affected files and a command per runner
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.runner import affected_tests, load_test_config, update_index
+
+ROOT = Path(__file__).parent.parent.parent
+
+PYTHON_PROJECT = {
+    "src/app/__init__.py": "",
+    "src/app/models.py": "class User:\n    pass\n",
+    "src/app/service.py": "from .models import User\n",
+    "src/app/report.py": "import json\n",
+    "tests/test_models.py": "from app import models\n",
+    "tests/test_service.py": "from app.service import User\n",
+    "tests/test_report.py": "import app.report\n",
+}
+
+
+GO_MAIN_TEST = """package main
+
+import (
+	"testing"
+
+	"example.com/m/src/pkg/x"
+)
+"""
+
+
+def _project(tmp_path: Path, files: dict, runners: dict) -> Path:
+    for path, text in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    config = {"source_directory": "src", "runners": runners, "default_runner": next(iter(runners))}
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / ".pairingbuddy" / "test-config.json").write_text(json.dumps(config))
+    return tmp_path
+
+
+def _runner(command: str, test_directory: str, file_pattern: str) -> dict:
+    return {
+        "name": command,
+        "command": command,
+        "test_directory": test_directory,
+        "file_pattern": file_pattern,
+        "run_args": ["-q"],
+    }
+
+
+def _affected(project: Path, changed: list[str]) -> dict:
+    config = load_test_config(project / ".pairingbuddy" / "test-config.json")
+    files = update_index(project, config, project / ".pairingbuddy")
+    return affected_tests(project, config, files, changed)
+
+
+@pytest.fixture
+def python_project(tmp_path):
+    return _project(tmp_path, PYTHON_PROJECT, {"unit": _runner("pytest", "tests", "test_*.py")})
+
+
+def test_python_imports_select_tests(python_project):
+    assert _affected(python_project, ["src/app/models.py"]) == {
+        "unit": ["tests/test_models.py", "tests/test_service.py"]
+    }
+    assert _affected(python_project, ["src/app/report.py"]) == {"unit": ["tests/test_report.py"]}
+    assert _affected(python_project, ["tests/test_service.py"]) == {
+        "unit": ["tests/test_service.py"]
+    }
+
+
+def test_changes_outside_the_graph(python_project):
+    everything = {"unit": ["tests/test_models.py", "tests/test_report.py", "tests/test_service.py"]}
+
+    assert _affected(python_project, ["pyproject.toml"]) == everything
+    assert _affected(python_project, ["README.md"]) == {}
+
+
+def test_js_and_go_imports(tmp_path):
+    files = {
+        "src/a.ts": "export const a = 1;\n",
+        "src/b.ts": "import { a } from './a';\n",
+        "src/c/index.js": "module.exports = {};\n",
+        "web/b.test.ts": "import { b } from '../src/b';\n",
+        "web/c.test.js": "const c = require('../src/c');\n",
+        "go.mod": "module example.com/m\n\ngo 1.22\n",
+        "src/pkg/x/x.go": "package x\n",
+        "src/pkg/x/x_test.go": "package x\n",
+        "src/cmd/main_test.go": GO_MAIN_TEST,
+    }
+    runners = {
+        "jest": _runner("npx jest", "web", "*.test.*"),
+        "go": _runner("go test", "src", "*_test.go"),
+    }
+    project = _project(tmp_path, files, runners)
+
+    assert _affected(project, ["src/a.ts"]) == {"jest": ["web/b.test.ts"]}
+    assert _affected(project, ["src/c/index.js"]) == {"jest": ["web/c.test.js"]}
+    assert _affected(project, ["src/pkg/x/x.go"]) == {
+        "go": ["src/cmd/main_test.go", "src/pkg/x/x_test.go"]
+    }
+
+
+def test_index_reparses_only_changed_files(python_project):
+    state = python_project / ".pairingbuddy"
+    config = load_test_config(state / "test-config.json")
+    update_index(python_project, config, state)
+    index_path = state / "cache" / "test-impact.json"
+    index = json.loads(index_path.read_text())
+    index["files"]["src/app/models.py"]["refs"] = ["py:marker"]
+    index_path.write_text(json.dumps(index))
+    report = python_project / "src" / "app" / "report.py"
+    report.write_text("from app.models import User\n")
+
+    files = update_index(python_project, config, state)
+
+    assert files["src/app/models.py"]["refs"] == ["py:marker"], "unchanged file was parsed"
+    assert files["src/app/report.py"]["refs"] == ["py:app.models", "py:app.models.User"]
+    assert json.loads(index_path.read_text())["files"] == files
+
+
+@pytest.mark.integration
+def test_cli_prints_commands(python_project):
+    launcher = str(ROOT / "scripts" / "pairingbuddy")
+    result = subprocess.run(
+        [launcher, "affected-tests", "--changed", "src/app/report.py"],
+        capture_output=True,
+        text=True,
+        cwd=python_project,
+        env={**os.environ, "PAIRINGBUDDY_PYTHON": sys.executable},
+    )
+
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout)
+    assert output["changed"] == ["src/app/report.py"]
+    assert output["runners"] == {
+        "unit": {"tests": ["tests/test_report.py"], "command": "pytest tests/test_report.py -q"}
+    }
@@ -0,0 +1,97 @@
+"""Tests for concurrent runners (pairingbuddy/runner/schedule.py).
+
+Scenarios covered:
+- parallel: With "parallel": true, runners overlap and their results merge in runner order
+- serial: Without it, runners run one after another
+- slots: Runners hold max_workers CPU slots, so wide runners do not overlap on a small machine
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.runner import aggregate, load_test_config, run_runners
+
+# Records when it ran, then writes a JUnit report with one passing and,
+# for runner "b", one failing test.
+FAKE_RUNNER = """
+import sys, time
+name, report = sys.argv[1], sys.argv[-1].split("=", 1)[1]
+start = time.time()
+time.sleep(0.4)
+with open(f"{name}.times", "w") as f:
+    f.write(f"{start} {time.time()}")
+failure = '<failure message="x">boom</failure>' if name == "b" else ""
+with open(report, "w") as f:
+    f.write(f'<testsuite><testcase file="{name}.py" name="ok"/>'
+            f'<testcase file="{name}.py" name="check">{failure}</testcase></testsuite>')
+"""
+
+
+def _write_config(project: Path, names: list[str], parallel: bool, max_workers: int = 1):
+    runners = {
+        name: {
+            "name": name,
+            "command": f"{sys.executable} fake_runner.py {name}",
+            "test_directory": "tests",
+            "file_pattern": "*.py",
+            "run_args": [],
+            "max_workers": max_workers,
+            "report": {"format": "junit", "args": ["--junitxml={report}"]},
+        }
+        for name in names
+    }
+    config = {"source_directory": "src", "runners": runners, "default_runner": names[0]}
+    if parallel:
+        config["parallel"] = True
+    path = project / ".pairingbuddy" / "test-config.json"
+    path.write_text(json.dumps(config))
+    return load_test_config(path)
+
+
+def _overlapping(project: Path, names: list[str]) -> bool:
+    spans = sorted(tuple(map(float, (project / f"{n}.times").read_text().split())) for n in names)
+    return any(later[0] < earlier[1] for earlier, later in zip(spans, spans[1:], strict=False))
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / "fake_runner.py").write_text(FAKE_RUNNER)
+    return tmp_path
+
+
+@pytest.mark.integration
+def test_parallel_runners_overlap_and_merge(project):
+    config = _write_config(project, ["a", "b", "c"], parallel=True)
+
+    results = run_runners(config.runners, project, parallel=config.parallel, capacity=4)
+
+    assert [result.runner_id for result in results] == ["a", "b", "c"]
+    assert _overlapping(project, ["a", "b", "c"])
+    summary = aggregate(results, project)
+    assert (summary["total"], summary["passed"], summary["failed"]) == (6, 5, 1)
+    assert summary["failures"] == [
+        {"test_file": "b.py", "test_function": "check", "failure_message": "boom"}
+    ]
+
+
+@pytest.mark.integration
+def test_runners_are_serial_by_default(project):
+    config = _write_config(project, ["a", "b"], parallel=False)
+
+    run_runners(config.runners, project, parallel=config.parallel, capacity=4)
+
+    assert not _overlapping(project, ["a", "b"])
+
+
+@pytest.mark.integration
+def test_max_workers_limits_overlap(project):
+    config = _write_config(project, ["a", "b"], parallel=True, max_workers=2)
+
+    results = run_runners(config.runners, project, parallel=config.parallel, capacity=3)
+
+    assert not _overlapping(project, ["a", "b"])
+    assert all(result.returncode == 0 for result in results)
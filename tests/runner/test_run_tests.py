@@ -0,0 +1,239 @@
+"""Tests for the deterministic run-all-tests engine (pairingbuddy/runner, scripts/pairingbuddy).
+
+Scenarios covered:
+- engine: run-tests runs a real pytest suite and writes schema-valid all-tests-results.json
+- reports: JUnit XML, jest JSON and go test -json reports parse to the same outcomes
+- broken runs: A runner that crashes or writes no report is counted as a failure
+- config: Runners without a known reporter stop the engine with exit code 2
+- launcher: session-start exports PAIRINGBUDDY_PLUGIN_ROOT so agents can find the launcher
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+from pairingbuddy.runner import Runner, build_command, load_test_config
+from pairingbuddy.runner.reports import parse_go_json, parse_jest_json, parse_junit
+
+ROOT = Path(__file__).parent.parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+RESULTS_SCHEMA = ROOT / "contracts" / "schemas" / "all-tests-results.schema.json"
+CONFIG_SCHEMA = ROOT / "contracts" / "schemas" / "test-config.schema.json"
+
+SUITE = """
+import pytest
+
+def test_passes():
+    assert True
+
+def test_fails():
+    assert 1 + 1 == 3
+
+@pytest.mark.skip(reason="not yet")
+def test_skipped():
+    pass
+
+class TestGroup:
+    def test_in_class(self):
+        pass
+"""
+
+
+def _write_config(project: Path, runners: dict) -> None:
+    config = {"source_directory": "src", "runners": runners, "default_runner": next(iter(runners))}
+    Draft7Validator(json.loads(CONFIG_SCHEMA.read_text())).validate(config)
+    (project / ".pairingbuddy").mkdir(exist_ok=True)
+    (project / ".pairingbuddy" / "test-config.json").write_text(json.dumps(config))
+
+
+def _runner(command: str, **extra) -> dict:
+    return {
+        "name": command,
+        "command": command,
+        "test_directory": "tests",
+        "file_pattern": "test_*.py",
+        "run_args": ["-q", "-p", "no:cacheprovider"],
+        **extra,
+    }
+
+
+def _run_engine(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), "run-tests", *args],
+        capture_output=True,
+        text=True,
+        cwd=project,
+        env=env,
+        timeout=60,
+    )
+
+
+def _results(project: Path) -> dict:
+    results = json.loads((project / ".pairingbuddy" / "all-tests-results.json").read_text())
+    Draft7Validator(json.loads(RESULTS_SCHEMA.read_text())).validate(results)
+    return results
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_suite.py").write_text(SUITE)
+    return tmp_path
+
+
+@pytest.mark.integration
+def test_engine_runs_pytest_and_writes_results(project):
+    _write_config(project, {"unit": _runner(f"{sys.executable} -m pytest")})
+
+    result = _run_engine(project)
+
+    assert result.returncode == 1, result.stderr
+    assert result.stdout.strip() == "2 passed, 1 failed, 1 skipped (0 cached): fail"
+    results = _results(project)
+    counts = [results[key] for key in ("total", "passed", "failed", "skipped")]
+    assert counts == [4, 2, 1, 1]
+    [failure] = results["failures"]
+    assert failure["test_file"] == "tests/test_suite.py"
+    assert failure["test_function"] == "test_fails"
+    assert "assert (1 + 1) == 3" in failure["failure_message"]
+
+
+@pytest.mark.integration
+def test_engine_passes_clean_suite(project):
+    (project / "tests" / "test_suite.py").write_text("def test_ok():\n    pass\n")
+    _write_config(project, {"unit": _runner(f"{sys.executable} -m pytest")})
+
+    result = _run_engine(project)
+
+    assert result.returncode == 0, result.stderr
+    assert _results(project) == {
+        "total": 1,
+        "passed": 1,
+        "failed": 0,
+        "skipped": 0,
+        "cached": 0,
+        "status": "pass",
+        "failures": [],
+    }
+
+
+@pytest.mark.integration
+def test_runner_without_report_fails_the_run(project):
+    broken = _runner("sh -c 'exit 3'", report={"format": "junit", "args": ["--junitxml={report}"]})
+    _write_config(project, {"broken": broken})
+
+    result = _run_engine(project)
+
+    assert result.returncode == 1
+    [failure] = _results(project)["failures"]
+    assert failure["test_function"] == "<broken>"
+    assert "runner wrote no report (exit code 3)" in failure["failure_message"]
+
+
+def test_unknown_reporter_is_a_usage_error(project):
+    _write_config(project, {"custom": _runner("./run-tests.sh")})
+
+    result = _run_engine(project)
+
+    assert result.returncode == 2
+    assert "no reporter known for runner custom" in result.stderr
+    assert not (project / ".pairingbuddy" / "all-tests-results.json").exists()
+
+
+@pytest.mark.integration
+def test_session_start_exports_plugin_root(tmp_path):
+    env_file = tmp_path / "claude-env"
+    env = {**os.environ, "CLAUDE_ENV_FILE": str(env_file), "PAIRINGBUDDY_HOOKD": "0"}
+    subprocess.run(
+        ["node", str(ROOT / "hooks" / "session-start.mjs")],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        cwd=tmp_path,
+        env=env,
+        check=True,
+    )
+
+    result = subprocess.run(
+        ["bash", "-c", f'source {env_file} && "$PAIRINGBUDDY_PLUGIN_ROOT/scripts/pairingbuddy" -h'],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PAIRINGBUDDY_PYTHON": sys.executable},
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "run-tests" in result.stdout
+
+
+def test_reporter_args_follow_run_args(tmp_path):
+    _write_config(tmp_path, {"unit": _runner("uv run pytest")})
+    [runner] = load_test_config(tmp_path / ".pairingbuddy" / "test-config.json").runners
+
+    assert isinstance(runner, Runner)
+    assert build_command(runner, Path("/tmp/r.xml")) == (
+        "uv run pytest tests -q -p no:cacheprovider --junitxml=/tmp/r.xml -o junit_family=xunit1"
+    )
+
+
+def test_report_formats_agree():
+    junit = """<testsuites><testsuite>
+      <testcase classname="tests.test_a.TestA" file="tests/test_a.py" name="test_one"/>
+      <testcase classname="tests.test_a" file="tests/test_a.py" name="test_two">
+        <failure message="boom">Traceback\nAssertionError: boom</failure></testcase>
+      <testcase classname="tests.test_a" file="tests/test_a.py" name="test_three">
+        <skipped/></testcase>
+    </testsuite></testsuites>"""
+    jest = {
+        "testResults": [
+            {
+                "name": "/repo/src/a.test.js",
+                "assertionResults": [
+                    {"fullName": "a one", "status": "passed", "failureMessages": []},
+                    {"fullName": "a two", "status": "failed", "failureMessages": ["boom"]},
+                    {"fullName": "a three", "status": "pending", "failureMessages": []},
+                ],
+            },
+            {
+                "name": "/repo/src/b.test.js",
+                "assertionResults": [],
+                "status": "failed",
+                "message": "SyntaxError",
+            },
+        ]
+    }
+    go = "\n".join(
+        json.dumps(event)
+        for event in [
+            {"Action": "pass", "Package": "ex/a", "Test": "TestOne"},
+            {"Action": "output", "Package": "ex/a", "Test": "TestTwo", "Output": "boom\n"},
+            {"Action": "fail", "Package": "ex/a", "Test": "TestTwo"},
+            {"Action": "skip", "Package": "ex/a", "Test": "TestThree"},
+            {"Action": "fail", "Package": "ex/a"},
+            {"Action": "output", "Package": "ex/b", "Output": "undefined: Foo\n"},
+            {"Action": "fail", "Package": "ex/b"},
+        ]
+    )
+
+    junit_cases = parse_junit(junit)
+    jest_cases = parse_jest_json(json.dumps(jest))
+    go_cases = parse_go_json(go)
+
+    assert [c.outcome for c in junit_cases] == ["passed", "failed", "skipped"]
+    assert junit_cases[0].name == "TestA::test_one"
+    assert junit_cases[1].message.endswith("AssertionError: boom")
+    assert [c.outcome for c in jest_cases] == ["passed", "failed", "skipped", "failed"]
+    assert (jest_cases[3].name, jest_cases[3].message) == ("<file>", "SyntaxError")
+    assert [(c.name, c.outcome) for c in go_cases] == [
+        ("TestOne", "passed"),
+        ("TestTwo", "failed"),
+        ("TestThree", "skipped"),
+        ("<package>", "failed"),
+    ]
+    assert go_cases[1].message == "boom"
+    assert go_cases[3].message == "undefined: Foo"
@@ -0,0 +1,114 @@
+"""Tests for sharded runners (pairingbuddy/runner/shards.py, durations.py).
+
+Scenarios covered:
+- partition: Files are split into shards of similar recorded duration
+- file shards: A runner without shard_args runs its test files split across shards
+- templated shards: shard_args get each shard's {index} and {count}
+- durations: Per-file and per-shard durations are recorded for the next run
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.runner import (
+    aggregate,
+    load_durations,
+    load_test_config,
+    partition,
+    plan_shards,
+    record_durations,
+    run_runners,
+)
+
+# Writes its argv to argv-<group>.json and a JUnit report with one test;
+# group 2 writes no report.
+FAKE_SPLITTER = """
+import json, sys
+group = next(a.split("=")[1] for a in sys.argv if a.startswith("--group="))
+with open(f"argv-{group}.json", "w") as f:
+    json.dump(sys.argv[1:], f)
+if group != "2":
+    report = sys.argv[-1].split("=", 1)[1]
+    with open(report, "w") as f:
+        f.write(f'<testsuite><testcase file="t.py" name="group{group}" time="0.5"/></testsuite>')
+"""
+
+
+def _config(project: Path, runner: dict):
+    base = {"name": "unit", "test_directory": "tests", "file_pattern": "test_*.py", "run_args": []}
+    config = {"source_directory": "src", "runners": {"unit": {**base, **runner}}}
+    config["default_runner"] = "unit"
+    path = project / ".pairingbuddy" / "test-config.json"
+    path.write_text(json.dumps(config))
+    return load_test_config(path)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / "tests").mkdir()
+    return tmp_path
+
+
+def test_partition_balances_recorded_durations():
+    weights = {"a.py": 4.0, "b.py": 3.0, "c.py": 2.0, "d.py": 1.0}
+
+    assert partition(["a.py", "b.py", "c.py", "d.py"], 2, weights) == [
+        ["a.py", "d.py"],
+        ["b.py", "c.py"],
+    ]
+    assert partition(["a.py", "new.py"], 3, {"a.py": 2.0}) == [["a.py"], ["new.py"], []]
+
+
+@pytest.mark.integration
+def test_file_shards_run_and_record_durations(project):
+    for name in ("a", "b", "c"):
+        (project / "tests" / f"test_{name}.py").write_text(f"def test_{name}():\n    pass\n")
+    (project / "tests" / "test_d.py").write_text("def test_d():\n    assert False\n")
+    command = f"{sys.executable} -m pytest"
+    run_args = ["-p", "no:cacheprovider"]
+    config = _config(project, {"command": command, "run_args": run_args, "shards": 2})
+    state = project / ".pairingbuddy"
+
+    results = run_runners(config.runners, project, parallel=False, capacity=4)
+    record_durations(state, results, project)
+
+    assert [result.shard.files for result in results] == [
+        ("tests/test_a.py", "tests/test_c.py"),
+        ("tests/test_b.py", "tests/test_d.py"),
+    ]
+    summary = aggregate(results, project)
+    assert (summary["total"], summary["failed"]) == (4, 1)
+    assert summary["failures"][0]["test_file"] == "tests/test_d.py"
+    recorded = load_durations(state)["unit"]
+    assert set(recorded["files"]) == {f"tests/test_{name}.py" for name in "abcd"}
+    assert [(s["index"], s["count"]) for s in recorded["shards"]] == [(1, 2), (2, 2)]
+
+    recorded["files"]["tests/test_a.py"] = 10.0
+    shards = plan_shards(config.runners[0], project, {"unit": recorded})
+    assert shards[0].files == ("tests/test_a.py",)
+
+
+@pytest.mark.integration
+def test_shard_args_template(project):
+    (project / "split.py").write_text(FAKE_SPLITTER)
+    config = _config(
+        project,
+        {
+            "command": f"{sys.executable} split.py",
+            "shards": 3,
+            "shard_args": ["--group={index}", "--splits={count}"],
+            "report": {"format": "junit", "args": ["--junitxml={report}"]},
+        },
+    )
+
+    results = run_runners(config.runners, project, parallel=False, capacity=4)
+
+    argv = json.loads((project / "argv-3.json").read_text())
+    assert argv[:3] == ["tests", "--group=3", "--splits=3"]
+    summary = aggregate(results, project)
+    assert (summary["total"], summary["passed"], summary["failed"]) == (3, 2, 1)
+    assert summary["failures"][0]["test_function"] == "<unit shard 2/3>"
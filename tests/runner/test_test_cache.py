@@ -0,0 +1,115 @@
+"""Tests for the content-addressed test result cache (pairingbuddy/runner/cache.py).
+
+Scenarios covered:
+- hits: A second run with nothing changed reports every passing file from the cache
+- invalidation: Changing a source file reruns only the tests that import it
+- failures: Failing test files are never cached
+- final gate: --no-cache runs every test, and still refreshes the cache
+- eviction: The least recently used entries go first once a limit is exceeded
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from pairingbuddy.runner import TestCache, load_test_config, update_index
+
+ROOT = Path(__file__).parent.parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+PROJECT = {
+    "src/app/__init__.py": "",
+    "src/app/models.py": "NAME = 'user'\n",
+    "src/app/report.py": "TITLE = 'report'\n",
+    "tests/test_models.py": "from app import models\n\ndef test_name():\n    assert models.NAME\n",
+    "tests/test_report.py": (
+        "from app import report\n\ndef test_title():\n    assert report.TITLE\n"
+    ),
+}
+
+
+def _project(tmp_path: Path, files: dict = PROJECT) -> Path:
+    for path, text in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    runner = {
+        "name": "pytest",
+        "command": f"{sys.executable} -m pytest",
+        "test_directory": "tests",
+        "file_pattern": "test_*.py",
+        "run_args": ["-q", "-p", "no:cacheprovider", "-o", "pythonpath=src"],
+    }
+    config = {"source_directory": "src", "runners": {"py": runner}, "default_runner": "py"}
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / ".pairingbuddy" / "test-config.json").write_text(json.dumps(config))
+    return tmp_path
+
+
+def _run_engine(project: Path, *args: str) -> str:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    result = subprocess.run(
+        [str(LAUNCHER), "run-tests", *args],
+        capture_output=True,
+        text=True,
+        cwd=project,
+        env=env,
+        timeout=60,
+    )
+    assert result.returncode in (0, 1), result.stderr
+    return result.stdout.strip()
+
+
+def test_second_run_reports_passing_files_from_cache(tmp_path):
+    project = _project(tmp_path)
+
+    assert _run_engine(project) == "2 passed, 0 failed, 0 skipped (0 cached): pass"
+    assert _run_engine(project) == "2 passed, 0 failed, 0 skipped (2 cached): pass"
+
+    results = json.loads((project / ".pairingbuddy" / "all-tests-results.json").read_text())
+    assert results["cached"] == 2
+
+
+def test_source_change_reruns_only_dependent_tests(tmp_path):
+    project = _project(tmp_path)
+    _run_engine(project)
+
+    (project / "src/app/models.py").write_text("NAME = 'admin'\n")
+
+    assert _run_engine(project) == "2 passed, 0 failed, 0 skipped (1 cached): pass"
+
+
+def test_failing_files_are_not_cached(tmp_path):
+    files = {**PROJECT, "tests/test_report.py": "def test_title():\n    assert False\n"}
+    project = _project(tmp_path, files)
+
+    assert _run_engine(project) == "1 passed, 1 failed, 0 skipped (0 cached): fail"
+    assert _run_engine(project) == "1 passed, 1 failed, 0 skipped (1 cached): fail"
+
+
+def test_no_cache_runs_every_test_and_refreshes_cache(tmp_path):
+    project = _project(tmp_path)
+    _run_engine(project)
+
+    assert _run_engine(project, "--no-cache") == "2 passed, 0 failed, 0 skipped (0 cached): pass"
+    assert _run_engine(project) == "2 passed, 0 failed, 0 skipped (2 cached): pass"
+
+
+def test_evict_removes_least_recently_used_entries(tmp_path):
+    project = _project(tmp_path)
+    _run_engine(project)
+    state = project / ".pairingbuddy"
+    config = load_test_config(state / "test-config.json")
+    cache = TestCache(state, project, config, update_index(project, config, state), {})
+    entries = sorted((state / "cache" / "tests").glob("*/*.json"))
+    assert len(entries) == 2
+    old = time.time() - 60
+    os.utime(entries[0], (old, old))
+
+    assert cache.evict(max_bytes=10**6, max_entries=1) == 1
+    assert not entries[0].exists() and entries[1].exists()
+    assert cache.evict(max_bytes=0, max_entries=10) == 1
+    assert not entries[1].exists()
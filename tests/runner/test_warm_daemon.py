@@ -0,0 +1,118 @@
+"""Tests for warm targeted runs (pairingbuddy/runner/daemon.py, warm.py).
+
+Scenarios covered:
+- warm: Targeted runs go through the daemon, started on first use, with the runner's exit code
+- stale: Editing a module the daemon preloaded restarts it, so runs see the edit
+- fallback: A daemon that does not start leaves the run to the cold command
+- cli: run-targeted passes the exit code through; affected-tests routes daemon runners
+  through it; stop-daemons stops them
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.runner import load_test_config, run_targeted, stop_daemon
+from pairingbuddy.runner.daemon import is_running
+
+ROOT = Path(__file__).parent.parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="the warm daemon forks")
+
+
+def _project(tmp_path: Path, daemon: dict) -> Path:
+    files = {
+        "helpers.py": "ANSWER = 42\n",
+        "tests/test_answer.py": "from helpers import ANSWER\n\n"
+        "def test_answer():\n    assert ANSWER == 42\n\n"
+        "def test_wrong():\n    assert ANSWER == 0\n",
+    }
+    for path, text in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    runner = {
+        "name": "pytest",
+        "command": f"{sys.executable} -m pytest -p no:cacheprovider",
+        "test_directory": "tests",
+        "file_pattern": "test_*.py",
+        "run_args": ["-q", "-p", "no:cacheprovider"],
+        "daemon": daemon,
+    }
+    (tmp_path / ".pairingbuddy").mkdir()
+    config = {"runners": {"unit": runner}, "default_runner": "unit"}
+    (tmp_path / ".pairingbuddy" / "test-config.json").write_text(json.dumps(config))
+    return tmp_path
+
+
+WARM = {
+    "command": f"{sys.executable} -m pairingbuddy.runner.warm --socket {{socket}} --preload helpers"
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = _project(tmp_path, WARM)
+    yield project
+    stop_daemon(project, _runner(project))
+
+
+def _runner(project: Path):
+    return load_test_config(project / ".pairingbuddy" / "test-config.json").runner()
+
+
+def _run(project: Path, *targets: str):
+    return run_targeted(project, project / ".pairingbuddy", _runner(project), list(targets))
+
+
+def test_targeted_runs_go_through_the_daemon(project):
+    passed = _run(project, "tests/test_answer.py::test_answer")
+    failed = _run(project, "tests/test_answer.py::test_wrong")
+
+    assert (passed.returncode, passed.warm) == (0, True)
+    assert (failed.returncode, failed.warm) == (1, True)
+    assert "1 failed" in failed.output
+    assert is_running(project, _runner(project))
+
+
+def test_edited_preloaded_module_restarts_the_daemon(project):
+    assert _run(project, "tests/test_answer.py::test_wrong").returncode == 1
+    helpers = project / "helpers.py"
+    helpers.write_text("ANSWER = 0\n")
+    os.utime(helpers, ns=(0, 0))
+
+    run = _run(project, "tests/test_answer.py::test_wrong")
+
+    assert (run.returncode, run.warm) == (0, True)
+
+
+def test_daemon_that_does_not_start_falls_back_to_cold(tmp_path):
+    project = _project(tmp_path, {"command": "exit 1 # {socket}", "startup_timeout": 5})
+
+    run = _run(project, "tests/test_answer.py")
+
+    assert (run.returncode, run.warm) == (1, False)
+    assert "1 failed, 1 passed" in run.output
+
+
+def _cli(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=project, env=env, timeout=60
+    )
+
+
+def test_cli_routes_daemon_runners_through_run_targeted(project):
+    affected = _cli(project, "affected-tests", "--changed", "helpers.py")
+    command = json.loads(affected.stdout)["runners"]["unit"]["command"]
+
+    assert command == f"{LAUNCHER.resolve()} run-targeted --runner unit tests/test_answer.py"
+    assert _cli(project, "run-targeted", "tests/test_answer.py::test_answer").returncode == 0
+    assert _cli(project, "run-targeted", "tests/test_answer.py").returncode == 1
+    assert _cli(project, "stop-daemons").stdout.strip() == "1 daemons stopped"
+    assert not is_running(project, _runner(project))
@@ -0,0 +1,66 @@
+"""Tests for render_status reading the guardian's active-session pointer.
+
+Scenarios covered:
+- pointer: The agent line comes from the session named in active-session, even if
+  another session file is newer
+- no-pointer: Without a pointer, the newest session file is used
+- bad-pointer: A pointer that is not a plain session id is ignored
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+SCRIPT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "solo-buddy.sh")
+)
+
+
+def _render(project) -> str:
+    script = f"""
+set +e
+cd {str(project)!r}
+PLAN_FILE=plan.md
+LAST_RENDER_LINES=0
+eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+render_status
+"""
+    return subprocess.run(["bash", "-c", script], capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def hooks_dir(tmp_path):
+    path = tmp_path / ".pairingbuddy" / "hooks"
+    path.mkdir(parents=True)
+    (path / "pinned.json").write_text(json.dumps({"lastAgent": "pairingbuddy:pinned-agent"}))
+    newer = path / "newer.json"
+    newer.write_text(json.dumps({"lastAgent": "pairingbuddy:newer-agent"}))
+    stat = newer.stat()
+    os.utime(newer, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    return path
+
+
+def test_pointer_selects_session(tmp_path, hooks_dir):
+    (hooks_dir / "active-session").write_text("pinned\n")
+
+    output = _render(tmp_path)
+
+    assert "pinned-agent" in output
+    assert "newer-agent" not in output
+
+
+def test_newest_session_without_pointer(tmp_path, hooks_dir):
+    output = _render(tmp_path)
+
+    assert "newer-agent" in output
+
+
+def test_invalid_pointer_is_ignored(tmp_path, hooks_dir):
+    (hooks_dir / "active-session").write_text("../../pinned\n")
+
+    output = _render(tmp_path)
+
+    assert "newer-agent" in output
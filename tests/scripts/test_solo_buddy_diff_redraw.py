@@ -0,0 +1,203 @@
+"""Tests for diff-based terminal redraw in render_status.
+
+Scenarios covered:
+- screen-matches-frame: After several frames the terminal shows exactly the latest frame
+- spinner-only-diff: A frame where only the spinner moved rewrites one line
+- shrinking-frame: Lines left over from a taller previous frame are cleared
+- viewport: Long plans show a window around the current task
+- render-stats: Bytes written per minute are appended to solo-render-stats
+"""
+
+import os
+import pty
+import re
+import subprocess
+
+import pytest
+
+SCRIPT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "solo-buddy.sh")
+)
+
+ESCAPE = re.compile(r"\x1b\[(\d*)([ABJKm])")
+
+
+def _emulate(stream: str) -> list[str]:
+    """Replay cursor-up/down, erase-line, erase-below and text onto a screen."""
+    rows, row, col, pos = [""], 0, 0, 0
+    while pos < len(stream):
+        match = ESCAPE.match(stream, pos)
+        if match:
+            count = int(match.group(1) or 1)
+            op = match.group(2)
+            if op == "A":
+                row = max(0, row - count)
+            elif op == "B":
+                row += count
+            elif op == "K":
+                rows[row] = ""
+            elif op == "J":
+                rows[row] = rows[row][:col]
+                del rows[row + 1 :]
+            pos = match.end()
+            while len(rows) <= row:
+                rows.append("")
+            continue
+        char = stream[pos]
+        pos += 1
+        if char == "\r":
+            col = 0
+        elif char == "\n":
+            row += 1
+            while len(rows) <= row:
+                rows.append("")
+        else:
+            line = rows[row].ljust(col)
+            rows[row] = line[:col] + char + line[col + 1 :]
+            col += 1
+    while rows and rows[-1] == "":
+        rows.pop()
+    return rows
+
+
+def _render_on_pty(project, body: str) -> tuple[str, str]:
+    """Run *body* with render_status loaded and stdout on a pty; return (tty output, stderr)."""
+    script = f"""
+set +e
+cd {str(project)!r}
+PLAN_FILE=plan.md
+LAST_RENDER_LINES=0
+FORCE_COLOR=0
+eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+{body}
+"""
+    master, slave = pty.openpty()
+    proc = subprocess.Popen(
+        ["bash", "-c", script],
+        stdout=slave,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "LANG": "C.UTF-8"},
+    )
+    os.close(slave)
+    output = b""
+    while True:
+        try:
+            chunk = os.read(master, 65536)
+        except OSError:
+            break
+        if not chunk:
+            break
+        output += chunk
+    stderr = proc.stderr.read()
+    proc.wait(timeout=10)
+    os.close(master)
+    return output.decode("utf-8"), stderr
+
+
+def _plan(checked: int, unchecked: int) -> str:
+    tasks = [f"- [x] Done {i}" for i in range(checked)]
+    tasks += [f"- [ ] Todo {i}" for i in range(unchecked)]
+    return "# Plan\n\n" + "\n".join(tasks) + "\n"
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / "plan.md").write_text(_plan(2, 3))
+    return tmp_path
+
+
+def _last_frame(project, body: str) -> list[str]:
+    """Render the same final state without a terminal to get the expected lines."""
+    script = f"""
+set +e
+cd {str(project)!r}
+PLAN_FILE=plan.md
+LAST_RENDER_LINES=0
+FORCE_COLOR=0
+eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+{body}
+"""
+    result = subprocess.run(["bash", "-c", script], capture_output=True, text=True)
+    return result.stdout.splitlines()
+
+
+def test_screen_matches_latest_frame(project):
+    """Diffed output leaves the terminal showing exactly the last frame."""
+    body = """
+render_status
+render_status
+sleep 0.05
+printf '%s\\n' '# Plan' '- [x] Done 0' '- [x] Done 1' '- [x] Todo 0' \\
+    '- [ ] Todo 1' '- [ ] Todo 2' > plan.md
+render_status
+"""
+    output, _ = _render_on_pty(project, body)
+
+    expected = _last_frame(project, "SPINNER_INDEX=2\nrender_status")
+    assert _emulate(output) == expected
+
+
+def test_spinner_only_frame_rewrites_one_line(project):
+    """When only the spinner moved, one line is rewritten instead of the whole frame."""
+    body = """
+render_status
+first=$RENDER_BYTES
+render_status
+echo "FIRST=$first SECOND=$(( RENDER_BYTES - first ))" >&2
+"""
+    output, stderr = _render_on_pty(project, body)
+
+    first, second = map(int, re.search(r"FIRST=(\d+) SECOND=(\d+)", stderr).groups())
+    assert second < first / 3, (
+        f"Spinner-only frame wrote {second} bytes vs {first} for a full frame"
+    )
+    assert output.count("\x1b[2K") == 1
+
+
+def test_shrinking_frame_clears_leftover_lines(project):
+    """Lines from a taller previous frame do not linger on screen."""
+    body = """
+render_status
+sleep 0.05
+printf '%s\\n' '# Plan' '- [ ] Only task' > plan.md
+render_status
+"""
+    output, _ = _render_on_pty(project, body)
+
+    screen = _emulate(output)
+    assert not any("Done" in line for line in screen), screen
+    assert screen == _last_frame(project, "SPINNER_INDEX=1\nrender_status")
+
+
+def test_viewport_caps_long_task_lists(project):
+    """A 60-task plan shows a window around the current task with summary lines."""
+    (project / "plan.md").write_text(_plan(30, 30))
+
+    lines = _last_frame(project, "RENDER_VIEWPORT=10\nrender_status")
+
+    task_lines = [line for line in lines if "Done" in line or "Todo" in line]
+    assert len(task_lines) == 10
+    assert "Todo 0" in "\n".join(task_lines), "The current task must be inside the viewport"
+    assert any("… 28 earlier" in line for line in lines)
+    assert any("… 22 more" in line for line in lines)
+    assert "[30/60]" in "\n".join(lines)
+
+
+def test_render_stats_written_each_minute(project):
+    """Once a minute the byte counters are appended to solo-render-stats."""
+    body = """
+render_status
+render_status
+RENDER_STATS_START=$(( SECONDS - 60 ))
+render_status
+"""
+    _render_on_pty(project, body)
+
+    stats = (project / ".pairingbuddy" / "solo-render-stats").read_text()
+    match = re.fullmatch(r"minute=1 bytes=(\d+) full_redraw_bytes=(\d+) frames=3\n", stats)
+    assert match, stats
+    assert int(match.group(1)) < int(match.group(2))
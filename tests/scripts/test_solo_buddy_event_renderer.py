@@ -0,0 +1,136 @@
+"""Tests for the event-driven solo-buddy renderer loop.
+
+Scenarios covered:
+- idle-backoff: With no file changes, redraws slow down along RENDER_BACKOFF
+- change-wakeup: A change to a watched file brings back fast redraws
+- no-forks-per-frame: render_status does not spawn external commands
+- in-memory-spinner: The spinner index is kept in SPINNER_INDEX, not a file
+"""
+
+import os
+import re
+import subprocess
+
+import pytest
+
+SCRIPT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "solo-buddy.sh")
+)
+
+BASH_MAJOR = int(
+    subprocess.run(
+        ["bash", "-c", "echo ${BASH_VERSINFO[0]}"], capture_output=True, text=True
+    ).stdout.strip()
+    or 0
+)
+
+# Frame timing uses $EPOCHREALTIME (bash 5+)
+needs_bash5 = pytest.mark.skipif(BASH_MAJOR < 5, reason="requires bash 5 for $EPOCHREALTIME")
+
+
+def _function_body(name: str) -> str:
+    with open(SCRIPT_PATH) as f:
+        content = f.read()
+    match = re.search(rf"^{name}\(\) \{{\n.*?^\}}", content, re.M | re.S)
+    assert match, f"{name} must exist in solo-buddy.sh"
+    return match.group(0)
+
+
+def _run_renderer(project, between: str, total_wait: float) -> list[float]:
+    """Run start_renderer with a frame-counting render_status; return frame times."""
+    script = f"""
+set +e
+cd {str(project)!r}
+PLAN_FILE=plan.md
+STATUS_FILE=.pairingbuddy/solo-status
+RENDER_INTERVAL=0.08
+RENDER_BACKOFF=("$RENDER_INTERVAL" 0.16 0.32 0.64 1)
+eval "$(awk '/^start_renderer\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+render_status() {{ echo "$EPOCHREALTIME" >> frames.log; }}
+start_renderer
+{between}
+kill "$RENDERER_PID"
+"""
+    subprocess.run(["bash", "-c", script], timeout=total_wait + 10, check=True)
+    times = [float(line) for line in (project / "frames.log").read_text().split()]
+    return [t - times[0] for t in times]
+
+
+def _assert_woken_after(frames: list[float], change_at: float) -> None:
+    """The change is picked up within the slowest step and redraws speed up again."""
+    late = [t for t in frames if t > change_at]
+    assert len(late) >= 2, frames
+    assert late[0] - change_at <= 1.2, f"Change noticed too late: {frames}"
+    assert late[1] - late[0] <= 0.2, f"Expected fast redraws after the change: {frames}"
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / "plan.md").write_text("- [ ] Task\n")
+    return tmp_path
+
+
+@needs_bash5
+def test_idle_renderer_backs_off(project):
+    """Three quiet seconds take a handful of frames, not one every 80 ms."""
+    frames = _run_renderer(project, "sleep 3", total_wait=3)
+
+    assert 4 <= len(frames) <= 9, frames
+    gaps = [b - a for a, b in zip(frames, frames[1:], strict=False)]
+    assert gaps[-1] >= 0.9, f"Idle redraws should settle at the slowest step: {gaps}"
+
+
+@needs_bash5
+def test_watched_file_change_restores_fast_redraws(project):
+    """Editing the plan resets the loop to the fast interval."""
+    frames = _run_renderer(
+        project,
+        "sleep 1.5\nprintf -- '- [x] Task\\n' > plan.md\nsleep 1.2",
+        total_wait=3,
+    )
+
+    _assert_woken_after(frames, 1.5)
+
+
+@needs_bash5
+def test_guardian_session_change_wakes_renderer(project):
+    """A guardian session file write counts as a change."""
+    (project / ".pairingbuddy" / "hooks").mkdir()
+    frames = _run_renderer(
+        project,
+        "sleep 1.5\necho '{}' > .pairingbuddy/hooks/s.json\nsleep 1.2",
+        total_wait=3,
+    )
+
+    _assert_woken_after(frames, 1.5)
+
+
+def test_render_status_spawns_no_external_commands():
+    """render_status uses builtins only; each frame must not fork helpers."""
+    body = _function_body("render_status")
+
+    for command in ("cat", "ls", "head", "grep", "sed", "wc", "tr", "mkdir"):
+        assert not re.search(rf"(^|[|$(;]\s*){command}\b", body, re.M), (
+            f"render_status must not run {command}"
+        )
+    assert not re.search(r"\$\((?!\()", body), "render_status must not use command substitution"
+
+
+def test_spinner_state_is_in_memory(project):
+    """The spinner advances via SPINNER_INDEX without writing a state file."""
+    script = f"""
+set +e
+cd {str(project)!r}
+PLAN_FILE=plan.md
+LAST_RENDER_LINES=0
+eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})"
+render_status > /dev/null
+render_status > /dev/null
+echo "INDEX=$SPINNER_INDEX"
+"""
+    result = subprocess.run(["bash", "-c", script], capture_output=True, text=True, timeout=10)
+
+    assert "INDEX=2" in result.stdout
+    assert not (project / ".pairingbuddy" / ".solo-spinner-index").exists()
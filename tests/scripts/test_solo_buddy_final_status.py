@@ -68,6 +68,7 @@ CLAUDE_EXIT=0
 {force_color_line}
 if grep -q 'write_final_status()' {script!r} 2>/dev/null; then
     eval "$(awk '/^write_final_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
 fi
 write_final_status
 """
@@ -348,6 +349,7 @@ PLAN_FILE={plan_file!r}
 CLAUDE_EXIT=0
 if grep -q 'write_final_status()' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^write_final_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 write_final_status
 """
@@ -380,6 +382,7 @@ PLAN_FILE={plan_file!r}
 CLAUDE_EXIT=1
 if grep -q 'write_final_status()' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^write_final_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 write_final_status
 """
@@ -624,6 +627,7 @@ PLAN_FILE={plan_file!r}
 CLAUDE_EXIT=0
 if grep -q 'write_final_status()' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^write_final_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 write_final_status
 """
@@ -659,6 +663,7 @@ PLAN_FILE={plan_file!r}
 CLAUDE_EXIT=1
 if grep -q 'write_final_status()' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^write_final_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 write_final_status
 """
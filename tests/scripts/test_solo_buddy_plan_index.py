@@ -0,0 +1,221 @@
+"""Tests for the solo-buddy renderer's use of the shared plan index.
+
+Scenarios covered:
+- fresh-index: render_status and write_final_status read tasks from an index newer than the plan
+- stale-index: A plan edited after the index was written is parsed directly
+- foreign-index: An index written for a different plan is ignored
+- relative-plan-path: An index the hook wrote for a relative plan path is used by the renderer
+- escapes: JSON escapes in index task text are decoded
+- frame-cache: Tasks are parsed once and re-read only after the plan changes
+- shared-loader: Both read tasks through load_plan_tasks, which fills the arrays it is given
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+from tests.conftest import run_hook
+
+SCRIPT_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "solo-buddy.sh")
+)
+
+PLAN = "# Plan\n\n- [x] Plan task one\n- [ ] Plan task two\n"
+
+
+def _load(function_name: str) -> str:
+    return f"eval \"$(awk '/^{function_name}\\(\\)[ \\t]*\\{{/,/^\\}}/' {SCRIPT_PATH!r})\""
+
+
+def _run_bash(project, body: str, plan_file: str | None = None) -> str:
+    script = f"""
+set +e
+cd {str(project)!r}
+PLAN_FILE={plan_file or str(project / "plan.md")!r}
+STATUS_FILE=.pairingbuddy/solo-status
+BRANCH=feature/test
+CLAUDE_EXIT=0
+LAST_RENDER_LINES=0
+FORCE_COLOR=0
+{_load("load_plan_tasks")}
+{_load("render_status")}
+{_load("write_final_status")}
+clear_terminal() {{ :; }}
+{body}
+"""
+    result = subprocess.run(["bash", "-c", script], capture_output=True, text=True)
+    return result.stdout
+
+
+def _write_index(project, texts_and_states, plan_path=None):
+    """Write a plan index in the hook's one-task-per-line layout."""
+    tasks = [
+        json.dumps(
+            {"line": i + 3, "offset": 0, "checked": checked, "text": text}, separators=(",", ":")
+        )
+        for i, (text, checked) in enumerate(texts_and_states)
+    ]
+    header = {
+        "version": 1,
+        "plan": {
+            "path": plan_path or str(project / "plan.md"),
+            "mtimeMs": 0,
+            "size": 0,
+            "sha1": "",
+        },
+        "completed": sum(1 for _, checked in texts_and_states if checked),
+        "total": len(texts_and_states),
+    }
+    body = json.dumps(header, indent=2)[:-2]
+    index_path = project / ".pairingbuddy" / "cache" / "plan-index.json"
+    index_path.parent.mkdir(exist_ok=True)
+    index_path.write_text(body + ',\n  "tasks": [\n    ' + ",\n    ".join(tasks) + "\n  ]\n}\n")
+    return index_path
+
+
+def _make_older(path, than):
+    stat = than.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".pairingbuddy").mkdir()
+    (tmp_path / "plan.md").write_text(PLAN)
+    return tmp_path
+
+
+def test_render_status_reads_fresh_index(project):
+    """With an index newer than the plan, render_status shows the indexed tasks."""
+    index = _write_index(project, [("Index task one", True), ("Index task two", False)])
+    _make_older(project / "plan.md", index)
+
+    output = _run_bash(project, "render_status")
+
+    assert "Index task one" in output
+    assert "Plan task" not in output
+    assert "[1/2]" in output
+
+
+def test_write_final_status_reads_fresh_index(project):
+    """write_final_status uses the same index as the renderer."""
+    index = _write_index(project, [("Index task one", True), ("Index task two", True)])
+    _make_older(project / "plan.md", index)
+
+    _run_bash(project, "write_final_status")
+
+    status = (project / ".pairingbuddy" / "solo-status").read_text()
+    assert "Index task two" in status
+    assert "[2/2]" in status
+
+
+def test_stale_index_falls_back_to_plan(project):
+    """A plan modified after the index was written is parsed directly."""
+    _write_index(project, [("Index task one", True)])
+    _make_older(project / ".pairingbuddy" / "cache" / "plan-index.json", project / "plan.md")
+
+    output = _run_bash(project, "render_status")
+
+    assert "Plan task two" in output
+    assert "Index task" not in output
+
+
+def test_index_for_other_plan_is_ignored(project):
+    """An index written for a different plan path is not trusted."""
+    index = _write_index(project, [("Other plan task", True)], plan_path="/elsewhere/plan.md")
+    _make_older(project / "plan.md", index)
+
+    output = _run_bash(project, "render_status")
+
+    assert "Plan task one" in output
+    assert "Other plan task" not in output
+
+
+def test_index_from_relative_plan_path_is_used(project):
+    """A hook given a relative plan path keys the index by the path the renderer looks up."""
+    payload = {"tool_name": "Agent", "tool_input": {"subagent_type": "test-agent"}}
+    env_vars = {"PAIRINGBUDDY_SOLO": "true", "PAIRINGBUDDY_PLAN_PATH": "plan.md"}
+    assert run_hook(env_vars, stdin_payload=payload, cwd=str(project)).returncode == 0
+    index = project / ".pairingbuddy" / "cache" / "plan-index.json"
+    assert json.loads(index.read_text())["plan"]["path"] == str(project / "plan.md")
+    # Only a renderer that trusts the index still shows the indexed tasks
+    (project / "plan.md").write_text("- [ ] Edited after indexing\n")
+    _make_older(project / "plan.md", index)
+
+    output = _run_bash(project, "render_status", plan_file="plan.md")
+
+    assert "Plan task two" in output
+    assert "Edited after indexing" not in output
+
+
+def test_index_text_escapes_are_decoded(project):
+    """Quotes, backslashes and tabs stored as JSON escapes render literally."""
+    index = _write_index(project, [('Quote " slash \\ tab\there', False)])
+    _make_older(project / "plan.md", index)
+
+    output = _run_bash(project, "render_status")
+
+    assert 'Quote " slash \\ tab\there' in output
+
+
+def test_tasks_reloaded_only_after_plan_changes(project):
+    """Frames reuse parsed tasks until the plan file is modified."""
+    output = _run_bash(
+        project,
+        """
+# Backdate the plan: with coarse file timestamps the stamp written by the
+# first frame could otherwise share the plan's mtime and look stale.
+touch -d '-1 minute' "$PLAN_FILE"
+render_status
+touch -r "$PLAN_FILE" plan.ref
+printf '%s\\n' '- [ ] Not re-read' > "$PLAN_FILE"
+touch -r plan.ref "$PLAN_FILE"
+echo '--- unchanged ---'
+render_status
+echo '--- edited ---'
+sleep 0.05
+printf '%s\\n' '- [x] Edited task' > "$PLAN_FILE"
+render_status
+""",
+    )
+
+    unchanged = output.split("--- unchanged ---")[1].split("--- edited ---")[0]
+    edited = output.split("--- edited ---")[1]
+    assert "Plan task two" in unchanged
+    assert "Not re-read" not in unchanged
+    assert "Edited task" in edited
+    assert "[1/1]" in edited
+
+
+def _tasks(project) -> list[str]:
+    output = _run_bash(
+        project,
+        """
+states=(); texts=()
+load_plan_tasks states texts
+for i in "${!states[@]}"; do printf '%s|%s\\n' "${states[$i]}" "${texts[$i]}"; done
+""",
+    )
+    return output.splitlines()
+
+
+def test_load_plan_tasks_fills_the_named_arrays(project):
+    """The loader reads the plan, or a fresh index for it, into the caller's arrays."""
+    (project / "plan.md").write_bytes(b"- [x] **Bold** `code`\r\n- [ ] Plain\r\n")
+    assert _tasks(project) == ["true|Bold code", "false|Plain"]
+
+    index = _write_index(project, [('Quote " here', True)])
+    _make_older(project / "plan.md", index)
+    assert _tasks(project) == ['true|Quote " here']
+
+
+def test_renderer_and_final_status_share_the_loader():
+    """Neither function parses the plan or the index itself, so the two cannot drift apart."""
+    with open(SCRIPT_PATH) as f:
+        script = f.read()
+    for name in ("render_status", "write_final_status"):
+        body = script.split(f"\n{name}() {{\n", 1)[1].split("\n}\n", 1)[0]
+        assert "load_plan_tasks " in body
+        assert '"checked\\"' not in body and "- \\[" not in body
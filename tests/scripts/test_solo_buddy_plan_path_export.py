@@ -2,6 +2,7 @@
 
 import os
 import re
+import subprocess
 
 import pytest
 
@@ -30,11 +31,27 @@ class TestPlanPathExport:
             "solo-buddy.sh must contain 'export PAIRINGBUDDY_PLAN_PATH'"
         )
 
-    def test_plan_path_export_value_matches_plan_file(self, script_content):
-        """The export references $PLAN_FILE variable."""
-        assert re.search(
-            r'export\s+PAIRINGBUDDY_PLAN_PATH=["\']?\$PLAN_FILE["\']?', script_content
-        ), "export PAIRINGBUDDY_PLAN_PATH must be assigned the value of $PLAN_FILE"
+    def test_plan_path_export_is_plan_file_made_absolute(self, script_content, tmp_path):
+        """The export is $PLAN_FILE as an absolute path, so hooks and renderer key it alike."""
+        export_line = re.search(r"^export\s+PAIRINGBUDDY_PLAN_PATH=.*$", script_content, re.M)
+        assert export_line and "$PLAN_FILE" in export_line.group(0)
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "plan.md").write_text("- [ ] Task\n")
+
+        result = subprocess.run(
+            [
+                "bash",
+                "-c",
+                f"PLAN_FILE=docs/../plan.md\n{export_line.group(0)}\n"
+                'echo "$PAIRINGBUDDY_PLAN_PATH"',
+            ],
+            capture_output=True,
+            text=True,
+            cwd=str(tmp_path),
+            check=True,
+        )
+
+        assert result.stdout.strip() == str(tmp_path / "plan.md")
 
     def test_plan_path_export_near_other_exports(self, script_content):
         """The export appears alongside other PAIRINGBUDDY_ exports."""
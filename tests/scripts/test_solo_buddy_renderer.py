@@ -47,6 +47,7 @@ set +e
 STATUS_FILE={status_file_path!r}
 if grep -q 'render_status()' {script!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
 fi
 cd {tmpdir!r}
 render_status
@@ -86,6 +87,7 @@ LAST_RENDER_LINES=0
 FORCE_COLOR=0
 if grep -q 'render_status()' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 cd {tmpdir!r}
 render_status
@@ -222,6 +224,7 @@ LAST_RENDER_LINES=0
 FORCE_COLOR=0
 if grep -q 'render_status()' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 cd {tmpdir!r}
 render_status
@@ -47,6 +47,7 @@ LAST_RENDER_LINES=0
 FORCE_COLOR=0
 if grep -q 'render_status()' {script!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
 fi
 cd {tmpdir!r}
 render_status
@@ -186,6 +187,7 @@ LAST_RENDER_LINES=0
 FORCE_COLOR=0
 if grep -q 'render_status\\(\\)' {script_path!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script_path!r})"
 fi
 cd {tmpdir!r}
 render_status
@@ -53,6 +53,7 @@ STATUS_FILE={status_file_path!r}
 LAST_RENDER_LINES=0
 if grep -q 'render_status()' {script!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
 fi
 cd {tmpdir!r}
 render_status
@@ -123,6 +124,9 @@ class TestFinalStatusOnCompletion:
             render_body = extract_shell_function(
                 script_content_from_path(script_path), "render_status"
             )
+            loader_body = extract_shell_function(
+                script_content_from_path(script_path), "load_plan_tasks"
+            )
 
             wrapper = os.path.join(tmpdir, "wrapper.sh")
             with open(wrapper, "w") as f:
@@ -134,6 +138,8 @@ LAST_RENDER_LINES=0
 FORCE_COLOR=0
 FINAL_RENDERED=false
 
+{loader_body}
+
 {render_body}
 
 {cleanup_body}
@@ -196,12 +202,15 @@ LAST_RENDER_LINES=0
 SPINNER_INDEX=0
 if grep -q 'render_status()' {os.path.abspath(script_path)!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {os.path.abspath(script_path)!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {os.path.abspath(script_path)!r})"
 fi
 cd {tmpdir!r}
-# First call
-output1=$(render_status 2>/dev/null)
-# Second call
-output2=$(render_status 2>/dev/null)
+# Two calls in the same shell: the spinner index lives in memory, so calls
+# in separate command-substitution subshells would not see each other's state
+render_status > spinner1.out 2>/dev/null
+render_status > spinner2.out 2>/dev/null
+output1=$(<spinner1.out)
+output2=$(<spinner2.out)
 echo "CALL1:$output1"
 echo "CALL2:$output2"
 # The spinner chars on each call must differ
@@ -257,6 +266,7 @@ STATUS_FILE={status_file_path!r}
 LAST_RENDER_LINES=0
 if grep -q 'render_status()' {script!r} 2>/dev/null; then
     eval "$(awk '/^render_status\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
+    eval "$(awk '/^load_plan_tasks\\(\\)[ \\t]*\\{{/,/^\\}}/' {script!r})"
 fi
 cd {tmpdir!r}
 # First call sets LAST_RENDER_LINES > 0
@@ -0,0 +1,146 @@
+"""
+Guardian session pointer and session file garbage collection tests.
+
+Tests for hooks/guardian.mjs publishing .pairingbuddy/hooks/active-session and
+for hooks/session-start.mjs collecting stale .pairingbuddy/hooks/<session>.json files.
+"""
+
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+GUARDIAN_PATH = REPO_ROOT / "hooks" / "guardian.mjs"
+SESSION_START_PATH = REPO_ROOT / "hooks" / "session-start.mjs"
+
+DAY = 24 * 60 * 60
+
+
+def _clean_env(extra=None):
+    env = os.environ.copy()
+    for name in (
+        "PAIRINGBUDDY_SOLO",
+        "PAIRINGBUDDY_SESSION_MAX_AGE_DAYS",
+        "PAIRINGBUDDY_SESSION_ARCHIVE",
+    ):
+        env.pop(name, None)
+    env["PAIRINGBUDDY_HOOKD"] = "0"
+    env.update(extra or {})
+    return env
+
+
+def _run_guardian(tmp_path, session_id):
+    payload = {"session_id": session_id, "hook_event_name": "PostToolUse", "tool_name": "Read"}
+    result = subprocess.run(
+        ["node", str(GUARDIAN_PATH)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=str(tmp_path),
+        env=_clean_env(),
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def _run_session_start(tmp_path, session_id="current", env_extra=None):
+    payload = {"session_id": session_id, "hook_event_name": "SessionStart", "source": "startup"}
+    result = subprocess.run(
+        ["node", str(SESSION_START_PATH)],
+        input=json.dumps(payload),
+        capture_output=True,
+        text=True,
+        cwd=str(tmp_path),
+        env=_clean_env(env_extra),
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _session_file(state_dir, session_id, age_days):
+    path = state_dir / f"{session_id}.json"
+    path.write_text(json.dumps({"lastTool": "Read"}))
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def state_dir(tmp_path):
+    path = tmp_path / ".pairingbuddy" / "hooks"
+    path.mkdir(parents=True)
+    return path
+
+
+class TestActiveSessionPointer:
+    """The guardian publishes the session it last served."""
+
+    def test_guardian_writes_active_session_pointer(self, tmp_path, state_dir):
+        _run_guardian(tmp_path, "session-a")
+
+        assert (state_dir / "active-session").read_text() == "session-a\n"
+
+    def test_pointer_follows_newest_session(self, tmp_path, state_dir):
+        _run_guardian(tmp_path, "session-a")
+        _run_guardian(tmp_path, "session-b")
+
+        assert (state_dir / "active-session").read_text() == "session-b\n"
+
+    def test_pointer_not_rewritten_for_same_session(self, tmp_path, state_dir):
+        _run_guardian(tmp_path, "session-a")
+        pointer = state_dir / "active-session"
+        os.utime(pointer, (1_000_000, 1_000_000))
+
+        _run_guardian(tmp_path, "session-a")
+
+        assert pointer.stat().st_mtime == 1_000_000
+
+
+class TestSessionGarbageCollection:
+    """SessionStart removes or archives session files older than the configured age."""
+
+    def test_stale_sessions_removed_by_default(self, tmp_path, state_dir):
+        old = _session_file(state_dir, "old", age_days=8)
+        recent = _session_file(state_dir, "recent", age_days=1)
+
+        output = _run_session_start(tmp_path)
+
+        assert output["hookSpecificOutput"]["hookEventName"] == "SessionStart"
+        assert not old.exists()
+        assert recent.exists()
+
+    def test_max_age_is_configurable(self, tmp_path, state_dir):
+        session = _session_file(state_dir, "two-days", age_days=2)
+
+        _run_session_start(tmp_path, env_extra={"PAIRINGBUDDY_SESSION_MAX_AGE_DAYS": "1"})
+
+        assert not session.exists()
+
+    def test_zero_max_age_disables_collection(self, tmp_path, state_dir):
+        session = _session_file(state_dir, "ancient", age_days=365)
+
+        _run_session_start(tmp_path, env_extra={"PAIRINGBUDDY_SESSION_MAX_AGE_DAYS": "0"})
+
+        assert session.exists()
+
+    def test_archive_moves_stale_sessions(self, tmp_path, state_dir):
+        _session_file(state_dir, "old", age_days=30)
+
+        _run_session_start(tmp_path, env_extra={"PAIRINGBUDDY_SESSION_ARCHIVE": "1"})
+
+        assert not (state_dir / "old.json").exists()
+        assert json.loads((state_dir / "archive" / "old.json").read_text()) == {"lastTool": "Read"}
+
+    def test_current_and_active_sessions_kept(self, tmp_path, state_dir):
+        current = _session_file(state_dir, "current", age_days=30)
+        active = _session_file(state_dir, "active", age_days=30)
+        (state_dir / "active-session").write_text("active\n")
+
+        _run_session_start(tmp_path, session_id="current")
+
+        assert current.exists()
+        assert active.exists()
+        assert (state_dir / "active-session").exists()
@@ -0,0 +1,111 @@
+"""Tests for generational state snapshots (pairingbuddy/history.py, history).
+
+Scenarios covered:
+- archive: A task's state files and the task.json saved when it started become one compressed
+  generation, named by time and task hash
+- retention: Only the newest PAIRINGBUDDY_HISTORY_KEEP generations are kept; the staging
+  directory of an interrupted archive is left alone
+- lookup: A state file is found across generations, newest first, filtered by task words
+- cli: history lists generations and prints a generation's file
+"""
+
+import gzip
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.history import (
+    HistoryError,
+    archive,
+    history_keep,
+    list_generations,
+    load_generation,
+    lookup,
+    start_task,
+)
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+
+def _task(state: Path, description: str, scenarios: list[str]) -> list[Path]:
+    state.mkdir(exist_ok=True)
+    (state / "task.json").write_text(json.dumps({"description": description}))
+    start_task(state)
+    docs = [{"scenario_id": s, "description": s, "test_cases": []} for s in scenarios]
+    (state / "scenarios.json").write_text(json.dumps({"scenarios": docs}))
+    (state / "broken.json").write_text("{not json")
+    return sorted(path for path in state.glob("*.json") if path.name != "task.json")
+
+
+def test_archive_writes_one_compressed_generation(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    paths = _task(state, "Add login", ["s1"])
+
+    task_id = archive(state, paths, keep=5)
+
+    generation = state / "history" / task_id
+    assert sorted(path.name for path in generation.iterdir()) == ["meta.json", "state.json.gz"]
+    assert json.loads(gzip.decompress((generation / "state.json.gz").read_bytes()))
+    assert [path.name for path in state.glob("*.json")] == ["task.json"]
+    assert not (state / "history" / ".task.json").exists()
+    meta = json.loads((generation / "meta.json").read_text())
+    assert meta["description"] == "Add login"
+    assert sorted(meta["files"]) == ["broken.json", "scenarios.json", "task.json"]
+    docs = load_generation(state, task_id)
+    assert docs["task.json"] == {"description": "Add login"}
+    assert docs["broken.json"] == "{not json"
+    assert archive(state, [], keep=5) is None
+
+
+def test_retention_keeps_the_newest_generations(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    ids = [archive(state, _task(state, f"task {n}", ["s"]), keep=2) for n in range(3)]
+    interrupted = state / "history" / ".20260101T000000Z-deadbeef"
+    interrupted.mkdir()
+    archive(state, _task(state, "task 3", ["s"]), keep=2)
+
+    assert [meta["description"] for meta in list_generations(state)] == ["task 3", "task 2"]
+    assert not (state / "history" / ids[0]).exists()
+    assert interrupted.exists()
+    assert history_keep({"PAIRINGBUDDY_HISTORY_KEEP": "x"}) == 20
+    assert history_keep({"PAIRINGBUDDY_HISTORY_KEEP": "0"}) == 0
+
+
+def test_lookup_finds_a_file_across_generations(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    archive(state, _task(state, "Add login form", ["form"]), keep=5)
+    archive(state, _task(state, "Fix logout", ["logout"]), keep=5)
+
+    found = lookup(state, "scenarios.json")
+    assert [item["description"] for item in found] == ["Fix logout", "Add login form"]
+    login = lookup(state, "scenarios.json", search="LOGIN form")
+    assert [s["scenario_id"] for s in login[0]["document"]["scenarios"]] == ["form"]
+    assert lookup(state, "tests.json") == []
+    with pytest.raises(HistoryError, match="no generation"):
+        load_generation(state, "20990101T000000Z-00000000")
+
+
+def _cli(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=project, env=env, timeout=30
+    )
+
+
+def test_cli_lists_and_shows_generations(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    task_id = archive(state, _task(state, "Add login", ["s1"]), keep=5)
+
+    listed = _cli(tmp_path, "history")
+    assert listed.returncode == 0, listed.stderr
+    assert [meta["task_id"] for meta in json.loads(listed.stdout)] == [task_id]
+    shown = _cli(tmp_path, "history", "--task", task_id, "--file", "task.json")
+    assert json.loads(shown.stdout) == {"description": "Add login"}
+    assert _cli(tmp_path, "history", "--task", task_id, "--file", "tests.json").returncode == 2
+    assert _cli(tmp_path, "history", "--task", "../x").returncode == 2
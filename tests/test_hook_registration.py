@@ -5,21 +5,28 @@ HOOKS_JSON = pathlib.Path(__file__).parent.parent / "hooks" / "hooks.json"
 
 
 def test_registered_in_hooks_json():
-    """hooks.json contains a PostToolUse entry that invokes solo-progress.mjs"""
+    """hooks.json contains a PostToolUse entry that invokes the post-tool-use.mjs shim,
+    which runs solo-progress (via the hook daemon or in-process)"""
     hooks_data = json.loads(HOOKS_JSON.read_text())
 
     post_tool_use_hooks = []
     for entry in hooks_data["hooks"]["PostToolUse"]:
         post_tool_use_hooks.extend(entry["hooks"])
 
-    solo_progress_hooks = [
-        hook for hook in post_tool_use_hooks if "solo-progress.mjs" in hook["command"]
-    ]
-    assert len(solo_progress_hooks) >= 1, (
-        "PostToolUse hooks must contain an entry for solo-progress.mjs"
-    )
+    shim_hooks = [hook for hook in post_tool_use_hooks if "post-tool-use.mjs" in hook["command"]]
+    assert len(shim_hooks) >= 1, "PostToolUse hooks must contain an entry for post-tool-use.mjs"
 
-    for hook in solo_progress_hooks:
+    for hook in shim_hooks:
         assert hook["type"] == "command", (
-            f"solo-progress.mjs entry must have type 'command', got {hook['type']!r}"
+            f"post-tool-use.mjs entry must have type 'command', got {hook['type']!r}"
         )
+
+
+def test_posttooluse_spawns_a_single_process():
+    """PostToolUse registers only the shim — guardian and solo-progress run inside it"""
+    hooks_data = json.loads(HOOKS_JSON.read_text())
+
+    commands = [
+        hook["command"] for entry in hooks_data["hooks"]["PostToolUse"] for hook in entry["hooks"]
+    ]
+    assert len(commands) == 1, f"Expected one PostToolUse command, got {commands}"
@@ -0,0 +1,132 @@
+"""Tests for the RED-GREEN batch planner (pairingbuddy/batches.py, plan-batches).
+
+Scenarios covered:
+- grouping: Tests are grouped by runner, test file and scenario, in first-seen order
+- size limit: Groups larger than the limit split; PAIRINGBUDDY_BATCH_SIZE=1 gives single tests
+- schema: Every planned batch is a valid current-batch.json document
+- cli: plan-batches skips processed tests and exits 2 without tests.json
+- groups: Batches sharing a test file or an imported module join one worktree group
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from jsonschema import Draft7Validator
+
+from pairingbuddy.batches import batch_size, plan_batches, plan_groups
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+BATCH_SCHEMA = ROOT / "contracts" / "schemas" / "current-batch.schema.json"
+
+
+def _test(test_id: str, test_file: str, scenario_id: str, runner_id: str = "unit") -> dict:
+    return {
+        "test_id": test_id,
+        "test_case_id": f"tc-{test_id}",
+        "scenario_id": scenario_id,
+        "runner_id": runner_id,
+        "test_file": test_file,
+        "test_function": f"test_{test_id}",
+    }
+
+
+TESTS = [
+    _test("a1", "tests/test_login.py", "login"),
+    _test("b1", "tests/test_logout.py", "logout"),
+    _test("a2", "tests/test_login.py", "login"),
+    _test("c1", "tests/test_login.py", "lockout"),
+    _test("a3", "tests/test_login.py", "login"),
+    _test("d1", "tests/test_login.py", "login", runner_id="e2e"),
+]
+
+
+def _ids(batches: list[dict]) -> list[list[str]]:
+    return [[test["test_id"] for test in batch["batch"]] for batch in batches]
+
+
+def test_groups_by_runner_file_and_scenario_in_order():
+    batches = plan_batches(TESTS, {}, max_size=5)
+
+    assert _ids(batches) == [["a1", "a2", "a3"], ["b1"], ["c1"], ["d1"]]
+
+
+def test_groups_split_at_the_size_limit():
+    pairs = plan_batches(TESTS, {}, max_size=2)
+    singles = plan_batches(TESTS, {}, max_size=1)
+
+    assert _ids(pairs) == [["a1", "a2"], ["a3"], ["b1"], ["c1"], ["d1"]]
+    assert _ids(singles) == [["a1"], ["a2"], ["a3"], ["b1"], ["c1"], ["d1"]]
+
+
+def test_batch_size_reads_environment():
+    assert batch_size({}) == 5
+    assert batch_size({"PAIRINGBUDDY_BATCH_SIZE": "1"}) == 1
+    assert batch_size({"PAIRINGBUDDY_BATCH_SIZE": "0"}) == 5
+    assert batch_size({"PAIRINGBUDDY_BATCH_SIZE": "many"}) == 5
+
+
+def test_batches_are_valid_current_batch_documents():
+    validator = Draft7Validator(json.loads(BATCH_SCHEMA.read_text()))
+    batches = plan_batches(TESTS, {"tc-a1": "valid credentials log in"}, max_size=5)
+
+    for batch in batches:
+        validator.validate(batch)
+    assert batches[0]["batch"][0]["test_case_description"] == "valid credentials log in"
+
+
+def _plan(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    env.pop("PAIRINGBUDDY_BATCH_SIZE", None)
+    return subprocess.run(
+        [str(LAUNCHER), "plan-batches", *args],
+        capture_output=True,
+        text=True,
+        cwd=project,
+        env=env,
+        timeout=30,
+    )
+
+
+def test_cli_skips_processed_tests(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    (state / "tests.json").write_text(json.dumps({"tests": TESTS}))
+    scenarios = [{"scenario_id": "login", "description": "Login", "test_cases": []}]
+    (state / "scenarios.json").write_text(json.dumps({"scenarios": scenarios}))
+
+    result = _plan(tmp_path, "--skip", "a1", "b1", "--max-size", "1")
+
+    assert result.returncode == 0, result.stderr
+    assert _ids(json.loads(result.stdout)["batches"]) == [["a2"], ["a3"], ["c1"], ["d1"]]
+
+
+def test_cli_without_tests_exits_2(tmp_path):
+    result = _plan(tmp_path)
+
+    assert result.returncode == 2
+    assert "tests.json not found" in result.stderr
+
+
+def test_groups_join_batches_that_touch_the_same_module():
+    batches = plan_batches(TESTS[:5], {}, max_size=5)  # login, logout, lockout
+    graph = {
+        "tests/test_login.py": {"src/app/auth.py", "src/app/__init__.py"},
+        "tests/test_logout.py": {"src/app/session.py", "src/app/__init__.py"},
+    }
+
+    groups = plan_groups(batches, graph)
+
+    assert [_ids(group["batches"]) for group in groups] == [[["a1", "a2", "a3"], ["c1"]], [["b1"]]]
+    assert groups[1] == {
+        "group_id": "g2",
+        "batches": [batches[1]],
+        "files": ["src/app/session.py", "tests/test_logout.py"],
+    }
+
+    graph["tests/test_logout.py"].add("src/app/auth.py")
+    assert len(plan_groups(batches, graph)) == 1
@@ -0,0 +1,119 @@
+"""Tests for plan MD tasks (pairingbuddy/plan.py, plan-tasks, mark-task-complete).
+
+Scenarios covered:
+- parse: Checkbox tasks come with index, state, title, indented description and TB context
+- offsets: Checkbox offsets are byte offsets, as in hooks/lib/plan-index.mjs
+- mark: Completing a task changes only its checkbox byte; an already checked task is a no-op
+- changed plan: A checkbox offset that no longer holds a box is refused
+- cli: plan-tasks prints the tasks or the next unchecked one; mark-task-complete checks it
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.plan import PlanError, mark_task_complete, next_unchecked_task, read_plan_tasks
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+PLAN = """# Plan: Login — café edition
+
+## TB1: Sign in
+**Goal:** a user can sign in.
+
+- [x] **Task 1: Add the login form**
+  Render `email` and password fields.
+
+  Keep the existing layout.
+- [ ] **Task 2: Check the password**
+  Compare against the stored hash.
+
+## TB2: Sign out
+
+- [ ] **Task 3: Add a sign-out link**
+"""
+
+
+@pytest.fixture
+def plan(tmp_path):
+    path = tmp_path / "plan.md"
+    path.write_text(PLAN)
+    return path
+
+
+def test_tasks_have_state_title_description_and_context(plan):
+    tasks = read_plan_tasks(plan)
+
+    assert [(t["index"], t["checked"], t["title"]) for t in tasks] == [
+        (1, True, "Task 1: Add the login form"),
+        (2, False, "Task 2: Check the password"),
+        (3, False, "Task 3: Add a sign-out link"),
+    ]
+    assert tasks[0]["description"] == (
+        "Task 1: Add the login form\nRender `email` and password fields.\n\n"
+        "Keep the existing layout."
+    )
+    assert tasks[1]["context"] == (
+        "# Plan: Login — café edition\n\n## TB1: Sign in\n**Goal:** a user can sign in."
+    )
+    assert tasks[2]["context"].endswith("## TB2: Sign out")
+    assert next_unchecked_task(tasks)["index"] == 2
+
+
+def test_offsets_are_byte_offsets_of_the_checkbox(plan):
+    content = plan.read_bytes()
+
+    for task in read_plan_tasks(plan):
+        assert content[task["offset"] - 1 : task["offset"] + 2] in (b"[x]", b"[ ]")
+    assert read_plan_tasks(plan)[1]["line"] == 10
+
+
+def test_mark_task_complete_changes_one_byte(plan):
+    before = plan.read_bytes()
+
+    assert mark_task_complete(plan, 2) is True
+    assert mark_task_complete(plan, 2) is False
+
+    after = plan.read_bytes()
+    assert [i for i in range(len(before)) if before[i] != after[i]] == [
+        read_plan_tasks(plan)[1]["offset"]
+    ]
+    assert [task["checked"] for task in read_plan_tasks(plan)] == [True, True, False]
+    with pytest.raises(PlanError, match="no task 4"):
+        mark_task_complete(plan, 4)
+
+
+def test_mark_task_complete_refuses_a_changed_plan(plan, monkeypatch):
+    tasks = read_plan_tasks(plan)
+    plan.write_text(PLAN.replace("- [ ] **Task 2", "-  [ ] **Task 2"))
+    monkeypatch.setattr("pairingbuddy.plan.read_plan_tasks", lambda path: tasks)
+
+    with pytest.raises(PlanError, match="changed while marking task 2"):
+        mark_task_complete(plan, 2)
+
+
+def _cli(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=project, env=env, timeout=30
+    )
+
+
+def test_cli_lists_and_checks_tasks(plan):
+    listed = _cli(plan.parent, "plan-tasks", "plan.md")
+    assert listed.returncode == 0, listed.stderr
+    assert len(json.loads(listed.stdout)) == 3
+
+    checked = _cli(plan.parent, "mark-task-complete", "plan.md", "2")
+    assert json.loads(checked.stdout) == {"index": 2, "changed": True}
+    following = _cli(plan.parent, "plan-tasks", "plan.md", "--next")
+    assert json.loads(following.stdout)["index"] == 3
+
+    assert _cli(plan.parent, "mark-task-complete", "plan.md", "9").returncode == 2
+    assert _cli(plan.parent, "plan-tasks", "missing.md").returncode == 2
@@ -0,0 +1,147 @@
+"""Tests for diff-scoped reviews (pairingbuddy/review.py, review-scope).
+
+Scenarios covered:
+- record: code-state.json results are added to files-changed.json once, created or modified
+- scope: Only changed files not yet reviewed in their current content are in scope
+- skip: Test files of the batch being written are left out of the scope
+- full: The final sweep lists every test file and changed file, reviewed or not
+- cli: review-scope writes a schema-valid review-scope.json and prints a summary
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+from pairingbuddy.review import mark_reviewed, record_changes, review_scope
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+SCOPE_SCHEMA = ROOT / "contracts" / "schemas" / "review-scope.schema.json"
+CHANGES_SCHEMA = ROOT / "contracts" / "schemas" / "files-changed.schema.json"
+
+
+def _code_result(test_id: str, test_file: str, files_changed: list[str]) -> dict:
+    return {
+        "test_id": test_id,
+        "test_file": test_file,
+        "test_function": f"test_{test_id}",
+        "status": "passing",
+        "files_changed": files_changed,
+    }
+
+
+@pytest.fixture
+def project(tmp_path):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    files = {
+        "src/auth.py": "def login():\n    pass\n",
+        "src/session.py": "def logout():\n    pass\n",
+        "tests/test_auth.py": "def test_login():\n    pass\n",
+        "tests/test_session.py": "def test_logout():\n    pass\n",
+    }
+    for path, text in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(text)
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    tests = [
+        {"test_id": "t1", "test_file": "tests/test_auth.py"},
+        {"test_id": "t2", "test_file": "tests/test_session.py"},
+    ]
+    (state / "tests.json").write_text(json.dumps({"tests": tests}))
+    return tmp_path
+
+
+def _green(project: Path, *results: dict) -> None:
+    state = project / ".pairingbuddy"
+    (state / "code-state.json").write_text(json.dumps({"results": list(results)}))
+    record_changes(project, state)
+
+
+def test_record_changes_adds_each_file_once(project):
+    subprocess.run(["git", "add", "src/auth.py"], cwd=project, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=dev", "-c", "user.email=dev@example.com", "commit", "-qm", "init"],
+        cwd=project,
+        check=True,
+    )
+    _green(project, _code_result("t1", "tests/test_auth.py", ["src/auth.py"]))
+    _green(project, _code_result("t1", "tests/test_auth.py", ["src/auth.py"]))
+
+    changes = json.loads((project / ".pairingbuddy" / "files-changed.json").read_text())
+    Draft7Validator(json.loads(CHANGES_SCHEMA.read_text())).validate(changes)
+    assert [(entry["path"], entry["action"]) for entry in changes["files"]] == [
+        ("tests/test_auth.py", "created"),
+        ("src/auth.py", "modified"),
+    ]
+
+
+def test_scope_leaves_out_files_reviewed_in_their_current_content(project):
+    state = project / ".pairingbuddy"
+    _green(project, _code_result("t1", "tests/test_auth.py", ["src/auth.py"]))
+
+    first = review_scope(project, state)
+    mark_reviewed(project, state)
+    _green(project, _code_result("t2", "tests/test_session.py", ["src/session.py"]))
+    (project / "src" / "auth.py").write_text("def login():\n    return True\n")
+    second = review_scope(project, state)
+
+    assert first == {
+        "full": False,
+        "test_files": ["tests/test_auth.py"],
+        "code_files": ["src/auth.py"],
+    }
+    assert second["test_files"] == ["tests/test_session.py"]
+    assert second["code_files"] == ["src/auth.py", "src/session.py"]
+
+
+def test_scope_skips_files_being_written(project):
+    state = project / ".pairingbuddy"
+    _green(project, _code_result("t1", "tests/test_auth.py", ["src/auth.py"]))
+
+    scope = review_scope(project, state, skip={"tests/test_auth.py"})
+
+    assert scope["test_files"] == []
+    assert scope["code_files"] == ["src/auth.py"]
+
+
+def test_full_scope_ignores_reviewed_hashes(project):
+    state = project / ".pairingbuddy"
+    _green(project, _code_result("t1", "tests/test_auth.py", ["src/auth.py"]))
+    review_scope(project, state)
+    mark_reviewed(project, state)
+
+    assert review_scope(project, state)["code_files"] == []
+    assert review_scope(project, state, full=True) == {
+        "full": True,
+        "test_files": ["tests/test_auth.py", "tests/test_session.py"],
+        "code_files": ["src/auth.py"],
+    }
+
+
+def test_cli_writes_valid_scope(project):
+    state = project / ".pairingbuddy"
+    _green(project, _code_result("t1", "tests/test_auth.py", ["src/auth.py"]))
+    batch = [{"test_file": "tests/test_auth.py"}]
+    (state / "current-batch.json").write_text(json.dumps({"batch": batch}))
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+
+    result = subprocess.run(
+        [str(LAUNCHER), "review-scope", "--skip-batch"],
+        capture_output=True,
+        text=True,
+        cwd=project,
+        env=env,
+        timeout=30,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "0 test files, 1 code files to review"
+    scope = json.loads((state / "review-scope.json").read_text())
+    Draft7Validator(json.loads(SCOPE_SCHEMA.read_text())).validate(scope)
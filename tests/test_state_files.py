@@ -0,0 +1,117 @@
+"""Tests for per-task state files (pairingbuddy/state.py, cleanup-state, filter-pending).
+
+Scenarios covered:
+- cleanup: Every top-level state file goes except test-config, doc-config and human-guidance;
+  subdirectories stay, and the cleared files are archived unless PAIRINGBUDDY_HISTORY_KEEP=0,
+  under the task that produced them rather than the task.json already written for the next one
+- pending: Pending spike units by status, pending tests by the processed ids
+- answered: mark_unit_answered updates spike-questions.json; an unknown unit is refused
+- cli: cleanup-state, filter-pending and mark-unit-answered print JSON
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.state import StateError, cleanup_state_files, filter_pending, mark_unit_answered
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+UNITS = [
+    {"id": "u1", "name": "Redis", "status": "answered"},
+    {"id": "u2", "name": "Kafka", "status": "pending"},
+    {"id": "u3", "name": "NATS", "status": "pending"},
+]
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    (state / "cache").mkdir(parents=True)
+    (state / "cache" / "reviewed.json").write_text("{}")
+    for name in ("test-config", "doc-config", "human-guidance", "task", "tests", "spike-config"):
+        (state / f"{name}.json").write_text("{}")
+    (state / "spike-questions.json").write_text(json.dumps({"units": UNITS}))
+    return state
+
+
+def test_cleanup_keeps_config_guidance_and_subdirectories(state):
+    result = cleanup_state_files(state, {"PAIRINGBUDDY_HISTORY_KEEP": "0"})
+
+    assert result == {
+        "removed": ["spike-config.json", "spike-questions.json", "task.json", "tests.json"],
+        "archived": None,
+    }
+    assert sorted(path.name for path in state.iterdir()) == [
+        "cache",
+        "doc-config.json",
+        "human-guidance.json",
+        "test-config.json",
+    ]
+    assert (state / "cache" / "reviewed.json").exists()
+
+
+def test_cleanup_archives_the_cleared_files(state):
+    result = cleanup_state_files(state, {})
+
+    assert (state / "history" / result["archived"]).is_dir()
+    assert not (state / "task.json").exists()
+
+
+def test_cleanup_archives_the_finished_task_not_the_next_one(state):
+    (state / "task.json").write_text(json.dumps({"description": "Add login"}))
+    cleanup_state_files(state, {})
+    (state / "scenarios.json").write_text(json.dumps({"scenarios": []}))
+    (state / "task.json").write_text(json.dumps({"description": "Fix logout"}))
+
+    archived = cleanup_state_files(state, {})["archived"]
+
+    meta = json.loads((state / "history" / archived / "meta.json").read_text())
+    assert meta["description"] == "Add login"
+    assert sorted(meta["files"]) == ["scenarios.json", "task.json"]
+    record = json.loads((state / "history" / ".task.json").read_text())
+    assert record == {"description": "Fix logout"}
+
+
+def test_filter_pending_units_and_tests():
+    tests = {"tests": [{"test_id": "t1"}, {"test_id": "t2"}]}
+
+    assert [unit["id"] for unit in filter_pending({"units": UNITS})] == ["u2", "u3"]
+    assert filter_pending(tests, {"t1"}) == [{"test_id": "t2"}]
+
+
+def test_mark_unit_answered_updates_spike_questions(state):
+    assert mark_unit_answered(state, "u2")["status"] == "answered"
+
+    units = json.loads((state / "spike-questions.json").read_text())["units"]
+    assert [unit["status"] for unit in units] == ["answered", "answered", "pending"]
+    with pytest.raises(StateError, match="no entry u9"):
+        mark_unit_answered(state, "u9")
+
+
+def _cli(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=project, env=env, timeout=30
+    )
+
+
+def test_cli_prints_json(state):
+    project = state.parent
+
+    pending = _cli(project, "filter-pending", "spike-questions")
+    assert [unit["id"] for unit in json.loads(pending.stdout)] == ["u2", "u3"]
+    answered = _cli(project, "mark-unit-answered", "u2")
+    assert json.loads(answered.stdout)["status"] == "answered"
+    assert _cli(project, "mark-unit-answered", "u9").returncode == 2
+
+    cleaned = _cli(project, "cleanup-state")
+    assert cleaned.returncode == 0, cleaned.stderr
+    assert "task.json" in json.loads(cleaned.stdout)["removed"]
+    assert _cli(project, "filter-pending", "tests").returncode == 2
@@ -0,0 +1,153 @@
+"""Tests for the state store backends (pairingbuddy/store.py, state-update, state-export).
+
+Scenarios covered:
+- export: The SQLite JSON view is byte-identical to what the file store writes and valid
+  against the contract's schema
+- partial update: update_item changes one entry in a transaction; the file changes on export
+- agent rewrite: A file rewritten since the last import or export wins over the database;
+  a deleted file is forgotten
+- backend: PAIRINGBUDDY_STATE_BACKEND selects the store; an unknown value is refused, and
+  sqlite3 errors such as a corrupt database become StoreError
+- cli: state-update and mark-unit-answered go through the SQLite store
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+from pairingbuddy.runner import write_json
+from pairingbuddy.store import FileStore, SqliteStore, StoreError, open_store
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+TESTS = {
+    "tests": [
+        {
+            "test_id": f"t{n}",
+            "test_case_id": f"tc{n}",
+            "scenario_id": "s1",
+            "runner_id": "unit",
+            "test_file": "tests/test_café.py",
+            "test_function": f"test_{n}",
+        }
+        for n in range(3)
+    ]
+}
+
+
+@pytest.fixture
+def state(tmp_path):
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    write_json(state / "tests.json", TESTS)
+    return state
+
+
+def test_export_matches_the_file_store_byte_for_byte(state, tmp_path):
+    twin = tmp_path / "twin"
+    twin.mkdir()
+    write_json(twin / "tests.json", TESTS)
+    changes = {"test_function": "test_renamed", "runner_id": "e2e"}
+
+    store = SqliteStore(state)
+    store.update_item("tests.json", "t1", changes)
+    assert store.export() == ["tests.json"]
+    store.close()
+    FileStore(twin).update_item("tests.json", "t1", changes)
+
+    assert (state / "tests.json").read_bytes() == (twin / "tests.json").read_bytes()
+    schema = json.loads((ROOT / "contracts" / "schemas" / "tests.schema.json").read_text())
+    exported = json.loads((state / "tests.json").read_text())
+    assert not list(Draft7Validator(schema).iter_errors(exported))
+
+
+def test_update_item_changes_one_entry_until_export(state):
+    before = (state / "tests.json").read_bytes()
+    store = SqliteStore(state)
+
+    entry = store.update_item("tests.json", "t2", {"runner_id": "e2e"})
+
+    assert entry["runner_id"] == "e2e"
+    assert (state / "tests.json").read_bytes() == before
+    assert [t["runner_id"] for t in store.read("tests.json")["tests"]] == ["unit", "unit", "e2e"]
+    with pytest.raises(StoreError, match="no entry t9"):
+        store.update_item("tests.json", "t9", {"runner_id": "e2e"})
+    with pytest.raises(StoreError, match="has no entries"):
+        store.update_item("task.json", "t1", {})
+    store.export()
+    assert store.export() == []
+    store.close()
+
+
+def test_a_rewritten_file_wins_and_a_deleted_one_is_forgotten(state):
+    store = SqliteStore(state)
+    store.update_item("tests.json", "t0", {"runner_id": "e2e"})
+    write_json(state / "tests.json", {"tests": TESTS["tests"][:1]})
+
+    assert store.read("tests.json") == {"tests": TESTS["tests"][:1]}
+    assert store.export() == []
+    (state / "tests.json").unlink()
+    assert store.read("tests.json") is None
+    store.write("task.json", {"description": "Add login"})
+    assert store.read("task.json") == {"description": "Add login"}
+    assert store.export() == ["task.json"]
+    store.close()
+
+
+def test_backend_is_selected_by_the_environment(state):
+    assert isinstance(open_store(state, {}), FileStore)
+    sqlite = open_store(state, {"PAIRINGBUDDY_STATE_BACKEND": "sqlite"})
+    assert isinstance(sqlite, SqliteStore)
+    sqlite.close()
+    with pytest.raises(StoreError, match="unknown PAIRINGBUDDY_STATE_BACKEND"):
+        open_store(state, {"PAIRINGBUDDY_STATE_BACKEND": "redis"})
+
+
+def test_database_errors_are_store_errors(state):
+    (state / "state.db").write_bytes(b"not a database" * 100)
+
+    with pytest.raises(StoreError, match="state.db: file is not a database"):
+        SqliteStore(state)
+
+
+def _cli(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    env["PAIRINGBUDDY_STATE_BACKEND"] = "sqlite"
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=project, env=env, timeout=30
+    )
+
+
+def test_cli_updates_through_the_sqlite_store(state):
+    project = state.parent
+    units = [{"id": "u1", "name": "Redis", "status": "pending"}]
+    write_json(state / "spike-questions.json", {"units": units})
+
+    deferred = _cli(
+        project, "state-update", "tests.json", "t1", "--set", "runner_id=e2e", "--defer-export"
+    )
+    assert deferred.returncode == 0, deferred.stderr
+    assert json.loads(deferred.stdout)["runner_id"] == "e2e"
+    assert json.loads((state / "tests.json").read_text()) == TESTS
+    exported = _cli(project, "state-export")
+    assert json.loads(exported.stdout) == {"exported": ["tests.json"]}
+    assert json.loads((state / "tests.json").read_text())["tests"][1]["runner_id"] == "e2e"
+
+    answered = _cli(project, "mark-unit-answered", "u1")
+    assert answered.returncode == 0, answered.stderr
+    spike = json.loads((state / "spike-questions.json").read_text())
+    assert spike["units"][0]["status"] == "answered"
+    assert (state / "state.db").exists()
+    assert _cli(project, "state-update", "tests.json", "t1", "--set", "oops").returncode == 2
+    (state / "state.db").write_bytes(b"not a database" * 100)
+    for args in (("state-update", "tests.json", "t1", "--set", "runner_id=e2e"), ("state-export",)):
+        broken = _cli(project, *args)
+        assert broken.returncode == 2
+        assert "state.db: file is not a database" in broken.stderr
@@ -0,0 +1,373 @@
+"""Tests for the workflow engine (pairingbuddy/workflow, workflow-next/-done).
+
+Scenarios covered:
+- program: The coding skill's pseudocode loads; unsupported syntax is rejected
+- bug fix: A bug_fix task runs its agents in workflow order, one batch per test file
+- control flow: Agent results decide branches; _stop ends the run with its message
+- pipeline: With PAIRINGBUDDY_PIPELINE=true the review runs alongside the next batch's RED;
+  without it each batch is reviewed and refactored right after its GREEN
+- groups: With worktrees > 1, independent groups get their agents at once, one worktree each;
+  the tests of a group whose merge conflicts are redone in the serial loop
+- plan: Plan mode reads the plan and checks each finished task's box natively
+- replay: Native steps run once, unfinished steps are handed out again, and a changed
+  program is refused
+- resume: A resumed run keeps completed steps and carries on at the interrupted batch;
+  a state file changed since a step saw it redoes the steps from there
+- cli: workflow-next, workflow-done and workflow-reset
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.workflow import (
+    WorkflowError,
+    complete_step,
+    load_journal,
+    load_program,
+    next_steps,
+    parse_program,
+    resume_run,
+)
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+TESTS = [
+    {
+        "test_id": f"t{n}",
+        "test_case_id": f"tc{n}",
+        "scenario_id": "s1",
+        "runner_id": "unit",
+        "test_file": test_file,
+        "test_function": f"test_{n}",
+    }
+    for n, test_file in ((1, "tests/test_a.py"), (2, "tests/test_a.py"), (3, "tests/test_b.py"))
+]
+
+
+def _results(doc: dict, status: str) -> dict:
+    return {"results": [{**test, "status": status} for test in doc["batch"]]}
+
+
+def _agents(task_type: str, suite: str = "pass", issues: bool = False) -> dict:
+    """What each fake agent writes, given the state directory."""
+
+    def read(state: Path, name: str) -> dict:
+        return json.loads((state / name).read_text())
+
+    scenario = {"scenario_id": "s1", "description": "s", "test_cases": []}
+    found = {"issues": [{"description": "rename"}] if issues else []}
+    return {
+        "curate-guidance": lambda state: {"human-guidance.json": {"guidance": []}},
+        "classify-task": lambda state: {"task-classification.json": {"task_type": task_type}},
+        "enumerate-scenarios-and-test-cases": lambda state: {
+            "scenarios.json": {"scenarios": [scenario]}
+        },
+        "create-test-placeholders": lambda state: {"tests.json": {"tests": TESTS}},
+        "implement-tests": lambda state: {
+            "test-state.json": _results(read(state, "current-batch.json"), "failing_correctly")
+        },
+        "implement-code": lambda state: {
+            "code-state.json": {
+                "results": [
+                    {**r, "status": "passing", "files_changed": ["src/app.py"]}
+                    for r in read(state, "test-state.json")["results"]
+                ]
+            }
+        },
+        "identify-test-issues": lambda state: {"test-issues.json": found},
+        "identify-code-issues": lambda state: {"code-issues.json": found},
+        "refactor-tests": lambda state: {"files-changed.json": read(state, "files-changed.json")},
+        "refactor-code": lambda state: {"files-changed.json": read(state, "files-changed.json")},
+        "verify-test-coverage": lambda state: {
+            "coverage-report.json": {"status": "complete", "gaps": []}
+        },
+        "run-all-tests": lambda state: {
+            "all-tests-results.json": {"total": 3, "passed": 3, "failed": 0, "status": suite}
+        },
+        "update-documentation": lambda state: {"docs-updated.json": {"files": []}},
+        "commit-changes": lambda state: {"commit-result.json": {"committed": True}},
+    }
+
+
+@pytest.fixture
+def project(tmp_path):
+    for path in ("src/app.py", "tests/test_a.py", "tests/test_b.py"):
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text("")
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    (state / "task.json").write_text(json.dumps({"description": "fix the login bug"}))
+    runner = {
+        "name": "pytest",
+        "command": "pytest",
+        "test_directory": "tests",
+        "file_pattern": "test_*.py",
+        "run_args": [],
+    }
+    config = {"runners": {"unit": runner}, "default_runner": "unit"}
+    (state / "test-config.json").write_text(json.dumps(config))
+    return tmp_path
+
+
+def _drive(project: Path, agents: dict, answers: dict, environ: dict | None = None):
+    """Carries out every step like an orchestrator; returns the rounds and the final status."""
+    state = project / ".pairingbuddy"
+    rounds = []
+    while True:
+        result = next_steps(project, state, environ=environ or {})
+        if result["status"] != "run":
+            return rounds, result
+        rounds.append([step.get("agent") or step["function"] for step in result["steps"]])
+        for step in result["steps"]:
+            if "agent" in step:
+                for name, doc in agents[step["agent"]](state).items():
+                    (state / name).write_text(json.dumps(doc))
+                complete_step(state, step["step"])
+            else:
+                complete_step(state, step["step"], answers.get(step["function"]))
+
+
+def test_coding_skill_program_loads():
+    program = load_program()
+
+    assert program.state_files["current_batch"] == "current-batch.json"
+    assert program.outputs("scope-refactoring") == ["code-issues.json", "test-issues.json"]
+    with pytest.raises(WorkflowError, match="Lambda is not supported"):
+        parse_program("x = lambda: 1\n", {})
+
+
+def test_bug_fix_runs_agents_in_workflow_order(project):
+    rounds, result = _drive(project, _agents("bug_fix"), {"_ask_human": True})
+
+    assert result == {"status": "done"}
+    assert [step for steps in rounds for step in steps] == [
+        "curate-guidance",
+        "classify-task",
+        "enumerate-scenarios-and-test-cases",
+        "create-test-placeholders",
+        "implement-tests",
+        "implement-code",
+        "implement-tests",
+        "implement-code",
+        "run-all-tests",
+        "update-documentation",
+        "_ask_human",
+        "commit-changes",
+    ]
+    state = project / ".pairingbuddy"
+    assert (state / "task.json").exists()  # restored after the cleanup
+    batch = json.loads((state / "current-batch.json").read_text())["batch"]
+    assert [test["test_id"] for test in batch] == ["t3"]
+
+
+def test_plan_mode_checks_off_finished_tasks(project):
+    plan = project / "plan.md"
+    plan.write_text("## TB1: Login\n\n- [x] **Task 1: Form**\n- [ ] **Task 2: Fix the bug**\n")
+    state = project / ".pairingbuddy"
+    (state / "task.json").write_text(json.dumps({"description": "execute plan.md"}))
+
+    rounds, result = _drive(project, _agents("bug_fix"), {"_ask_human": True})
+
+    assert result == {"status": "stopped", "message": "Plan execution paused/complete."}
+    assert plan.read_text().count("- [x]") == 2
+    steps = [step for steps in rounds for step in steps]
+    assert "_read_plan_tasks" not in steps and "_mark_task_complete" not in steps
+    assert steps.count("classify-task") == 1
+    task = json.loads((state / "task.json").read_text())
+    assert task == {"description": "Task 2: Fix the bug", "context": "## TB1: Login"}
+
+
+def test_failing_suite_stops_with_message(project):
+    rounds, result = _drive(project, _agents("bug_fix", suite="fail"), {})
+
+    assert result["status"] == "stopped"
+    assert result["message"] == "Final verification failed - tests not passing"
+    assert rounds[-1] == ["run-all-tests"]
+
+
+def test_pipelined_review_runs_with_next_red(project):
+    rounds, result = _drive(
+        project,
+        _agents("new_feature", issues=True),
+        {"_ask_human": True},
+        environ={"PAIRINGBUDDY_PIPELINE": "true"},
+    )
+
+    assert result == {"status": "done"}
+    assert ["identify-test-issues", "identify-code-issues", "implement-tests"] in rounds
+    assert sum(steps.count("implement-tests") for steps in rounds) == 2
+    assert sum(steps.count("refactor-code") for steps in rounds) == 2
+
+
+def test_unpipelined_review_follows_each_green(project):
+    rounds, result = _drive(project, _agents("new_feature", issues=True), {"_ask_human": True})
+
+    assert result == {"status": "done"}
+    steps = [step for steps in rounds for step in steps]
+    start = steps.index("implement-tests")
+    batch = [
+        "implement-tests",
+        "implement-code",
+        "identify-test-issues",
+        "identify-code-issues",
+        "refactor-tests",
+        "refactor-code",
+    ]
+    assert steps[start : start + 12] == batch * 2
+    assert all(len(round_steps) == 1 for round_steps in rounds)
+
+
+def _parallel(project: Path) -> None:
+    """Makes project a git repository that ignores .pairingbuddy/, with two worktrees."""
+    git = ["git", "-c", "user.name=dev", "-c", "user.email=dev@example.com"]
+    subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+    (project / ".gitignore").write_text(".pairingbuddy/\n")
+    subprocess.run(["git", "add", ".gitignore"], cwd=project, check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "init"], cwd=project, check=True)
+    config_path = project / ".pairingbuddy" / "test-config.json"
+    config_path.write_text(json.dumps({**json.loads(config_path.read_text()), "worktrees": 2}))
+
+
+def test_independent_groups_run_in_parallel_worktrees(project):
+    _parallel(project)
+    agents = _agents("new_feature")
+    state = project / ".pairingbuddy"
+    while True:
+        steps = next_steps(project, state, environ={})["steps"]
+        if steps[0].get("agent") == "implement-tests":
+            break
+        for name, doc in agents.get(steps[0].get("agent"), lambda state: {})(state).items():
+            (state / name).write_text(json.dumps(doc))
+        complete_step(state, steps[0]["step"])
+
+    assert [step["step"] for step in steps] == ["8.g1.1", "8.g2.1"]
+    for step in steps:
+        batch = Path(step["worktree"], ".pairingbuddy", "current-batch.json")
+        assert step["prompt"] == f"worktree={step['worktree']}"
+        assert {test["test_file"] for test in json.loads(batch.read_text())["batch"]} == {
+            "tests/test_a.py" if step["step"].startswith("8.g1") else "tests/test_b.py"
+        }
+
+
+def test_conflicting_group_is_redone_serially(project):
+    _parallel(project)
+    agents = _agents("new_feature")
+    state = project / ".pairingbuddy"
+    serial = []
+    while (result := next_steps(project, state, environ={}))["status"] == "run":
+        for step in result["steps"]:
+            if "agent" not in step:
+                complete_step(state, step["step"], True)
+                continue
+            base = Path(step["worktree"]) / ".pairingbuddy" if "worktree" in step else state
+            if step["agent"] == "implement-code" and "worktree" in step:
+                # Both groups edit the same lines: the second merge conflicts
+                (base.parent / "src" / "app.py").write_text(f"{step['step']}\n")
+            if step["agent"] == "implement-tests" and "worktree" not in step:
+                batch = json.loads((state / "current-batch.json").read_text())["batch"]
+                serial += [test["test_id"] for test in batch]
+            for name, doc in agents[step["agent"]](base).items():
+                (base / name).write_text(json.dumps(doc))
+            complete_step(state, step["step"])
+
+    assert result == {"status": "done"}
+    assert (project / "src" / "app.py").read_text().startswith("8.g1")
+    assert serial == ["t3"]
+
+
+def test_replay_hands_out_unfinished_steps_again(project):
+    state = project / ".pairingbuddy"
+    first = next_steps(project, state, environ={})
+    assert next_steps(project, state, environ={}) == first
+
+    complete_step(state, first["steps"][0]["step"])
+    following = next_steps(project, state, environ={})
+
+    assert following["steps"][0]["agent"] == "classify-task"
+    assert load_journal(state).steps["0"]["call"] == "_detect_plan_file"
+    assert load_journal(state).steps["2"]["call"] == "_cleanup_state_files"
+    with pytest.raises(WorkflowError, match="not pending"):
+        complete_step(state, first["steps"][0]["step"])
+
+    program = parse_program("classify_task(task)\n", load_program().state_files)
+    with pytest.raises(WorkflowError, match="workflow changed"):
+        next_steps(project, state, program=program, environ={})
+
+
+def _interrupt(project: Path, agents: dict, agent: str, occurrence: int) -> dict:
+    """Carries out steps until the given occurrence of agent is handed out; returns that step."""
+    state = project / ".pairingbuddy"
+    seen = 0
+    while True:
+        step = next_steps(project, state, environ={})["steps"][0]
+        if step.get("agent") == agent:
+            seen += 1
+            if seen == occurrence:
+                return step
+        for name, doc in agents.get(step.get("agent"), lambda state: {})(state).items():
+            (state / name).write_text(json.dumps(doc))
+        complete_step(state, step["step"], True if "function" in step else None)
+
+
+def test_resume_carries_on_at_the_interrupted_batch(project):
+    state = project / ".pairingbuddy"
+    step = _interrupt(project, _agents("bug_fix"), "implement-code", 2)
+
+    result = resume_run(project, state, environ={})
+
+    assert result["steps"] == [step]
+    assert result["resumed"] == {"redo_from": None, "changed": []}
+    steps = load_journal(state).steps.values()
+    record = next(r for r in steps if r.get("agent") == "implement-tests")
+    assert set(record["inputs"]) >= {"current-batch.json", "task.json"}
+    assert list(record["outputs"]) == ["test-state.json"]
+    assert record["started_at"] <= record["completed_at"]
+
+
+def test_resume_redoes_steps_that_saw_a_changed_file(project):
+    state = project / ".pairingbuddy"
+    _interrupt(project, _agents("bug_fix"), "implement-code", 2)
+    (state / "tests.json").write_text(json.dumps({"tests": TESTS[2:]}))
+
+    result = resume_run(project, state, environ={})
+
+    assert result["resumed"]["changed"] == ["tests.json"]
+    assert result["steps"][0]["agent"] == "implement-tests"
+    batch = json.loads((state / "current-batch.json").read_text())["batch"]
+    assert [test["test_id"] for test in batch] == ["t3"]
+
+    (state / "task.json").write_text(json.dumps({"description": "fix the logout bug"}))
+    result = resume_run(project, state, environ={})
+
+    assert result["resumed"] == {"redo_from": "1", "changed": ["task.json"]}
+    assert result["steps"][0]["agent"] == "curate-guidance"
+    assert load_journal(state).inputs["task"] == {"description": "fix the logout bug"}
+
+
+def _cli(project: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=project, env=env, timeout=30
+    )
+
+
+def test_cli_steps_through_the_workflow(project):
+    first = _cli(project, "workflow-next")
+    assert first.returncode == 0, first.stderr
+    step = json.loads(first.stdout)["steps"][0]
+    assert step == {"step": "1", "agent": "curate-guidance", "prompt": ""}
+
+    done = _cli(project, "workflow-done", "1")
+    assert (done.returncode, done.stdout.strip()) == (0, "step 1 (curate_guidance) done")
+    assert _cli(project, "workflow-done", "1").returncode == 2
+    assert _cli(project, "workflow-done", "2", "--result", "{").returncode == 2
+
+    assert _cli(project, "workflow-reset").returncode == 0
+    assert json.loads(_cli(project, "workflow-next").stdout)["steps"][0]["step"] == "1"
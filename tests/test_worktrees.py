@@ -0,0 +1,120 @@
+"""Tests for parallel RED-GREEN worktrees (pairingbuddy/worktrees.py).
+
+Scenarios covered:
+- create: A worktree holds uncommitted and untracked work plus the shared state files,
+  without touching the user's branch, index or status
+- merge: A group's edits and agent results land in the project tree
+- conflicts: A group that conflicts with an earlier merge applies nothing
+- cli: create-worktree and merge-worktree exit 0, 1 on conflict, 2 on errors
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from pairingbuddy.worktrees import create_worktree, merge_worktree
+
+ROOT = Path(__file__).parent.parent
+LAUNCHER = ROOT / "scripts" / "pairingbuddy"
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "dev@example.com")
+    _git(tmp_path, "config", "user.name", "dev")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "auth.py").write_text("def login():\n    pass\n")
+    (tmp_path / "src" / "session.py").write_text("def logout():\n    pass\n")
+    (tmp_path / ".gitignore").write_text(".pairingbuddy/\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    state = tmp_path / ".pairingbuddy"
+    state.mkdir()
+    (state / "tests.json").write_text(json.dumps({"tests": []}))
+    return tmp_path
+
+
+def test_worktree_holds_uncommitted_work_and_shared_state(repo):
+    (repo / "src" / "auth.py").write_text("def login():\n    return True\n")
+    (repo / "src" / "new.py").write_text("NEW = 1\n")
+    status, head = _git(repo, "status", "--porcelain"), _git(repo, "rev-parse", "HEAD")
+
+    path = create_worktree(repo, repo / ".pairingbuddy", "g1")
+
+    assert (path / "src" / "auth.py").read_text() == "def login():\n    return True\n"
+    assert (path / "src" / "new.py").read_text() == "NEW = 1\n"
+    assert (path / ".pairingbuddy" / "tests.json").exists()
+    assert _git(repo, "status", "--porcelain") == status
+    assert _git(repo, "rev-parse", "HEAD") == head
+    assert _git(repo, "stash", "list") == ""
+
+
+def test_merge_applies_edits_and_results(repo):
+    state = repo / ".pairingbuddy"
+    (state / "code-state.json").write_text(json.dumps({"results": [{"test_id": "old"}]}))
+    path = create_worktree(repo, state, "g1")
+    (path / "src" / "auth.py").write_text("def login():\n    return True\n")
+    (path / "src" / "token.py").write_text("TOKEN = 1\n")
+    (path / ".pairingbuddy" / "code-state.json").write_text(
+        json.dumps({"results": [{"test_id": "t1", "status": "passing"}]})
+    )
+
+    assert merge_worktree(repo, state, "g1") == []
+
+    assert (repo / "src" / "auth.py").read_text() == "def login():\n    return True\n"
+    assert (repo / "src" / "token.py").read_text() == "TOKEN = 1\n"
+    results = json.loads((state / "code-state.json").read_text())["results"]
+    assert [entry["test_id"] for entry in results] == ["old", "t1"]
+    assert not path.exists()
+    assert len(_git(repo, "worktree", "list").splitlines()) == 1
+
+
+def test_conflicting_group_applies_nothing(repo):
+    state = repo / ".pairingbuddy"
+    first = create_worktree(repo, state, "g1")
+    second = create_worktree(repo, state, "g2")
+    (first / "src" / "auth.py").write_text("def login():\n    return 1\n")
+    (second / "src" / "auth.py").write_text("def login():\n    return 2\n")
+    (second / "src" / "session.py").write_text("def logout():\n    return 2\n")
+    (second / ".pairingbuddy" / "code-state.json").write_text(json.dumps({"results": []}))
+
+    assert merge_worktree(repo, state, "g1") == []
+    assert merge_worktree(repo, state, "g2") == ["src/auth.py"]
+
+    assert (repo / "src" / "auth.py").read_text() == "def login():\n    return 1\n"
+    assert (repo / "src" / "session.py").read_text() == "def logout():\n    pass\n"
+    assert not (state / "code-state.json").exists()
+    assert not second.exists()
+
+
+def _cli(repo: Path, *args: str) -> subprocess.CompletedProcess:
+    env = os.environ.copy()
+    env["PAIRINGBUDDY_PYTHON"] = sys.executable
+    return subprocess.run(
+        [str(LAUNCHER), *args], capture_output=True, text=True, cwd=repo, env=env, timeout=30
+    )
+
+
+def test_cli_exit_codes(repo):
+    created = _cli(repo, "create-worktree", "g1")
+    assert created.returncode == 0, created.stderr
+    assert _cli(repo, "create-worktree", "g1").returncode == 2
+
+    Path(created.stdout.strip(), "src", "auth.py").write_text("changed\n")
+    (repo / "src" / "auth.py").write_text("also changed\n")
+
+    merged = _cli(repo, "merge-worktree", "g1")
+    assert merged.returncode == 1
+    assert merged.stdout.strip() == "g1: conflicts in src/auth.py; nothing merged"
+    assert _cli(repo, "merge-worktree", "g1").returncode == 2